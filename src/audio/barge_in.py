@@ -6,11 +6,14 @@ when user speaks while assistant is responding.
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Optional, Callable
 from datetime import datetime, timedelta
 
+from bridge.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +40,7 @@ class BargeInConfig:
     min_speech_ms: int = 250          # Minimum speech duration to trigger interrupt
     cooldown_ms: int = 500            # Cooldown after interrupt before new detection
     vad_threshold: float = 0.5
+    frame_duration_ms: int = 30       # Audio per feed_frame() call (push mode)
     
     # Latency targets
     max_interrupt_latency_ms: float = 100.0
@@ -60,6 +64,10 @@ class BargeInHandler:
     3. Trigger interruption event
     4. Cancel current TTS/audio output
     5. Transition back to listening state
+    
+    Energy arrives either by polling ``vad_callback`` (start/stop) or,
+    preferably, pushed per audio frame through ``feed_frame``, which
+    debounces in sample time and can be called from the audio thread.
     """
     
     def __init__(
@@ -82,12 +90,25 @@ class BargeInHandler:
         self.last_interrupt: Optional[datetime] = None
         self.interrupt_count = 0
         
+        # Push-mode tracking (monotonic capture timestamps, frame counts)
+        self._voiced_frames = 0
+        self._voiced_start_ts: Optional[float] = None
+        self._last_interrupt_ts: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         # Statistics
         self.stats = {
             'interruptions_detected': 0,
             'avg_latency_ms': 0.0,
             'total_latency_ms': 0.0,
         }
+        metrics = get_metrics_registry()
+        self._latency_hist = metrics.histogram(
+            "barge_in_latency_seconds", "First voiced frame to confirmed interruption"
+        )
+        self._interruptions_counter = metrics.counter(
+            "barge_in_interruptions_total", "Confirmed barge-in interruptions"
+        )
         
         # Background task
         self._monitor_task: Optional[asyncio.Task] = None
@@ -100,6 +121,7 @@ class BargeInHandler:
             return
             
         self._running = True
+        self._loop = asyncio.get_running_loop()
         self._monitor_task = asyncio.create_task(self._monitor_loop())
         logger.info("Barge-in monitor started");
     
@@ -176,6 +198,20 @@ class BargeInHandler:
         if self.on_state_change:
             await self._safe_callback(self.on_state_change, old_state, self.state)
         
+        event = self._record_interruption(energy, duration_ms, latency_ms, now)
+        
+        # Notify handler
+        if self.on_interruption:
+            await self._safe_callback(self.on_interruption, event)
+    
+    def _record_interruption(
+        self,
+        energy: float,
+        duration_ms: float,
+        latency_ms: float,
+        now: datetime
+    ) -> InterruptionEvent:
+        """Update tracking and stats for a confirmed interruption."""
         # Update tracking
         self.last_interrupt = now
         self.speech_start = None  # Reset
@@ -187,23 +223,118 @@ class BargeInHandler:
         self.stats['avg_latency_ms'] = (
             self.stats['total_latency_ms'] / self.stats['interruptions_detected']
         )
+        self._latency_hist.observe(latency_ms / 1000)
+        self._interruptions_counter.inc()
         
         # Create event
         event = InterruptionEvent(
             timestamp=now,
             vad_energy=energy,
-            confidence=min(1.0, duration_ms / self.config.min_speech_ms),
+            confidence=min(1.0, duration_ms / self.config.min_speech_ms)
+            if self.config.min_speech_ms else 1.0,
             latency_ms=latency_ms
         )
         
         logger.info(
             f"Barge-in detected: energy={energy:.3f}, latency={latency_ms:.1f}ms, "
             f"confidence={event.confidence:.2f}"
-        );
+        )
+        return event
+    
+    # Push mode
+    
+    def feed_frame(self, energy: float, ts: float) -> Optional[InterruptionEvent]:
+        """Feed VAD energy for one audio frame (push mode).
         
-        # Notify handler
+        Safe to call from the audio/analysis thread. The ``min_speech_ms``
+        debounce counts consecutive voiced frames of
+        ``config.frame_duration_ms`` each, so it is measured in audio time
+        rather than by when frames happen to be processed.
+        
+        Args:
+            energy: VAD energy/probability for the frame (0.0-1.0)
+            ts: Monotonic capture timestamp of the frame (time.monotonic() clock)
+        
+        Returns:
+            The InterruptionEvent if this frame confirmed an interruption
+        """
+        if self.state != BargeInState.SPEAKING:
+            return None
+        
+        if energy <= self.config.sensitivity.value:
+            self._voiced_frames = 0
+            self._voiced_start_ts = None
+            return None
+        
+        if self._last_interrupt_ts is not None:
+            if (ts - self._last_interrupt_ts) * 1000 < self.config.cooldown_ms:
+                return None
+        
+        if self._voiced_frames == 0:
+            self._voiced_start_ts = ts
+        self._voiced_frames += 1
+        
+        duration_ms = self._voiced_frames * self.config.frame_duration_ms
+        if duration_ms < self.config.min_speech_ms:
+            return None
+        
+        return self._fire_interruption(energy, duration_ms, ts)
+    
+    def _fire_interruption(
+        self,
+        energy: float,
+        duration_ms: float,
+        ts: float
+    ) -> InterruptionEvent:
+        """Confirm an interruption detected in push mode and notify handlers."""
+        latency_ms = (time.monotonic() - self._voiced_start_ts) * 1000
+        
+        old_state = self.state
+        self.state = BargeInState.INTERRUPTING
+        self._voiced_frames = 0
+        self._voiced_start_ts = None
+        self._last_interrupt_ts = ts
+        
+        event = self._record_interruption(energy, duration_ms, latency_ms, datetime.now())
+        
+        if self.on_state_change:
+            self._dispatch_callback(self.on_state_change, old_state, self.state)
         if self.on_interruption:
-            await self._safe_callback(self.on_interruption, event)
+            self._dispatch_callback(self.on_interruption, event)
+        return event
+    
+    def _dispatch_callback(self, callback, *args):
+        """Run a callback from push mode, which may be off the event loop.
+        
+        Plain callables run inline. Coroutine callbacks are scheduled on the
+        running loop, or on the handler's loop when called from another thread.
+        """
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                try:
+                    asyncio.get_running_loop().create_task(callback(*args))
+                except RuntimeError:
+                    if self._loop is None or self._loop.is_closed():
+                        logger.warning("No event loop for async barge-in callback")
+                        return
+                    asyncio.run_coroutine_threadsafe(callback(*args), self._loop)
+            else:
+                callback(*args)
+        except Exception as e:
+            logger.error(f"Error in barge-in callback: {e}")
+    
+    def set_state(self, new_state: BargeInState):
+        """Synchronously transition state (for callers outside the event loop)."""
+        old_state = self.state
+        self.state = new_state
+        self.speech_start = None
+        self._voiced_frames = 0
+        self._voiced_start_ts = None
+        
+        if self.on_state_change and old_state != new_state:
+            self._dispatch_callback(self.on_state_change, old_state, new_state)
+        
+        logger.debug(f"Barge-in state: {old_state.name} -> {new_state.name}")
     
     async def _safe_callback(self, callback, *args):
         """Safely execute a callback."""
@@ -220,12 +351,15 @@ class BargeInHandler:
     async def transition_to(self, new_state: BargeInState):
         """Transition to a new state."""
         async with self._state_lock:
+            self._loop = asyncio.get_running_loop()
             old_state = self.state
             self.state = new_state
             
             # Reset speech detection on state change
             if new_state != BargeInState.SPEAKING:
                 self.speech_start = None
+            self._voiced_frames = 0
+            self._voiced_start_ts = None
             
             if self.on_state_change and old_state != new_state:
                 await self._safe_callback(self.on_state_change, old_state, new_state)
@@ -14,7 +14,18 @@ from bridge.response_filter import (
     FilterDecision,
     FilteredMessage,
 )
-from bridge.audio_buffer import AudioBuffer
+from bridge.audio_buffer import AudioBuffer, PlaybackQueue
+from bridge.resampler import StreamingResampler
+from bridge.downmix import ChannelDownmixer, DownmixMode
+from bridge.metrics import (
+    MetricsRegistry,
+    MetricsServer,
+    Counter,
+    Gauge,
+    Histogram,
+    get_metrics_registry,
+)
+from bridge.latency import LatencyTracer, TurnStage, TurnTrace, get_latency_tracer
 from bridge.vad import (
     WebRTCVAD,
     VADConfig,
@@ -22,7 +33,17 @@ from bridge.vad import (
     VADState,
     SpeechSegmenter,
     SpeechSegment,
+    SpeechChunk,
+    SpeechChunkType,
+    SegmentAccumulator,
+    PreRollRing,
     MockVAD,
+    EnergyVAD,
+    VADBackend,
+    create_vad,
+    open_pcm16_wav,
+    read_pcm16_frames,
+    process_wav_file,
 )
 from bridge.audio_pipeline import (
     AudioPipeline,
@@ -31,6 +52,38 @@ from bridge.audio_pipeline import (
     AudioDeviceType,
     PipelineState,
     PipelineStats,
+    FrameActivity,
+    VoiceActivityMonitor,
+)
+from bridge.pipeline_host import PipelineHost, HostSource
+from bridge.device_registry import DeviceRegistry, DeviceSnapshot, get_device_registry
+from bridge.wake_word import (
+    WakeWordGate,
+    WakeWordDetector,
+    WakeWordDetection,
+    WakeWordBackend,
+    EnergyPatternDetector,
+    TemplateDetector,
+    create_wake_word_detector,
+)
+from bridge.audio_frame import (
+    AudioFrame,
+    AudioCodec,
+    FrameFlags,
+    AudioFrameError,
+)
+from bridge.codec import (
+    JSONCodec,
+    get_codec,
+    set_codec,
+    decode_message,
+    register_message_type,
+    ProtocolMessage,
+    VoiceInputMessage,
+    ControlMessage,
+    SessionRestoreMessage,
+    KeepaliveMessage,
+    TextMessage,
 )
 from bridge.openclaw_middleware import (
     OpenClawMiddleware,
@@ -80,6 +133,10 @@ from bridge.history_manager import (
     ConversationSession,
     get_history_manager,
 )
+from bridge.persistence_writer import (
+    PersistenceWriter,
+    PendingTurn,
+)
 from bridge.context_window import (
     ContextWindow,
     ContextMessage,
@@ -106,19 +163,74 @@ __all__ = [
     "FilterDecision",
     "FilteredMessage",
     "AudioBuffer",
+    "PlaybackQueue",
+    "StreamingResampler",
+    "ChannelDownmixer",
+    "DownmixMode",
+    "MetricsRegistry",
+    "MetricsServer",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "get_metrics_registry",
+    "LatencyTracer",
+    "TurnStage",
+    "TurnTrace",
+    "get_latency_tracer",
     "WebRTCVAD",
     "VADConfig",
     "VADMode",
     "VADState",
     "SpeechSegmenter",
     "SpeechSegment",
+    "SpeechChunk",
+    "SpeechChunkType",
+    "SegmentAccumulator",
+    "PreRollRing",
     "MockVAD",
+    "EnergyVAD",
+    "VADBackend",
+    "create_vad",
+    "open_pcm16_wav",
+    "read_pcm16_frames",
+    "process_wav_file",
     "AudioPipeline",
     "AudioDeviceManager",
     "AudioDeviceInfo",
     "AudioDeviceType",
     "PipelineState",
     "PipelineStats",
+    "FrameActivity",
+    "VoiceActivityMonitor",
+    "PipelineHost",
+    "HostSource",
+    "DeviceRegistry",
+    "DeviceSnapshot",
+    "get_device_registry",
+    "WakeWordGate",
+    "WakeWordDetector",
+    "WakeWordDetection",
+    "WakeWordBackend",
+    "EnergyPatternDetector",
+    "TemplateDetector",
+    "create_wake_word_detector",
+    # Binary Audio Frames
+    "AudioFrame",
+    "AudioCodec",
+    "FrameFlags",
+    "AudioFrameError",
+    # Protocol Codec
+    "JSONCodec",
+    "get_codec",
+    "set_codec",
+    "decode_message",
+    "register_message_type",
+    "ProtocolMessage",
+    "VoiceInputMessage",
+    "ControlMessage",
+    "SessionRestoreMessage",
+    "KeepaliveMessage",
+    "TextMessage",
     # OpenClaw Middleware
     "OpenClawMiddleware",
     "MessageMetadata",
@@ -157,6 +269,8 @@ __all__ = [
     "ConversationTurn",
     "ConversationSession",
     "get_history_manager",
+    "PersistenceWriter",
+    "PendingTurn",
     "ContextWindow",
     "ContextMessage",
     "ContextWindowManager",
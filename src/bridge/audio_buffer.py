@@ -2,9 +2,12 @@
 Thread-safe ring buffer for audio streaming.
 
 Provides producer/consumer pattern for continuous audio I/O
-with overflow/underflow handling.
+with overflow/underflow handling. A lock-free single-producer/single-consumer
+ring mode backed by one preallocated array is available for audio callbacks,
+and PlaybackQueue streams variable-size chunks to the output device.
 """
 import threading
+import time
 from collections import deque
 from typing import Optional, List
 
@@ -20,13 +23,26 @@ class AudioBuffer:
     
     Supports multiple producers and consumers with configurable
     overflow behavior and frame-based operations.
+    
+    Every frame carries a monotonic capture timestamp (``write(...,
+    timestamp=)``, defaulting to the time of the write); after a successful
+    ``read()`` it is available as ``last_timestamp``.
+    
+    With ``lock_free=True`` the buffer runs as a single-producer/
+    single-consumer ring: frames are copied in place into one preallocated
+    ``(max_frames, frame_size)`` array and the producer and consumer only
+    ever advance their own index (``_head`` / ``_tail``), so the write path
+    takes no lock and allocates nothing. ``read()`` returns a fresh copy of
+    each frame, since the producer reuses the slot once it wraps around;
+    pass ``out=`` to copy into a caller-owned array without allocating.
     """
     
     def __init__(
         self,
         max_frames: int = 20,
         frame_size: int = 480,  # 30ms @ 16kHz
-        dtype: np.dtype = np.int16
+        dtype: np.dtype = np.int16,
+        lock_free: bool = False
     ):
         """
         Initialize audio buffer.
@@ -35,17 +51,36 @@ class AudioBuffer:
             max_frames: Maximum number of frames to store
             frame_size: Samples per frame
             dtype: NumPy data type for audio samples
+            lock_free: Use the preallocated SPSC ring instead of a locked deque
         """
         self.max_frames = max_frames
         self.frame_size = frame_size
         self.dtype = dtype
+        self.lock_free = lock_free
         
-        # Thread-safe buffer using deque
+        # Thread-safe buffer using deque (timestamps kept in step)
         self._buffer: deque = deque(maxlen=max_frames)
+        self._timestamps: deque = deque(maxlen=max_frames)
+        self.last_timestamp: Optional[float] = None
         self._lock = threading.RLock()
         self._not_empty = threading.Condition(self._lock)
         self._not_full = threading.Condition(self._lock)
         
+        # SPSC ring: _head is only advanced by the producer, _tail only by
+        # the consumer. Both are monotonically increasing frame counters;
+        # the slot index is counter % max_frames.
+        self._ring: Optional[np.ndarray] = None
+        self._ring_ts: Optional[np.ndarray] = None
+        self._head = 0
+        self._tail = 0
+        self._data_ready = threading.Event()
+        self._space_ready = threading.Event()
+        self._reader_waiting = False
+        self._writer_waiting = False
+        if lock_free:
+            self._ring = np.zeros((max_frames, frame_size), dtype=dtype)
+            self._ring_ts = np.zeros(max_frames, dtype=np.float64)
+        
         # Statistics
         self._overflow_count = 0
         self._underflow_count = 0
@@ -56,30 +91,50 @@ class AudioBuffer:
             "audio_buffer_initialized",
             max_frames=max_frames,
             frame_size=frame_size,
-            dtype=str(dtype)
+            dtype=str(dtype),
+            lock_free=lock_free
         )
     
+    def _ring_count(self) -> int:
+        """Number of frames in the ring (safe to call from either side)."""
+        return self._head - self._tail
+    
     @property
     def is_empty(self) -> bool:
         """Check if buffer is empty."""
+        if self.lock_free:
+            return self._ring_count() <= 0
         with self._lock:
             return len(self._buffer) == 0
     
     @property
     def is_full(self) -> bool:
         """Check if buffer is at capacity."""
+        if self.lock_free:
+            return self._ring_count() >= self.max_frames
         with self._lock:
             return len(self._buffer) >= self.max_frames
     
     @property
     def frame_count(self) -> int:
         """Get current number of frames in buffer."""
+        if self.lock_free:
+            return max(0, self._ring_count())
         with self._lock:
             return len(self._buffer)
     
     @property
     def stats(self) -> dict:
         """Get buffer statistics."""
+        if self.lock_free:
+            return {
+                "overflow_count": self._overflow_count,
+                "underflow_count": self._underflow_count,
+                "total_written": self._total_written,
+                "total_read": self._total_read,
+                "current_frames": self.frame_count,
+                "max_frames": self.max_frames
+            }
         with self._lock:
             return {
                 "overflow_count": self._overflow_count,
@@ -90,7 +145,13 @@ class AudioBuffer:
                 "max_frames": self.max_frames
             }
     
-    def write(self, frame: np.ndarray, block: bool = True, timeout: Optional[float] = None) -> bool:
+    def write(
+        self,
+        frame: np.ndarray,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        timestamp: Optional[float] = None
+    ) -> bool:
         """
         Write a frame to the buffer.
         
@@ -98,10 +159,17 @@ class AudioBuffer:
             frame: Audio frame as numpy array
             block: If True, wait until space available
             timeout: Max seconds to wait if blocking
+            timestamp: Monotonic capture time of the frame's first sample
+                (time of the write if None)
             
         Returns:
             True if frame was written, False if dropped
         """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.lock_free:
+            return self._ring_write(frame, block, timeout, timestamp)
+        
         # Validate frame
         if frame.shape[0] != self.frame_size:
             logger.warning(
@@ -120,7 +188,6 @@ class AudioBuffer:
             if self.is_full:
                 if not block:
                     self._overflow_count += 1
-                    logger.debug("buffer_overflow_frame_dropped")
                     return False
                 
                 # Wait for space
@@ -131,28 +198,127 @@ class AudioBuffer:
             
             # Write frame
             self._buffer.append(frame.copy())
+            self._timestamps.append(timestamp)
             self._total_written += 1
             self._not_empty.notify()
-            
-            logger.debug("frame_written", frame_count=len(self._buffer))
             return True
     
-    def read(self, block: bool = True, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+    def _ring_write(
+        self,
+        frame: np.ndarray,
+        block: bool,
+        timeout: Optional[float],
+        timestamp: float
+    ) -> bool:
+        """Producer side of the SPSC ring. No locks, no allocation."""
+        if self._head - self._tail >= self.max_frames:
+            if not block or not self._wait_ring(self._space_ready, True, timeout):
+                self._overflow_count += 1
+                return False
+        
+        index = self._head % self.max_frames
+        slot = self._ring[index]
+        self._ring_ts[index] = timestamp
+        n = frame.shape[0]
+        if n >= self.frame_size:
+            slot[:] = frame[:self.frame_size]
+        else:
+            # Pad short frames with silence
+            slot[:n] = frame
+            slot[n:] = 0
+        
+        # Publish only after the slot is fully written
+        self._head += 1
+        self._total_written += 1
+        if self._reader_waiting:
+            self._data_ready.set()
+        return True
+    
+    def _ring_read(
+        self,
+        block: bool,
+        timeout: Optional[float],
+        out: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """Consumer side of the SPSC ring. Copies the slot into ``out`` or a new array."""
+        if self._head - self._tail <= 0:
+            if not block or not self._wait_ring(self._data_ready, False, timeout):
+                self._underflow_count += 1
+                return None
+        
+        index = self._tail % self.max_frames
+        slot = self._ring[index]
+        self.last_timestamp = float(self._ring_ts[index])
+        if out is not None:
+            out[:] = slot
+            frame = out
+        else:
+            frame = slot.copy()
+        
+        self._tail += 1
+        self._total_read += 1
+        if self._writer_waiting:
+            self._space_ready.set()
+        return frame
+    
+    def _wait_ring(self, event: threading.Event, writer: bool, timeout: Optional[float]) -> bool:
+        """
+        Block the calling side of the ring until the other side makes progress.
+        
+        The waiting flag is raised before the condition is re-checked so a
+        concurrent publish either becomes visible to the re-check or sees
+        the flag and sets the event.
+        """
+        def ready() -> bool:
+            if writer:
+                return self._head - self._tail < self.max_frames
+            return self._head - self._tail > 0
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            event.clear()
+            if writer:
+                self._writer_waiting = True
+            else:
+                self._reader_waiting = True
+            try:
+                if ready():
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                event.wait(remaining)
+            finally:
+                if writer:
+                    self._writer_waiting = False
+                else:
+                    self._reader_waiting = False
+    
+    def read(
+        self,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
         """
         Read a frame from the buffer.
         
         Args:
             block: If True, wait until data available
             timeout: Max seconds to wait if blocking
+            out: Optional preallocated array to copy the frame into
             
         Returns:
-            Audio frame or None if timeout/empty
+            Audio frame or None if timeout/empty (its capture timestamp is
+            in ``last_timestamp``)
         """
+        if self.lock_free:
+            return self._ring_read(block, timeout, out)
+        
         with self._not_empty:
             if self.is_empty:
                 if not block:
                     self._underflow_count += 1
-                    logger.debug("buffer_underflow")
                     return None
                 
                 if not self._not_empty.wait(timeout=timeout):
@@ -162,10 +328,12 @@ class AudioBuffer:
             
             # Read frame
             frame = self._buffer.popleft()
+            self.last_timestamp = self._timestamps.popleft()
             self._total_read += 1
             self._not_full.notify()
-            
-            logger.debug("frame_read", remaining=len(self._buffer))
+            if out is not None:
+                out[:] = frame
+                return out
             return frame
     
     def read_multiple(self, count: int, block: bool = True, timeout: Optional[float] = None) -> List[np.ndarray]:
@@ -192,12 +360,25 @@ class AudioBuffer:
         """
         Clear all frames from buffer.
         
+        In lock-free mode this discards everything the producer has
+        published so far and should be called from the consumer side.
+        
         Returns:
             Number of frames cleared
         """
+        if self.lock_free:
+            head = self._head
+            count = max(0, head - self._tail)
+            self._tail = head
+            if self._writer_waiting:
+                self._space_ready.set()
+            logger.info("buffer_cleared", frames_cleared=count)
+            return count
+        
         with self._lock:
             count = len(self._buffer)
             self._buffer.clear()
+            self._timestamps.clear()
             self._not_full.notify_all()
             logger.info("buffer_cleared", frames_cleared=count)
             return count
@@ -209,6 +390,11 @@ class AudioBuffer:
         Returns:
             Next frame or None if empty
         """
+        if self.lock_free:
+            if self._head - self._tail <= 0:
+                return None
+            return self._ring[self._tail % self.max_frames].copy()
+        
         with self._lock:
             if self._buffer:
                 return self._buffer[0].copy()
@@ -222,3 +408,155 @@ class AudioBuffer:
         """Context manager exit - clears buffer."""
         self.clear()
         return False
+
+
+class PlaybackQueue:
+    """
+    Sample-granular FIFO for streaming TTS playback.
+    
+    Unlike AudioBuffer it does not split audio into fixed frames: producers
+    write chunks of any length straight into one preallocated circular
+    array, and the output callback copies exactly as many samples as the
+    device block needs. ``write(block=True)`` waits for free space instead
+    of dropping (backpressure); ``clear()`` wakes blocked writers so a
+    cancelled stream stops promptly.
+    """
+    
+    def __init__(self, capacity: int = 32000, dtype: np.dtype = np.int16):
+        """
+        Initialize playback queue.
+        
+        Args:
+            capacity: Maximum queued samples
+            dtype: NumPy data type for audio samples
+        """
+        self.capacity = capacity
+        self.dtype = dtype
+        self._data = np.zeros(capacity, dtype=dtype)
+        # Monotonic sample counters; position in _data is counter % capacity
+        self._read_pos = 0
+        self._write_pos = 0
+        self._epoch = 0  # Bumped by clear() to release blocked writers
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        
+        # Statistics
+        self._total_written = 0
+        self._total_read = 0
+        
+        logger.info("playback_queue_initialized", capacity=capacity, dtype=str(dtype))
+    
+    @property
+    def available(self) -> int:
+        """Samples queued for playback."""
+        return self._write_pos - self._read_pos
+    
+    @property
+    def free(self) -> int:
+        """Samples that can be written without blocking."""
+        return self.capacity - self.available
+    
+    @property
+    def is_empty(self) -> bool:
+        """Check if nothing is queued."""
+        return self.available == 0
+    
+    @property
+    def stats(self) -> dict:
+        """Get queue statistics."""
+        with self._lock:
+            return {
+                'capacity': self.capacity,
+                'current_samples': self._write_pos - self._read_pos,
+                'total_written': self._total_written,
+                'total_read': self._total_read,
+            }
+    
+    def _copy_in(self, samples: np.ndarray):
+        """Copy samples at the write position (caller holds the lock)."""
+        start = self._write_pos % self.capacity
+        first = min(samples.shape[0], self.capacity - start)
+        np.copyto(self._data[start:start + first], samples[:first], casting='unsafe')
+        if first < samples.shape[0]:
+            np.copyto(self._data[:samples.shape[0] - first], samples[first:], casting='unsafe')
+        self._write_pos += samples.shape[0]
+    
+    def write(
+        self,
+        samples: np.ndarray,
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Queue samples for playback.
+        
+        Args:
+            samples: 1-D audio samples of any length
+            block: Wait for space instead of writing only what fits
+            timeout: Max seconds to wait for space if blocking
+            
+        Returns:
+            Number of samples queued (less than len(samples) on timeout,
+            non-blocking overflow, or if the queue was cleared meanwhile)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        total = samples.shape[0]
+        written = 0
+        with self._not_full:
+            epoch = self._epoch
+            while written < total:
+                space = self.capacity - (self._write_pos - self._read_pos)
+                if space > 0:
+                    n = min(space, total - written)
+                    self._copy_in(samples[written:written + n])
+                    written += n
+                    continue
+                if not block:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._not_full.wait(timeout=remaining)
+                if self._epoch != epoch:
+                    break
+            self._total_written += written
+        return written
+    
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Copy up to len(out) queued samples into out (never blocks).
+        
+        Args:
+            out: Destination array (may be a strided view, e.g. outdata[:, 0])
+            
+        Returns:
+            Number of samples copied; out[n:] is left untouched
+        """
+        with self._not_full:
+            n = min(out.shape[0], self._write_pos - self._read_pos)
+            if n:
+                start = self._read_pos % self.capacity
+                first = min(n, self.capacity - start)
+                out[:first] = self._data[start:start + first]
+                if first < n:
+                    out[first:n] = self._data[:n - first]
+                self._read_pos += n
+                self._total_read += n
+                self._not_full.notify_all()
+        return n
+    
+    def clear(self) -> int:
+        """
+        Drop all queued samples and release blocked writers.
+        
+        Returns:
+            Number of samples dropped
+        """
+        with self._not_full:
+            dropped = self._write_pos - self._read_pos
+            self._read_pos = self._write_pos
+            self._epoch += 1
+            self._not_full.notify_all()
+        if dropped:
+            logger.debug("playback_queue_cleared", samples_dropped=dropped)
+        return dropped
@@ -10,9 +10,10 @@ import json
 from dataclasses import dataclass
 from typing import List, Optional
 
-import sounddevice as sd
 import structlog
 
+from bridge.device_registry import get_device_registry
+
 logger = structlog.get_logger()
 
 
@@ -60,17 +61,22 @@ class AudioDiscovery:
         self.default_input: Optional[AudioDevice] = None
         self.default_output: Optional[AudioDevice] = None
         
-    def discover(self) -> AudioDiscovery:
-        """Discover all audio devices."""
+    def discover(self, refresh: bool = False) -> AudioDiscovery:
+        """Discover all audio devices.
+        
+        Uses the shared device registry, so devices are only enumerated
+        again if ``refresh`` is set (or nothing has enumerated them yet).
+        """
         logger.info("Discovering audio devices...")
         self.devices = []
         
         try:
-            device_list = sd.query_devices()
-            default_input_idx = sd.default.device[0]
-            default_output_idx = sd.default.device[1]
+            registry = get_device_registry()
+            snapshot = registry.refresh() if refresh else registry.snapshot()
+            default_input_idx = snapshot.default_input
+            default_output_idx = snapshot.default_output
             
-            for i, dev_info in enumerate(device_list):
+            for i, dev_info in snapshot.by_index.items():
                 is_input = dev_info.get("max_input_channels", 0) > 0
                 is_output = dev_info.get("max_output_channels", 0) > 0
                 
@@ -0,0 +1,179 @@
+"""
+Binary audio frames for the OpenClaw WebSocket.
+
+Voice input normally reaches OpenClaw as transcribed text. Endpoints that
+cannot run STT locally stream the captured audio instead, as binary
+WebSocket frames: a fixed 23-byte header, the session ID, then the raw
+PCM or Opus payload. No base64 or JSON wrapping, so the audio costs its
+own size on the wire and the server reads the header with one unpack.
+
+Header layout (network byte order)::
+
+    magic        2s  b"VB"
+    version      B   FRAME_VERSION
+    codec        B   AudioCodec
+    flags        B   FrameFlags
+    channels     B
+    sample_rate  I   Hz
+    sequence     I   per-connection counter (gaps mean lost frames)
+    timestamp    Q   capture time, microseconds since the epoch
+    session_len  B   length of the UTF-8 session ID that follows
+"""
+import enum
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+FRAME_MAGIC = b"VB"
+FRAME_VERSION = 1
+
+_HEADER = struct.Struct("!2sBBBBIIQB")
+HEADER_SIZE = _HEADER.size
+
+MAX_SESSION_ID_BYTES = 255
+MAX_PAYLOAD_BYTES = 64 * 1024  # ~2 s of 16 kHz mono PCM
+
+
+class AudioCodec(enum.IntEnum):
+    """Payload encoding."""
+    PCM16 = 1   # Little-endian signed 16-bit, interleaved
+    OPUS = 2    # One Opus packet per frame
+
+
+class FrameFlags(enum.IntFlag):
+    """Position of a frame within its utterance."""
+    NONE = 0
+    START = 0x01    # First frame of an utterance
+    END = 0x02      # Last frame; the server can transcribe now
+    DISCARD = 0x04  # Utterance was too short; drop what was received
+
+
+class AudioFrameError(ValueError):
+    """Raised when binary data is not a valid audio frame."""
+
+
+@dataclass
+class AudioFrame:
+    """One chunk of streamed audio plus its header fields."""
+    session_id: str
+    sequence: int
+    payload: bytes
+    timestamp: float = 0.0  # Capture time (seconds since the epoch)
+    codec: AudioCodec = AudioCodec.PCM16
+    sample_rate: int = 16000
+    channels: int = 1
+    flags: FrameFlags = FrameFlags.NONE
+    
+    @classmethod
+    def from_pcm(
+        cls,
+        samples: np.ndarray,
+        session_id: str,
+        sequence: int,
+        sample_rate: int = 16000,
+        timestamp: Optional[float] = None,
+        flags: FrameFlags = FrameFlags.NONE
+    ) -> "AudioFrame":
+        """
+        Build a PCM16 frame from int16 samples.
+        
+        Args:
+            samples: Mono (samples,) or interleaved (samples, channels) int16 audio
+            session_id: OpenClaw session ID
+            sequence: Frame sequence number
+            sample_rate: Sample rate in Hz
+            timestamp: Capture time (now if None)
+            flags: Utterance position flags
+        """
+        samples = np.asarray(samples)
+        if samples.dtype != np.int16:
+            raise AudioFrameError(f"PCM16 frames need int16 samples, got {samples.dtype}")
+        channels = 1 if samples.ndim == 1 else samples.shape[1]
+        return cls(
+            session_id=session_id,
+            sequence=sequence,
+            payload=samples.astype("<i2", copy=False).tobytes(),
+            timestamp=time.time() if timestamp is None else timestamp,
+            codec=AudioCodec.PCM16,
+            sample_rate=sample_rate,
+            channels=channels,
+            flags=flags,
+        )
+    
+    @property
+    def is_end(self) -> bool:
+        return bool(self.flags & FrameFlags.END)
+    
+    def samples(self) -> np.ndarray:
+        """Decode a PCM16 payload to int16 samples ((n,) or (n, channels))."""
+        if self.codec != AudioCodec.PCM16:
+            raise AudioFrameError(f"Cannot decode {self.codec.name} payload to samples")
+        samples = np.frombuffer(self.payload, dtype="<i2").astype(np.int16, copy=False)
+        return samples if self.channels == 1 else samples.reshape(-1, self.channels)
+    
+    def encode(self) -> bytes:
+        """
+        Serialize to a binary WebSocket frame.
+        
+        Raises:
+            AudioFrameError: If a header field does not fit its slot
+        """
+        session = self.session_id.encode()
+        if len(session) > MAX_SESSION_ID_BYTES:
+            raise AudioFrameError("Session ID is longer than 255 bytes")
+        try:
+            header = _HEADER.pack(
+                FRAME_MAGIC,
+                FRAME_VERSION,
+                int(self.codec),
+                int(self.flags),
+                self.channels,
+                self.sample_rate,
+                self.sequence & 0xFFFFFFFF,
+                int(self.timestamp * 1_000_000),
+                len(session),
+            )
+        except struct.error as e:
+            raise AudioFrameError(f"Header field out of range: {e}") from None
+        return b"".join((header, session, self.payload))
+    
+    @classmethod
+    def decode(cls, data: bytes) -> "AudioFrame":
+        """
+        Parse a binary WebSocket frame.
+        
+        Raises:
+            AudioFrameError: If the header is malformed or unsupported
+        """
+        if len(data) < HEADER_SIZE:
+            raise AudioFrameError(f"Frame shorter than the {HEADER_SIZE}-byte header")
+        (magic, version, codec, flags, channels, sample_rate,
+         sequence, timestamp_us, session_len) = _HEADER.unpack_from(data)
+        if magic != FRAME_MAGIC:
+            raise AudioFrameError("Not an audio frame (bad magic)")
+        if version != FRAME_VERSION:
+            raise AudioFrameError(f"Unsupported frame version {version}")
+        try:
+            codec = AudioCodec(codec)
+        except ValueError:
+            raise AudioFrameError(f"Unknown audio codec {codec}") from None
+        body = HEADER_SIZE + session_len
+        if len(data) < body:
+            raise AudioFrameError("Frame truncated inside the session ID")
+        try:
+            session_id = bytes(data[HEADER_SIZE:body]).decode()
+        except UnicodeDecodeError:
+            raise AudioFrameError("Session ID is not valid UTF-8") from None
+        return cls(
+            session_id=session_id,
+            sequence=sequence,
+            payload=bytes(data[body:]),
+            timestamp=timestamp_us / 1_000_000,
+            codec=codec,
+            sample_rate=sample_rate,
+            channels=channels,
+            flags=FrameFlags(flags),
+        )
@@ -4,21 +4,45 @@ Audio Pipeline for Voice Bridge.
 Manages audio I/O, voice activity detection, buffering, and barge-in.
 Connects microphone input to STT and TTS output to speakers.
 """
+import asyncio
 import enum
 import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Callable, Optional, List, Dict, Any, Iterable, AsyncIterable, Union
 
 import structlog
 import numpy as np
 
-from bridge.config import get_config, AudioConfig
-from bridge.vad import WebRTCVAD, VADConfig, VADMode, SpeechSegmenter, SpeechSegment
-from bridge.audio_buffer import AudioBuffer
+from bridge.config import get_config, AudioConfig, WakeWordConfig
+from bridge.vad import (
+    create_vad,
+    VADConfig,
+    VADMode,
+    VADState,
+    SpeechSegmenter,
+    SpeechSegment,
+    SpeechChunk,
+)
+from bridge.audio_buffer import AudioBuffer, PlaybackQueue
+from bridge.resampler import StreamingResampler
+from bridge.downmix import ChannelDownmixer, DownmixMode
+from bridge.latency import LatencyTracer, TurnStage, stream_time_to_monotonic
+from bridge.metrics import CALLBACK_BUCKETS, get_metrics_registry
+from bridge.device_registry import DeviceRegistry, DeviceSnapshot, get_device_registry
+from bridge.wake_word import WakeWordDetection, WakeWordGate
 
 logger = structlog.get_logger()
 
+# Number of recent input callbacks kept for duration percentiles
+CALLBACK_TIMING_WINDOW = 1024
+
+# Seconds of TTS audio the playback queue holds before writers block
+PLAYBACK_QUEUE_SECONDS = 2.0
+
+# Number of recent analysed frames kept in the activity history (~2 s at 30 ms)
+ACTIVITY_HISTORY_FRAMES = 64
+
 # Optional imports for audio I/O
 try:
     import sounddevice as sd
@@ -64,6 +88,15 @@ class PipelineStats:
     barge_in_count: int = 0
     error_count: int = 0
     start_time: float = 0.0
+    samples_played_after_interrupt: int = 0  # Audible output samples after a playback cancel
+    playback_samples_dropped: int = 0  # TTS samples rejected by a full playback queue
+    callback_allocations: int = 0  # Array allocations made inside the input callback
+    callback_count: int = 0
+    callback_max_ms: float = 0.0
+    callback_durations_ms: np.ndarray = field(
+        default_factory=lambda: np.zeros(CALLBACK_TIMING_WINDOW, dtype=np.float64),
+        repr=False
+    )
     
     @property
     def uptime_seconds(self) -> float:
@@ -71,6 +104,153 @@ class PipelineStats:
         if self.start_time == 0:
             return 0
         return time.time() - self.start_time
+    
+    def record_callback_duration(self, duration_ms: float):
+        """Record one input callback duration (called from the audio thread)."""
+        window = self.callback_durations_ms
+        window[self.callback_count % window.shape[0]] = duration_ms
+        self.callback_count += 1
+        if duration_ms > self.callback_max_ms:
+            self.callback_max_ms = duration_ms
+    
+    def _callback_percentile(self, q: float) -> float:
+        """Percentile over the most recent callback durations."""
+        n = min(self.callback_count, self.callback_durations_ms.shape[0])
+        if n == 0:
+            return 0.0
+        return float(np.percentile(self.callback_durations_ms[:n], q))
+    
+    @property
+    def callback_p50_ms(self) -> float:
+        """Median input callback duration over the recent window."""
+        return self._callback_percentile(50)
+    
+    @property
+    def callback_p99_ms(self) -> float:
+        """99th percentile input callback duration over the recent window."""
+        return self._callback_percentile(99)
+
+
+@dataclass(frozen=True)
+class FrameActivity:
+    """VAD output for one analysed input frame."""
+    frame_index: int
+    timestamp: float           # Capture time of the frame (monotonic clock)
+    energy: float              # RMS relative to int16 full scale (0.0-1.0)
+    speech_probability: float  # 0.0-1.0, backend dependent
+    is_speech: bool
+
+
+class VoiceActivityMonitor:
+    """
+    Publishes per-frame VAD activity from the analysis worker.
+    
+    The latest frame is held in a single-reference slot that readers can
+    load from any thread without locking (the worker swaps in a new
+    immutable FrameActivity per frame). A short preallocated ring keeps
+    recent energy/probability history, and listeners are called
+    synchronously on the worker for every frame so consumers such as
+    barge-in react without polling.
+    """
+    
+    def __init__(self, history_frames: int = ACTIVITY_HISTORY_FRAMES):
+        """
+        Initialize monitor.
+        
+        Args:
+            history_frames: Number of recent frames kept in the ring history
+                (0 disables the history)
+        """
+        self.history_frames = history_frames
+        self._latest: Optional[FrameActivity] = None
+        self._count = 0
+        self._energy = np.zeros(history_frames, dtype=np.float32)
+        self._probability = np.zeros(history_frames, dtype=np.float32)
+        self._timestamps = np.zeros(history_frames, dtype=np.float64)
+        self._listeners: List[Callable[[FrameActivity], None]] = []
+    
+    @property
+    def latest(self) -> Optional[FrameActivity]:
+        """Most recently published frame (None before the first frame)."""
+        return self._latest
+    
+    @property
+    def frame_count(self) -> int:
+        """Total frames published."""
+        return self._count
+    
+    def add_listener(self, listener: Callable[[FrameActivity], None]):
+        """Add a per-frame listener (runs on the analysis worker)."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[FrameActivity], None]):
+        """Remove a per-frame listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def publish(
+        self,
+        energy: float,
+        speech_probability: float,
+        is_speech: bool,
+        timestamp: float
+    ) -> FrameActivity:
+        """
+        Publish activity for one frame and notify listeners.
+        
+        Must only be called from a single producer thread.
+        
+        Returns:
+            The published FrameActivity
+        """
+        index = self._count
+        if self.history_frames:
+            slot = index % self.history_frames
+            self._energy[slot] = energy
+            self._probability[slot] = speech_probability
+            self._timestamps[slot] = timestamp
+        
+        activity = FrameActivity(
+            frame_index=index,
+            timestamp=timestamp,
+            energy=energy,
+            speech_probability=speech_probability,
+            is_speech=is_speech
+        )
+        self._latest = activity
+        self._count = index + 1
+        
+        for listener in self._listeners:
+            try:
+                listener(activity)
+            except Exception as e:
+                logger.error("activity_listener_error", error=str(e))
+        return activity
+    
+    def history(self, frames: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get recent activity in chronological order (copies).
+        
+        Args:
+            frames: Number of most recent frames (all available if None)
+            
+        Returns:
+            Dict with 'energy', 'speech_probability' and 'timestamp' arrays
+        """
+        available = min(self._count, self.history_frames)
+        if frames is not None:
+            available = min(available, frames)
+        order = (np.arange(self._count - available, self._count) % max(self.history_frames, 1))
+        return {
+            'energy': self._energy[order],
+            'speech_probability': self._probability[order],
+            'timestamp': self._timestamps[order],
+        }
+    
+    def reset(self):
+        """Forget published activity (listeners are kept)."""
+        self._latest = None
+        self._count = 0
 
 
 class AudioDeviceManager:
@@ -78,16 +258,38 @@ class AudioDeviceManager:
     Manages audio device discovery and selection.
     
     Handles device enumeration, selection by name/index,
-    and provides device information.
+    and provides device information. The device list comes from the
+    process-wide DeviceRegistry, so creating a manager does not query
+    PortAudio again; ``refresh()`` re-enumerates.
     """
     
-    def __init__(self):
-        """Initialize device manager."""
+    def __init__(self, registry: Optional[DeviceRegistry] = None):
+        """
+        Initialize device manager.
+        
+        Args:
+            registry: Device registry (the global one if None)
+        """
+        self._registry = registry or get_device_registry()
+        self._snapshot: Optional[DeviceSnapshot] = None
         self._devices: Dict[int, AudioDeviceInfo] = {}
         self._refresh_devices()
     
+    def refresh(self, rescan: bool = False):
+        """
+        Re-enumerate devices (e.g. after a hotplug) and reload the list.
+        
+        Args:
+            rescan: Re-initialise PortAudio so new devices appear
+        """
+        try:
+            self._registry.refresh(rescan=rescan)
+        except Exception as e:
+            logger.error("device_refresh_failed", error=str(e))
+        self._refresh_devices()
+    
     def _refresh_devices(self):
-        """Refresh device list from sounddevice."""
+        """Load the device list from the registry snapshot."""
         self._devices.clear()
         
         if not SOUNDDEVICE_AVAILABLE:
@@ -95,45 +297,42 @@ class AudioDeviceManager:
             return
         
         try:
-            # Get all devices
-            devices = sd.query_devices()
-            default_input = sd.query_devices(kind='input')
-            default_output = sd.query_devices(kind='output')
+            snapshot = self._registry.snapshot()
+        except Exception as e:
+            logger.error("device_refresh_failed", error=str(e))
+            return
+        self._snapshot = snapshot
+        
+        for idx, device in snapshot.by_index.items():
+            # Determine device type
+            max_input = device.get('max_input_channels', 0)
+            max_output = device.get('max_output_channels', 0)
             
-            for idx, device in enumerate(devices):
-                # Determine device type
-                max_input = device.get('max_input_channels', 0)
-                max_output = device.get('max_output_channels', 0)
-                
-                if max_input > 0:
-                    device_type = AudioDeviceType.INPUT
-                    channels = max_input
-                    is_default = (device == default_input)
-                elif max_output > 0:
-                    device_type = AudioDeviceType.OUTPUT
-                    channels = max_output
-                    is_default = (device == default_output)
-                else:
-                    continue
-                
-                info = AudioDeviceInfo(
-                    index=idx,
-                    name=device['name'],
-                    device_type=device_type,
-                    channels=channels,
-                    sample_rate=int(device.get('default_samplerate', 16000)),
-                    is_default=is_default
-                )
-                self._devices[idx] = info
+            if max_input > 0:
+                device_type = AudioDeviceType.INPUT
+                channels = max_input
+                is_default = (idx == snapshot.default_input)
+            elif max_output > 0:
+                device_type = AudioDeviceType.OUTPUT
+                channels = max_output
+                is_default = (idx == snapshot.default_output)
+            else:
+                continue
             
-            logger.info(
-                "devices_refreshed",
-                input_count=sum(1 for d in self._devices.values() if d.device_type == AudioDeviceType.INPUT),
-                output_count=sum(1 for d in self._devices.values() if d.device_type == AudioDeviceType.OUTPUT)
+            self._devices[idx] = AudioDeviceInfo(
+                index=idx,
+                name=device['name'],
+                device_type=device_type,
+                channels=channels,
+                sample_rate=int(device.get('default_samplerate', 16000)),
+                is_default=is_default
             )
-            
-        except Exception as e:
-            logger.error("device_refresh_failed", error=str(e))
+    
+    def _sync(self):
+        """Reload if the registry was refreshed since the list was built."""
+        snapshot = self._registry.cached
+        if snapshot is not None and self._snapshot is not None and snapshot is not self._snapshot:
+            self._refresh_devices()
     
     def list_devices(self, device_type: Optional[AudioDeviceType] = None) -> List[AudioDeviceInfo]:
         """
@@ -145,6 +344,7 @@ class AudioDeviceManager:
         Returns:
             List of device information
         """
+        self._sync()
         devices = list(self._devices.values())
         if device_type:
             devices = [d for d in devices if d.device_type == device_type]
@@ -161,13 +361,19 @@ class AudioDeviceManager:
         Returns:
             Device info or None if not found
         """
+        self._sync()
         if isinstance(identifier, int):
             device = self._devices.get(identifier)
             if device and device.device_type == device_type:
                 return device
         else:
-            # Search by name (case-insensitive, partial match)
+            # Exact name through the snapshot's lookup map, then a
+            # case-insensitive partial match
             identifier_lower = identifier.lower()
+            if self._snapshot is not None:
+                device = self._devices.get(self._snapshot.by_name.get(identifier_lower, -1))
+                if device and device.device_type == device_type:
+                    return device
             for device in self._devices.values():
                 if (device.device_type == device_type and 
                     identifier_lower in device.name.lower()):
@@ -184,12 +390,19 @@ class AudioDeviceManager:
         Returns:
             Default device info or None
         """
+        self._sync()
         for device in self._devices.values():
             if device.device_type == device_type and device.is_default:
                 return device
         return None
 
 
+async def _aiter_sync(iterable: Iterable[np.ndarray]):
+    """Adapt a plain iterable for ``async for``."""
+    for item in iterable:
+        yield item
+
+
 class AudioPipeline:
     """
     Main audio pipeline managing I/O, VAD, and barge-in.
@@ -201,7 +414,15 @@ class AudioPipeline:
     def __init__(
         self,
         audio_config: Optional[AudioConfig] = None,
-        vad_config: Optional[VADConfig] = None
+        vad_config: Optional[VADConfig] = None,
+        input_stream_factory: Optional[Callable[..., Any]] = None,
+        output_stream_factory: Optional[Callable[..., Any]] = None,
+        device_manager: Optional[AudioDeviceManager] = None,
+        wake_gate: Optional[WakeWordGate] = None,
+        listen_timeout: float = 8.0,
+        wake_word_config: Optional[WakeWordConfig] = None,
+        wake_phrase: str = "",
+        latency_tracer: Optional[LatencyTracer] = None
     ):
         """
         Initialize audio pipeline.
@@ -209,30 +430,62 @@ class AudioPipeline:
         Args:
             audio_config: Audio configuration (loads from config if None)
             vad_config: VAD configuration (uses defaults if None)
+            input_stream_factory: Called with sd.InputStream's keyword
+                arguments to open capture (sd.InputStream if None), e.g. a
+                replay source
+            output_stream_factory: Same for playback (sd.OutputStream if None)
+            device_manager: Device list to select from (enumerates devices
+                if None); pass one instance to share it across pipelines
+            wake_gate: Wake-word gate; when set, capture starts IDLE and
+                the VAD/segmenter only run after the wake word
+            listen_timeout: With a wake gate, seconds of listening without
+                speech before returning to IDLE
+            wake_word_config: Builds the wake gate (and listen timeout) when
+                enabled and no wake_gate is given; taken from the app config
+                when audio_config is loaded from it
+            wake_phrase: Wake phrase for logs and detections
+            latency_tracer: Tracer for this pipeline's turns (a new one if
+                None); pass it to the pipeline's WebSocket client too
         """
         # Load configuration
         if audio_config is None:
             config = get_config()
             audio_config = config.audio
+            if wake_word_config is None:
+                wake_word_config = config.wake_word
+                wake_phrase = wake_phrase or config.bridge.wake_word
         
         self.audio_config = audio_config
         self.vad_config = vad_config or VADConfig()
         
+        if wake_gate is None and wake_word_config is not None and wake_word_config.enabled:
+            wake_gate = WakeWordGate.from_config(
+                wake_word_config,
+                phrase=wake_phrase,
+                sample_rate=self.vad_config.sample_rate,
+                frame_ms=self.vad_config.frame_duration_ms
+            )
+            listen_timeout = wake_word_config.listen_timeout
+        
         # Initialize components
-        self.device_manager = AudioDeviceManager()
-        self.vad = WebRTCVAD(self.vad_config)
+        self.device_manager = device_manager or AudioDeviceManager()
+        self.vad = create_vad(self.vad_config)
         self.segmenter = SpeechSegmenter(self.vad, self.vad_config)
+        self.segmenter.on_chunk = self._dispatch_speech_chunk
         
-        # Audio buffers
+        # Audio buffers (input is written from the PortAudio callback,
+        # so it uses the lock-free SPSC ring). Frames are at the VAD/STT
+        # rate; capture may run at the device rate and be resampled.
         self.input_buffer = AudioBuffer(
             max_frames=50,
             frame_size=int(
-                self.audio_config.sample_rate * self.vad_config.frame_duration_ms / 1000
-            )
+                self.vad_config.sample_rate * self.vad_config.frame_duration_ms / 1000
+            ),
+            lock_free=True
         )
-        self.output_buffer = AudioBuffer(
-            max_frames=20,
-            frame_size=1024  # TTS frame size
+        # TTS output: sample-granular queue, any chunk size, backpressure
+        self.output_buffer = PlaybackQueue(
+            capacity=int(self.audio_config.sample_rate * PLAYBACK_QUEUE_SECONDS)
         )
         
         # State
@@ -241,16 +494,59 @@ class AudioPipeline:
         self._state_callbacks: List[Callable[[PipelineState, PipelineState], None]] = []
         
         # Audio I/O
+        self.input_stream_factory = input_stream_factory
+        self.output_stream_factory = output_stream_factory
         self._input_stream = None
         self._output_stream = None
         self._input_device = None
         self._output_device = None
         
+        # Per-stream scratch for the capture callback (see _prepare_capture_scratch)
+        self._capture_frame: Optional[np.ndarray] = None
+        self._downmixer: Optional[ChannelDownmixer] = None
+        
+        # Device-rate -> VAD-rate conversion (see _prepare_resampler)
+        self.capture_rate = self.audio_config.sample_rate
+        self._resampler: Optional[StreamingResampler] = None
+        self._resample_frame = np.zeros(self.input_buffer.frame_size, dtype=np.int16)
+        self._resample_fill = 0
+        self._resample_frame_ts = 0.0  # Capture time of _resample_frame[0]
+        
+        # Analysis worker: drains input_buffer and runs VAD/segmentation
+        # so the PortAudio callback only enqueues frames
+        self._analysis_thread: Optional[threading.Thread] = None
+        self._analysis_stop = threading.Event()
+        self._energy_scratch = np.zeros(self.input_buffer.frame_size, dtype=np.float32)
+        
+        # Per-frame VAD activity (latest-value slot, history, listeners)
+        self.activity = VoiceActivityMonitor()
+        
+        # Wake word: IDLE frames go to the gate instead of the VAD
+        self.wake_gate = wake_gate
+        self.listen_timeout = listen_timeout
+        self._listen_deadline: Optional[float] = None
+        
+        # Per-turn capture-to-playback latency (one open turn per pipeline)
+        self.latency_tracer = latency_tracer or LatencyTracer()
+        self._init_metrics()
+        
         # Barge-in
         self._barge_in_enabled = True
         self._is_speaking = False
         self._barge_in_lock = threading.Lock()
         
+        # Playback cancellation: cancel_playback() bumps the generation and
+        # the output callback plays a short fade of the next queued samples
+        # instead of finishing the utterance
+        self._cancel_generation = 0
+        self._output_generation = 0
+        fade_samples = int(
+            self.audio_config.sample_rate * getattr(self.audio_config, 'fade_out_ms', 8.0) / 1000
+        )
+        self._fade_ramp = np.linspace(1.0, 0.0, fade_samples, endpoint=False, dtype=np.float32)
+        self._fade_frame = np.zeros(fade_samples, dtype=np.int16)
+        self._fade_pending = 0
+        
         # Statistics
         self._stats = PipelineStats(start_time=time.time())
         
@@ -261,12 +557,54 @@ class AudioPipeline:
             barge_in=self._barge_in_enabled
         )
     
+    def _init_metrics(self):
+        """Look up this pipeline's series in the shared metrics registry."""
+        metrics = get_metrics_registry()
+        self._callback_hist = metrics.histogram(
+            "audio_input_callback_seconds", "Input callback duration", CALLBACK_BUCKETS
+        )
+        self._analysis_hist = metrics.histogram(
+            "audio_analysis_seconds", "VAD and segmentation time per frame", CALLBACK_BUCKETS
+        )
+        self._capture_lag_hist = metrics.histogram(
+            "audio_capture_to_analysis_seconds", "Delay from capture to analysis per frame"
+        )
+        self._segments_counter = metrics.counter(
+            "speech_segments_total", "Speech segments emitted by the segmenter"
+        )
+        self._barge_in_counter = metrics.counter(
+            "pipeline_barge_ins_total", "Playback stopped by barge-in"
+        )
+        self._dropped_counter = metrics.counter(
+            "playback_samples_dropped_total", "TTS samples rejected by a full playback queue"
+        )
+        self._errors_counter = metrics.counter(
+            "audio_errors_total", "Errors in audio analysis"
+        )
+        self._wake_counter = metrics.counter(
+            "wake_word_detections_total", "Wake-word gate firings"
+        )
+        # Summed over live pipelines
+        metrics.gauge(
+            "audio_input_frames_queued", "Captured frames waiting for analysis",
+            owner=self, fn=lambda pipeline: pipeline.input_buffer.frame_count
+        )
+        metrics.gauge(
+            "playback_samples_queued", "TTS samples waiting in the playback queue",
+            owner=self, fn=lambda pipeline: pipeline.output_buffer.available
+        )
+    
     @property
     def state(self) -> PipelineState:
         """Get current pipeline state."""
         with self._state_lock:
             return self._state
     
+    @property
+    def waiting_for_wake_word(self) -> bool:
+        """True while IDLE frames go to the wake-word gate."""
+        return self.wake_gate is not None and self.state == PipelineState.IDLE
+    
     def _set_state(self, new_state: PipelineState):
         """Set pipeline state and notify callbacks."""
         with self._state_lock:
@@ -274,6 +612,8 @@ class AudioPipeline:
             if old_state != new_state:
                 self._state = new_state
                 self._stats.state_changes += 1
+                if new_state == PipelineState.LISTENING:
+                    self._listen_deadline = None  # Restart the listen window
                 logger.info(
                     "pipeline_state_changed",
                     old=old_state.value,
@@ -286,6 +626,10 @@ class AudioPipeline:
                         callback(old_state, new_state)
                     except Exception as e:
                         logger.error("state_callback_error", error=str(e))
+                
+                # A turn ends once its response stops playing
+                if old_state == PipelineState.SPEAKING:
+                    self.latency_tracer.finish_turn()
     
     def add_state_callback(self, callback: Callable[[PipelineState, PipelineState], None]):
         """Add callback for state changes."""
@@ -303,15 +647,18 @@ class AudioPipeline:
     
     def initialize_devices(
         self,
-        input_device: Optional[str or int] = None,
-        output_device: Optional[str or int] = None
+        input_device: Optional[Union[str, int, AudioDeviceInfo]] = None,
+        output_device: Optional[Union[str, int, AudioDeviceInfo]] = None
     ) -> bool:
         """
         Initialize audio input/output devices.
         
         Args:
-            input_device: Input device name or index (uses config default if None)
-            output_device: Output device name or index (uses config default if None)
+            input_device: Input device name or index (uses config default
+                if None), or an AudioDeviceInfo used as-is (e.g. a replay
+                source's)
+            output_device: Output device name or index (uses config default
+                if None), or an AudioDeviceInfo used as-is
             
         Returns:
             True if both devices initialized successfully
@@ -323,7 +670,9 @@ class AudioPipeline:
             output_device = getattr(self.audio_config, 'output_device', None)
         
         # Get input device
-        if input_device is not None:
+        if isinstance(input_device, AudioDeviceInfo):
+            self._input_device = input_device
+        elif input_device is not None:
             self._input_device = self.device_manager.get_device(
                 input_device, AudioDeviceType.INPUT
             )
@@ -333,7 +682,9 @@ class AudioPipeline:
             )
         
         # Get output device
-        if output_device is not None:
+        if isinstance(output_device, AudioDeviceInfo):
+            self._output_device = output_device
+        elif output_device is not None:
             self._output_device = self.device_manager.get_device(
                 output_device, AudioDeviceType.OUTPUT
             )
@@ -366,7 +717,7 @@ class AudioPipeline:
         Returns:
             True if capture started successfully
         """
-        if not SOUNDDEVICE_AVAILABLE:
+        if self.input_stream_factory is None and not SOUNDDEVICE_AVAILABLE:
             logger.error("sounddevice_not_available")
             return False
         
@@ -375,27 +726,38 @@ class AudioPipeline:
             return False
         
         try:
-            frame_size = int(
-                self.audio_config.sample_rate * self.vad_config.frame_duration_ms / 1000
-            )
+            capture_rate = self._select_capture_rate()
+            channels = self._select_capture_channels()
+            frame_size = int(capture_rate * self.vad_config.frame_duration_ms / 1000)
+            self._prepare_resampler(capture_rate, frame_size)
+            self._prepare_capture_scratch(frame_size, channels)
+            self._start_analysis_worker()
             
-            self._input_stream = sd.InputStream(
+            open_stream = self.input_stream_factory or sd.InputStream
+            self._input_stream = open_stream(
                 device=self._input_device.index,
-                channels=1,
-                samplerate=self.audio_config.sample_rate,
+                channels=channels,
+                samplerate=capture_rate,
                 blocksize=frame_size,
                 dtype=np.int16,
                 callback=self._audio_input_callback
             )
             
             self._input_stream.start()
-            self._set_state(PipelineState.LISTENING)
+            self._set_state(self._capture_state())
             
-            logger.info("audio_capture_started", frame_size=frame_size)
+            logger.info(
+                "audio_capture_started",
+                frame_size=frame_size,
+                capture_rate=capture_rate,
+                channels=channels,
+                resampling=self._resampler is not None
+            )
             return True
             
         except Exception as e:
             logger.error("audio_capture_start_failed", error=str(e))
+            self._stop_analysis_worker()
             self._set_state(PipelineState.ERROR)
             return False
     
@@ -410,35 +772,333 @@ class AudioPipeline:
                 logger.error("audio_capture_stop_error", error=str(e))
             finally:
                 self._input_stream = None
+        
+        self._stop_analysis_worker()
                 
         if self.state == PipelineState.LISTENING:
             self._set_state(PipelineState.IDLE)
     
+    def attach_capture(self, capture_rate: int, frames: int):
+        """
+        Prepare to be fed one channel of a stream owned by someone else.
+        
+        Used by PipelineHost: the host's stream callback passes this
+        pipeline's channel to ``_audio_input_callback`` and the host's
+        analysis worker drains ``input_buffer``, so neither a stream nor an
+        analysis thread is started here.
+        
+        Args:
+            capture_rate: Sample rate of the shared stream
+            frames: Block size of the shared stream
+        """
+        self._prepare_resampler(capture_rate, frames)
+        self._prepare_capture_scratch(frames, 1)
+        self._set_state(self._capture_state())
+    
+    def detach_capture(self):
+        """Undo attach_capture once the shared stream has stopped."""
+        if self.state == PipelineState.LISTENING:
+            self._set_state(PipelineState.IDLE)
+    
+    def _capture_state(self) -> PipelineState:
+        """State capture starts in: IDLE behind a wake gate, else LISTENING."""
+        if self.wake_gate is not None:
+            self.wake_gate.reset()
+            return PipelineState.IDLE
+        return PipelineState.LISTENING
+    
+    def _select_capture_rate(self) -> int:
+        """
+        Pick the rate the input device is opened at.
+        
+        With ``native_capture_rate`` the device's own default rate is used
+        (avoiding PortAudio/host resampling); otherwise the configured
+        ``audio_config.sample_rate``.
+        """
+        native = getattr(self.audio_config, 'native_capture_rate', False)
+        if native and self._input_device is not None and self._input_device.sample_rate > 0:
+            return self._input_device.sample_rate
+        return self.audio_config.sample_rate
+    
+    def _prepare_resampler(self, capture_rate: int, frames: int):
+        """Set up the resampling stage if capture and VAD rates differ."""
+        self.capture_rate = capture_rate
+        self._resample_fill = 0
+        if capture_rate == self.vad_config.sample_rate:
+            self._resampler = None
+            return
+        self._resampler = StreamingResampler(
+            capture_rate,
+            self.vad_config.sample_rate,
+            max_block=max(frames, 1) * 2
+        )
+    
+    def _select_capture_channels(self) -> int:
+        """Number of channels to capture, capped by what the device offers."""
+        channels = getattr(self.audio_config, 'channels', 1)
+        if self._input_device is not None and self._input_device.channels > 0:
+            channels = min(channels, self._input_device.channels)
+        return max(1, channels)
+    
+    def _create_downmixer(self, channels: int, frames: int) -> ChannelDownmixer:
+        """
+        Build the configured multi-channel downmixer.
+        
+        Per-channel weights and delays are trimmed when the device offers
+        fewer channels than configured.
+        
+        Raises:
+            ValueError: If weights or delays cover fewer channels than captured
+        """
+        weights = getattr(self.audio_config, 'channel_weights', None)
+        delays = getattr(self.audio_config, 'channel_delays', None)
+        return ChannelDownmixer(
+            channels,
+            frames,
+            mode=DownmixMode(getattr(self.audio_config, 'downmix', 'sum')),
+            channel=min(getattr(self.audio_config, 'capture_channel', 0), channels - 1),
+            weights=weights[:channels] if weights else None,
+            delays=delays[:channels] if delays else None
+        )
+    
+    def _prepare_capture_scratch(self, frames: int, channels: int):
+        """
+        Allocate the scratch arrays used by the input callback.
+        
+        Called once per stream from start_capture so the callback itself
+        never allocates in steady state.
+        """
+        self._capture_frame = np.zeros(frames, dtype=np.int16)
+        self._downmixer = self._create_downmixer(channels, frames) if channels > 1 else None
+    
+    def _capture_to_mono(self, indata: np.ndarray, frames: int) -> np.ndarray:
+        """
+        Convert a PortAudio input block to an int16 mono frame.
+        
+        int16 mono input is returned as a view with no copy. int16
+        multi-channel input goes through the configured ChannelDownmixer
+        (pick / fixed-weight sum / delay-and-sum) into the preallocated
+        scratch frame. Anything else is converted in place; every array the
+        callback has to allocate is counted in
+        ``PipelineStats.callback_allocations``.
+        """
+        channels = indata.shape[1]
+        if channels == 1 and indata.dtype == np.int16:
+            return indata[:, 0]
+        
+        if self._capture_frame is None or self._capture_frame.shape[0] != frames:
+            self._prepare_capture_scratch(frames, channels)
+            self._stats.callback_allocations += 1
+        out = self._capture_frame
+        
+        if channels == 1:
+            np.copyto(out, indata[:, 0], casting='unsafe')
+        elif indata.dtype == np.int16:
+            downmixer = self._downmixer
+            if downmixer is None or downmixer.channels != channels or downmixer.frames != frames:
+                downmixer = self._downmixer = self._create_downmixer(channels, frames)
+                self._stats.callback_allocations += 1
+            return downmixer.process(indata, out=out)
+        else:
+            np.copyto(out, indata.mean(axis=1), casting='unsafe')
+            self._stats.callback_allocations += 1
+        return out
+    
     def _audio_input_callback(self, indata, frames, time_info, status):
         """
         Callback for audio input stream.
         
-        Called by sounddevice on each audio block.
+        Called by sounddevice on each audio block. Only converts the block
+        and enqueues it into input_buffer; VAD and segmentation run on the
+        analysis worker.
         """
+        started = time.perf_counter()
         if status:
             logger.warning("audio_input_status", status=str(status))
         
-        # Convert to mono if needed
-        if indata.shape[1] > 1:
-            audio_frame = indata.mean(axis=1).astype(np.int16)
-        else:
-            audio_frame = indata[:, 0].astype(np.int16)
+        audio_frame = self._capture_to_mono(indata, frames)
+        captured_at = stream_time_to_monotonic(time_info, 'inputBufferAdcTime')
         
-        # Write to input buffer
-        self.input_buffer.write(audio_frame, block=False)
+        # Write to input buffer (copied into the ring)
+        if self._resampler is None:
+            self.input_buffer.write(audio_frame, block=False, timestamp=captured_at)
+        else:
+            self._write_resampled(self._resampler.process(audio_frame), captured_at)
         self._stats.audio_frames_processed += 1
         
-        # Process through segmenter if listening
-        if self.state == PipelineState.LISTENING:
-            segment = self.segmenter.process_frame(audio_frame)
-            if segment:
-                self._stats.speech_segments_detected += 1
-                self._on_speech_segment(segment)
+        elapsed = time.perf_counter() - started
+        self._stats.record_callback_duration(elapsed * 1000)
+        self._callback_hist.observe(elapsed)
+    
+    def _write_resampled(self, samples: np.ndarray, timestamp: float):
+        """
+        Re-frame resampled audio into VAD-sized frames for input_buffer.
+        
+        For integer rate ratios each device block resamples to exactly one
+        frame and is written straight through; otherwise samples are
+        assembled in a preallocated frame, timestamped with the capture
+        time of its first sample.
+        
+        Args:
+            samples: Resampled samples at the VAD rate
+            timestamp: Monotonic capture time of samples[0]
+        """
+        frame = self._resample_frame
+        size = frame.shape[0]
+        if self._resample_fill == 0 and samples.shape[0] == size:
+            self.input_buffer.write(samples, block=False, timestamp=timestamp)
+            return
+        
+        pos = 0
+        total = samples.shape[0]
+        while pos < total:
+            if self._resample_fill == 0:
+                self._resample_frame_ts = timestamp + pos / self.vad_config.sample_rate
+            n = min(size - self._resample_fill, total - pos)
+            frame[self._resample_fill:self._resample_fill + n] = samples[pos:pos + n]
+            self._resample_fill += n
+            pos += n
+            if self._resample_fill == size:
+                self.input_buffer.write(frame, block=False, timestamp=self._resample_frame_ts)
+                self._resample_fill = 0
+    
+    def _start_analysis_worker(self):
+        """Start the thread that runs VAD and segmentation on captured frames."""
+        if self._analysis_thread is not None and self._analysis_thread.is_alive():
+            return
+        self._analysis_stop.clear()
+        self._analysis_thread = threading.Thread(
+            target=self._analysis_loop,
+            name="audio-analysis",
+            daemon=True
+        )
+        self._analysis_thread.start()
+    
+    def _stop_analysis_worker(self, timeout: float = 1.0):
+        """Stop the analysis worker and wait for it to exit."""
+        self._analysis_stop.set()
+        if self._analysis_thread is not None:
+            self._analysis_thread.join(timeout=timeout)
+            self._analysis_thread = None
+    
+    def _analysis_loop(self):
+        """Drain input_buffer and feed frames to the segmenter."""
+        frame = np.zeros(self.input_buffer.frame_size, dtype=np.int16)
+        while not self._analysis_stop.is_set():
+            if self.input_buffer.read(block=True, timeout=0.1, out=frame) is None:
+                continue
+            captured_at = self.input_buffer.last_timestamp
+            started = time.perf_counter()
+            if self.latency_tracer.record_metrics:
+                self._capture_lag_hist.observe(time.monotonic() - captured_at)
+            try:
+                self._analyze_frame(frame, captured_at)
+            except Exception as e:
+                self._stats.error_count += 1
+                self._errors_counter.inc()
+                logger.error("audio_analysis_error", error=str(e))
+            self._analysis_hist.observe(time.perf_counter() - started)
+    
+    def _analyze_frame(
+        self,
+        audio_frame: np.ndarray,
+        timestamp: Optional[float] = None,
+        is_speech: Optional[bool] = None,
+        energy: Optional[float] = None
+    ):
+        """
+        Run VAD on one captured frame and publish its activity.
+        
+        While listening the frame goes through the segmenter; in every
+        other state the VAD still runs so barge-in sees live activity
+        during playback.
+        
+        Args:
+            audio_frame: Mono frame at the VAD rate
+            timestamp: Monotonic capture time of the frame (now if None)
+            is_speech: VAD decision already made for the frame, e.g. by a
+                PipelineHost scoring many pipelines at once (runs self.vad
+                if None)
+            energy: Full-scale RMS of the frame if already known
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        state = self.state
+        if state == PipelineState.IDLE and self.wake_gate is not None:
+            self._gate_frame(audio_frame, timestamp)
+            return
+        
+        segment = None
+        if state == PipelineState.LISTENING:
+            segment = self.segmenter.process_frame(audio_frame, timestamp, is_speech)
+            is_speech = self.vad.state == VADState.SPEECH
+            if self.wake_gate is not None:
+                self._check_listen_timeout(timestamp)
+        elif is_speech is None:
+            is_speech = self.vad.process_frame(audio_frame)
+        
+        self.activity.publish(
+            self._frame_energy(audio_frame) if energy is None else energy,
+            self.vad.speech_probability,
+            is_speech,
+            timestamp
+        )
+        
+        if segment:
+            self._stats.speech_segments_detected += 1
+            self._segments_counter.inc()
+            self._trace_segment(segment)
+            self._on_speech_segment(segment)
+    
+    def _gate_frame(self, audio_frame: np.ndarray, timestamp: float):
+        """Run the wake-word gate on an IDLE frame; start listening if it fires."""
+        detection = self.wake_gate.process(audio_frame, timestamp)
+        if detection is None:
+            return
+        self._wake_counter.inc()
+        self.vad.reset()
+        self.segmenter.reset()
+        self.segmenter.prime(detection.audio)
+        self._set_state(PipelineState.LISTENING)
+        self._on_wake_word(detection)
+    
+    def _check_listen_timeout(self, timestamp: float):
+        """Return to IDLE after listen_timeout seconds without speech."""
+        if self.segmenter.in_speech or self._listen_deadline is None:
+            self._listen_deadline = timestamp + self.listen_timeout
+        elif timestamp >= self._listen_deadline:
+            self._listen_deadline = None
+            self.segmenter.reset()
+            self.wake_gate.reset()
+            self._set_state(PipelineState.IDLE)
+    
+    def _on_wake_word(self, detection: WakeWordDetection):
+        """
+        Handle a wake-word detection.
+        
+        Called on the analysis worker after the pipeline switched to
+        LISTENING. ``detection.audio`` is the gate's pre-roll (the phrase
+        and what preceded it), e.g. for server-side verification.
+        Override or connect callback for custom handling.
+        """
+        # Subclasses can override this or use callbacks
+    
+    def _trace_segment(self, segment: SpeechSegment):
+        """Open a latency trace for the turn a finished segment starts."""
+        self.latency_tracer.start_turn(segment.start_time)
+        self.latency_tracer.mark(TurnStage.SPEECH_END, segment.end_time)
+        self.latency_tracer.mark(TurnStage.SEGMENT_EMITTED)
+    
+    def _frame_energy(self, audio_frame: np.ndarray) -> float:
+        """RMS energy of an int16 frame relative to full scale."""
+        n = audio_frame.shape[0]
+        if n == 0:
+            return 0.0
+        scratch = self._energy_scratch
+        if scratch.shape[0] != n:
+            scratch = self._energy_scratch = np.zeros(n, dtype=np.float32)
+        np.multiply(audio_frame, 1.0 / 32768.0, out=scratch, casting='unsafe')
+        return float(np.sqrt(np.dot(scratch, scratch) / n))
     
     def _on_speech_segment(self, segment: SpeechSegment):
         """
@@ -454,6 +1114,27 @@ class AudioPipeline:
         )
         # Subclasses can override this or use callbacks
     
+    def _dispatch_speech_chunk(self, chunk: SpeechChunk):
+        """Forward segmenter chunks to the (overridable) chunk handler."""
+        self._on_speech_chunk(chunk)
+    
+    def _on_speech_chunk(self, chunk: SpeechChunk):
+        """
+        Handle a partial speech chunk (streaming mode).
+        
+        Called on the analysis worker every ``VADConfig.stream_chunk_ms``
+        while speech is in progress, so STT can start before the user
+        stops talking. ``chunk.audio_data`` is a view; copy it to keep it
+        beyond the current utterance.
+        """
+        logger.debug(
+            "speech_chunk_ready",
+            chunk_type=chunk.chunk_type.value,
+            utterance_id=chunk.utterance_id,
+            samples=chunk.audio_data.shape[0]
+        )
+        # Subclasses can override this or use callbacks
+    
     def start_playback(self) -> bool:
         """
         Start audio playback to output device.
@@ -461,7 +1142,7 @@ class AudioPipeline:
         Returns:
             True if playback started successfully
         """
-        if not SOUNDDEVICE_AVAILABLE:
+        if self.output_stream_factory is None and not SOUNDDEVICE_AVAILABLE:
             logger.error("sounddevice_not_available")
             return False
         
@@ -470,7 +1151,12 @@ class AudioPipeline:
             return False
         
         try:
-            self._output_stream = sd.OutputStream(
+            # Drop any cancel requested while no stream was running
+            self._output_generation = self._cancel_generation
+            self._fade_pending = 0
+            
+            open_stream = self.output_stream_factory or sd.OutputStream
+            self._output_stream = open_stream(
                 device=self._output_device.index,
                 channels=1,
                 samplerate=self.audio_config.sample_rate,
@@ -508,23 +1194,57 @@ class AudioPipeline:
         if status:
             logger.warning("audio_output_status", status=str(status))
         
-        # Try to read from output buffer
-        frame = self.output_buffer.read(block=False)
+        generation = self._cancel_generation
+        if generation != self._output_generation:
+            self._output_generation = generation
+            self._play_fade_out(outdata, frames)
+            return
+        
+        # Copy exactly one device block from the playback queue
+        n = self.output_buffer.read_into(outdata[:, 0])
+        if n < frames:
+            outdata[n:].fill(0)
+        if n:
+            self.latency_tracer.mark(
+                TurnStage.FIRST_TTS_SAMPLE,
+                stream_time_to_monotonic(time_info, 'outputBufferDacTime')
+            )
+    
+    def _play_fade_out(self, outdata, frames: int):
+        """Fill one output block with the faded-out cancel frame, then silence."""
+        outdata.fill(0)
+        n = min(self._fade_pending, frames)
+        if n:
+            np.multiply(
+                self._fade_frame[:n], self._fade_ramp[:n],
+                out=outdata[:n, 0], casting='unsafe'
+            )
+        self._fade_pending = 0
+        self._stats.samples_played_after_interrupt += n
+    
+    def cancel_playback(self) -> int:
+        """
+        Cancel queued TTS audio without stopping the output stream.
         
-        if frame is not None:
-            # Ensure correct size
-            if len(frame) >= frames:
-                outdata[:, 0] = frame[:frames]
-            else:
-                outdata[:len(frame), 0] = frame
-                outdata[len(frame):, 0] = 0  # Zero padding
-        else:
-            # Output silence
-            outdata.fill(0)
+        Takes the next queued samples as the fade-out source, drops the
+        rest (releasing any blocked stream_audio writer) and bumps the
+        cancel generation so the output callback plays only a
+        ``fade_out_ms`` ramp before going silent.
+        
+        Returns:
+            Number of queued samples dropped
+        """
+        self._fade_pending = self.output_buffer.read_into(self._fade_frame)
+        self._cancel_generation += 1
+        return self.output_buffer.clear()
     
     def play_audio(self, audio_data: np.ndarray) -> bool:
         """
-        Queue audio data for playback.
+        Queue audio data for playback without blocking.
+        
+        Samples beyond the queue's free space are dropped and counted in
+        ``PipelineStats.playback_samples_dropped``; use stream_audio for
+        long or incrementally synthesized audio.
         
         Args:
             audio_data: Audio samples as numpy array (int16)
@@ -536,39 +1256,162 @@ class AudioPipeline:
             logger.error("cannot_play_audio_in_error_state")
             return False
         
-        # Split into frames
-        frame_size = 1024  # TTS frame size
-        frames = [
-            audio_data[i:i+frame_size]
-            for i in range(0, len(audio_data), frame_size)
-        ]
-        
-        # Queue frames
-        queued = 0
-        for frame in frames:
-            if self.output_buffer.write(frame, block=False):
-                queued += 1
+        audio_data = np.asarray(audio_data).reshape(-1)
+        queued = self.output_buffer.write(audio_data, block=False)
+        dropped = audio_data.shape[0] - queued
+        if dropped:
+            self._stats.playback_samples_dropped += dropped
+            self._dropped_counter.inc(dropped)
+            logger.warning("playback_queue_full", samples_dropped=dropped)
         
         if queued > 0:
-            self._set_state(PipelineState.SPEAKING)
-            self._is_speaking = True
-            self._stats.tts_utterances_played += 1
-            logger.info("audio_queued_for_playback", frames=queued)
+            self._begin_utterance()
+            logger.info("audio_queued_for_playback", samples=queued)
             return True
         else:
             logger.warning("failed_to_queue_audio")
             return False
     
-    def stop_playback_immediate(self):
-        """Immediately stop playback (barge-in)."""
+    def _begin_utterance(self):
+        """Mark TTS playback as started."""
+        self._set_state(PipelineState.SPEAKING)
+        self._is_speaking = True
+        self._stats.tts_utterances_played += 1
+    
+    def stream_audio(
+        self,
+        chunks: Iterable[np.ndarray],
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Stream TTS audio chunks to the output as they are produced.
+        
+        Chunks may be any length and are written straight into the playback
+        queue. The pipeline switches to SPEAKING as soon as the first chunk
+        is queued, so playback starts while synthesis continues. When the
+        queue is full the call blocks (backpressure) instead of dropping
+        audio. The stream ends early if playback is cancelled (barge-in).
+        
+        Args:
+            chunks: Iterable of audio sample arrays (int16)
+            timeout: Max seconds to wait for queue space per chunk (None waits)
+            
+        Returns:
+            Number of samples queued
+        """
+        if self.state == PipelineState.ERROR:
+            logger.error("cannot_play_audio_in_error_state")
+            return 0
+        
+        generation = self._cancel_generation
+        queued = 0
+        for chunk in chunks:
+            if self._cancel_generation != generation:
+                break
+            chunk = np.asarray(chunk).reshape(-1)
+            written = self.output_buffer.write(chunk, block=True, timeout=timeout)
+            keep_going = self._finish_stream_chunk(chunk, written, generation, queued == 0)
+            queued += written
+            if not keep_going:
+                break
+        
+        logger.info("audio_stream_queued", samples=queued)
+        return queued
+    
+    async def stream_audio_async(
+        self,
+        chunks: Union[AsyncIterable[np.ndarray], Iterable[np.ndarray]],
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Async variant of stream_audio for TTS engines that yield chunks.
+        
+        Chunks that fit are queued inline; waiting for queue space happens
+        in a worker thread so the event loop is never blocked.
+        
+        Args:
+            chunks: Async or sync iterable of audio sample arrays (int16)
+            timeout: Max seconds to wait for queue space per chunk (None waits)
+            
+        Returns:
+            Number of samples queued
+        """
+        if self.state == PipelineState.ERROR:
+            logger.error("cannot_play_audio_in_error_state")
+            return 0
+        
+        if not hasattr(chunks, '__aiter__'):
+            chunks = _aiter_sync(chunks)
+        
+        generation = self._cancel_generation
+        queued = 0
+        async for chunk in chunks:
+            if self._cancel_generation != generation:
+                break
+            chunk = np.asarray(chunk).reshape(-1)
+            written = self.output_buffer.write(chunk, block=False)
+            if written < chunk.shape[0]:
+                written += await asyncio.to_thread(
+                    self.output_buffer.write, chunk[written:], True, timeout
+                )
+            keep_going = self._finish_stream_chunk(chunk, written, generation, queued == 0)
+            queued += written
+            if not keep_going:
+                break
+        
+        logger.info("audio_stream_queued", samples=queued)
+        return queued
+    
+    def _finish_stream_chunk(
+        self,
+        chunk: np.ndarray,
+        written: int,
+        generation: int,
+        first: bool
+    ) -> bool:
+        """Book-keeping after a streamed chunk; returns False to stop the stream."""
+        if written and first:
+            self._begin_utterance()
+        if self._cancel_generation != generation:
+            return False
+        if written < chunk.shape[0]:
+            dropped = chunk.shape[0] - written
+            self._stats.playback_samples_dropped += dropped
+            self._dropped_counter.inc(dropped)
+            logger.warning("playback_stream_timeout", samples_dropped=dropped)
+            return False
+        return True
+    
+    @property
+    def playback_pending(self) -> bool:
+        """True while the output callback still has TTS or fade-out audio to play."""
+        return (
+            not self.output_buffer.is_empty
+            or self._cancel_generation != self._output_generation
+        )
+    
+    def finish_playback(self):
+        """Return to listening once the queued response has been played."""
         with self._barge_in_lock:
             if self._is_speaking:
-                logger.info("barge_in_triggered")
-                self.output_buffer.clear()
                 self._is_speaking = False
-                self._stats.barge_in_count += 1
                 self._set_state(PipelineState.LISTENING)
     
+    def stop_playback_immediate(self):
+        """Immediately stop playback (barge-in)."""
+        with self._barge_in_lock:
+            if self._is_speaking:
+                self._interrupt_playback()
+    
+    def _interrupt_playback(self):
+        """Cancel playback, count the barge-in and listen again (holds _barge_in_lock)."""
+        logger.info("barge_in_triggered")
+        self.cancel_playback()
+        self._is_speaking = False
+        self._stats.barge_in_count += 1
+        self._barge_in_counter.inc()
+        self._set_state(PipelineState.LISTENING)
+    
     def enable_barge_in(self, enabled: bool = True):
         """Enable or disable barge-in capability."""
         self._barge_in_enabled = enabled
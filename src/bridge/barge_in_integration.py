@@ -4,13 +4,12 @@ Issue #8: Connects the BargeInHandler with AudioPipeline for interruption
 support during TTS playback.
 """
 import asyncio
-import threading
 from typing import Optional, Callable
 
 import structlog
 
-from audio.barge_in import BargeInHandler, BargeInConfig, InterruptionEvent
-from bridge.audio_pipeline import AudioPipeline, PipelineState
+from audio.barge_in import BargeInHandler, BargeInConfig, BargeInState, InterruptionEvent
+from bridge.audio_pipeline import AudioPipeline, FrameActivity, PipelineState
 
 logger = structlog.get_logger()
 
@@ -19,7 +18,8 @@ class AudioPipelineBargeIn:
     """Integrates BargeInHandler with AudioPipeline.
     
     Monitors audio input during TTS playback and triggers
-    interruption when user speaks (barge-in).
+    interruption when user speaks (barge-in). Detection is driven by the
+    pipeline's per-frame activity events rather than a polling thread.
     """
     
     def __init__(
@@ -41,12 +41,14 @@ class AudioPipelineBargeIn:
         
         # Tracking
         self._monitoring = False
-        self._monitor_thread: Optional[threading.Thread] = None
+        self._capture_loop()
         
-        # Set up pipeline state callback
+        # Set up pipeline state and per-frame activity callbacks
         self.pipeline.add_state_callback(self._on_pipeline_state_change)
+        self.pipeline.activity.add_listener(self._on_frame_activity)
         
         # Set up barge-in callback
+        self.barge_in.config.frame_duration_ms = self.pipeline.vad_config.frame_duration_ms
         self.barge_in.on_interruption = self._handle_interruption
         
         logger.info("barge_in_integration_initialized")
@@ -67,12 +69,20 @@ class AudioPipelineBargeIn:
             return
         
         logger.info("barge_in_monitoring_started")
-        self.barge_in.transition_to_speaking()
+        self._capture_loop()
+        self.barge_in.set_state(BargeInState.SPEAKING)
         self._monitoring = True
+    
+    def _capture_loop(self):
+        """Remember the caller's event loop for async interruption callbacks.
         
-        # Start monitoring loop
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._monitor_thread.start()
+        Interruptions are detected on the pipeline's analysis thread, which
+        has no loop of its own.
+        """
+        try:
+            self.barge_in._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
     
     def _stop_monitoring(self):
         """Stop barge-in monitoring."""
@@ -82,41 +92,13 @@ class AudioPipelineBargeIn:
         logger.info("barge_in_monitoring_stopped")
         self._monitoring = False
         
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=0.1)
-        
         # Return to listening state
-        asyncio.run_coroutine_threadsafe(
-            self.barge_in.start_listening(),
-            asyncio.get_event_loop() if asyncio.get_event_loop().is_running() else asyncio.new_event_loop()
-        )
-    
-    def _monitor_loop(self):
-        """Monitor loop for VAD energy during speaking."""
-        while self._monitoring and self.pipeline.state == PipelineState.SPEAKING:
-            # Get VAD energy from pipeline
-            if hasattr(self.pipeline, 'vad'):
-                energy = self._get_vad_energy()
-                if energy > self.barge_in.config.sensitivity.value:
-                    # Potential interruption - update speech tracking
-                    self._check_for_interruption(energy)
-            
-            # Small sleep to prevent busy-waiting
-            threading.Event().wait(0.05)  # 50ms
+        self.barge_in.set_state(BargeInState.LISTENING)
     
-    def _get_vad_energy(self) -> float:
-        """Get current VAD energy level from pipeline."""
-        # This would need to be implemented based on actual VAD
-        # For now, return a mock value
-        if hasattr(self.pipeline.vad, 'current_energy'):
-            return self.pipeline.vad.current_energy
-        return 0.0
-    
-    def _check_for_interruption(self, energy: float):
-        """Check if energy level indicates interruption."""
-        # This would tie into BargeInHandler's logic
-        # For now, just trigger if configured
-        pass
+    def _on_frame_activity(self, activity: FrameActivity):
+        """Per-frame listener pushing VAD output into the barge-in handler."""
+        if self._monitoring:
+            self.barge_in.feed_frame(activity.speech_probability, activity.timestamp)
     
     def _handle_interruption(self, event: InterruptionEvent):
         """Handle detected interruption."""
@@ -126,27 +108,14 @@ class AudioPipelineBargeIn:
             energy=event.vad_energy
         )
         
-        # Update pipeline stats
-        self.pipeline._stats.barge_in_count += 1
-        
-        # Stop TTS playback
-        self.pipeline.stop_playback()
-        
-        # Transition pipeline to listening
-        self.pipeline._set_state(PipelineState.LISTENING)
-        
-        # Clear output buffer
-        self.pipeline.output_buffer.clear()
+        # Cancel TTS playback (fades out; the output stream stays open),
+        # count the barge-in and transition the pipeline to listening
+        with self.pipeline._barge_in_lock:
+            self.pipeline._interrupt_playback()
         
-        # Notify callback
+        # Notify callback (scheduled on the captured loop if async)
         if self.on_interruption:
-            try:
-                if asyncio.iscoroutinefunction(self.on_interruption):
-                    asyncio.create_task(self.on_interruption(event))
-                else:
-                    self.on_interruption(event)
-            except Exception as e:
-                logger.error("interruption_callback_error", error=str(e))
+            self.barge_in._dispatch_callback(self.on_interruption, event)
     
     def enable(self):
         """Enable barge-in monitoring."""
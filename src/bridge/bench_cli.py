@@ -0,0 +1,481 @@
+"""
+Audio hot-path benchmark CLI.
+
+Replays a WAV file or synthetic speech through a real AudioPipeline (no
+sound hardware needed) and reports throughput, callback-time percentiles
+and per-stage turn latency. Each detected segment is answered with a
+short synthetic response so the playback path is exercised too.
+
+As fast as possible, capture timestamps follow the audio's own clock and
+run ahead of the wall clock, so capture-relative latencies (capture to
+analysis, turn stages) are only reported for ``--realtime`` runs.
+
+Usage:
+    python -m bridge.bench_cli run                       # 60 s of synthetic speech
+    python -m bridge.bench_cli run --wav session.wav     # Replay a recording
+    python -m bridge.bench_cli run --rate 48000 --channels 4 --realtime
+    python -m bridge.bench_cli run --json                # Machine-readable report
+    python -m bridge.bench_cli scale --pipelines 1 8 32 64  # Pipelines per core
+    python -m bridge.bench_cli codec                     # JSON backends on protocol traffic
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import structlog
+from rich.console import Console
+from rich.table import Table
+
+from bridge import codec
+from bridge.audio_pipeline import AudioPipeline
+from bridge.config import AudioConfig
+from bridge.metrics import get_metrics_registry
+from bridge.pipeline_host import PipelineHost
+from bridge.replay import FAST_QUEUE_FRAMES, ReplayHarness, ReplaySource, synthetic_speech
+from bridge.vad import SpeechSegment, VADBackend, VADConfig
+
+console = Console()
+
+
+class BenchPipeline(AudioPipeline):
+    """Pipeline that answers every segment with a fixed-length tone."""
+    
+    def __init__(self, *args, response_ms: int = 300, **kwargs):
+        super().__init__(*args, **kwargs)
+        n = int(self.audio_config.sample_rate * response_ms / 1000)
+        t = np.arange(n) / self.audio_config.sample_rate
+        self._response = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    
+    def _on_speech_segment(self, segment: SpeechSegment):
+        if self._response.shape[0]:
+            self.play_audio(self._response)
+
+
+def _percentiles_ms(values_s: Iterable[float]) -> Dict[str, float]:
+    """p50/p99/max in milliseconds of values given in seconds."""
+    values = np.asarray(list(values_s), dtype=np.float64) * 1000
+    if values.size == 0:
+        return {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'p50': float(np.percentile(values, 50)),
+        'p99': float(np.percentile(values, 99)),
+        'max': float(values.max()),
+    }
+
+
+def _histogram_ms(name: str) -> Dict[str, float]:
+    """p50/p99 in milliseconds of a registry histogram."""
+    hist = get_metrics_registry().histogram(name)
+    return {'p50': hist.quantile(0.5) * 1000, 'p99': hist.quantile(0.99) * 1000}
+
+
+def run_replay_bench(
+    source: ReplaySource,
+    vad_backend: VADBackend = VADBackend.AUTO,
+    response_ms: int = 300
+) -> Dict[str, Any]:
+    """
+    Replay a source through a fresh pipeline and collect a report.
+    
+    Args:
+        source: Audio to replay (its pacing decides real time vs fast)
+        vad_backend: VAD engine
+        response_ms: Length of the tone played for each segment
+    
+    Returns:
+        Report dict (times in milliseconds)
+    """
+    get_metrics_registry().reset()
+    
+    pipeline = BenchPipeline(
+        audio_config=AudioConfig(channels=source.channels, native_capture_rate=True),
+        vad_config=VADConfig(backend=vad_backend),
+        response_ms=response_ms
+    )
+    tracer = pipeline.latency_tracer
+    result = ReplayHarness(pipeline, source).run()
+    tracer.finish_turn()
+    
+    stats = pipeline.stats
+    window = stats.callback_durations_ms[:min(stats.callback_count, stats.callback_durations_ms.shape[0])]
+    report = {
+        'source': source.name,
+        'sample_rate': source.sample_rate,
+        'channels': source.channels,
+        'realtime': source.realtime,
+        'audio_seconds': result.audio_seconds,
+        'wall_seconds': result.wall_seconds,
+        'realtime_factor': result.realtime_factor,
+        'frames_per_second': result.blocks_per_second,
+        'frames_analysed': result.frames_analysed,
+        'frames_dropped': result.frames_dropped,
+        'segments': stats.speech_segments_detected,
+        'samples_played': int(result.played.shape[0]),
+        'callback_ms': _percentiles_ms(window / 1000),
+        'analysis_ms': _histogram_ms("audio_analysis_seconds"),
+        'capture_to_analysis_ms': None,
+        'turn_total_ms': None,
+        'stages_ms': {},
+    }
+    if source.realtime:
+        traces = tracer.recent()
+        spans: Dict[str, list] = {}
+        for trace in traces:
+            for span, ms in trace.breakdown_ms().items():
+                spans.setdefault(span, []).append(ms / 1000)
+        report['capture_to_analysis_ms'] = _histogram_ms("audio_capture_to_analysis_seconds")
+        report['turn_total_ms'] = _percentiles_ms(
+            t.total_ms / 1000 for t in traces if t.total_ms is not None
+        )
+        report['stages_ms'] = {span: _percentiles_ms(v) for span, v in spans.items()}
+    return report
+
+
+def run_scale_bench(
+    pipelines: int,
+    seconds: float = 10.0,
+    sample_rate: int = 16000,
+    channels_per_source: int = 8,
+    vad_backend: VADBackend = VADBackend.ENERGY,
+    drain_timeout: float = 5.0
+) -> Dict[str, Any]:
+    """
+    Replay synthetic speech into N hosted pipelines as fast as possible.
+    
+    Pipelines are fed from multichannel replay sources (one distinct
+    talker per channel) and analysed by the host's single worker, so the
+    CPU time spent per second of audio shows how many pipelines one core
+    sustains in real time.
+    
+    Args:
+        pipelines: Number of pipelines to host
+        seconds: Audio length per pipeline
+        sample_rate: Source sample rate
+        channels_per_source: Pipelines fed from each replay source
+        vad_backend: VAD engine (energy VADs are scored in batches)
+        drain_timeout: Max seconds to wait for analysis after the last block
+    
+    Returns:
+        Report dict for this pipeline count
+    """
+    get_metrics_registry().reset()
+    host = PipelineHost(
+        audio_config=AudioConfig(sample_rate=sample_rate, native_capture_rate=True),
+        vad_config=VADConfig(backend=vad_backend)
+    )
+    sources: List[ReplaySource] = []
+    remaining = pipelines
+    while remaining > 0:
+        channels = min(channels_per_source, remaining)
+        audio = np.stack([
+            synthetic_speech(seconds, sample_rate, seed=len(sources) * channels_per_source + ch)
+            for ch in range(channels)
+        ], axis=1)
+        source = ReplaySource(audio, sample_rate, realtime=False, name=f"synthetic{len(sources)}")
+        source.backpressure = lambda: host.backlog() >= FAST_QUEUE_FRAMES
+        host_source = host.add_source(channels, sample_rate, stream_factory=source)
+        for _ in range(channels):
+            # Fast replay: capture times do not follow the wall clock
+            host.add_pipeline(host_source).latency_tracer.record_metrics = False
+        sources.append(source)
+        remaining -= channels
+    
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    if not host.start():
+        raise RuntimeError("Pipeline host could not be started")
+    try:
+        for source in sources:
+            source.wait()
+        deadline = time.perf_counter() + drain_timeout
+        while host.backlog() and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        wall = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    finally:
+        host.stop()
+    
+    stats = host.stats()
+    audio_seconds = sources[0].blocks_delivered * sources[0].blocksize / sample_rate
+    stream_seconds = audio_seconds * pipelines
+    return {
+        'pipelines': pipelines,
+        'sources': len(sources),
+        'audio_seconds': audio_seconds,
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'realtime_factor': audio_seconds / wall if wall > 0 else 0.0,
+        'pipelines_per_core': stream_seconds / cpu if cpu > 0 else 0.0,
+        'mean_batch_frames': stats['mean_batch_frames'],
+        'frames_analysed': stats['frames_analysed'],
+        'frames_dropped': stats['frames_dropped'],
+        'segments': stats['segments'],
+        'batch_ms': _histogram_ms("host_analysis_batch_seconds"),
+    }
+
+
+def codec_messages() -> List[Dict[str, Any]]:
+    """A representative mix of protocol traffic for the codec bench."""
+    return [
+        {
+            "type": "voice_input",
+            "text": "what's the weather like in Montreal this weekend",
+            "timestamp": 1760700000.123,
+            "metadata": {"confidence": 0.93, "source": "voice", "language": "en"},
+        },
+        {
+            "type": "control",
+            "action": "interrupt",
+            "timestamp": 1760700001.5,
+            "data": {"reason": "barge_in", "tts_position_ms": 1840, "queued_chunks": 3},
+        },
+        {"type": "ping", "timestamp": 1760700002.0},
+        {
+            "type": "response",
+            "text": "Expect light rain on Saturday and sun on Sunday, highs around 12 degrees.",
+            "timestamp": 1760700002.75,
+            "metadata": {"speakable": True, "model": "assistant", "tokens": 24},
+            "_type": "final",
+            "_speakability": "speakable",
+        },
+        {
+            "type": "tool_result",
+            "content": {
+                "tool": "weather.forecast",
+                "days": [
+                    {"date": "2026-10-17", "high": 11.5, "low": 4.0, "rain_mm": 6.2},
+                    {"date": "2026-10-18", "high": 12.8, "low": 3.1, "rain_mm": 0.0},
+                ],
+            },
+            "timestamp": 1760700002.4,
+            "metadata": {"speakable": False, "tool_call_id": "call_41"},
+        },
+    ]
+
+
+def run_codec_bench(
+    iterations: int = 20000,
+    backends: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Time encoding and decoding of protocol messages per JSON backend.
+    
+    Args:
+        iterations: Passes over the message mix per backend
+        backends: Backend names (all available if None)
+    
+    Returns:
+        One report dict per backend, with microseconds per message
+    """
+    messages = codec_messages()
+    encoded = [json.dumps(m) for m in messages]
+    count = iterations * len(messages)
+    reports = []
+    previous = codec.get_codec()
+    try:
+        for name in backends or list(codec.available_codecs()):
+            backend = codec.create_codec(name)
+            codec.set_codec(backend)
+            
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for message in messages:
+                    backend.dumps(message)
+            encode = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for text in encoded:
+                    backend.loads(text)
+            decode = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for text in encoded:
+                    codec.decode_message(text)
+            typed = time.perf_counter() - started
+            
+            reports.append({
+                'backend': name,
+                'messages': count,
+                'encode_us': encode / count * 1e6,
+                'decode_us': decode / count * 1e6,
+                'decode_message_us': typed / count * 1e6,
+            })
+    finally:
+        codec.set_codec(previous)
+    return reports
+
+
+def print_report(report: Dict[str, Any]):
+    """Render a bench report as tables."""
+    summary = Table(title=f"Replay: {report['source']}")
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", style="white", justify="right")
+    summary.add_row("Audio", f"{report['audio_seconds']:.1f} s "
+                    f"@ {report['sample_rate']} Hz x{report['channels']}")
+    summary.add_row("Wall time", f"{report['wall_seconds']:.2f} s")
+    summary.add_row("Realtime factor", f"{report['realtime_factor']:.1f}x")
+    summary.add_row("Callbacks/s", f"{report['frames_per_second']:.0f}")
+    summary.add_row("Frames analysed", str(report['frames_analysed']))
+    summary.add_row("Frames dropped", str(report['frames_dropped']))
+    summary.add_row("Segments", str(report['segments']))
+    console.print(summary)
+    
+    timings = Table(title="Latency (ms)")
+    timings.add_column("Stage", style="cyan")
+    timings.add_column("p50", justify="right")
+    timings.add_column("p99", justify="right")
+    rows = [
+        ("input callback", report['callback_ms']),
+        ("frame analysis", report['analysis_ms']),
+        ("capture -> analysis", report['capture_to_analysis_ms']),
+        ("turn total", report['turn_total_ms']),
+    ] + [(span.replace("_to_", " -> "), values) for span, values in report['stages_ms'].items()]
+    for name, values in rows:
+        if values is None:
+            timings.add_row(name, "-", "-")
+        else:
+            timings.add_row(name, f"{values['p50']:.3f}", f"{values['p99']:.3f}")
+    console.print(timings)
+
+
+def print_scale_report(reports: List[Dict[str, Any]]):
+    """Render scale bench results as a table."""
+    table = Table(title="Pipeline scaling (single analysis worker)")
+    table.add_column("Pipelines", justify="right", style="cyan")
+    table.add_column("Realtime factor", justify="right")
+    table.add_column("Pipelines/core", justify="right")
+    table.add_column("Batch p99 (ms)", justify="right")
+    table.add_column("Mean batch", justify="right")
+    table.add_column("Dropped", justify="right")
+    table.add_column("Segments", justify="right")
+    for report in reports:
+        table.add_row(
+            str(report['pipelines']),
+            f"{report['realtime_factor']:.1f}x",
+            f"{report['pipelines_per_core']:.0f}",
+            f"{report['batch_ms']['p99']:.3f}",
+            f"{report['mean_batch_frames']:.1f}",
+            str(report['frames_dropped']),
+            str(report['segments'])
+        )
+    console.print(table)
+
+
+def print_codec_report(reports: List[Dict[str, Any]]):
+    """Render codec bench results as a table."""
+    table = Table(title="JSON codec (us per message)")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Encode", justify="right")
+    table.add_column("Decode", justify="right")
+    table.add_column("decode_message", justify="right")
+    for report in reports:
+        table.add_row(
+            report['backend'],
+            f"{report['encode_us']:.2f}",
+            f"{report['decode_us']:.2f}",
+            f"{report['decode_message_us']:.2f}"
+        )
+    console.print(table)
+
+
+def cmd_run(args):
+    """Replay one source and report."""
+    if args.wav:
+        source = ReplaySource.from_wav(args.wav, realtime=args.realtime)
+    else:
+        mono = synthetic_speech(args.seconds, args.rate)
+        source = ReplaySource(
+            np.repeat(mono[:, None], args.channels, axis=1),
+            args.rate,
+            realtime=args.realtime,
+            name="synthetic"
+        )
+    
+    report = run_replay_bench(source, VADBackend(args.vad), args.response_ms)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+def cmd_scale(args):
+    """Measure how many hosted pipelines one core sustains."""
+    reports = [
+        run_scale_bench(
+            n, args.seconds, args.rate, args.channels, VADBackend(args.vad)
+        )
+        for n in args.pipelines
+    ]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_scale_report(reports)
+
+
+def cmd_codec(args):
+    """Compare JSON backends on protocol messages."""
+    reports = run_codec_bench(args.iterations, args.backends)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_codec_report(reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice Bridge audio benchmark")
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+    
+    # Run command
+    run_parser = subparsers.add_parser("run", help="Replay audio through one pipeline")
+    run_parser.add_argument("--wav", help="16-bit PCM WAV file (synthetic speech if omitted)")
+    run_parser.add_argument("--seconds", type=float, default=60.0, help="Synthetic audio length")
+    run_parser.add_argument("--rate", type=int, default=16000, help="Synthetic sample rate")
+    run_parser.add_argument("--channels", type=int, default=1, help="Synthetic channel count")
+    run_parser.add_argument("--realtime", action="store_true", help="Pace at the stream rate")
+    run_parser.add_argument("--vad", choices=[b.value for b in VADBackend], default="auto")
+    run_parser.add_argument("--response-ms", type=int, default=300, help="Reply tone per segment")
+    run_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    run_parser.set_defaults(func=cmd_run)
+    
+    # Scale command
+    scale_parser = subparsers.add_parser("scale", help="Host N pipelines and report pipelines per core")
+    scale_parser.add_argument("--pipelines", type=int, nargs="+", default=[1, 4, 16, 64],
+                              help="Pipeline counts to measure")
+    scale_parser.add_argument("--seconds", type=float, default=10.0, help="Audio per pipeline")
+    scale_parser.add_argument("--rate", type=int, default=16000, help="Source sample rate")
+    scale_parser.add_argument("--channels", type=int, default=8, help="Pipelines per replay source")
+    scale_parser.add_argument("--vad", choices=[b.value for b in VADBackend], default="energy")
+    scale_parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    scale_parser.set_defaults(func=cmd_scale)
+    
+    # Codec command
+    codec_parser = subparsers.add_parser("codec", help="Compare JSON backends on protocol messages")
+    codec_parser.add_argument("--iterations", type=int, default=20000, help="Passes over the message mix")
+    codec_parser.add_argument("--backends", nargs="+", choices=list(codec.available_codecs()),
+                              help="Backends to measure (all available if omitted)")
+    codec_parser.add_argument("--json", action="store_true", help="Print the reports as JSON")
+    codec_parser.set_defaults(func=cmd_codec)
+    
+    args = parser.parse_args()
+    
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+    
+    # Keep stdout for the report (--json output must parse as-is)
+    structlog.configure(
+        logger_factory=structlog.PrintLoggerFactory(sys.stderr),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+    )
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
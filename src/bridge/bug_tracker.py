@@ -65,11 +65,12 @@ class SystemSnapshot:
         """Capture current system state."""
         import psutil
         
-        # Get audio devices if available
+        # Audio devices from the shared registry (enumerated at most once,
+        # not on every captured error)
         audio_devices = None
         try:
-            import sounddevice as sd
-            devices = sd.query_devices()
+            from bridge.device_registry import get_device_registry
+            devices = get_device_registry().snapshot().devices
             audio_devices = [
                 {"name": d.get("name"), "channels": d.get("max_input_channels", 0)}
                 for d in devices
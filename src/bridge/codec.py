@@ -0,0 +1,301 @@
+"""
+JSON codec for the OpenClaw protocol and session storage.
+
+Every protocol and persistence call site encodes and decodes through this
+module, which uses orjson or msgspec when installed (``pip install
+voice-bridge[fast]``) and the standard library otherwise. The backend can
+be swapped at runtime with ``set_codec``.
+
+Encoders always produce ``str`` (``dumpb`` gives bytes) so WebSocket
+messages stay text frames whichever backend is active. Objects a fast
+backend cannot encode are retried with the standard library, and decode
+errors are always raised as ``json.JSONDecodeError``.
+
+``decode_message`` turns a protocol message into a typed dataclass once,
+so consumers read attributes instead of repeating ``dict.get`` lookups.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Type, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+class JSONCodec:
+    """Standard library codec."""
+    
+    name = "json"
+    
+    def dumps(self, obj: Any) -> str:
+        """Encode to a JSON string."""
+        return json.dumps(obj)
+    
+    def dumpb(self, obj: Any) -> bytes:
+        """Encode to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode()
+    
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a JSON string or bytes."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson codec (non-string keys and NumPy arrays allowed)."""
+    
+    name = "orjson"
+    
+    def __init__(self):
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj: Any) -> str:
+        return self.dumpb(obj).decode()
+    
+    def dumpb(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=self._options)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib raises if it can't either
+            return json.dumps(obj).encode()
+    
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """msgspec codec."""
+    
+    name = "msgspec"
+    
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+    
+    def dumps(self, obj: Any) -> str:
+        return self.dumpb(obj).decode()
+    
+    def dumpb(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, OverflowError):
+            return json.dumps(obj).encode()
+    
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            doc = data if isinstance(data, str) else data.decode(errors="replace")
+            raise json.JSONDecodeError(str(e), doc, 0) from e
+
+
+def available_codecs() -> Dict[str, Type[JSONCodec]]:
+    """Codec classes usable in this environment, fastest first."""
+    codecs: Dict[str, Type[JSONCodec]] = {}
+    if ORJSON_AVAILABLE:
+        codecs["orjson"] = OrjsonCodec
+    if MSGSPEC_AVAILABLE:
+        codecs["msgspec"] = MsgspecCodec
+    codecs["json"] = JSONCodec
+    return codecs
+
+
+def create_codec(name: str = "auto") -> JSONCodec:
+    """
+    Create a codec by backend name.
+    
+    Args:
+        name: 'orjson', 'msgspec', 'json' or 'auto' (fastest available)
+    
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    codecs = available_codecs()
+    if name == "auto":
+        return next(iter(codecs.values()))()
+    if name not in codecs:
+        raise ValueError(f"JSON backend '{name}' is not available (have: {', '.join(codecs)})")
+    return codecs[name]()
+
+
+# Active codec shared by every call site
+_codec: JSONCodec = create_codec()
+
+
+def get_codec() -> JSONCodec:
+    """Get the active codec."""
+    return _codec
+
+
+def set_codec(codec: Union[str, JSONCodec]) -> JSONCodec:
+    """
+    Replace the active codec.
+    
+    Args:
+        codec: Codec instance or backend name (see create_codec)
+    
+    Returns:
+        The previously active codec
+    """
+    global _codec
+    previous = _codec
+    _codec = create_codec(codec) if isinstance(codec, str) else codec
+    logger.info("json_codec_selected", backend=_codec.name)
+    return previous
+
+
+def dumps(obj: Any) -> str:
+    """Encode to a JSON string with the active codec."""
+    return _codec.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode to JSON bytes with the active codec."""
+    return _codec.dumpb(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with the active codec."""
+    return _codec.loads(data)
+
+
+# --- Typed protocol messages ---
+
+
+@dataclass
+class ProtocolMessage:
+    """
+    A decoded OpenClaw message.
+    
+    ``raw`` is the decoded dict (what ``on_message`` callbacks receive);
+    the other fields are read from it once at decode time. ``tag`` and
+    ``speakability`` come from the middleware's ``_type`` and
+    ``_speakability`` annotations when present.
+    """
+    type: str
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+    content: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    tag: Optional[str] = None
+    speakability: Optional[str] = None
+    timestamp: Optional[float] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], /, **fields) -> "ProtocolMessage":
+        """Build from a decoded dict; subclasses pass their own fields."""
+        metadata = data.get("metadata")
+        if not isinstance(metadata, dict):
+            metadata = {}
+        speakability = data.get("_speakability")
+        if speakability is None and "speakable" in metadata:
+            speakability = "speakable" if metadata["speakable"] else "silent"
+        content = data.get("text") or data.get("content") or ""
+        return cls(
+            type=data.get("type", ""),
+            raw=data,
+            content=content if isinstance(content, str) else dumps(content),
+            metadata=metadata,
+            tag=data.get("_type"),
+            speakability=speakability,
+            timestamp=data.get("timestamp"),
+            **fields
+        )
+    
+    @property
+    def message_type(self) -> str:
+        """Middleware tag if present, else the protocol type."""
+        return self.tag or self.type
+
+
+@dataclass
+class VoiceInputMessage(ProtocolMessage):
+    """Transcribed user speech (``content`` holds the text)."""
+    
+    @property
+    def confidence(self) -> Optional[float]:
+        return self.metadata.get("confidence")
+
+
+@dataclass
+class ControlMessage(ProtocolMessage):
+    """Control action such as an interrupt."""
+    action: str = ""
+    data: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], /, **fields) -> "ControlMessage":
+        return super().from_dict(
+            data, action=data.get("action", ""), data=data.get("data"), **fields
+        )
+
+
+@dataclass
+class SessionRestoreMessage(ProtocolMessage):
+    """Request to restore a session."""
+    session_id: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], /, **fields) -> "SessionRestoreMessage":
+        return super().from_dict(data, session_id=data.get("session_id", ""), **fields)
+
+
+@dataclass
+class KeepaliveMessage(ProtocolMessage):
+    """Ping or pong."""
+
+
+@dataclass
+class TextMessage(ProtocolMessage):
+    """Any other message: assistant responses and middleware-tagged output."""
+
+
+# Message type -> decoder; register_message_type adds more
+_MESSAGE_TYPES: Dict[str, Callable[[Dict[str, Any]], ProtocolMessage]] = {
+    "voice_input": VoiceInputMessage.from_dict,
+    "control": ControlMessage.from_dict,
+    "session_restore": SessionRestoreMessage.from_dict,
+    "ping": KeepaliveMessage.from_dict,
+    "pong": KeepaliveMessage.from_dict,
+}
+
+
+def register_message_type(
+    msg_type: str,
+    decoder: Callable[[Dict[str, Any]], ProtocolMessage]
+):
+    """Decode messages of ``msg_type`` with ``decoder`` (e.g. a from_dict)."""
+    _MESSAGE_TYPES[msg_type] = decoder
+
+
+def decode_message(data: Union[str, bytes, Dict[str, Any]]) -> ProtocolMessage:
+    """
+    Decode a protocol message into its typed form.
+    
+    Args:
+        data: JSON text/bytes or an already decoded dict
+    
+    Returns:
+        Typed message (TextMessage for unregistered types)
+    
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+        ValueError: If the JSON is not an object
+    """
+    if not isinstance(data, dict):
+        data = loads(data)
+        if not isinstance(data, dict):
+            raise ValueError("Protocol message must be a JSON object")
+    decoder = _MESSAGE_TYPES.get(data.get("type"), TextMessage.from_dict)
+    return decoder(data)
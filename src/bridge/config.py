@@ -15,7 +15,7 @@ import sys
 from pathlib import Path
 from typing import Literal
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, Field, ValidationError, ValidationInfo, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import structlog
 import yaml
@@ -36,8 +36,14 @@ class AudioConfig(BaseModel):
     input_device: str | int = Field(default="default", description="Input device name or index")
     output_device: str | int = Field(default="default", description="Output device name or index")
     sample_rate: int = Field(default=16000, ge=8000, le=192000)
-    channels: int = Field(default=1, ge=1, le=2)
+    channels: int = Field(default=1, ge=1, le=32, description="Capture channels (array mics use >2)")
+    downmix: Literal["pick", "sum", "delay_sum"] = Field(default="sum", description="Multi-channel to mono downmix")
+    capture_channel: int = Field(default=0, ge=0, description="Channel used by the 'pick' downmix")
+    channel_weights: list[float] | None = Field(default=None, description="Per-channel downmix gains (default 1/N)")
+    channel_delays: list[int] | None = Field(default=None, description="Per-channel delay-and-sum delays in samples")
     chunk_size: int = Field(default=1024, ge=256, le=8192)
+    native_capture_rate: bool = Field(default=False, description="Capture at the input device's default rate and resample (opt-in)")
+    fade_out_ms: float = Field(default=8.0, ge=0.0, le=50.0, description="Fade applied when playback is cancelled")
     
     @field_validator("input_device", "output_device")
     @classmethod
@@ -46,6 +52,15 @@ class AudioConfig(BaseModel):
         if isinstance(v, int) and v < -1:
             raise ValueError(f"Device index must be >= -1, got {v}")
         return v
+    
+    @field_validator("channel_weights", "channel_delays")
+    @classmethod
+    def validate_per_channel(cls, v: list | None, info: ValidationInfo) -> list | None:
+        """Validate per-channel downmix settings give one value per channel."""
+        channels = info.data.get("channels")
+        if v is not None and channels is not None and len(v) != channels:
+            raise ValueError(f"{info.field_name} needs {channels} values, got {len(v)}")
+        return v
 
 
 class STTConfig(BaseModel):
@@ -102,6 +117,29 @@ class PersistenceConfig(BaseModel):
     cleanup_interval: int = Field(default=60, ge=10, le=3600, description="Seconds between cleanup runs")
 
 
+class MetricsConfig(BaseModel):
+    """Metrics export configuration."""
+    
+    enabled: bool = Field(default=False, description="Serve Prometheus metrics over HTTP")
+    host: str = Field(default="127.0.0.1", description="Metrics endpoint bind address")
+    port: int = Field(default=9464, ge=0, le=65535)
+    textfile: str | None = Field(default=None, description="Also write metrics to this file (textfile collector)")
+    textfile_interval: float = Field(default=15.0, ge=1.0, le=3600.0, description="Seconds between textfile writes")
+    labels: dict[str, str] = Field(default_factory=dict, description="Labels added to every metric (e.g. instance)")
+
+
+class WakeWordConfig(BaseModel):
+    """Wake-word gate configuration (the phrase itself is bridge.wake_word)."""
+    
+    enabled: bool = Field(default=False, description="Wait for the wake word before listening")
+    backend: Literal["energy", "template"] = Field(default="energy", description="Wake-word detector")
+    syllables: int = Field(default=2, ge=1, le=8, description="Voiced bursts in the phrase (energy backend)")
+    template_path: str | None = Field(default=None, description="WAV recording of the phrase (template backend)")
+    threshold: float = Field(default=0.75, ge=0.0, le=1.0, description="Template match score needed to fire")
+    pre_roll_ms: int = Field(default=1500, ge=0, le=10000, description="Audio handed over when the gate fires")
+    listen_timeout: float = Field(default=8.0, ge=1.0, le=120.0, description="Seconds without speech before returning to idle")
+
+
 class BridgeConfig(BaseModel):
     """Bridge behavior configuration."""
     
@@ -137,6 +175,8 @@ class AppConfig(BaseSettings):
     openclaw: OpenClawConfig = Field(default_factory=OpenClawConfig)
     bridge: BridgeConfig = Field(default_factory=BridgeConfig)
     persistence: PersistenceConfig = Field(default_factory=PersistenceConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    wake_word: WakeWordConfig = Field(default_factory=WakeWordConfig)
     
     # Internal
     _config_file: Path | None = None
@@ -1,9 +1,9 @@
 """Context Window - Manage conversation context for LLM context windows."""
 
-import json
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
 
+from bridge import codec
 from bridge.conversation_store import get_conversation_store
 from bridge.history_manager import get_history_manager, ConversationTurn
 
@@ -239,7 +239,7 @@ class ContextWindow:
     
     def to_json(self) -> str:
         """Serialize to JSON."""
-        return json.dumps(self.to_dict())
+        return codec.dumps(self.to_dict())
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ContextWindow":
@@ -265,7 +265,7 @@ class ContextWindow:
     @classmethod
     def from_json(cls, json_str: str) -> "ContextWindow":
         """Create from JSON string."""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(codec.loads(json_str))
     
     def estimate_tokens(self) -> int:
         """Rough token estimation.
@@ -0,0 +1,298 @@
+"""
+Process-wide audio device registry.
+
+Enumerating devices through PortAudio can take hundreds of milliseconds
+(ALSA probes every card), so the device list is queried once and shared
+by AudioDeviceManager, audio discovery and the bug tracker. Each query
+produces an immutable DeviceSnapshot with index and name lookup maps;
+``refresh()`` replaces it explicitly and ``start_auto_refresh()`` does so
+on a timer, notifying listeners when devices were plugged or unplugged.
+"""
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from bridge.metrics import get_metrics_registry
+
+logger = structlog.get_logger()
+
+
+def _default_index(devices: List[Dict[str, Any]], default: Any) -> Optional[int]:
+    """Index of the device PortAudio reports as default, if any."""
+    if not default:
+        return None
+    index = default.get('index') if hasattr(default, 'get') else None
+    if isinstance(index, int):
+        return index
+    for i, device in enumerate(devices):
+        if device == default:
+            return i
+    return None
+
+
+@dataclass
+class DeviceSnapshot:
+    """
+    One enumeration of the audio devices.
+    
+    Snapshots are never modified after creation, so callers can hold one
+    and share it across threads.
+    """
+    devices: List[Dict[str, Any]] = field(default_factory=list)
+    default_input: Optional[int] = None
+    default_output: Optional[int] = None
+    version: int = 0
+    captured_at: float = 0.0
+    
+    def __post_init__(self):
+        self.by_index: Dict[int, Dict[str, Any]] = dict(enumerate(self.devices))
+        self.by_name: Dict[str, int] = {}
+        for i, device in enumerate(self.devices):
+            self.by_name.setdefault(str(device.get('name', '')).lower(), i)
+        self._matches: Dict[Tuple[str, Optional[str]], Optional[int]] = {}
+    
+    @property
+    def fingerprint(self) -> Tuple:
+        """What a hotplug changes: names, channel counts and defaults."""
+        return (
+            tuple(
+                (d.get('name'), d.get('max_input_channels', 0), d.get('max_output_channels', 0))
+                for d in self.devices
+            ),
+            self.default_input,
+            self.default_output,
+        )
+    
+    def has_direction(self, index: int, kind: Optional[str]) -> bool:
+        """Check if a device offers input ('input'), output ('output') or either (None)."""
+        device = self.by_index.get(index)
+        if device is None:
+            return False
+        if kind is None:
+            return True
+        return device.get(f'max_{kind}_channels', 0) > 0
+    
+    def find(self, identifier: Any, kind: Optional[str] = None) -> Optional[int]:
+        """
+        Look up a device by index or name.
+        
+        Names match exactly (case-insensitive) through ``by_name`` first,
+        then as a substring; substring results are memoized per snapshot.
+        
+        Args:
+            identifier: Device index (int) or name (str)
+            kind: 'input', 'output' or None for either
+        
+        Returns:
+            Device index or None if not found
+        """
+        if isinstance(identifier, int):
+            return identifier if self.has_direction(identifier, kind) else None
+        
+        name = str(identifier).lower()
+        index = self.by_name.get(name)
+        if index is not None and self.has_direction(index, kind):
+            return index
+        
+        key = (name, kind)
+        if key not in self._matches:
+            self._matches[key] = next(
+                (i for i, d in enumerate(self.devices)
+                 if name in str(d.get('name', '')).lower() and self.has_direction(i, kind)),
+                None
+            )
+        return self._matches[key]
+
+
+def _sounddevice() -> Any:
+    """The registered sounddevice module (imported on first use)."""
+    sd = sys.modules.get('sounddevice')
+    if sd is None:
+        import sounddevice as sd
+    return sd
+
+
+def _query_devices(sd: Any, rescan: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[int]]:
+    """Enumerate devices and find the default input/output indices."""
+    
+    if rescan and hasattr(sd, '_terminate'):
+        # PortAudio only sees hot-plugged devices after re-initialisation
+        sd._terminate()
+        sd._initialize()
+    
+    devices = [dict(device) for device in sd.query_devices()]
+    try:
+        default_input = _default_index(devices, sd.query_devices(kind='input'))
+    except Exception:
+        default_input = None
+    try:
+        default_output = _default_index(devices, sd.query_devices(kind='output'))
+    except Exception:
+        default_output = None
+    return devices, default_input, default_output
+
+
+class DeviceRegistry:
+    """
+    Caches the device list for the whole process.
+    
+    ``snapshot()`` enumerates on first use and then returns the cached
+    snapshot (re-querying once it is older than ``max_age`` if set).
+    """
+    
+    def __init__(self, max_age: Optional[float] = None):
+        """
+        Initialize registry.
+        
+        Args:
+            max_age: Seconds after which snapshot() re-queries (never if None)
+        """
+        self.max_age = max_age
+        self._snapshot: Optional[DeviceSnapshot] = None
+        self._backend: Any = None  # sounddevice module the snapshot came from
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[DeviceSnapshot], None]] = []
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        
+        metrics = get_metrics_registry()
+        self._query_hist = metrics.histogram(
+            "device_query_seconds", "Time spent enumerating audio devices"
+        )
+        self._changes_counter = metrics.counter(
+            "device_changes_total", "Device list changes seen on refresh"
+        )
+    
+    @property
+    def cached(self) -> Optional[DeviceSnapshot]:
+        """Current snapshot without querying (None before the first query)."""
+        return self._snapshot
+    
+    def snapshot(self) -> DeviceSnapshot:
+        """
+        Get the device snapshot, enumerating if none is cached or it expired.
+        
+        A snapshot taken through a sounddevice module that has since been
+        replaced (reloaded or patched) is treated as expired too.
+        
+        Raises:
+            Exception: Whatever the first enumeration raised
+        """
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or sys.modules.get('sounddevice') is not self._backend
+            or (self.max_age is not None
+                and time.monotonic() - snapshot.captured_at > self.max_age)
+        ):
+            snapshot = self.refresh()
+        return snapshot
+    
+    def refresh(self, rescan: bool = False) -> DeviceSnapshot:
+        """
+        Enumerate devices now and replace the cached snapshot.
+        
+        Listeners are notified when the device list changed.
+        
+        Args:
+            rescan: Re-initialise PortAudio so hot-plugged devices show up
+                (only safe while no streams are open)
+        
+        Returns:
+            The new snapshot
+        """
+        with self._lock:
+            started = time.perf_counter()
+            backend = _sounddevice()
+            devices, default_input, default_output = _query_devices(backend, rescan)
+            self._backend = backend
+            self._query_hist.observe(time.perf_counter() - started)
+            
+            previous = self._snapshot
+            snapshot = DeviceSnapshot(
+                devices=devices,
+                default_input=default_input,
+                default_output=default_output,
+                version=previous.version + 1 if previous else 1,
+                captured_at=time.monotonic()
+            )
+            self._snapshot = snapshot
+        
+        changed = previous is not None and previous.fingerprint != snapshot.fingerprint
+        logger.info(
+            "device_registry_refreshed",
+            devices=len(devices),
+            version=snapshot.version,
+            changed=changed
+        )
+        if changed:
+            self._changes_counter.inc()
+            for listener in list(self._listeners):
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    logger.error("device_listener_error", error=str(e))
+        return snapshot
+    
+    def add_listener(self, listener: Callable[[DeviceSnapshot], None]):
+        """Call ``listener(snapshot)`` whenever a refresh sees a change."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[DeviceSnapshot], None]):
+        """Remove a change listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def start_auto_refresh(self, interval: float = 5.0, rescan: bool = False):
+        """
+        Refresh on a background timer to pick up hotplug events.
+        
+        Args:
+            interval: Seconds between refreshes
+            rescan: Re-initialise PortAudio on each refresh (see refresh)
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval, rescan),
+            name="device-refresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+    
+    def stop_auto_refresh(self):
+        """Stop the refresh timer."""
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=2.0)
+            self._refresh_thread = None
+    
+    def _refresh_loop(self, interval: float, rescan: bool):
+        while not self._refresh_stop.wait(interval):
+            try:
+                self.refresh(rescan=rescan)
+            except Exception as e:
+                logger.error("device_refresh_failed", error=str(e))
+    
+    def invalidate(self):
+        """Drop the cached snapshot so the next snapshot() re-queries."""
+        with self._lock:
+            self._snapshot = None
+
+
+# Global registry shared by every device consumer
+_device_registry: Optional[DeviceRegistry] = None
+
+
+def get_device_registry() -> DeviceRegistry:
+    """Get or create the global device registry."""
+    global _device_registry
+    if _device_registry is None:
+        _device_registry = DeviceRegistry()
+    return _device_registry
@@ -8,6 +8,7 @@ from typing import Optional, List, Dict, Any, Iterator
 import csv
 import json
 
+from bridge import codec
 from bridge.conversation_store import get_conversation_store
 from bridge.session_manager import get_session_manager
 
@@ -49,7 +50,7 @@ class ConversationTurn:
             content=row['content'],
             message_type=row['message_type'],
             speakability=row['speakability'],
-            tool_calls=json.loads(row['tool_calls']) if row['tool_calls'] else None
+            tool_calls=codec.loads(row['tool_calls']) if row['tool_calls'] else None
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -136,13 +137,44 @@ class HistoryManager:
                 (
                     session_id, turn_index, datetime.utcnow().isoformat(),
                     role, content, message_type, speakability,
-                    json.dumps(tool_calls) if tool_calls else None
+                    codec.dumps(tool_calls) if tool_calls else None
                 )
             )
             turn_id = cursor.lastrowid
         
         return self.get_turn(turn_id)
     
+    def add_turns(self, turns: List[ConversationTurn]) -> int:
+        """Add several turns in one transaction.
+        
+        Unlike add_turn, the turns' own timestamps are stored and the
+        created rows are not read back.
+        
+        Args:
+            turns: Turns with session_id set
+        
+        Returns:
+            Number of turns written
+        """
+        if not turns:
+            return 0
+        with self.store._get_connection() as conn:
+            conn.executemany(
+                """INSERT INTO conversation_turns
+                    (session_id, turn_index, timestamp, role, content,
+                     message_type, speakability, tool_calls)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        turn.session_id, turn.turn_index, turn.timestamp,
+                        turn.role, turn.content, turn.message_type, turn.speakability,
+                        codec.dumps(turn.tool_calls) if turn.tool_calls else None
+                    )
+                    for turn in turns
+                ]
+            )
+        return len(turns)
+    
     def get_turn(self, turn_id: int) -> Optional[ConversationTurn]:
         """Get turn by ID.
         
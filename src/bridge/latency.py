@@ -0,0 +1,256 @@
+"""
+Per-turn latency tracing.
+
+A conversational turn passes through capture, segmentation, the OpenClaw
+WebSocket and TTS playback, each on a different thread. LatencyTracer
+collects one monotonic timestamp per stage so the end-to-end latency of a
+turn can be broken down:
+
+    first voiced frame -> speech end -> segment emitted -> text sent
+    -> first response byte -> first TTS sample played
+
+All timestamps use the ``time.monotonic()`` clock; audio stages are
+converted from PortAudio stream time with ``stream_time_to_monotonic``.
+"""
+import enum
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import structlog
+
+from bridge.metrics import get_metrics_registry
+
+logger = structlog.get_logger()
+
+
+class TurnStage(enum.Enum):
+    """Stages of a conversational turn, in pipeline order."""
+    FIRST_VOICED = "first_voiced"
+    SPEECH_END = "speech_end"
+    SEGMENT_EMITTED = "segment_emitted"
+    TEXT_SENT = "text_sent"
+    FIRST_RESPONSE_BYTE = "first_response_byte"
+    FIRST_TTS_SAMPLE = "first_tts_sample"
+
+
+STAGE_ORDER: List[TurnStage] = list(TurnStage)
+
+
+def stream_time_to_monotonic(
+    time_info: Any,
+    attribute: str,
+    now: Optional[float] = None
+) -> float:
+    """
+    Convert a PortAudio ``time_info`` timestamp to the monotonic clock.
+    
+    PortAudio reports ADC/DAC times on the stream clock alongside
+    ``currentTime``; the offset between them is applied to ``now``. Falls
+    back to ``now`` when the host API reports no timing.
+    
+    Args:
+        time_info: The callback's time_info (may be None)
+        attribute: 'inputBufferAdcTime' or 'outputBufferDacTime'
+        now: Current monotonic time (read if None)
+    
+    Returns:
+        Monotonic timestamp for the buffer's first sample
+    """
+    if now is None:
+        now = time.monotonic()
+    if time_info is None:
+        return now
+    try:
+        current = time_info.currentTime
+        stamp = getattr(time_info, attribute)
+    except AttributeError:
+        return now
+    if not current or not stamp:
+        return now
+    return now + (stamp - current)
+
+
+@dataclass
+class TurnTrace:
+    """Stage timestamps for one turn (first mark of each stage wins)."""
+    turn_id: int
+    marks: Dict[TurnStage, float] = field(default_factory=dict)
+    
+    def mark(self, stage: TurnStage, timestamp: Optional[float] = None) -> bool:
+        """
+        Record a stage if it has not been recorded yet.
+        
+        Returns:
+            True if the stage was recorded by this call
+        """
+        if stage in self.marks:
+            return False
+        self.marks[stage] = time.monotonic() if timestamp is None else timestamp
+        return True
+    
+    @property
+    def complete(self) -> bool:
+        """Check if every stage was recorded."""
+        return len(self.marks) == len(STAGE_ORDER)
+    
+    @property
+    def total_ms(self) -> Optional[float]:
+        """First voiced frame to first TTS sample, if both were recorded."""
+        start = self.marks.get(TurnStage.FIRST_VOICED)
+        end = self.marks.get(TurnStage.FIRST_TTS_SAMPLE)
+        if start is None or end is None:
+            return None
+        return (end - start) * 1000
+    
+    def breakdown_ms(self) -> Dict[str, float]:
+        """Milliseconds spent between consecutive recorded stages."""
+        result = {}
+        previous = None
+        for stage in STAGE_ORDER:
+            if stage not in self.marks:
+                continue
+            if previous is not None:
+                key = f"{previous.value}_to_{stage.value}"
+                result[key] = (self.marks[stage] - self.marks[previous]) * 1000
+            previous = stage
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view of the trace."""
+        return {
+            'turn_id': self.turn_id,
+            'marks': {stage.value: ts for stage, ts in self.marks.items()},
+            'breakdown_ms': self.breakdown_ms(),
+            'total_ms': self.total_ms,
+        }
+
+
+class LatencyTracer:
+    """
+    Tracks the current turn and keeps recently finished traces.
+    
+    ``start_turn`` and ``finish_turn`` take a lock; ``mark`` is a plain
+    dict update on the current trace so it can be called from audio
+    callbacks.
+    """
+    
+    def __init__(self, history: int = 100):
+        """
+        Initialize tracer.
+        
+        Args:
+            history: Number of finished traces to keep
+        """
+        self._lock = threading.Lock()
+        self._current: Optional[TurnTrace] = None
+        self._next_id = 1
+        self._recent: Deque[TurnTrace] = deque(maxlen=history)
+        self.on_trace: Optional[Callable[[TurnTrace], None]] = None
+        # Off when capture times do not follow the wall clock (fast replay):
+        # traces are still kept, but not observed, logged, or used for the
+        # owning pipeline's capture-lag histogram
+        self.record_metrics = True
+        self._metrics = get_metrics_registry()
+        self._total_hist = self._metrics.histogram(
+            "turn_latency_seconds", "First voiced frame to first TTS sample"
+        )
+    
+    @property
+    def current(self) -> Optional[TurnTrace]:
+        """Trace of the turn in progress."""
+        return self._current
+    
+    def start_turn(self, first_voiced: Optional[float] = None) -> TurnTrace:
+        """
+        Begin tracing a new turn, finishing the previous one.
+        
+        Args:
+            first_voiced: Capture timestamp of the turn's first voiced frame
+        
+        Returns:
+            The new trace
+        """
+        with self._lock:
+            previous = self._current
+            trace = TurnTrace(turn_id=self._next_id)
+            self._next_id += 1
+            trace.mark(TurnStage.FIRST_VOICED, first_voiced)
+            self._current = trace
+        if previous is not None:
+            self._finish(previous)
+        return trace
+    
+    def mark(self, stage: TurnStage, timestamp: Optional[float] = None) -> bool:
+        """
+        Record a stage on the current turn.
+        
+        Returns:
+            True if recorded (False with no turn or if already recorded)
+        """
+        trace = self._current
+        if trace is None:
+            return False
+        return trace.mark(stage, timestamp)
+    
+    def finish_turn(self) -> Optional[TurnTrace]:
+        """
+        Close the current turn and log its latency breakdown.
+        
+        Returns:
+            The finished trace, or None if no turn was in progress
+        """
+        with self._lock:
+            trace = self._current
+            self._current = None
+        if trace is not None:
+            self._finish(trace)
+        return trace
+    
+    def _finish(self, trace: TurnTrace):
+        """Store and report a finished trace."""
+        self._recent.append(trace)
+        if self.record_metrics:
+            if trace.total_ms is not None:
+                self._total_hist.observe(trace.total_ms / 1000)
+            for span, ms in trace.breakdown_ms().items():
+                self._metrics.histogram(
+                    "turn_stage_seconds", "Time between consecutive turn stages",
+                    labels={"span": span}
+                ).observe(ms / 1000)
+            logger.info(
+                "turn_latency",
+                turn_id=trace.turn_id,
+                total_ms=trace.total_ms,
+                **trace.breakdown_ms()
+            )
+        if self.on_trace:
+            try:
+                self.on_trace(trace)
+            except Exception as e:
+                logger.error("latency_trace_callback_error", error=str(e))
+    
+    def recent(self) -> List[TurnTrace]:
+        """Finished traces, oldest first."""
+        return list(self._recent)
+    
+    def reset(self):
+        """Drop the current turn and history."""
+        with self._lock:
+            self._current = None
+            self._recent.clear()
+
+
+# Global tracer for code outside a pipeline; each AudioPipeline owns its
+# own tracer, since a tracer has a single open turn
+_latency_tracer: Optional[LatencyTracer] = None
+
+
+def get_latency_tracer() -> LatencyTracer:
+    """Get or create the global latency tracer."""
+    global _latency_tracer
+    if _latency_tracer is None:
+        _latency_tracer = LatencyTracer()
+    return _latency_tracer
@@ -11,6 +11,7 @@ import structlog
 
 from bridge.config import AppConfig, get_config, DEFAULT_CONFIG_FILE
 from bridge.audio_discovery import run_discovery, print_discovery_report
+from bridge.metrics import get_metrics_registry
 
 
 def setup_logging(log_level: str = "INFO") -> None:
@@ -78,6 +79,18 @@ def run_first_time_setup() -> AppConfig:
     return config
 
 
+async def write_metrics_textfile(path: str, interval: float) -> None:
+    """Periodically write the metrics registry to a textfile."""
+    logger = structlog.get_logger()
+    registry = get_metrics_registry()
+    while True:
+        try:
+            registry.write_textfile(path)
+        except OSError as e:
+            logger.error("Failed to write metrics textfile", path=path, error=str(e))
+        await asyncio.sleep(interval)
+
+
 async def main():
     """Main entry point for the voice bridge."""
     setup_logging()
@@ -123,6 +136,17 @@ async def main():
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, lambda s=sig: signal_handler(s))
     
+    # Metrics export
+    metrics_server = None
+    registry = get_metrics_registry()
+    registry.const_labels.update(config.metrics.labels)
+    if config.metrics.enabled:
+        metrics_server = registry.serve(config.metrics.port, config.metrics.host)
+    if config.metrics.textfile:
+        asyncio.create_task(
+            write_metrics_textfile(config.metrics.textfile, config.metrics.textfile_interval)
+        )
+    
     logger.info("Bridge initialized successfully")
     logger.info("Note: Full implementation in progress - WebSocket, STT, TTS modules pending")
     
@@ -131,6 +155,8 @@ async def main():
         while True:
             await asyncio.sleep(1)
     except asyncio.CancelledError:
+        if metrics_server:
+            metrics_server.stop()
         logger.info("Bridge shutdown complete")
 
 
@@ -0,0 +1,524 @@
+"""
+Process-wide metrics registry.
+
+Counters, gauges and fixed-bucket histograms shared by the audio
+pipeline, WebSocket client, response filter, barge-in handler and tool
+chain manager, so percentiles (p50/p99) are available instead of running
+averages. Snapshots export in the Prometheus text format, either from a
+local HTTP endpoint or to a file for the node_exporter textfile
+collector.
+
+Recording takes no lock so it is safe to call from PortAudio callbacks:
+an observation is a bisect over the bucket bounds and two in-place
+additions. Concurrent recorders on the same metric may rarely lose an
+update, which is acceptable for monitoring. Only metric creation and
+export take the registry lock.
+"""
+import bisect
+import math
+import os
+import tempfile
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Prefix applied to every exported metric name
+METRIC_PREFIX = "voice_bridge_"
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> List[float]:
+    """
+    Bucket upper bounds growing geometrically.
+    
+    Args:
+        start: First upper bound
+        factor: Ratio between consecutive bounds (> 1)
+        count: Number of bounds
+    
+    Returns:
+        List of bounds (the +Inf bucket is implicit)
+    """
+    if start <= 0 or factor <= 1 or count < 1:
+        raise ValueError("exponential_buckets needs start > 0, factor > 1, count >= 1")
+    return [start * factor ** i for i in range(count)]
+
+
+# 0.5 ms .. ~8 s: end-to-end and network latencies
+LATENCY_BUCKETS = exponential_buckets(0.0005, 2.0, 15)
+
+# 50 us .. ~100 ms: audio callback and per-frame processing times
+CALLBACK_BUCKETS = exponential_buckets(0.00005, 2.0, 12)
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    """Hashable, sorted form of a label set."""
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as ``{a="1",b="2"}`` (empty string if none)."""
+    pairs = list(labels)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(
+            k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value as Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing count."""
+    
+    kind = "counter"
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0):
+        """Add to the counter."""
+        self.value += amount
+    
+    def samples(self, name: str, labels: LabelKey) -> List[str]:
+        """Prometheus sample lines."""
+        return [f"{name}{_format_labels(labels)} {_format_value(self.value)}"]
+    
+    def snapshot(self) -> float:
+        """Current value."""
+        return self.value
+    
+    def reset(self):
+        """Zero the counter."""
+        self.value = 0.0
+
+
+class Gauge:
+    """
+    Value that can go up and down, or is read from a callback at export.
+    
+    Owner callbacks (see ``add_owner``) are summed over the owners still
+    alive, so one series covers every pipeline or client without keeping
+    any of them from being garbage collected.
+    """
+    
+    kind = "gauge"
+    
+    def __init__(self, fn: Optional[Callable[[], float]] = None):
+        self.value = 0.0
+        self.fn = fn
+        self._owners: "weakref.WeakKeyDictionary[Any, Callable[[Any], float]]" = \
+            weakref.WeakKeyDictionary()
+    
+    def add_owner(self, owner: Any, fn: Callable[[Any], float]):
+        """Add ``fn(owner)`` to the gauge for as long as ``owner`` lives."""
+        self._owners[owner] = fn
+    
+    def set(self, value: float):
+        """Set the gauge."""
+        self.value = value
+    
+    def inc(self, amount: float = 1.0):
+        """Add to the gauge."""
+        self.value += amount
+    
+    def dec(self, amount: float = 1.0):
+        """Subtract from the gauge."""
+        self.value -= amount
+    
+    def get(self) -> float:
+        """Current value (calls fn if set, or sums the owner callbacks)."""
+        if self._owners:
+            try:
+                return float(sum(fn(owner) for owner, fn in list(self._owners.items())))
+            except Exception as e:
+                logger.debug("metrics_gauge_callback_error", error=str(e))
+                return math.nan
+        if self.fn is not None:
+            try:
+                return float(self.fn())
+            except Exception as e:
+                logger.debug("metrics_gauge_callback_error", error=str(e))
+                return math.nan
+        return self.value
+    
+    def samples(self, name: str, labels: LabelKey) -> List[str]:
+        """Prometheus sample lines."""
+        return [f"{name}{_format_labels(labels)} {_format_value(self.get())}"]
+    
+    def snapshot(self) -> float:
+        """Current value."""
+        return self.get()
+    
+    def reset(self):
+        """Zero the gauge (callback gauges are unaffected)."""
+        self.value = 0.0
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+    
+    Counts are kept per bucket (not cumulative) so an observation touches
+    a single slot; cumulative counts are built at export. Quantiles are
+    estimated by linear interpolation inside the bucket holding the rank,
+    as Prometheus' ``histogram_quantile`` does.
+    """
+    
+    kind = "histogram"
+    
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        bounds = sorted(float(b) for b in (buckets or LATENCY_BUCKETS))
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile from the bucket counts.
+        
+        Args:
+            q: Quantile in [0, 1]
+        
+        Returns:
+            Estimated value (0.0 with no observations; the largest finite
+            bound if the rank falls in the +Inf bucket)
+        """
+        total = sum(self.counts)
+        if total == 0:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and cumulative + count >= rank:
+                if math.isinf(bound):
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            if not math.isinf(bound):
+                lower = bound
+        return lower
+    
+    def samples(self, name: str, labels: LabelKey) -> List[str]:
+        """Prometheus sample lines (cumulative buckets, sum and count)."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            le = ("le", _format_value(bound) if math.isinf(bound) else repr(bound))
+            lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Count, sum and common quantiles."""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.quantile(0.50),
+            'p90': self.quantile(0.90),
+            'p99': self.quantile(0.99),
+        }
+    
+    def reset(self):
+        """Drop all observations."""
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Family:
+    """All label sets of one metric name."""
+    
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.children: Dict[LabelKey, object] = {}
+
+
+class MetricsRegistry:
+    """
+    Named metrics with Prometheus text export.
+    
+    ``counter``/``gauge``/``histogram`` return the existing metric when
+    called again with the same name and labels, so components can look
+    their metrics up once in ``__init__`` and several instances share
+    process-wide series.
+    """
+    
+    def __init__(
+        self,
+        prefix: str = METRIC_PREFIX,
+        const_labels: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize registry.
+        
+        Args:
+            prefix: Prepended to every metric name
+            const_labels: Labels added to every exported sample (e.g. the
+                bridge instance name when many bridges share a scraper)
+        """
+        self.prefix = prefix
+        self.const_labels: Dict[str, str] = dict(const_labels or {})
+        self._lock = threading.Lock()
+        self._families: Dict[str, _Family] = {}
+    
+    def _get(self, kind: str, name: str, help_text: str, labels, factory):
+        full_name = self.prefix + name
+        key = _label_key(labels)
+        with self._lock:
+            family = self._families.get(full_name)
+            if family is None:
+                family = _Family(full_name, kind, help_text)
+                self._families[full_name] = family
+            elif family.kind != kind:
+                raise ValueError(
+                    f"Metric {full_name} already registered as a {family.kind}"
+                )
+            metric = family.children.get(key)
+            if metric is None:
+                metric = factory()
+                family.children[key] = metric
+            return metric
+    
+    def counter(
+        self,
+        name: str,
+        help_text: str = "",
+        labels: Optional[Dict[str, str]] = None
+    ) -> Counter:
+        """Get or create a counter (name should end in ``_total``)."""
+        return self._get("counter", name, help_text, labels, Counter)
+    
+    def gauge(
+        self,
+        name: str,
+        help_text: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        fn: Optional[Callable[..., float]] = None,
+        owner: Any = None
+    ) -> Gauge:
+        """
+        Get or create a gauge.
+        
+        Args:
+            name: Metric name
+            help_text: HELP line
+            labels: Label set
+            fn: Read at export time instead of a set() value. Without an
+                owner it replaces the callback of an existing gauge (the
+                latest caller wins)
+            owner: Object the value is read from; ``fn(owner)`` is summed
+                with the other live owners' values and the owner is only
+                weakly referenced, so fn must not close over it
+        """
+        if owner is not None:
+            gauge = self._get("gauge", name, help_text, labels, Gauge)
+            if fn is not None:
+                gauge.add_owner(owner, fn)
+            return gauge
+        gauge = self._get("gauge", name, help_text, labels, lambda: Gauge(fn))
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+    
+    def histogram(
+        self,
+        name: str,
+        help_text: str = "",
+        buckets: Optional[Sequence[float]] = None,
+        labels: Optional[Dict[str, str]] = None
+    ) -> Histogram:
+        """Get or create a histogram (buckets apply on first creation)."""
+        return self._get("histogram", name, help_text, labels, lambda: Histogram(buckets))
+    
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Plain-dict view of every metric.
+        
+        Returns:
+            ``{name: value}`` for unlabelled metrics and
+            ``{name: {"a=1,b=2": value}}`` for labelled ones; histogram
+            values are dicts with count, sum, p50, p90 and p99
+        """
+        result: Dict[str, object] = {}
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            children = list(family.children.items())
+            if len(children) == 1 and children[0][0] == ():
+                result[family.name] = children[0][1].snapshot()
+            else:
+                result[family.name] = {
+                    ",".join(f"{k}={v}" for k, v in key): metric.snapshot()
+                    for key, metric in children
+                }
+        return result
+    
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        const = _label_key(self.const_labels)
+        lines: List[str] = []
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda f: f.name)
+            children = {f.name: list(f.children.items()) for f in families}
+        for family in families:
+            if family.help:
+                lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for key, metric in sorted(children[family.name], key=lambda c: c[0]):
+                lines.extend(metric.samples(family.name, const + key))
+        return "\n".join(lines) + "\n"
+    
+    def write_textfile(self, path: str):
+        """
+        Atomically write the Prometheus text export to a file.
+        
+        Args:
+            path: Destination (e.g. a node_exporter textfile collector
+                directory entry ending in ``.prom``)
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "MetricsServer":
+        """
+        Start a background HTTP endpoint serving ``/metrics``.
+        
+        Args:
+            port: TCP port (0 picks a free port)
+            host: Bind address (loopback by default)
+        
+        Returns:
+            Running MetricsServer
+        """
+        server = MetricsServer(self, host, port)
+        server.start()
+        return server
+    
+    def reset(self):
+        """Zero every metric, keeping registrations."""
+        with self._lock:
+            for family in self._families.values():
+                for metric in family.children.values():
+                    metric.reset()
+
+
+class MetricsServer:
+    """Minimal threaded HTTP server exposing a registry at ``/metrics``."""
+    
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        """
+        Initialize server (call start() to listen).
+        
+        Args:
+            registry: Registry to export
+            host: Bind address
+            port: TCP port (0 picks a free port)
+        """
+        self.registry = registry
+        
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    handler.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+            
+            def log_message(handler, format, *args):
+                logger.debug("metrics_request", request=format % args)
+        
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Bound (host, port)."""
+        return self._httpd.server_address[:2]
+    
+    def start(self):
+        """Serve in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="metrics-http",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info("metrics_server_started", host=self.address[0], port=self.address[1])
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._httpd.server_close()
+        logger.info("metrics_server_stopped")
+
+
+# Global registry shared by all components
+_metrics_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get or create the global metrics registry."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -5,7 +5,6 @@ Marks tool calls and internal processing as silent/non-speakable,
 ensuring only final user-facing responses reach TTS.
 """
 import enum
-import json
 import time
 from dataclasses import dataclass, field, asdict
 from typing import Optional, Dict, Any, Callable, List
@@ -13,6 +12,8 @@ from functools import wraps
 
 import structlog
 
+from bridge import codec
+
 logger = structlog.get_logger()
 
 
@@ -80,7 +81,7 @@ class TaggedMessage:
     
     def to_json(self) -> str:
         """Serialize to JSON."""
-        return json.dumps({
+        return codec.dumps({
             "content": self.content,
             "metadata": self.metadata.to_dict(),
         })
@@ -88,7 +89,7 @@ class TaggedMessage:
     @classmethod
     def from_json(cls, json_str: str) -> "TaggedMessage":
         """Deserialize from JSON."""
-        data = json.loads(json_str)
+        data = codec.loads(json_str)
         return cls(
             content=data["content"],
             metadata=MessageMetadata.from_dict(data["metadata"]),
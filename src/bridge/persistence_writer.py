@@ -0,0 +1,306 @@
+"""
+Background writer for conversation history.
+
+The WebSocket client used to write each turn with synchronous SQLite
+calls on the event loop, so a slow disk delayed message delivery. Turns
+are now queued and written by a dedicated thread: whatever has queued up
+while the previous batch was being written goes to the database in one
+transaction. ``flush()`` (or ``aflush()`` from async code) waits until
+everything submitted so far is written, which the client does on
+disconnect before closing the session.
+"""
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from bridge.metrics import get_metrics_registry
+
+logger = structlog.get_logger()
+
+_STOP = object()  # Queue sentinel that ends the writer thread
+
+
+@dataclass
+class PendingTurn:
+    """A conversation turn waiting to be written."""
+    session_uuid: str
+    role: str
+    content: str
+    turn_index: int
+    message_type: Optional[str] = None
+    speakability: Optional[str] = None
+    timestamp: str = ""  # ISO time the turn was submitted
+
+
+class PersistenceWriter:
+    """
+    Bounded queue of turns drained by a writer thread in batches.
+    
+    ``submit`` never blocks: when the queue is full the turn is dropped
+    and counted, so persistence can fall behind without stalling the
+    caller. The thread starts on the first submit and is stopped by
+    ``close``; a later submit starts it again.
+    """
+    
+    def __init__(
+        self,
+        history_manager: Any = None,
+        session_manager: Any = None,
+        max_queue: int = 1000,
+        batch_size: int = 100
+    ):
+        """
+        Initialize writer.
+        
+        Args:
+            history_manager: HistoryManager (global one if None)
+            session_manager: SessionManager used to resolve session UUIDs
+                (global one if None)
+            max_queue: Turns held before submits are dropped
+            batch_size: Most turns written per transaction
+        """
+        if history_manager is None:
+            from bridge.history_manager import get_history_manager
+            history_manager = get_history_manager()
+        if session_manager is None:
+            from bridge.session_manager import get_session_manager
+            session_manager = get_session_manager()
+        self.history_manager = history_manager
+        self.session_manager = session_manager
+        self.batch_size = max(1, batch_size)
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._pending = 0  # Submitted but not yet written (or failed)
+        self._session_ids: Dict[str, int] = {}
+        
+        self.turns_written = 0
+        self.turns_dropped = 0
+        self.turns_orphaned = 0
+        self.batches_written = 0
+        self.write_errors = 0
+        
+        metrics = get_metrics_registry()
+        metrics.gauge(
+            "persistence_queue_depth", "Turns waiting to be written",
+            owner=self, fn=lambda writer: writer._queue.qsize()
+        )
+        self._batch_hist = metrics.histogram(
+            "persistence_batch_seconds", "Time to write one batch of turns"
+        )
+        self._batch_size_hist = metrics.histogram(
+            "persistence_batch_turns", "Turns written per transaction",
+            buckets=(1, 2, 5, 10, 25, 50, 100, 250)
+        )
+        self._written_counter = metrics.counter(
+            "persistence_turns_written_total", "Turns written to history"
+        )
+        self._dropped_counter = metrics.counter(
+            "persistence_turns_dropped_total", "Turns dropped because the queue was full"
+        )
+        self._orphaned_counter = metrics.counter(
+            "persistence_turns_orphaned_total", "Turns skipped because their session no longer exists"
+        )
+        self._errors_counter = metrics.counter(
+            "persistence_errors_total", "Failed history writes"
+        )
+    
+    @property
+    def queue_depth(self) -> int:
+        """Turns waiting in the queue."""
+        return self._queue.qsize()
+    
+    @property
+    def pending(self) -> int:
+        """Turns submitted and not yet written."""
+        return self._pending
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the writer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start the writer thread (no-op if running)."""
+        with self._thread_lock:
+            if self.is_running:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="persistence-writer",
+                daemon=True
+            )
+            self._thread.start()
+    
+    def submit(self, turn: PendingTurn) -> bool:
+        """
+        Queue a turn for writing.
+        
+        Args:
+            turn: Turn to write
+        
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        if not turn.timestamp:
+            turn.timestamp = datetime.utcnow().isoformat()
+        self.start()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(turn)
+        except queue.Full:
+            with self._idle:
+                self._pending -= 1
+                self._idle.notify_all()
+            self.turns_dropped += 1
+            self._dropped_counter.inc()
+            logger.warning(
+                "Persistence queue full, dropping turn",
+                session_uuid=turn.session_uuid,
+                turn_index=turn.turn_index,
+            )
+            return False
+        return True
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every submitted turn has been written.
+        
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+        
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+    
+    async def aflush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Flush without blocking the event loop."""
+        if self._pending == 0:
+            return True
+        return await asyncio.to_thread(self.flush, timeout)
+    
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Flush and stop the writer thread.
+        
+        Returns:
+            True if everything was written before the timeout
+        """
+        flushed = self.flush(timeout)
+        with self._thread_lock:
+            thread = self._thread
+            if thread is None:
+                return flushed
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return False
+            thread.join(timeout)
+            self._thread = None
+        return flushed
+    
+    async def aclose(self, timeout: Optional[float] = 5.0) -> bool:
+        """Close without blocking the event loop."""
+        return await asyncio.to_thread(self.close, timeout)
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            # Take whatever queued up while the last batch was written
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            self._write(batch)
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
+            if stop:
+                return
+    
+    def _session_id(self, session_uuid: str) -> Optional[int]:
+        """Database ID of a session (cached per UUID)."""
+        session_id = self._session_ids.get(session_uuid)
+        if session_id is None:
+            session = self.session_manager.get_session(session_uuid)
+            if not session or not session.id:
+                return None
+            session_id = self._session_ids[session_uuid] = session.id
+        return session_id
+    
+    def _write(self, batch: List[PendingTurn]):
+        """Write one batch in a single transaction."""
+        from bridge.history_manager import ConversationTurn
+        
+        started = time.perf_counter()
+        orphaned: Dict[str, int] = {}
+        try:
+            turns = []
+            for pending in batch:
+                session_id = self._session_id(pending.session_uuid)
+                if session_id is None:
+                    orphaned[pending.session_uuid] = orphaned.get(pending.session_uuid, 0) + 1
+                    continue
+                turns.append(ConversationTurn(
+                    session_id=session_id,
+                    turn_index=pending.turn_index,
+                    timestamp=pending.timestamp,
+                    role=pending.role,
+                    content=pending.content,
+                    message_type=pending.message_type,
+                    speakability=pending.speakability,
+                ))
+            for session_uuid, count in orphaned.items():
+                self.turns_orphaned += count
+                self._orphaned_counter.inc(count)
+                logger.warning(
+                    "Dropping turns for unknown session",
+                    session_uuid=session_uuid,
+                    turns=count,
+                )
+            if turns:
+                self.history_manager.add_turns(turns)
+        except Exception as e:
+            self.write_errors += 1
+            self._errors_counter.inc()
+            logger.error("Failed to persist turns", turns=len(batch), error=str(e))
+            return
+        
+        self._batch_hist.observe(time.perf_counter() - started)
+        self._batch_size_hist.observe(len(turns))
+        self.batches_written += 1
+        self.turns_written += len(turns)
+        self._written_counter.inc(len(turns))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Writer statistics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "pending": self._pending,
+            "turns_written": self.turns_written,
+            "turns_dropped": self.turns_dropped,
+            "turns_orphaned": self.turns_orphaned,
+            "batches_written": self.batches_written,
+            "write_errors": self.write_errors,
+        }
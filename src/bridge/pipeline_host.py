@@ -0,0 +1,410 @@
+"""
+Multi-pipeline host.
+
+Runs many AudioPipeline instances (one per talker/endpoint) in one
+process. Each capture stream, a multichannel device or a replay source,
+is opened once and its callback hands every assigned pipeline its own
+channel. A single analysis worker then drains all pipelines together:
+frames that arrived in the same round are stacked so energy VADs are
+scored with one NumPy call, and device enumeration is shared.
+
+Usage:
+    host = PipelineHost(vad_config=VADConfig(backend=VADBackend.ENERGY))
+    source = host.add_source(channels=8, device="ReSpeaker")
+    pipelines = [host.add_pipeline(source) for _ in range(8)]
+    host.start()
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from bridge.audio_pipeline import (
+    SOUNDDEVICE_AVAILABLE,
+    AudioDeviceManager,
+    AudioDeviceType,
+    AudioPipeline,
+)
+from bridge.config import AudioConfig, get_config
+from bridge.metrics import CALLBACK_BUCKETS, get_metrics_registry
+from bridge.vad import EnergyVAD, VADConfig
+
+if SOUNDDEVICE_AVAILABLE:
+    import sounddevice as sd
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class HostSource:
+    """One capture stream and the pipelines fed from its channels."""
+    name: str
+    channels: int
+    sample_rate: int
+    device: Any = None
+    stream_factory: Optional[Callable[..., Any]] = None
+    routes: List[Tuple[AudioPipeline, int]] = field(default_factory=list)
+    stream: Any = None
+    
+    def next_channel(self) -> int:
+        """Lowest channel not yet routed to a pipeline."""
+        used = {channel for _, channel in self.routes}
+        for channel in range(self.channels):
+            if channel not in used:
+                return channel
+        raise ValueError(f"All {self.channels} channels of '{self.name}' are in use")
+
+
+class PipelineHost:
+    """
+    Hosts N pipelines behind shared capture streams and one analysis worker.
+    
+    Pipelines keep their own VAD, segmenter, buffers and callbacks; only
+    capture and analysis scheduling move to the host. Playback is still
+    per pipeline: call ``initialize_devices``/``start_playback`` on the
+    pipelines that speak.
+    """
+    
+    def __init__(
+        self,
+        audio_config: Optional[AudioConfig] = None,
+        vad_config: Optional[VADConfig] = None,
+        device_manager: Optional[AudioDeviceManager] = None,
+        pipeline_factory: Callable[..., AudioPipeline] = AudioPipeline
+    ):
+        """
+        Initialize host.
+        
+        Args:
+            audio_config: Audio configuration for every pipeline (loads
+                from config if None)
+            vad_config: VAD configuration for every pipeline
+            device_manager: Device list shared by all pipelines
+                (enumerated once here if None)
+            pipeline_factory: Pipeline class or factory, called with
+                audio_config, vad_config and device_manager
+        """
+        if audio_config is None:
+            audio_config = get_config().audio
+        self.audio_config = audio_config
+        self.vad_config = vad_config or VADConfig()
+        self.device_manager = device_manager or AudioDeviceManager()
+        self.pipeline_factory = pipeline_factory
+        
+        self.frame_size = int(
+            self.vad_config.sample_rate * self.vad_config.frame_duration_ms / 1000
+        )
+        self._sources: List[HostSource] = []
+        self._pipelines: List[AudioPipeline] = []
+        
+        # Analysis worker: one thread for every pipeline
+        self._analysis_thread: Optional[threading.Thread] = None
+        self._analysis_stop = threading.Event()
+        self._frames_ready = threading.Event()
+        self._running = False
+        
+        self.batches = 0
+        self.frames_analysed = 0
+        metrics = get_metrics_registry()
+        self._batch_hist = metrics.histogram(
+            "host_analysis_batch_seconds", "Analysis time per host batch", CALLBACK_BUCKETS
+        )
+        self._batch_size_hist = metrics.histogram(
+            "host_analysis_batch_frames", "Frames analysed per host batch",
+            buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256]
+        )
+    
+    @property
+    def pipelines(self) -> List[AudioPipeline]:
+        """Hosted pipelines in the order they were added."""
+        return list(self._pipelines)
+    
+    @property
+    def sources(self) -> List[HostSource]:
+        """Capture streams in the order they were added."""
+        return list(self._sources)
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the streams and worker are running."""
+        return self._running
+    
+    def add_source(
+        self,
+        channels: int,
+        sample_rate: Optional[int] = None,
+        device: Any = None,
+        stream_factory: Optional[Callable[..., Any]] = None,
+        name: Optional[str] = None
+    ) -> HostSource:
+        """
+        Register a capture stream.
+        
+        Args:
+            channels: Channels to open; each can feed one pipeline
+            sample_rate: Stream rate (configured sample rate if None;
+                pipelines resample to the VAD rate)
+            device: Input device name or index (default input if None)
+            stream_factory: Called with sd.InputStream's keyword arguments
+                (sd.InputStream if None), e.g. a ReplaySource
+            name: Label for logs (device name or "source<N>" if None)
+        
+        Returns:
+            The registered source
+        
+        Raises:
+            RuntimeError: If the host is running
+            ValueError: If the device is unknown
+        """
+        if self._running:
+            raise RuntimeError("Sources cannot be added while the host is running")
+        
+        index = None
+        if stream_factory is None:
+            if device is None:
+                info = self.device_manager.get_default_device(AudioDeviceType.INPUT)
+            else:
+                info = self.device_manager.get_device(device, AudioDeviceType.INPUT)
+            if info is None:
+                raise ValueError(f"Input device not found: {device if device is not None else 'default'}")
+            index = info.index
+            name = name or info.name
+            channels = min(channels, info.channels) if info.channels > 0 else channels
+        elif device is not None:
+            index = device
+        
+        source = HostSource(
+            name=name or f"source{len(self._sources)}",
+            channels=max(1, channels),
+            sample_rate=sample_rate or self.audio_config.sample_rate,
+            device=index,
+            stream_factory=stream_factory
+        )
+        self._sources.append(source)
+        return source
+    
+    def add_pipeline(
+        self,
+        source: HostSource,
+        channel: Optional[int] = None,
+        **kwargs
+    ) -> AudioPipeline:
+        """
+        Create a pipeline fed from one channel of a source.
+        
+        Args:
+            source: Source returned by add_source
+            channel: Channel to route (next free channel if None)
+            **kwargs: Extra arguments for the pipeline factory
+        
+        Returns:
+            The new pipeline
+        
+        Raises:
+            RuntimeError: If the host is running
+            ValueError: If the channel is out of range or already routed
+        """
+        if self._running:
+            raise RuntimeError("Pipelines cannot be added while the host is running")
+        if channel is None:
+            channel = source.next_channel()
+        elif not 0 <= channel < source.channels:
+            raise ValueError(f"Channel {channel} out of range for '{source.name}'")
+        elif any(routed == channel for _, routed in source.routes):
+            raise ValueError(f"Channel {channel} of '{source.name}' is already routed")
+        
+        pipeline = self.pipeline_factory(
+            audio_config=self.audio_config,
+            vad_config=self.vad_config,
+            device_manager=self.device_manager,
+            **kwargs
+        )
+        source.routes.append((pipeline, channel))
+        self._pipelines.append(pipeline)
+        return pipeline
+    
+    def backlog(self) -> int:
+        """Most frames waiting for analysis in any one pipeline."""
+        return max((p.input_buffer.frame_count for p in self._pipelines), default=0)
+    
+    def start(self) -> bool:
+        """
+        Open every source and start the analysis worker.
+        
+        Returns:
+            True if all streams started
+        """
+        if self._running:
+            return True
+        if not self._pipelines:
+            logger.error("pipeline_host_empty")
+            return False
+        if not SOUNDDEVICE_AVAILABLE and any(s.stream_factory is None for s in self._sources):
+            logger.error("sounddevice_not_available")
+            return False
+        
+        try:
+            for source in self._sources:
+                blocksize = int(source.sample_rate * self.vad_config.frame_duration_ms / 1000)
+                for pipeline, _ in source.routes:
+                    pipeline.attach_capture(source.sample_rate, blocksize)
+                open_stream = source.stream_factory or sd.InputStream
+                source.stream = open_stream(
+                    device=source.device,
+                    channels=source.channels,
+                    samplerate=source.sample_rate,
+                    blocksize=blocksize,
+                    dtype=np.int16,
+                    callback=partial(self._source_callback, source)
+                )
+            
+            self._analysis_stop.clear()
+            self._analysis_thread = threading.Thread(
+                target=self._analysis_loop,
+                name="host-analysis",
+                daemon=True
+            )
+            self._analysis_thread.start()
+            self._running = True
+            
+            for source in self._sources:
+                source.stream.start()
+            
+            logger.info(
+                "pipeline_host_started",
+                sources=len(self._sources),
+                pipelines=len(self._pipelines)
+            )
+            return True
+        
+        except Exception as e:
+            logger.error("pipeline_host_start_failed", error=str(e))
+            self.stop()
+            return False
+    
+    def stop(self):
+        """Close every source and stop the analysis worker."""
+        for source in self._sources:
+            if source.stream is None:
+                continue
+            try:
+                source.stream.stop()
+                source.stream.close()
+            except Exception as e:
+                logger.error("pipeline_host_stream_stop_error", source=source.name, error=str(e))
+            finally:
+                source.stream = None
+        
+        self._analysis_stop.set()
+        self._frames_ready.set()
+        if self._analysis_thread is not None:
+            self._analysis_thread.join(timeout=1.0)
+            self._analysis_thread = None
+        
+        for pipeline in self._pipelines:
+            pipeline.detach_capture()
+        if self._running:
+            self._running = False
+            logger.info("pipeline_host_stopped", frames_analysed=self.frames_analysed)
+    
+    def _source_callback(self, source: HostSource, indata, frames, time_info, status):
+        """Hand each routed pipeline its channel of the block."""
+        for pipeline, channel in source.routes:
+            pipeline._audio_input_callback(
+                indata[:, channel:channel + 1], frames, time_info, status
+            )
+        self._frames_ready.set()
+    
+    def _analysis_loop(self):
+        """Analyse frames from every pipeline in batches until stopped."""
+        pipelines = self._pipelines
+        batch = np.zeros((len(pipelines), self.frame_size), dtype=np.int16)
+        timestamps = np.zeros(len(pipelines), dtype=np.float64)
+        owners: List[AudioPipeline] = []
+        while not self._analysis_stop.is_set():
+            # Clear before polling so a block written after the poll wakes us
+            self._frames_ready.clear()
+            if self._analyse_round(pipelines, batch, timestamps, owners) == 0:
+                self._frames_ready.wait(timeout=0.1)
+    
+    def _analyse_round(
+        self,
+        pipelines: List[AudioPipeline],
+        batch: np.ndarray,
+        timestamps: np.ndarray,
+        owners: List[AudioPipeline]
+    ) -> int:
+        """
+        Take at most one frame from each pipeline and analyse them together.
+        
+        Returns:
+            Number of frames analysed
+        """
+        owners.clear()
+        for pipeline in pipelines:
+            buffer = pipeline.input_buffer
+            if buffer.is_empty:
+                continue
+            row = len(owners)
+            buffer.read(block=False, out=batch[row])
+            timestamps[row] = buffer.last_timestamp
+            owners.append(pipeline)
+        count = len(owners)
+        if count == 0:
+            return 0
+        
+        started = time.perf_counter()
+        now = time.monotonic()
+        frames = batch[:count]
+        # int16 RMS of every frame in one call, shared by energy VADs and
+        # the activity monitor
+        x = frames.astype(np.float32)
+        energies = np.sqrt(np.einsum('ij,ij->i', x, x) / frames.shape[1]).tolist()
+        for row, pipeline in enumerate(owners):
+            timestamp = float(timestamps[row])
+            if pipeline.latency_tracer.record_metrics:
+                pipeline._capture_lag_hist.observe(now - timestamp)
+            vad = pipeline.vad
+            try:
+                is_speech = None
+                if isinstance(vad, EnergyVAD) and not pipeline.waiting_for_wake_word:
+                    is_speech = vad.process_energy(energies[row])
+                pipeline._analyze_frame(
+                    frames[row], timestamp, is_speech, energies[row] / 32768.0
+                )
+            except Exception as e:
+                pipeline._stats.error_count += 1
+                pipeline._errors_counter.inc()
+                logger.error("audio_analysis_error", error=str(e))
+        
+        self.batches += 1
+        self.frames_analysed += count
+        self._batch_hist.observe(time.perf_counter() - started)
+        self._batch_size_hist.observe(count)
+        return count
+    
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate counters across sources and pipelines."""
+        rings = [p.input_buffer.stats for p in self._pipelines]
+        return {
+            'sources': len(self._sources),
+            'pipelines': len(self._pipelines),
+            'batches': self.batches,
+            'frames_analysed': self.frames_analysed,
+            'mean_batch_frames': self.frames_analysed / self.batches if self.batches else 0.0,
+            'frames_dropped': sum(r['overflow_count'] for r in rings),
+            'segments': sum(p.stats.speech_segments_detected for p in self._pipelines),
+        }
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
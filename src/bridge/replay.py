@@ -0,0 +1,520 @@
+"""
+Audio replay harness for deterministic pipeline runs without hardware.
+
+ReplaySource stands in for ``sd.InputStream``: it delivers a WAV file or
+synthetic waveform to the pipeline's input callback with the same block
+size and channel layout the real stream would use. ReplaySink stands in
+for ``sd.OutputStream`` and records what the output callback would have
+played. Both run their own thread, either paced in real time or as fast
+as the pipeline keeps up (with backpressure so no frames are dropped).
+
+ReplayHarness wires them into an AudioPipeline through its stream
+factories and runs the source to the end.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import structlog
+import numpy as np
+
+from bridge.audio_pipeline import (
+    AudioPipeline,
+    AudioDeviceInfo,
+    AudioDeviceType,
+    PipelineState,
+)
+from bridge.vad import open_pcm16_wav, read_pcm16_frames
+
+logger = structlog.get_logger()
+
+# Sleep while waiting on backpressure in as-fast-as-possible mode
+POLL_INTERVAL = 0.0001
+
+# Fast mode: frames allowed in the capture ring before the source waits
+FAST_QUEUE_FRAMES = 4
+
+
+@dataclass
+class StreamTime:
+    """Callback ``time_info`` in the shape PortAudio reports it."""
+    currentTime: float
+    inputBufferAdcTime: float = 0.0
+    outputBufferDacTime: float = 0.0
+
+
+def synthetic_speech(
+    seconds: float,
+    sample_rate: int = 16000,
+    burst_ms: int = 800,
+    gap_ms: int = 1200,
+    amplitude: float = 0.3,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Voiced bursts separated by near-silence, for driving VAD and segmentation.
+    
+    Each burst is a 140 Hz harmonic series with a syllable-rate envelope
+    plus a little noise; the result is deterministic for a given seed.
+    
+    Args:
+        seconds: Total length
+        sample_rate: Sample rate in Hz
+        burst_ms: Length of each voiced burst
+        gap_ms: Silence between bursts
+        amplitude: Peak level relative to full scale
+        seed: Noise seed
+    
+    Returns:
+        Mono int16 samples
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    voiced = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    voiced *= 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) ** 2
+    
+    period = int((burst_ms + gap_ms) * sample_rate / 1000)
+    burst = int(burst_ms * sample_rate / 1000)
+    gate = (np.arange(n) % period) < burst
+    
+    signal = np.where(gate, voiced / np.max(np.abs(voiced)) * amplitude, 0.0)
+    signal += rng.normal(0.0, 0.002, n)
+    return np.clip(signal * 32767, -32768, 32767).astype(np.int16)
+
+
+def _as_int16_frames(audio: np.ndarray) -> np.ndarray:
+    """Return audio as a (frames, channels) int16 array."""
+    audio = np.asarray(audio)
+    if audio.ndim == 1:
+        audio = audio.reshape(-1, 1)
+    if audio.dtype != np.int16:
+        if np.issubdtype(audio.dtype, np.floating):
+            audio = np.clip(audio * 32767, -32768, 32767)
+        audio = audio.astype(np.int16)
+    return np.ascontiguousarray(audio)
+
+
+class ReplaySource:
+    """
+    Input stream stand-in that plays recorded or synthetic audio.
+    
+    Calling the source with ``sd.InputStream``'s keyword arguments opens
+    it, so it can be passed directly as an AudioPipeline
+    ``input_stream_factory``.
+    """
+    
+    def __init__(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        realtime: bool = False,
+        name: str = "replay"
+    ):
+        """
+        Initialize replay source.
+        
+        Args:
+            audio: int16 or float samples, shape (frames,) or (frames, channels)
+            sample_rate: Sample rate of audio
+            realtime: Pace blocks at the stream rate instead of as fast as possible
+            name: Device name reported in device_info
+        """
+        self.audio = _as_int16_frames(audio)
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.name = name
+        
+        # Fast mode waits while this returns True (e.g. input ring near full)
+        self.backpressure: Optional[Callable[[], bool]] = None
+        
+        self.blocks_delivered = 0
+        self.finished = threading.Event()
+        self._callback: Optional[Callable] = None
+        self.blocksize = 0  # Set when opened
+        self._channels = self.channels
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @classmethod
+    def from_wav(cls, path, realtime: bool = False) -> "ReplaySource":
+        """
+        Load a 16-bit PCM WAV file.
+        
+        Raises:
+            ValueError: If the file is not 16-bit PCM
+        """
+        with open_pcm16_wav(path) as wav:
+            rate = wav.getframerate()
+            data = read_pcm16_frames(wav, wav.getnframes())
+        return cls(data, rate, realtime=realtime, name=str(path))
+    
+    @property
+    def channels(self) -> int:
+        """Channels available in the source audio."""
+        return self.audio.shape[1]
+    
+    @property
+    def duration(self) -> float:
+        """Length of the source audio in seconds."""
+        return self.audio.shape[0] / self.sample_rate
+    
+    @property
+    def device_info(self) -> AudioDeviceInfo:
+        """Input device description matching the source audio."""
+        return AudioDeviceInfo(
+            index=-1,
+            name=self.name,
+            device_type=AudioDeviceType.INPUT,
+            channels=self.channels,
+            sample_rate=self.sample_rate,
+            is_default=True
+        )
+    
+    def __call__(
+        self,
+        callback: Callable,
+        samplerate: int,
+        blocksize: int,
+        channels: int = 1,
+        dtype: Any = np.int16,
+        device: Any = None
+    ) -> "ReplaySource":
+        """
+        Open the source as an input stream (``sd.InputStream`` signature).
+        
+        Raises:
+            ValueError: If the requested rate or channel count does not
+                match the source audio
+        """
+        if samplerate != self.sample_rate:
+            raise ValueError(
+                f"Replay audio is {self.sample_rate} Hz, stream opened at {samplerate} Hz"
+            )
+        if channels > self.channels:
+            raise ValueError(f"Replay audio has {self.channels} channels, {channels} requested")
+        self._callback = callback
+        self.blocksize = blocksize
+        self._channels = channels
+        return self
+    
+    def start(self):
+        """Start delivering blocks on a background thread."""
+        if self._callback is None:
+            raise RuntimeError("ReplaySource must be opened before start()")
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, name="replay-source", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        block = np.zeros((self.blocksize, self._channels), dtype=np.int16)
+        total = self.audio.shape[0]
+        period = self.blocksize / self.sample_rate
+        started = time.monotonic()
+        try:
+            for index, pos in enumerate(range(0, total, self.blocksize)):
+                if self._stop.is_set():
+                    break
+                n = min(self.blocksize, total - pos)
+                block[:n] = self.audio[pos:pos + n, :self._channels]
+                block[n:] = 0
+                
+                if self.realtime:
+                    delay = started + index * period - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    while (self.backpressure is not None and self.backpressure()
+                           and not self._stop.is_set()):
+                        time.sleep(POLL_INTERVAL)
+                
+                # Stamp blocks on the stream clock so VAD timing (silence
+                # durations, segment times) follows the audio, not the wall
+                time_info = StreamTime(
+                    currentTime=time.monotonic(),
+                    inputBufferAdcTime=started + index * period
+                )
+                self._callback(block, self.blocksize, time_info, None)
+                self.blocks_delivered += 1
+        except Exception as e:
+            logger.error("replay_source_error", error=str(e))
+        finally:
+            self.finished.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every block was delivered."""
+        return self.finished.wait(timeout)
+    
+    def stop(self):
+        """Stop delivering blocks."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def close(self):
+        """Release the stream (nothing to free)."""
+        self._callback = None
+
+
+class ReplaySink:
+    """
+    Output stream stand-in that records what the output callback plays.
+    
+    In real time it pulls a block every block period, exactly like a
+    sound card. As fast as possible it pulls only while ``ready`` returns
+    True (e.g. while the pipeline has audio queued) so idle periods do not
+    fill the recording with silence.
+    """
+    
+    def __init__(
+        self,
+        realtime: bool = False,
+        max_seconds: float = 600.0,
+        name: str = "replay-sink"
+    ):
+        """
+        Initialize replay sink.
+        
+        Args:
+            realtime: Pull blocks at the stream rate
+            max_seconds: Recording capacity (later blocks are counted, not kept)
+            name: Device name reported in device_info
+        """
+        self.realtime = realtime
+        self.max_seconds = max_seconds
+        self.name = name
+        self.ready: Optional[Callable[[], bool]] = None
+        
+        self.sample_rate = 0
+        self.blocks_played = 0
+        self._recording: Optional[np.ndarray] = None
+        self._recorded = 0
+        self._callback: Optional[Callable] = None
+        self.blocksize = 0  # Set when opened
+        self._channels = 1
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def device_info(self) -> AudioDeviceInfo:
+        """Output device description for initialize_devices."""
+        return AudioDeviceInfo(
+            index=-1,
+            name=self.name,
+            device_type=AudioDeviceType.OUTPUT,
+            channels=1,
+            sample_rate=self.sample_rate,
+            is_default=True
+        )
+    
+    @property
+    def audio(self) -> np.ndarray:
+        """Recorded output samples (first channel)."""
+        if self._recording is None:
+            return np.zeros(0, dtype=np.int16)
+        return self._recording[:self._recorded].copy()
+    
+    def __call__(
+        self,
+        callback: Callable,
+        samplerate: int,
+        blocksize: int,
+        channels: int = 1,
+        dtype: Any = np.int16,
+        device: Any = None
+    ) -> "ReplaySink":
+        """Open the sink as an output stream (``sd.OutputStream`` signature)."""
+        self._callback = callback
+        self.sample_rate = samplerate
+        self.blocksize = blocksize
+        self._channels = channels
+        self._recording = np.zeros(int(self.max_seconds * samplerate), dtype=np.int16)
+        self._recorded = 0
+        return self
+    
+    def start(self):
+        """Start pulling blocks on a background thread."""
+        if self._callback is None:
+            raise RuntimeError("ReplaySink must be opened before start()")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replay-sink", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        outdata = np.zeros((self.blocksize, self._channels), dtype=np.int16)
+        period = self.blocksize / self.sample_rate
+        started = time.monotonic()
+        index = 0
+        try:
+            while not self._stop.is_set():
+                if self.realtime:
+                    delay = started + index * period - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                elif self.ready is not None and not self.ready():
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                
+                self._callback(outdata, self.blocksize, None, None)
+                self._record(outdata[:, 0])
+                self.blocks_played += 1
+                index += 1
+        except Exception as e:
+            logger.error("replay_sink_error", error=str(e))
+    
+    def _record(self, block: np.ndarray):
+        n = min(block.shape[0], self._recording.shape[0] - self._recorded)
+        if n > 0:
+            self._recording[self._recorded:self._recorded + n] = block[:n]
+            self._recorded += n
+    
+    def stop(self):
+        """Stop pulling blocks."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def close(self):
+        """Release the stream (the recording is kept)."""
+        self._callback = None
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of one replay run."""
+    audio_seconds: float
+    wall_seconds: float
+    blocks: int
+    frames_analysed: int
+    frames_dropped: int
+    played: np.ndarray = field(repr=False)
+    
+    @property
+    def realtime_factor(self) -> float:
+        """Audio seconds processed per wall-clock second."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+    
+    @property
+    def blocks_per_second(self) -> float:
+        """Input callbacks handled per wall-clock second."""
+        return self.blocks / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class ReplayHarness:
+    """
+    Runs an AudioPipeline against a ReplaySource and ReplaySink.
+    
+    The pipeline's real capture/playback code paths are used: its stream
+    factories open the replay streams and its analysis worker runs as
+    usual. When a queued response has finished playing the harness
+    returns the pipeline to listening, as the bridge would after TTS.
+    """
+    
+    def __init__(
+        self,
+        pipeline: AudioPipeline,
+        source: ReplaySource,
+        sink: Optional[ReplaySink] = None
+    ):
+        """
+        Initialize harness.
+        
+        Args:
+            pipeline: Pipeline under test (its stream factories are replaced)
+            source: Audio to capture
+            sink: Output recorder (created with the source's pacing if None)
+        """
+        self.pipeline = pipeline
+        self.source = source
+        self.sink = sink or ReplaySink(realtime=source.realtime)
+        
+        pipeline.input_stream_factory = self.source
+        pipeline.output_stream_factory = self.sink
+        if not source.realtime:
+            source.backpressure = self._fast_backpressure
+            # Capture times run ahead of the wall clock, so turn spans
+            # would be meaningless (often negative)
+            pipeline.latency_tracer.record_metrics = False
+        if not self.sink.realtime:
+            self.sink.ready = lambda: pipeline.playback_pending
+    
+    def run(self, timeout: Optional[float] = None, drain_timeout: float = 5.0) -> ReplayResult:
+        """
+        Play the whole source through the pipeline.
+        
+        Args:
+            timeout: Max seconds to wait for the source (default: its
+                duration in real time, unbounded otherwise)
+            drain_timeout: Max seconds to wait for analysis and playback
+                to catch up after the last block
+        
+        Returns:
+            ReplayResult
+        """
+        pipeline = self.pipeline
+        if timeout is None and self.source.realtime:
+            timeout = self.source.duration + drain_timeout
+        
+        if not pipeline.initialize_devices(self.source.device_info, self.sink.device_info):
+            raise RuntimeError("Replay devices could not be initialized")
+        pipeline.start_playback()
+        started = time.perf_counter()
+        if not pipeline.start_capture():
+            pipeline.stop_playback()
+            raise RuntimeError("Replay capture could not be started")
+        
+        try:
+            deadline = None if timeout is None else started + timeout
+            while not self.source.finished.is_set():
+                if deadline is not None and time.perf_counter() > deadline:
+                    logger.warning("replay_timeout", timeout=timeout)
+                    break
+                self._settle()
+                time.sleep(0.002)
+            
+            drain_deadline = time.perf_counter() + drain_timeout
+            while time.perf_counter() < drain_deadline:
+                self._settle()
+                if pipeline.input_buffer.is_empty and not pipeline.playback_pending:
+                    break
+                time.sleep(0.002)
+            self._settle()
+            wall = time.perf_counter() - started
+        finally:
+            pipeline.stop_capture()
+            pipeline.stop_playback()
+        
+        ring = pipeline.input_buffer.stats
+        return ReplayResult(
+            audio_seconds=self.source.blocks_delivered * self.source.blocksize
+            / self.source.sample_rate,
+            wall_seconds=wall,
+            blocks=self.source.blocks_delivered,
+            frames_analysed=ring['total_read'],
+            frames_dropped=ring['overflow_count'],
+            played=self.sink.audio
+        )
+    
+    def _fast_backpressure(self) -> bool:
+        """
+        Hold the source while analysis lags or a response is playing.
+        
+        Without pacing, audio would otherwise race past while the
+        pipeline is speaking and segments would be missed.
+        """
+        self._settle()
+        pipeline = self.pipeline
+        return (
+            pipeline.input_buffer.frame_count >= FAST_QUEUE_FRAMES
+            or pipeline.state == PipelineState.SPEAKING
+        )
+    
+    def _settle(self):
+        """Return to listening once a response has played out."""
+        pipeline = self.pipeline
+        if pipeline.state == PipelineState.SPEAKING and not pipeline.playback_pending:
+            pipeline.finish_playback()
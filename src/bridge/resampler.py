@@ -0,0 +1,163 @@
+"""
+Streaming polyphase resampler.
+
+Converts audio between rational sample rates (e.g. a USB microphone's
+native 48 kHz or 44.1 kHz down to the 16 kHz used by VAD/STT) one block
+at a time. The windowed-sinc filter is designed once; each block only
+gathers input samples and applies per-phase taps into preallocated
+arrays, and filter history is carried between blocks so block boundaries
+are seamless.
+"""
+from math import gcd
+from typing import Dict, Optional, Tuple
+
+import structlog
+import numpy as np
+
+logger = structlog.get_logger()
+
+# Bound on cached block plans (distinct offset/size pairs are few in practice)
+MAX_CACHED_PLANS = 1024
+
+
+class StreamingResampler:
+    """
+    Rational-ratio polyphase resampler with block-to-block state.
+    
+    Output sample ``n`` sits at position ``n * down`` on the upsampled
+    (``up`` x input rate) grid; it is computed from ``taps_per_phase``
+    input samples weighted by the filter phase ``(n * down) % up``. The
+    gather indices and weights for a block only depend on the block size
+    and the carried-over grid offset, so they are built once per distinct
+    (offset, size) pair and reused; steady-state blocks allocate nothing.
+    """
+    
+    def __init__(
+        self,
+        input_rate: int,
+        output_rate: int,
+        zero_crossings: int = 8,
+        cutoff: float = 0.9,
+        kaiser_beta: float = 8.0,
+        max_block: int = 8192
+    ):
+        """
+        Initialize resampler.
+        
+        Args:
+            input_rate: Input sample rate in Hz
+            output_rate: Output sample rate in Hz
+            zero_crossings: Sinc zero crossings on each side (filter quality)
+            cutoff: Passband edge as a fraction of the lower Nyquist rate
+            kaiser_beta: Kaiser window shape parameter
+            max_block: Largest input block accepted by process()
+        """
+        if input_rate <= 0 or output_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        g = gcd(input_rate, output_rate)
+        self.up = output_rate // g
+        self.down = input_rate // g
+        self.max_block = max_block
+        
+        # Prototype low-pass on the upsampled grid
+        ratio = max(self.up, self.down)
+        self.taps_per_phase = int(np.ceil(2 * zero_crossings * ratio / self.up))
+        length = self.taps_per_phase * self.up
+        fc = 0.5 * cutoff / ratio  # cycles per upsampled sample
+        t = np.arange(length) - (length - 1) / 2
+        h = 2 * fc * np.sinc(2 * fc * t) * np.kaiser(length, kaiser_beta)
+        h *= self.up / h.sum()
+        # phase_taps[p, k] weights input sample (top - k) for phase p
+        self._phase_taps = h.reshape(self.taps_per_phase, self.up).T.astype(np.float32)
+        
+        history = self.taps_per_phase - 1
+        self._history = history
+        self._work = np.zeros(history + max_block, dtype=np.float32)
+        max_out = (max_block * self.up) // self.down + 2
+        self._gather = np.zeros((max_out, self.taps_per_phase), dtype=np.float32)
+        self._out_f = np.zeros(max_out, dtype=np.float32)
+        self._out = np.zeros(max_out, dtype=np.int16)
+        self._offset = 0  # Grid position of the next output relative to block start
+        self._plans: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray, int]] = {}
+        
+        logger.info(
+            "resampler_initialized",
+            input_rate=input_rate,
+            output_rate=output_rate,
+            up=self.up,
+            down=self.down,
+            taps_per_phase=self.taps_per_phase
+        )
+    
+    @property
+    def is_passthrough(self) -> bool:
+        """True when input and output rates are equal."""
+        return self.up == self.down
+    
+    def output_length(self, input_length: int) -> int:
+        """Nominal number of output samples for an input block length."""
+        return (input_length * self.up) // self.down
+    
+    def _plan(self, offset: int, n: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Gather indices and weights for a block (cached per offset/size)."""
+        key = (offset, n)
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= MAX_CACHED_PLANS:
+                self._plans.clear()
+            limit = n * self.up
+            count = max(0, -(-(limit - offset) // self.down))
+            positions = offset + self.down * np.arange(count)
+            tops = positions // self.up + self._history
+            index = tops[:, None] - np.arange(self.taps_per_phase)[None, :]
+            weights = self._phase_taps[positions % self.up]
+            next_offset = offset + self.down * count - limit
+            plan = (index, weights, next_offset)
+            self._plans[key] = plan
+        return plan
+    
+    def process(self, block: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Resample one block of int16 samples.
+        
+        Args:
+            block: 1-D input samples (at most ``max_block``)
+            out: Optional int16 array to receive the output
+        
+        Returns:
+            int16 output samples: a view into the resampler's buffer (valid
+            until the next call) or the leading slice of ``out``
+        """
+        n = block.shape[0]
+        if n > self.max_block:
+            raise ValueError(f"Block of {n} samples exceeds max_block={self.max_block}")
+        
+        history = self._history
+        work = self._work
+        np.copyto(work[history:history + n], block, casting='unsafe')
+        
+        index, weights, next_offset = self._plan(self._offset, n)
+        count = index.shape[0]
+        gather = self._gather[:count]
+        np.take(work, index, out=gather)
+        result = self._out_f[:count]
+        np.einsum('ij,ij->i', gather, weights, out=result)
+        np.rint(result, out=result)
+        np.clip(result, -32768, 32767, out=result)
+        
+        target = self._out[:count] if out is None else out[:count]
+        np.copyto(target, result, casting='unsafe')
+        
+        # Carry the last taps_per_phase-1 inputs into the next block
+        if history:
+            np.copyto(work[:history], work[n:n + history])
+        self._offset = next_offset
+        return target
+    
+    def reset(self):
+        """Clear filter history."""
+        self._work.fill(0)
+        self._offset = 0
@@ -13,6 +13,8 @@ from collections import deque
 
 import structlog
 
+from bridge.metrics import CALLBACK_BUCKETS, get_metrics_registry
+
 logger = structlog.get_logger()
 
 
@@ -120,6 +122,18 @@ class ResponseFilter:
         self._queue: deque[FilteredMessage] = deque(maxlen=queue_size)
         self._last_spoken_time: Optional[float] = None
         self.stats = FilterStats()
+        metrics = get_metrics_registry()
+        self._filter_hist = metrics.histogram(
+            "filter_seconds", "Time to classify one OpenClaw message", CALLBACK_BUCKETS
+        )
+        self._type_counters = {
+            t: metrics.counter("filter_messages_total", "Filtered messages by type", labels={"type": t.value})
+            for t in ResponseType
+        }
+        self._decision_counters = {
+            d: metrics.counter("filter_decisions_total", "Filter decisions", labels={"decision": d.value})
+            for d in FilterDecision
+        }
         
         # Compile regex patterns
         self._thinking_patterns = [re.compile(p) for p in self.THINKING_PATTERNS]
@@ -141,6 +155,7 @@ class ResponseFilter:
         Returns:
             FilteredMessage with decision and metadata
         """
+        started = time.perf_counter()
         self.stats.total_messages += 1
         
         # Extract text content
@@ -149,6 +164,7 @@ class ResponseFilter:
         # Detect response type
         response_type = self._detect_type(message, text)
         self.stats.type_counts[response_type.value] += 1
+        self._type_counters[response_type].inc()
         
         # Calculate confidence and decision
         confidence, decision = self._evaluate_message(message, text, response_type)
@@ -173,6 +189,9 @@ class ResponseFilter:
             self.stats.queued_messages += 1
             self._queue.append(filtered)
         
+        self._decision_counters[decision].inc()
+        self._filter_hist.observe(time.perf_counter() - started)
+        
         # Update running average
         n = self.stats.total_messages
         self.stats.avg_confidence = (
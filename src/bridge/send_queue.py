@@ -0,0 +1,149 @@
+"""
+Outbound message queue for the WebSocket client.
+
+Messages wait in one of three priority lanes and are written by a single
+sender task, so a slow socket holds up the queue instead of the callers
+and an interrupt is never stuck behind queued voice input or pings. A
+message with a ``coalesce_key`` replaces a still-queued message with the
+same key (a newer ping supersedes an older one, unmute supersedes mute),
+keeping the older message's place in its lane.
+"""
+import asyncio
+import enum
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+
+class SendPriority(enum.IntEnum):
+    """Outbound lanes, drained lowest value first."""
+    CONTROL = 0      # Interrupts and other control messages
+    VOICE = 1        # Transcribed voice input
+    BACKGROUND = 2   # Keepalive pings
+
+
+@dataclass
+class OutboundMessage:
+    """A serialized message waiting to be written."""
+    message: dict
+    payload: Union[str, bytes]  # bytes for binary audio frames
+    priority: SendPriority = SendPriority.VOICE
+    coalesce_key: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    coalesced: int = 0  # Earlier messages this one replaced
+    
+    def resolve(self, sent: bool):
+        """Report the send result to everyone waiting on this message."""
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(sent)
+        self.waiters.clear()
+
+
+class OutboundQueue:
+    """
+    Priority lanes with coalescing, drained by one consumer.
+    
+    Not thread-safe: use from the event loop that owns the client.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize queue.
+        
+        Args:
+            max_size: Messages held across all lanes before put() refuses
+        """
+        self.max_size = max_size
+        self._lanes: Dict[SendPriority, Deque[OutboundMessage]] = {
+            priority: deque() for priority in SendPriority
+        }
+        self._keyed: Dict[str, OutboundMessage] = {}
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+        self.rejected = 0
+    
+    def __len__(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+    
+    def depths(self) -> Dict[str, int]:
+        """Queued messages per lane."""
+        return {priority.name.lower(): len(lane) for priority, lane in self._lanes.items()}
+    
+    def put(self, item: OutboundMessage) -> Tuple[bool, OutboundMessage]:
+        """
+        Queue a message, or fold it into a queued one with the same key.
+        
+        Args:
+            item: Message to queue
+        
+        Returns:
+            (accepted, queued): queued is the entry that will be written,
+            which is an earlier one when the message was coalesced
+        """
+        key = item.coalesce_key
+        if key is not None and key in self._keyed:
+            queued = self._keyed[key]
+            queued.message = item.message
+            queued.payload = item.payload
+            queued.waiters.extend(item.waiters)
+            queued.coalesced += 1
+            self.coalesced += 1
+            return True, queued
+        
+        if len(self) >= self.max_size:
+            self.rejected += 1
+            return False, item
+        self._lanes[item.priority].append(item)
+        if key is not None:
+            self._keyed[key] = item
+        self._ready.set()
+        return True, item
+    
+    def pop(self) -> Optional[OutboundMessage]:
+        """Take the oldest message from the highest-priority lane, if any."""
+        for lane in self._lanes.values():
+            if lane:
+                item = lane.popleft()
+                if item.coalesce_key is not None:
+                    self._keyed.pop(item.coalesce_key, None)
+                if not len(self):
+                    self._ready.clear()
+                return item
+        self._ready.clear()
+        return None
+    
+    async def get(self) -> OutboundMessage:
+        """Wait for and take the next message."""
+        while True:
+            item = self.pop()
+            if item is not None:
+                return item
+            await self._ready.wait()
+    
+    def clear(self, sent: bool = False) -> int:
+        """
+        Drop every queued message, resolving its waiters with ``sent``.
+        
+        Returns:
+            Number of messages dropped
+        """
+        dropped = 0
+        for lane in self._lanes.values():
+            while lane:
+                lane.popleft().resolve(sent)
+                dropped += 1
+        self._keyed.clear()
+        self._ready.clear()
+        return dropped
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue statistics."""
+        return {
+            "depth": len(self),
+            "lanes": self.depths(),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
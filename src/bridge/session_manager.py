@@ -1,12 +1,12 @@
 """Session Manager - High-level session lifecycle management."""
 
-import json
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 import uuid
 
+from bridge import codec
 from bridge.conversation_store import ConversationStore, get_conversation_store
 from bridge.config import get_config
 
@@ -60,20 +60,19 @@ class Session:
             created_at=row['created_at'],
             last_activity=row['last_activity'],
             state=row['state'],
-            context_window=json.loads(row['context_window']) if row['context_window'] else [],
-            metadata=json.loads(row['metadata']) if row['metadata'] else {}
+            context_window=codec.loads(row['context_window']) if row['context_window'] else [],
+            metadata=codec.loads(row['metadata']) if row['metadata'] else {}
         )
     
     def to_db_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage."""
-        import json
         return {
             'session_uuid': self.session_uuid,
             'created_at': self.created_at,
             'last_activity': self.last_activity,
             'state': self.state,
-            'context_window': json.dumps(self.context_window) if self.context_window else None,
-            'metadata': json.dumps(self.metadata) if self.metadata else None
+            'context_window': codec.dumps(self.context_window) if self.context_window else None,
+            'metadata': codec.dumps(self.metadata) if self.metadata else None
         }
     
     def update_activity(self):
@@ -87,8 +86,6 @@ class Session:
             message: Message to add
             max_size: Maximum context window size
         """
-        import json
-        
         self.context_window.append(message)
         
         # Prune if necessary
@@ -170,8 +167,6 @@ class SessionManager:
         Returns:
             New Session instance (persisted)
         """
-        import json
-        
         session = Session(
             session_uuid=self.generate_uuid(),
             metadata=metadata or {}
@@ -188,8 +183,8 @@ class SessionManager:
                     session.created_at,
                     session.last_activity,
                     session.state,
-                    json.dumps(session.context_window) if session.context_window else None,
-                    json.dumps(session.metadata) if session.metadata else None
+                    codec.dumps(session.context_window) if session.context_window else None,
+                    codec.dumps(session.metadata) if session.metadata else None
                 )
             )
             session.id = cursor.lastrowid
@@ -261,8 +256,6 @@ class SessionManager:
         Returns:
             Updated session
         """
-        import json
-        
         if session.id is None:
             raise SessionError("Session must be persisted before update")
         
@@ -279,8 +272,8 @@ class SessionManager:
                 (
                     session.last_activity,
                     session.state,
-                    json.dumps(session.context_window) if session.context_window else None,
-                    json.dumps(session.metadata) if session.metadata else None,
+                    codec.dumps(session.context_window) if session.context_window else None,
+                    codec.dumps(session.metadata) if session.metadata else None,
                     session.id
                 )
             )
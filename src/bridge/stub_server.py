@@ -0,0 +1,216 @@
+"""
+Local stand-in for the OpenClaw gateway.
+
+Speaks enough of the protocol to exercise the WebSocket client without a
+real gateway: sends the welcome message, answers pings, records every JSON
+message and binary audio frame, and reassembles streamed audio into
+utterances. When an utterance ends it replies with a ``transcript`` message
+produced by a pluggable transcriber (a sample count by default), which is
+where a real server would run STT.
+
+Usage:
+    python -m bridge.stub_server --port 8080
+"""
+import argparse
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import structlog
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from bridge import codec
+from bridge.audio_frame import AudioCodec, AudioFrame, FrameFlags
+from bridge.config import OpenClawConfig
+from bridge.websocket_client import MessageType, MessageValidator
+
+logger = structlog.get_logger()
+
+
+def _count_samples(audio: np.ndarray, sample_rate: int) -> str:
+    """Default transcriber: describe the audio instead of recognising it."""
+    return f"{audio.shape[0]} samples at {sample_rate} Hz"
+
+
+class StubOpenClawServer:
+    """
+    In-process OpenClaw stand-in for tests and thin-endpoint development.
+    
+    Use as an async context manager; ``port=0`` picks a free port and
+    ``config()`` returns an OpenClawConfig pointing at it.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        session_id: str = "stub-session",
+        transcriber: Optional[Callable[[np.ndarray, int], str]] = None
+    ):
+        """
+        Initialize server.
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 for any free port)
+            session_id: Session ID sent in the welcome message
+            transcriber: Called with (int16 samples, sample_rate) for each
+                completed PCM utterance; returns the transcript text
+        """
+        self.host = host
+        self.port = port
+        self.session_id = session_id
+        self.transcriber = transcriber or _count_samples
+        
+        self.messages: List[Dict[str, Any]] = []
+        self.audio_frames: List[AudioFrame] = []
+        self.utterances: List[np.ndarray] = []
+        self.errors: List[str] = []
+        self.lost_frames = 0
+        
+        self._server = None
+        self._clients: set = set()
+        self._received = asyncio.Condition()
+    
+    async def __aenter__(self) -> "StubOpenClawServer":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def start(self):
+        """Start listening."""
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("stub_server.started", host=self.host, port=self.port)
+    
+    async def stop(self):
+        """Close all connections and stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            logger.info("stub_server.stopped", port=self.port)
+    
+    def config(self, **overrides) -> OpenClawConfig:
+        """Client configuration for this server."""
+        return OpenClawConfig(host=self.host, port=self.port, **overrides)
+    
+    async def send(self, message: Dict[str, Any]):
+        """Send a JSON message to every connected client."""
+        for websocket in list(self._clients):
+            await websocket.send(codec.dumps(message))
+    
+    async def send_audio(self, frame: AudioFrame):
+        """Send a binary audio frame to every connected client."""
+        for websocket in list(self._clients):
+            await websocket.send(frame.encode())
+    
+    async def wait_for(self, predicate: Callable[[], bool], timeout: float = 2.0) -> bool:
+        """Wait until ``predicate()`` holds after some message arrived."""
+        async with self._received:
+            try:
+                await asyncio.wait_for(self._received.wait_for(predicate), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+    
+    async def _handle(self, websocket, *args):
+        self._clients.add(websocket)
+        pending: List[AudioFrame] = []
+        expected_sequence = 0
+        try:
+            await websocket.send(codec.dumps({"session_id": self.session_id}))
+            async for data in websocket:
+                if isinstance(data, bytes):
+                    frame = self._accept_audio(data)
+                    if frame is not None:
+                        if frame.sequence != expected_sequence:
+                            self.lost_frames += frame.sequence - expected_sequence
+                        expected_sequence = frame.sequence + 1
+                        pending = await self._on_audio(websocket, frame, pending)
+                else:
+                    await self._on_message(websocket, data)
+                async with self._received:
+                    self._received.notify_all()
+        except ConnectionClosed:
+            pass
+        finally:
+            self._clients.discard(websocket)
+    
+    def _accept_audio(self, data: bytes) -> Optional[AudioFrame]:
+        is_valid, error = MessageValidator.validate_binary(data)
+        if not is_valid:
+            self.errors.append(error)
+            logger.warning("stub_server.invalid_frame", error=error)
+            return None
+        frame = AudioFrame.decode(data)
+        self.audio_frames.append(frame)
+        return frame
+    
+    async def _on_audio(
+        self,
+        websocket,
+        frame: AudioFrame,
+        pending: List[AudioFrame]
+    ) -> List[AudioFrame]:
+        """Buffer an utterance's frames; transcribe when it ends."""
+        if frame.flags & FrameFlags.START:
+            pending = []
+        pending.append(frame)
+        if not frame.is_end:
+            return pending
+        if frame.flags & FrameFlags.DISCARD:
+            return []
+        
+        reply = {
+            "type": "transcript",
+            "sequence": frame.sequence,
+            "metadata": {"frames": len(pending), "codec": frame.codec.name.lower()},
+        }
+        if frame.codec == AudioCodec.PCM16:
+            audio = np.concatenate([f.samples() for f in pending], axis=0)
+            self.utterances.append(audio)
+            reply["text"] = self.transcriber(audio, frame.sample_rate)
+            reply["metadata"]["samples"] = int(audio.shape[0])
+        else:
+            reply["text"] = ""
+            reply["metadata"]["bytes"] = sum(len(f.payload) for f in pending)
+        await websocket.send(codec.dumps(reply))
+        return []
+    
+    async def _on_message(self, websocket, data: str):
+        try:
+            message = codec.loads(data)
+        except ValueError as e:
+            self.errors.append(str(e))
+            return
+        self.messages.append(message)
+        if isinstance(message, dict) and message.get("type") == MessageType.PING.value:
+            await websocket.send(codec.dumps({
+                "type": MessageType.PONG.value,
+                "timestamp": message.get("timestamp"),
+            }))
+
+
+async def _serve_forever(host: str, port: int):
+    async with StubOpenClawServer(host, port) as server:
+        print(f"Stub OpenClaw server on ws://{server.host}:{server.port}/api/voice")
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenClaw stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ from bridge.openclaw_middleware import (
     wrap_tool_execution,
 )
 from bridge.middleware_integration import MiddlewareResponseFilter
+from bridge.metrics import get_metrics_registry
 
 logger = structlog.get_logger()
 
@@ -153,6 +154,11 @@ class ToolChainManager:
         self._interrupted = False
         self._chain_start_time: Optional[float] = None
         
+        self._metrics = get_metrics_registry()
+        self._chain_hist = self._metrics.histogram(
+            "tool_chain_seconds", "Tool chain execution time"
+        )
+        
         logger.info(
             "tool_chain_manager.initialized",
             max_chain_length=max_chain_length,
@@ -284,6 +290,7 @@ class ToolChainManager:
             
             # Execute the step
             await self._execute_step(step, tool_registry)
+            self._record_step_metrics(step)
             
             # Notify callback
             if self.on_step_complete:
@@ -294,6 +301,7 @@ class ToolChainManager:
         
         # Calculate results
         total_duration = time.time() - self._chain_start_time
+        self._chain_hist.observe(total_duration)
         success = all(
             s.status == ToolResultStatus.SUCCESS 
             for s in steps
@@ -411,6 +419,18 @@ class ToolChainManager:
             step.end_time = time.time()
             logger.error("step.execution_failed", tool=step.tool_name, error=str(e))
     
+    def _record_step_metrics(self, step: ToolStep) -> None:
+        """Count a finished step by status and record its duration per tool."""
+        self._metrics.counter(
+            "tool_steps_total", "Tool steps by final status",
+            labels={"status": step.status.value}
+        ).inc()
+        if step.duration is not None:
+            self._metrics.histogram(
+                "tool_step_seconds", "Tool step execution time",
+                labels={"tool": step.tool_name}
+            ).observe(step.duration)
+    
     def interrupt(self) -> None:
         """Interrupt the current tool chain."""
         logger.warning("chain.interrupt_requested")
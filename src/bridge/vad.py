@@ -1,13 +1,16 @@
 """
 Voice Activity Detection (VAD) for audio pipeline.
 
-Supports WebRTC VAD for lightweight, real-time speech detection.
+Supports WebRTC VAD for lightweight, real-time speech detection and a
+vectorized energy VAD for hosts without webrtcvad or for bulk replay.
 Detects speech start/end events and filters non-speech audio.
 """
 import enum
 import threading
+import time
+import wave
 from dataclasses import dataclass
-from typing import Callable, Optional, List
+from typing import Callable, Optional, Tuple
 
 import structlog
 import numpy as np
@@ -31,6 +34,13 @@ class VADMode(enum.Enum):
     HIGH = 3        # Most aggressive, fewer false positives
 
 
+class VADBackend(enum.Enum):
+    """VAD engine selection."""
+    AUTO = "auto"          # WebRTC when installed, energy otherwise
+    WEBRTC = "webrtc"
+    ENERGY = "energy"
+
+
 class VADState(enum.Enum):
     """Current VAD state."""
     SILENCE = "silence"
@@ -42,11 +52,15 @@ class VADState(enum.Enum):
 class VADConfig:
     """VAD configuration."""
     mode: VADMode = VADMode.MEDIUM
+    backend: VADBackend = VADBackend.AUTO
     frame_duration_ms: int = 30  # 10, 20, or 30ms for WebRTC
     sample_rate: int = 16000
     min_speech_duration_ms: int = 250
     min_silence_duration_ms: int = 500
-    padding_duration_ms: int = 300  # Padding around speech
+    padding_duration_ms: int = 300  # Audio kept ahead of speech onset
+    trailing_padding_ms: Optional[int] = None  # Silence kept after speech (None keeps min_silence_duration_ms)
+    max_speech_duration_ms: int = 120000  # Force a segment once an utterance reaches this length
+    stream_chunk_ms: int = 0  # Emit SpeechChunk events this often during speech (0 disables)
 
 
 @dataclass
@@ -63,6 +77,205 @@ class SpeechSegment:
         return (self.end_time - self.start_time) * 1000
 
 
+class SpeechChunkType(enum.Enum):
+    """Position of a streamed chunk within its utterance."""
+    START = "start"
+    CONTINUE = "continue"
+    END = "end"
+
+
+@dataclass
+class SpeechChunk:
+    """
+    Partial speech audio emitted while an utterance is still in progress.
+    
+    ``sample_offset`` is the position of the chunk's first sample in the
+    segmenter's input stream, so offsets increase monotonically across
+    chunks and utterances. An END chunk carries whatever audio has not been
+    streamed yet (possibly none); ``discarded`` is set when the utterance
+    turned out to be shorter than ``min_speech_duration_ms``.
+    """
+    chunk_type: SpeechChunkType
+    utterance_id: int
+    sample_offset: int
+    audio_data: np.ndarray
+    timestamp: float
+    discarded: bool = False
+
+
+class SegmentAccumulator:
+    """
+    Growable preallocated buffer that speech frames are written into in place.
+    
+    Capacity doubles when exhausted (amortised O(1) per frame) and is capped
+    at ``max_samples``. ``detach()`` hands the filled region out as a view
+    and starts the next utterance in a fresh buffer, so no end-of-utterance
+    concatenate or copy is needed.
+    """
+    
+    def __init__(
+        self,
+        initial_samples: int,
+        max_samples: Optional[int] = None,
+        dtype: np.dtype = np.int16
+    ):
+        """
+        Initialize accumulator.
+        
+        Args:
+            initial_samples: Capacity allocated for each new utterance
+            max_samples: Hard cap on samples per utterance (None for no cap)
+            dtype: NumPy data type for audio samples
+        """
+        self.initial_samples = max(1, initial_samples)
+        if max_samples is not None:
+            self.initial_samples = min(self.initial_samples, max_samples)
+        self.max_samples = max_samples
+        self.dtype = dtype
+        self._data: Optional[np.ndarray] = None
+        self._length = 0
+        self.grow_count = 0
+    
+    @property
+    def length(self) -> int:
+        """Number of samples written for the current utterance."""
+        return self._length
+    
+    @property
+    def capacity(self) -> int:
+        """Currently allocated capacity in samples."""
+        return 0 if self._data is None else self._data.shape[0]
+    
+    @property
+    def is_full(self) -> bool:
+        """Check if the utterance has reached max_samples."""
+        return self.max_samples is not None and self._length >= self.max_samples
+    
+    def _reserve(self, needed: int):
+        """Ensure capacity for ``needed`` samples, doubling as required."""
+        if self._data is None:
+            self._data = np.empty(max(self.initial_samples, needed), dtype=self.dtype)
+            return
+        capacity = self._data.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        if self.max_samples is not None:
+            new_capacity = min(new_capacity, self.max_samples)
+        grown = np.empty(new_capacity, dtype=self.dtype)
+        grown[:self._length] = self._data[:self._length]
+        self._data = grown
+        self.grow_count += 1
+    
+    def append(self, frame: np.ndarray) -> int:
+        """
+        Copy a frame into the buffer.
+        
+        Args:
+            frame: Audio samples
+            
+        Returns:
+            Number of samples written (fewer than len(frame) at the cap)
+        """
+        count = frame.shape[0]
+        if self.max_samples is not None:
+            count = min(count, self.max_samples - self._length)
+        if count <= 0:
+            return 0
+        end = self._length + count
+        self._reserve(end)
+        self._data[self._length:end] = frame[:count]
+        self._length = end
+        return count
+    
+    def view(self) -> np.ndarray:
+        """View of the samples written so far (valid until the next append)."""
+        if self._data is None:
+            return np.empty(0, dtype=self.dtype)
+        return self._data[:self._length]
+    
+    def detach(self) -> np.ndarray:
+        """Return the current utterance as a view and start a new buffer."""
+        data = self.view()
+        self._data = None
+        self._length = 0
+        return data
+    
+    def truncate(self, length: int):
+        """Drop samples past ``length`` from the current utterance."""
+        self._length = max(0, min(self._length, length))
+    
+    def clear(self):
+        """Discard the current utterance, keeping the allocation for reuse."""
+        self._length = 0
+
+
+class PreRollRing:
+    """
+    Fixed-size ring holding the most recent audio ahead of an utterance.
+    
+    The ring is allocated once and frames are copied into it, wrapping at
+    the end. ``parts()`` returns the contents oldest first as two views
+    (the second is empty until the ring wraps), so callers write them
+    straight into a SegmentAccumulator instead of concatenating.
+    """
+    
+    def __init__(self, capacity: int, dtype: np.dtype = np.int16):
+        """
+        Initialize ring.
+        
+        Args:
+            capacity: Samples kept (0 disables the ring)
+            dtype: NumPy data type for audio samples
+        """
+        self._data = np.zeros(max(0, capacity), dtype=dtype)
+        self._write = 0
+        self._length = 0
+    
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples held."""
+        return self._data.shape[0]
+    
+    @property
+    def length(self) -> int:
+        """Number of samples currently held."""
+        return self._length
+    
+    def push(self, frame: np.ndarray):
+        """Copy a frame in, overwriting the oldest samples once full."""
+        data = self._data
+        size = data.shape[0]
+        n = frame.shape[0]
+        if size == 0 or n == 0:
+            return
+        if n >= size:
+            data[:] = frame[n - size:]
+            self._write = 0
+        else:
+            first = min(n, size - self._write)
+            data[self._write:self._write + first] = frame[:first]
+            data[:n - first] = frame[first:]
+            self._write = (self._write + n) % size
+        self._length = min(self._length + n, size)
+    
+    def load(self, audio: np.ndarray):
+        """Replace the contents with the tail of ``audio``."""
+        self.clear()
+        self.push(audio)
+    
+    def parts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Contents as two views, oldest first (valid until the next push)."""
+        if self._length < self._data.shape[0]:
+            return self._data[:self._length], self._data[:0]
+        return self._data[self._write:], self._data[:self._write]
+    
+    def clear(self):
+        """Forget the held audio, keeping the allocation."""
+        self._write = 0
+        self._length = 0
+
+
 class WebRTCVAD:
     """
     WebRTC-based Voice Activity Detection.
@@ -81,6 +294,10 @@ class WebRTCVAD:
         self._vad = None
         self._state = VADState.UNKNOWN
         self._state_lock = threading.Lock()
+        self._frame_samples = self.frame_samples
+        
+        # Latest per-frame outputs (plain attribute writes, read lock-free)
+        self.speech_probability = 0.0
         
         if WEBRTC_AVAILABLE:
             self._init_webrtc()
@@ -105,12 +322,23 @@ class WebRTCVAD:
         """Check if VAD is available and initialized."""
         return self._vad is not None or not WEBRTC_AVAILABLE
     
+    def reset(self):
+        """Forget the speech state (e.g. when listening restarts)."""
+        self.speech_probability = 0.0
+        with self._state_lock:
+            self._state = VADState.UNKNOWN
+    
     @property
     def state(self) -> VADState:
         """Get current VAD state."""
         with self._state_lock:
             return self._state
     
+    @property
+    def frame_samples(self) -> int:
+        """Samples per frame for the configured rate and frame duration."""
+        return int(self.config.sample_rate * self.config.frame_duration_ms / 1000)
+    
     def process_frame(self, audio_frame: np.ndarray) -> bool:
         """
         Process a single audio frame for voice activity.
@@ -129,17 +357,19 @@ class WebRTCVAD:
         if len(audio_frame) == 0:
             return False
         
-        # Convert to bytes (WebRTC expects bytes)
+        # WebRTC expects a bytes-like buffer; contiguous int16 frames are
+        # passed through as a memoryview without copying
         try:
-            audio_bytes = audio_frame.astype(np.int16).tobytes()
+            if audio_frame.dtype == np.int16 and audio_frame.flags.c_contiguous:
+                audio_bytes = memoryview(audio_frame).cast('B')
+            else:
+                audio_bytes = audio_frame.astype(np.int16).tobytes()
         except Exception as e:
             logger.error("audio_conversion_failed", error=str(e))
             return False
         
         # Check frame size matches expected duration
-        expected_samples = int(
-            self.config.sample_rate * self.config.frame_duration_ms / 1000
-        )
+        expected_samples = self._frame_samples
         if len(audio_frame) != expected_samples:
             logger.warning(
                 "frame_size_mismatch",
@@ -150,6 +380,7 @@ class WebRTCVAD:
         # Process with WebRTC VAD
         try:
             is_speech = self._vad.is_speech(audio_bytes, self.config.sample_rate)
+            self.speech_probability = 1.0 if is_speech else 0.0
             
             with self._state_lock:
                 self._state = VADState.SPEECH if is_speech else VADState.SILENCE
@@ -175,6 +406,136 @@ class WebRTCVAD:
             is_speech = self.process_frame(frame)
             if callback:
                 callback(is_speech, frame)
+    
+    def process_batch(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Run VAD over a long buffer of samples in one call.
+        
+        The buffer is reshaped into frames in a single step, the frame size
+        is computed once and the state lock is taken once at the end, so
+        this is much cheaper per frame than process_frame/process_stream.
+        Trailing samples that do not fill a whole frame are ignored.
+        
+        Args:
+            samples: Mono audio samples (int16, or anything castable to it)
+            
+        Returns:
+            Boolean array with one speech decision per frame
+        """
+        frame_len = self.frame_samples
+        count = samples.shape[0] // frame_len
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+        
+        frames = np.ascontiguousarray(samples[:count * frame_len], dtype=np.int16)
+        frames = frames.reshape(count, frame_len)
+        
+        vad = getattr(self, '_vad', None)
+        if vad is None:
+            # No WebRTC backend (mock or subclass): fall back per frame
+            return np.fromiter(
+                (self.process_frame(frame) for frame in frames), dtype=bool, count=count
+            )
+        
+        data = memoryview(frames).cast('B')
+        step = frame_len * frames.itemsize
+        rate = self.config.sample_rate
+        is_speech = vad.is_speech
+        try:
+            result = np.fromiter(
+                (is_speech(data[i:i + step], rate) for i in range(0, count * step, step)),
+                dtype=bool,
+                count=count
+            )
+        except Exception as e:
+            logger.error("vad_batch_processing_failed", error=str(e))
+            return np.zeros(count, dtype=bool)
+        
+        self.speech_probability = 1.0 if result[-1] else 0.0
+        with self._state_lock:
+            self._state = VADState.SPEECH if result[-1] else VADState.SILENCE
+        return result
+
+
+def open_pcm16_wav(path) -> wave.Wave_read:
+    """
+    Open a WAV file for reading, checking it holds 16-bit PCM.
+    
+    Raises:
+        ValueError: If the file is not 16-bit PCM
+    """
+    wav = wave.open(str(path), 'rb')
+    width = wav.getsampwidth()
+    if width != 2:
+        wav.close()
+        raise ValueError(f"Expected 16-bit PCM, got {width * 8}-bit")
+    return wav
+
+
+def read_pcm16_frames(wav: wave.Wave_read, frames: int, mono: bool = False) -> np.ndarray:
+    """
+    Read up to ``frames`` frames from a WAV opened with open_pcm16_wav.
+    
+    Returns:
+        int16 samples shaped (n, channels), or (n,) averaged over the
+        channels when ``mono`` is set
+    """
+    channels = wav.getnchannels()
+    samples = np.frombuffer(wav.readframes(frames), dtype='<i2').astype(np.int16, copy=False)
+    samples = samples.reshape(-1, channels)
+    if not mono:
+        return samples
+    if channels == 1:
+        return samples[:, 0]
+    return samples.mean(axis=1).astype(np.int16)
+
+
+def process_wav_file(
+    path,
+    vad: Optional[WebRTCVAD] = None,
+    block_frames: int = 2000
+) -> np.ndarray:
+    """
+    Run VAD over a 16-bit PCM WAV file much faster than real time.
+    
+    The file is read in blocks of ``block_frames`` VAD frames and each block
+    goes through ``process_batch``, so memory stays bounded for hours of
+    recorded audio. Multi-channel files are averaged to mono.
+    
+    Args:
+        path: WAV file path
+        vad: VAD to use (created for the file's sample rate if None)
+        block_frames: VAD frames decoded per read
+        
+    Returns:
+        Boolean array with one speech decision per frame
+        
+    Raises:
+        ValueError: If the file is not 16-bit PCM or its sample rate does
+            not match the VAD configuration
+    """
+    with open_pcm16_wav(path) as wav:
+        rate = wav.getframerate()
+        
+        if vad is None:
+            vad = create_vad(VADConfig(sample_rate=rate))
+        elif vad.config.sample_rate != rate:
+            raise ValueError(
+                f"WAV sample rate {rate} does not match VAD sample rate "
+                f"{vad.config.sample_rate}"
+            )
+        
+        block_samples = vad.frame_samples * block_frames
+        results = []
+        while True:
+            samples = read_pcm16_frames(wav, block_samples, mono=True)
+            if not samples.size:
+                break
+            results.append(vad.process_batch(samples))
+    
+    if not results:
+        return np.zeros(0, dtype=bool)
+    return np.concatenate(results)
 
 
 class SpeechSegmenter:
@@ -182,7 +543,10 @@ class SpeechSegmenter:
     Detects and extracts speech segments from continuous audio.
     
     Uses VAD to identify speech boundaries and returns complete
-    speech segments with configurable padding.
+    speech segments with configurable padding. The last
+    ``padding_duration_ms`` of audio is kept in a PreRollRing and written
+    ahead of each utterance so onsets are not clipped; trailing silence is
+    trimmed to ``trailing_padding_ms`` when that is set.
     """
     
     def __init__(
@@ -197,70 +561,200 @@ class SpeechSegmenter:
             vad: VAD instance (creates default if None)
             config: VAD configuration
         """
-        self.vad = vad or WebRTCVAD(config)
+        self.vad = vad or create_vad(config)
         self.config = config or self.vad.config
         
         # State tracking
         self._in_speech = False
         self._speech_start_time: Optional[float] = None
         self._silence_start_time: Optional[float] = None
-        self._buffered_frames: List[np.ndarray] = []
-        self._padding_frames: List[np.ndarray] = []
+        self._lead_samples = 0  # Padding samples ahead of the first voiced frame
+        self._voiced_end = 0  # Utterance samples up to the last voiced frame
         
         # Timing
         self._frame_duration_sec = self.config.frame_duration_ms / 1000
         self._min_speech_sec = self.config.min_speech_duration_ms / 1000
         self._min_silence_sec = self.config.min_silence_duration_ms / 1000
-        self._padding_frames_count = int(
-            self.config.padding_duration_ms / self.config.frame_duration_ms
+        samples_per_ms = self.config.sample_rate / 1000
+        
+        # Pre-roll: whole frames of recent audio, allocated once
+        frame_samples = int(self.config.frame_duration_ms * samples_per_ms)
+        padding_frames = int(self.config.padding_duration_ms / self.config.frame_duration_ms)
+        self._padding = PreRollRing(padding_frames * frame_samples)
+        self._trailing_samples: Optional[int] = None
+        if self.config.trailing_padding_ms is not None:
+            self._trailing_samples = int(self.config.trailing_padding_ms * samples_per_ms)
+        
+        # Utterance audio is written in place; start with room for ~2s
+        self._accumulator = SegmentAccumulator(
+            initial_samples=int(2000 * samples_per_ms),
+            max_samples=int(self.config.max_speech_duration_ms * samples_per_ms) or None
         )
+        
+        # Streaming: on_chunk receives SpeechChunk events while speech is in
+        # progress when config.stream_chunk_ms > 0
+        self.on_chunk: Optional[Callable[[SpeechChunk], None]] = None
+        self._chunk_samples = int(self.config.stream_chunk_ms * samples_per_ms)
+        self._stream_samples = 0
+        self._utterance_id = 0
+        self._utterance_offset = 0
+        self._streamed_samples = 0
+    
+    @property
+    def in_speech(self) -> bool:
+        """Check if an utterance is in progress."""
+        return self._in_speech
+    
+    def prime(self, audio: np.ndarray):
+        """
+        Load recent audio as padding ahead of the next utterance.
+        
+        Used when capture resumes after a gap (e.g. a wake-word gate
+        handing over its pre-roll) so an utterance that starts right away
+        keeps its onset.
+        
+        Args:
+            audio: Mono samples, oldest first
+        """
+        if not self._in_speech:
+            self._padding.load(audio)
+    
+    @property
+    def streaming(self) -> bool:
+        """Check if partial chunks are being emitted."""
+        return self._chunk_samples > 0 and self.on_chunk is not None
     
     def reset(self):
-        """Reset segmenter state."""
+        """Reset segmenter state, including the pre-roll."""
+        self._end_utterance()
+        self._padding.clear()
+    
+    def _end_utterance(self):
+        """Drop the utterance in progress (the pre-roll keeps running)."""
         self._in_speech = False
         self._speech_start_time = None
         self._silence_start_time = None
-        self._buffered_frames = []
-        self._padding_frames = []
+        self._lead_samples = 0
+        self._voiced_end = 0
+        self._accumulator.clear()
+        self._streamed_samples = 0
+    
+    def _emit_chunk(
+        self,
+        chunk_type: SpeechChunkType,
+        timestamp: float,
+        discarded: bool = False
+    ):
+        """Send the not-yet-streamed part of the utterance to on_chunk."""
+        # Views stay valid: the accumulator only appends past this region
+        audio = self._accumulator.view()[self._streamed_samples:]
+        chunk = SpeechChunk(
+            chunk_type=chunk_type,
+            utterance_id=self._utterance_id,
+            sample_offset=self._utterance_offset + self._streamed_samples,
+            audio_data=audio,
+            timestamp=timestamp,
+            discarded=discarded
+        )
+        self._streamed_samples += audio.shape[0]
+        try:
+            self.on_chunk(chunk)
+        except Exception as e:
+            logger.error("speech_chunk_callback_error", error=str(e))
+    
+    def _maybe_stream(self, timestamp: float):
+        """Emit a START/CONTINUE chunk once enough new audio is buffered."""
+        if self._accumulator.length - self._streamed_samples < self._chunk_samples:
+            return
+        chunk_type = (
+            SpeechChunkType.START if self._streamed_samples == 0 else SpeechChunkType.CONTINUE
+        )
+        self._emit_chunk(chunk_type, timestamp)
+    
+    def _end_stream(self, timestamp: float, discarded: bool = False):
+        """Close an utterance that has already been partially streamed."""
+        if self.streaming and self._streamed_samples > 0:
+            self._emit_chunk(SpeechChunkType.END, timestamp, discarded=discarded)
+    
+    def _emit_segment(self, end_time: float, event: str) -> SpeechSegment:
+        """Hand the accumulated utterance out as a segment and reset."""
+        if self._trailing_samples is not None:
+            # Trailing padding policy; audio already streamed stays
+            self._accumulator.truncate(max(
+                self._voiced_end + self._trailing_samples, self._streamed_samples
+            ))
+        self._end_stream(end_time)
+        speech_duration = end_time - self._speech_start_time
+        segment = SpeechSegment(
+            start_time=self._speech_start_time,
+            end_time=end_time,
+            audio_data=self._accumulator.detach(),
+            confidence=min(1.0, speech_duration / 1.0)  # Longer = more confident
+        )
+        
+        logger.info(
+            event,
+            duration_ms=segment.duration_ms,
+            confidence=segment.confidence
+        )
+        
+        self._end_utterance()
+        return segment
     
     def process_frame(
         self,
         frame: np.ndarray,
-        timestamp: Optional[float] = None
+        timestamp: Optional[float] = None,
+        is_speech: Optional[bool] = None
     ) -> Optional[SpeechSegment]:
         """
         Process a single frame and detect speech segments.
         
         Args:
             frame: Audio frame
-            timestamp: Current timestamp (uses time.time() if None)
+            timestamp: Monotonic capture time of the frame (uses
+                time.monotonic() if None); carried into the segment's
+                start_time/end_time
+            is_speech: VAD decision already made for this frame (runs
+                self.vad if None)
             
         Returns:
             SpeechSegment when speech ends, None otherwise
         """
         if timestamp is None:
-            import time
-            timestamp = time.time()
+            timestamp = time.monotonic()
         
-        is_speech = self.vad.process_frame(frame)
+        if is_speech is None:
+            is_speech = self.vad.process_frame(frame)
+        frame_offset = self._stream_samples
+        self._stream_samples += frame.shape[0]
         
-        # Store frame in padding buffer
-        self._padding_frames.append(frame)
-        if len(self._padding_frames) > self._padding_frames_count:
-            self._padding_frames.pop(0)
+        if is_speech and not self._in_speech:
+            # Speech start: write the pre-roll ahead of this frame
+            self._in_speech = True
+            self._speech_start_time = timestamp
+            self._accumulator.clear()
+            for part in self._padding.parts():
+                self._accumulator.append(part)
+            self._lead_samples = self._accumulator.length
+            self._utterance_id += 1
+            self._utterance_offset = frame_offset - self._accumulator.length
+            logger.debug("speech_started", timestamp=timestamp)
+            
+        # The caller may reuse the frame's memory (the capture path hands
+        # over a reused frame), so the ring keeps its own copy
+        self._padding.push(frame)
         
         if is_speech:
             self._silence_start_time = None
+            self._accumulator.append(frame)
+            self._voiced_end = self._accumulator.length
             
-            if not self._in_speech:
-                # Speech start
-                self._in_speech = True
-                self._speech_start_time = timestamp
-                # Include padding frames
-                self._buffered_frames = self._padding_frames.copy()
-                logger.debug("speech_started", timestamp=timestamp)
-            
-            self._buffered_frames.append(frame)
+            if self._accumulator.is_full:
+                # Utterance hit the length cap: hand it off now
+                return self._emit_segment(timestamp, "speech_segment_max_length")
+            if self.streaming:
+                self._maybe_stream(timestamp)
         else:
             if self._in_speech:
                 if self._silence_start_time is None:
@@ -268,36 +762,27 @@ class SpeechSegmenter:
                 
                 silence_duration = timestamp - self._silence_start_time
                 
-                if silence_duration >= self._min_silence_sec:
-                    # Speech end
-                    speech_duration = self._silence_start_time - self._speech_start_time
-                    
-                    if speech_duration >= self._min_speech_sec:
-                        # Valid speech segment
-                        audio_data = np.concatenate(self._buffered_frames)
-                        
-                        segment = SpeechSegment(
-                            start_time=self._speech_start_time,
-                            end_time=self._silence_start_time,
-                            audio_data=audio_data,
-                            confidence=min(1.0, speech_duration / 1.0)  # Longer = more confident
-                        )
-                        
-                        logger.info(
-                            "speech_segment_detected",
-                            duration_ms=segment.duration_ms,
-                            confidence=segment.confidence
-                        )
-                        
-                        self.reset()
-                        return segment
-                    else:
-                        # Too short, discard
-                        logger.debug("speech_too_short_discarded", duration=speech_duration)
-                        self.reset()
-                else:
+                if silence_duration < self._min_silence_sec:
                     # Still in speech, buffer the silence frames
-                    self._buffered_frames.append(frame)
+                    self._accumulator.append(frame)
+                    if not self._accumulator.is_full:
+                        if self.streaming:
+                            self._maybe_stream(timestamp)
+                        return None
+                
+                # Speech end (trailing silence elapsed or length cap reached)
+                speech_duration = self._silence_start_time - self._speech_start_time
+                
+                if speech_duration >= self._min_speech_sec:
+                    # Valid speech segment
+                    return self._emit_segment(
+                        self._silence_start_time, "speech_segment_detected"
+                    )
+                
+                # Too short, discard
+                logger.debug("speech_too_short_discarded", duration=speech_duration)
+                self._end_stream(timestamp, discarded=True)
+                self._end_utterance()
         
         return None
     
@@ -308,73 +793,238 @@ class SpeechSegmenter:
         Returns:
             SpeechSegment if speech was in progress, None otherwise
         """
-        if self._in_speech and self._speech_start_time:
-            import time
-            end_time = time.time()
+        if self._in_speech and self._speech_start_time is not None:
+            # Derive the end from the audio held since speech start, so it
+            # stays on the frames' clock without reading the wall clock
+            voiced_samples = self._accumulator.length - self._lead_samples
+            end_time = self._speech_start_time + voiced_samples / self.config.sample_rate
             speech_duration = end_time - self._speech_start_time
             
             if speech_duration >= self._min_speech_sec:
-                audio_data = np.concatenate(self._buffered_frames)
-                
-                segment = SpeechSegment(
-                    start_time=self._speech_start_time,
-                    end_time=end_time,
-                    audio_data=audio_data,
-                    confidence=min(1.0, speech_duration / 1.0)
-                )
-                
-                logger.info("speech_segment_flushed", duration_ms=segment.duration_ms)
-                self.reset()
-                return segment
+                return self._emit_segment(end_time, "speech_segment_flushed")
+            self._end_stream(end_time, discarded=True)
         
-        self.reset()
+        self._end_utterance()
         return None
 
 
-class MockVAD(WebRTCVAD):
-    """Mock VAD for testing without webrtcvad dependency."""
+class EnergyVAD(WebRTCVAD):
+    """
+    RMS-energy Voice Activity Detection.
     
-    def __init__(self, config: Optional[VADConfig] = None):
-        """Initialize mock VAD."""
+    Speech is declared when frame RMS exceeds the larger of a per-mode
+    absolute threshold and ``noise_margin`` times an adaptive noise floor
+    (an exponential average of non-speech frames). Once in speech the
+    threshold drops by ``hysteresis`` so trailing syllables do not flap.
+    Frames are scored through a reused float32 scratch buffer, and
+    ``process_batch`` scores a whole buffer of frames with one NumPy call.
+    """
+    
+    # Absolute RMS thresholds per aggressiveness mode
+    THRESHOLDS = {
+        VADMode.NORMAL: 100.0,
+        VADMode.LOW: 200.0,
+        VADMode.MEDIUM: 300.0,
+        VADMode.HIGH: 500.0,
+    }
+    # Required ratio of frame energy to the noise floor per mode
+    NOISE_MARGINS = {
+        VADMode.NORMAL: 2.0,
+        VADMode.LOW: 2.5,
+        VADMode.MEDIUM: 3.0,
+        VADMode.HIGH: 4.0,
+    }
+    
+    def __init__(
+        self,
+        config: Optional[VADConfig] = None,
+        adaptive: bool = True,
+        noise_alpha: float = 0.05,
+        hysteresis: float = 0.7
+    ):
+        """
+        Initialize energy VAD.
+        
+        Args:
+            config: VAD configuration (uses defaults if None)
+            adaptive: Track the noise floor and raise the threshold above it
+            noise_alpha: Smoothing factor for the noise floor average
+            hysteresis: Threshold multiplier applied while in speech (1.0 disables)
+        """
         self.config = config or VADConfig()
+        self._vad = None
         self._state = VADState.UNKNOWN
-        self._frame_count = 0
+        self._state_lock = threading.Lock()
+        self._frame_samples = self.frame_samples
+        
+        self.adaptive = adaptive
+        self.noise_alpha = noise_alpha
+        self.hysteresis = hysteresis
+        self.threshold = self.THRESHOLDS.get(self.config.mode, 300.0)
+        self.noise_margin = self.NOISE_MARGINS.get(self.config.mode, 3.0)
+        self.noise_floor = 0.0
+        self.current_energy = 0.0
+        self.speech_probability = 0.0
+        self._in_speech = False
+        self._scratch = np.zeros(self._frame_samples, dtype=np.float32)
     
     def _init_webrtc(self):
-        """Skip WebRTC initialization."""
+        """No WebRTC backend."""
         pass
     
     @property
     def is_available(self) -> bool:
-        """Mock is always available."""
+        """Energy VAD needs no optional dependency."""
         return True
     
+    def reset(self):
+        """Forget the noise floor and speech state."""
+        self.noise_floor = 0.0
+        self.current_energy = 0.0
+        self.speech_probability = 0.0
+        self._in_speech = False
+        self._state = VADState.UNKNOWN
+    
+    def frame_energy(self, audio_frame: np.ndarray) -> float:
+        """RMS energy of one frame, computed in the reused scratch buffer."""
+        n = audio_frame.shape[0]
+        if n == 0:
+            return 0.0
+        if n != self._scratch.shape[0]:
+            self._scratch = np.zeros(n, dtype=np.float32)
+        scratch = self._scratch
+        np.copyto(scratch, audio_frame, casting='unsafe')
+        return float(np.sqrt(np.dot(scratch, scratch) / n))
+    
+    def batch_energy(self, frames: np.ndarray) -> np.ndarray:
+        """RMS energy of every row of a (frames, samples) array in one call."""
+        x = frames.astype(np.float32)
+        return np.sqrt(np.einsum('ij,ij->i', x, x) / frames.shape[1])
+    
+    def _decide(self, energy: float) -> bool:
+        """Apply threshold, hysteresis and noise-floor tracking to one frame."""
+        threshold = self.threshold
+        if self.adaptive:
+            threshold = max(threshold, self.noise_floor * self.noise_margin)
+        if self._in_speech:
+            threshold *= self.hysteresis
+        
+        # Soft score: 0.5 at the active threshold, saturating at twice it
+        self.speech_probability = min(1.0, 0.5 * energy / threshold) if threshold > 0 else 1.0
+        is_speech = energy > threshold
+        if self.adaptive and not is_speech:
+            self.noise_floor += self.noise_alpha * (energy - self.noise_floor)
+        self._in_speech = is_speech
+        return is_speech
+    
     def process_frame(self, audio_frame: np.ndarray) -> bool:
         """
-        Mock VAD: detect speech based on energy threshold.
+        Detect speech in one frame from its RMS energy.
         
-        Simple energy-based detection for testing.
+        Args:
+            audio_frame: Audio samples as numpy array
+            
+        Returns:
+            True if speech detected, False otherwise
         """
-        self._frame_count += 1
+        return self.process_energy(self.frame_energy(audio_frame))
+    
+    def process_energy(self, energy: float) -> bool:
+        """
+        Advance the detector with a frame energy computed elsewhere.
         
-        # Calculate RMS energy
-        if len(audio_frame) == 0:
-            energy = 0
-        else:
-            energy = np.sqrt(np.mean(audio_frame.astype(np.float32) ** 2))
+        Lets a caller that scores many streams at once (one
+        ``batch_energy`` call over frames stacked from several pipelines)
+        feed each stream's detector without recomputing the RMS.
         
-        # Threshold based on mode
-        thresholds = {
-            VADMode.NORMAL: 100,
-            VADMode.LOW: 200,
-            VADMode.MEDIUM: 300,
-            VADMode.HIGH: 500
-        }
-        threshold = thresholds.get(self.config.mode, 300)
+        Args:
+            energy: RMS energy of the frame in int16 units
+            
+        Returns:
+            True if speech detected, False otherwise
+        """
+        self.current_energy = energy
+        is_speech = self._decide(energy)
+        self._state = VADState.SPEECH if is_speech else VADState.SILENCE
+        return is_speech
+    
+    def process_batch(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Score a long buffer of samples.
         
-        is_speech = energy > threshold
+        Energies for all frames come from a single NumPy call. With
+        adaptation and hysteresis disabled the decision is vectorized too;
+        otherwise the (cheap, scalar) state recurrence runs per frame.
         
-        with threading.Lock():
-            self._state = VADState.SPEECH if is_speech else VADState.SILENCE
+        Args:
+            samples: Mono audio samples
+            
+        Returns:
+            Boolean array with one speech decision per frame
+        """
+        frame_len = self.frame_samples
+        count = samples.shape[0] // frame_len
+        if count == 0:
+            return np.zeros(0, dtype=bool)
         
-        return is_speech
+        energies = self.batch_energy(samples[:count * frame_len].reshape(count, frame_len))
+        if not self.adaptive and self.hysteresis == 1.0:
+            result = energies > self.threshold
+            self.speech_probability = min(1.0, 0.5 * float(energies[-1]) / self.threshold)
+        else:
+            decide = self._decide
+            result = np.fromiter(
+                (decide(e) for e in energies.tolist()), dtype=bool, count=count
+            )
+        
+        self.current_energy = float(energies[-1])
+        self._in_speech = bool(result[-1])
+        self._state = VADState.SPEECH if result[-1] else VADState.SILENCE
+        return result
+
+
+class MockVAD(EnergyVAD):
+    """
+    Mock VAD for testing without webrtcvad dependency.
+    
+    Fixed-threshold energy detection: no noise floor and no hysteresis,
+    so results depend only on the current frame.
+    """
+    
+    def __init__(self, config: Optional[VADConfig] = None):
+        """Initialize mock VAD."""
+        super().__init__(config, adaptive=False, hysteresis=1.0)
+        self._frame_count = 0
+    
+    def process_frame(self, audio_frame: np.ndarray) -> bool:
+        """
+        Mock VAD: detect speech based on energy threshold.
+        
+        Simple energy-based detection for testing.
+        """
+        self._frame_count += 1
+        return super().process_frame(audio_frame)
+
+
+def create_vad(config: Optional[VADConfig] = None) -> WebRTCVAD:
+    """
+    Create the VAD engine selected by ``config.backend``.
+    
+    AUTO uses WebRTC when webrtcvad is installed and the energy VAD
+    otherwise; an explicit WEBRTC request also falls back to energy when
+    the package is missing rather than reporting every frame as speech.
+    
+    Args:
+        config: VAD configuration (uses defaults if None)
+        
+    Returns:
+        VAD instance
+    """
+    config = config or VADConfig()
+    if config.backend == VADBackend.ENERGY:
+        return EnergyVAD(config)
+    if not WEBRTC_AVAILABLE:
+        if config.backend == VADBackend.WEBRTC:
+            logger.warning("webrtcvad_unavailable_using_energy_vad")
+        return EnergyVAD(config)
+    return WebRTCVAD(config)
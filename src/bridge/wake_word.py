@@ -0,0 +1,376 @@
+"""
+Wake-word gate.
+
+While the pipeline is IDLE, captured frames go to a WakeWordGate instead
+of the VAD and segmenter. The gate keeps the last ``pre_roll_ms`` of
+audio in a fixed ring and runs a detector over each frame; when the
+detector fires, the pipeline switches to LISTENING and receives the
+pre-roll audio with the detection.
+
+Detectors are pluggable (anything with ``process(frame)`` and ``reset()``,
+e.g. an adapter around a neural keyword spotter). Two lightweight local
+backends are included:
+
+- EnergyPatternDetector: fires on a short run of voiced bursts (one per
+  syllable of the phrase) bounded by silence.
+- TemplateDetector: matches the energy and zero-crossing contour of the
+  last frames against an enrolled recording of the phrase.
+"""
+import enum
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import structlog
+
+from bridge.vad import PreRollRing, open_pcm16_wav, read_pcm16_frames
+
+logger = structlog.get_logger()
+
+
+class WakeWordBackend(enum.Enum):
+    """Built-in wake-word detectors."""
+    ENERGY = "energy"        # Syllable-count energy pattern
+    TEMPLATE = "template"    # Contour match against an enrolled recording
+
+
+@dataclass
+class WakeWordDetection:
+    """A wake-word hit and the audio that led up to it."""
+    phrase: str
+    score: float
+    timestamp: float  # Monotonic capture time of the frame that fired
+    audio: np.ndarray  # Pre-roll audio ending at the firing frame
+
+
+class WakeWordDetector:
+    """
+    Base class for wake-word detectors.
+    
+    ``process`` is called once per VAD-sized frame and returns a score
+    when the phrase has just been heard, None otherwise.
+    """
+    
+    def process(self, frame: np.ndarray) -> Optional[float]:
+        """Score one frame; return the match score when the detector fires."""
+        raise NotImplementedError
+    
+    def reset(self):
+        """Forget partial matches."""
+
+
+class EnergyPatternDetector(WakeWordDetector):
+    """
+    Detects a phrase as N short voiced bursts bounded by silence.
+    
+    Frame RMS is compared to the larger of ``min_energy`` and
+    ``noise_margin`` times an adaptive noise floor. A burst is a run of
+    voiced frames between ``min_burst_ms`` and ``max_burst_ms``; bursts
+    separated by less than ``max_gap_ms`` form one pattern, which fires
+    once it is followed by ``max_gap_ms`` of silence with exactly
+    ``syllables`` bursts. Longer runs (ordinary speech) spoil the pattern
+    until the next pause.
+    """
+    
+    def __init__(
+        self,
+        syllables: int = 2,
+        frame_ms: int = 30,
+        min_burst_ms: int = 60,
+        max_burst_ms: int = 500,
+        max_gap_ms: int = 300,
+        min_energy: float = 300.0,
+        noise_margin: float = 3.0,
+        noise_alpha: float = 0.05
+    ):
+        """
+        Initialize detector.
+        
+        Args:
+            syllables: Voiced bursts in the phrase ("hey hal" = 2)
+            frame_ms: Frame duration
+            min_burst_ms: Shorter voiced runs are ignored as clicks
+            max_burst_ms: Longer voiced runs are not part of the phrase
+            max_gap_ms: Longest pause between syllables; also the
+                silence that ends the phrase
+            min_energy: Absolute RMS threshold (int16 units)
+            noise_margin: Required ratio of frame RMS to the noise floor
+            noise_alpha: Smoothing factor of the noise floor
+        """
+        self.syllables = syllables
+        self.min_burst = max(1, round(min_burst_ms / frame_ms))
+        self.max_burst = max(self.min_burst, round(max_burst_ms / frame_ms))
+        self.max_gap = max(1, round(max_gap_ms / frame_ms))
+        self.min_energy = min_energy
+        self.noise_margin = noise_margin
+        self.noise_alpha = noise_alpha
+        self.noise_floor = 0.0
+        self._scratch: Optional[np.ndarray] = None
+        self.reset()
+    
+    def reset(self):
+        """Forget the pattern in progress (the noise floor is kept)."""
+        self._burst = 0       # Voiced frames in the current burst
+        self._gap = 0         # Unvoiced frames since the last burst
+        self._count = 0       # Completed bursts in the pattern
+        self._spoiled = False
+    
+    def _energy(self, frame: np.ndarray) -> float:
+        n = frame.shape[0]
+        if n == 0:
+            return 0.0
+        if self._scratch is None or self._scratch.shape[0] != n:
+            self._scratch = np.zeros(n, dtype=np.float32)
+        np.copyto(self._scratch, frame, casting='unsafe')
+        return float(np.sqrt(np.dot(self._scratch, self._scratch) / n))
+    
+    def process(self, frame: np.ndarray) -> Optional[float]:
+        """Advance the burst pattern by one frame."""
+        energy = self._energy(frame)
+        voiced = energy > max(self.min_energy, self.noise_floor * self.noise_margin)
+        
+        if voiced:
+            self._burst += 1
+            if self._burst > self.max_burst:
+                self._spoiled = True
+            return None
+        
+        self.noise_floor += self.noise_alpha * (energy - self.noise_floor)
+        if self._burst:
+            if self._burst >= self.min_burst:
+                self._count += 1
+                self._gap = 0
+            self._burst = 0
+            return None
+        
+        self._gap += 1
+        if self._gap < self.max_gap or (self._count == 0 and not self._spoiled):
+            return None
+        
+        # Pause long enough to close the pattern
+        fired = self._count == self.syllables and not self._spoiled
+        self.reset()
+        return 1.0 if fired else None
+
+
+class TemplateDetector(WakeWordDetector):
+    """
+    Matches the recent frame contour against an enrolled phrase.
+    
+    Each frame is reduced to log RMS energy and zero-crossing rate. The
+    last ``len(template)`` values are kept in a doubled ring, so the
+    window is always one contiguous slice, and scored by the mean Pearson
+    correlation of both contours with the template.
+    """
+    
+    def __init__(
+        self,
+        template: np.ndarray,
+        threshold: float = 0.75,
+        min_energy: float = 300.0
+    ):
+        """
+        Initialize detector.
+        
+        Args:
+            template: (frames, 2) features from ``frame_features``
+            threshold: Correlation needed to fire (0-1)
+            min_energy: Window RMS below which nothing fires (int16 units)
+        """
+        if template.ndim != 2 or template.shape[0] < 2:
+            raise ValueError("Template needs at least two frames of features")
+        self.threshold = threshold
+        self.min_log_energy = float(np.log1p(min_energy))
+        self.length = template.shape[0]
+        centered = template - template.mean(axis=0)
+        norms = np.linalg.norm(centered, axis=0)
+        norms[norms == 0] = 1.0
+        self._template = (centered / norms).astype(np.float64)
+        self._history = np.zeros((2 * self.length, 2), dtype=np.float64)
+        self.reset()
+    
+    @staticmethod
+    def frame_features(frame: np.ndarray) -> np.ndarray:
+        """Log RMS energy and zero-crossing rate of one frame."""
+        n = frame.shape[0]
+        if n == 0:
+            return np.zeros(2)
+        x = frame.astype(np.float32)
+        energy = np.log1p(np.sqrt(np.dot(x, x) / n))
+        crossings = np.count_nonzero(np.signbit(x[1:]) != np.signbit(x[:-1])) / max(n - 1, 1)
+        return np.array([energy, crossings])
+    
+    @classmethod
+    def from_audio(
+        cls,
+        audio: np.ndarray,
+        frame_samples: int = 480,
+        **kwargs
+    ) -> "TemplateDetector":
+        """
+        Enroll a recording of the phrase.
+        
+        Args:
+            audio: Mono int16 recording, trimmed to the phrase
+            frame_samples: Samples per frame (must match the pipeline)
+            **kwargs: Detector options
+        """
+        count = audio.shape[0] // frame_samples
+        frames = audio[:count * frame_samples].reshape(count, frame_samples)
+        template = np.array([cls.frame_features(f) for f in frames])
+        return cls(template, **kwargs)
+    
+    @classmethod
+    def from_wav(cls, path, frame_ms: int = 30, **kwargs) -> "TemplateDetector":
+        """Enroll a 16-bit PCM WAV recording of the phrase."""
+        with open_pcm16_wav(path) as wav:
+            rate = wav.getframerate()
+            audio = read_pcm16_frames(wav, wav.getnframes(), mono=True)
+        return cls.from_audio(audio, int(rate * frame_ms / 1000), **kwargs)
+    
+    def reset(self):
+        """Clear the feature window."""
+        self._history[:] = 0.0
+        self._pos = 0
+        self._filled = 0
+        self._refractory = 0
+        self.last_score = 0.0
+    
+    def process(self, frame: np.ndarray) -> Optional[float]:
+        """Slide the window by one frame and score it."""
+        features = self.frame_features(frame)
+        length = self.length
+        self._history[self._pos] = features
+        self._history[self._pos + length] = features
+        self._pos = (self._pos + 1) % length
+        self._filled = min(self._filled + 1, length)
+        if self._refractory:
+            self._refractory -= 1
+            return None
+        if self._filled < length:
+            return None
+        
+        window = self._history[self._pos:self._pos + length]
+        if window[:, 0].max() < self.min_log_energy:
+            return None
+        centered = window - window.mean(axis=0)
+        norms = np.linalg.norm(centered, axis=0)
+        norms[norms == 0] = 1.0
+        score = float(np.mean(np.sum(centered / norms * self._template, axis=0)))
+        self.last_score = score
+        if score < self.threshold:
+            return None
+        # One detection per utterance of the phrase
+        self._refractory = length
+        return score
+
+
+def create_wake_word_detector(
+    backend: WakeWordBackend,
+    frame_ms: int = 30,
+    syllables: int = 2,
+    template_path: Optional[str] = None,
+    threshold: float = 0.75
+) -> WakeWordDetector:
+    """
+    Create a built-in detector.
+    
+    Raises:
+        ValueError: If the template backend has no template_path
+    """
+    if backend == WakeWordBackend.TEMPLATE:
+        if not template_path:
+            raise ValueError("The template wake-word backend needs template_path")
+        return TemplateDetector.from_wav(template_path, frame_ms=frame_ms, threshold=threshold)
+    return EnergyPatternDetector(syllables=syllables, frame_ms=frame_ms)
+
+
+class WakeWordGate:
+    """
+    Pre-roll ring plus detector, run on frames while the pipeline is idle.
+    
+    The ring is allocated once; ``process`` copies each frame into it
+    and only allocates when the detector fires (to hand out the pre-roll).
+    """
+    
+    def __init__(
+        self,
+        detector: WakeWordDetector,
+        sample_rate: int = 16000,
+        pre_roll_ms: int = 1500,
+        phrase: str = ""
+    ):
+        """
+        Initialize gate.
+        
+        Args:
+            detector: Wake-word detector
+            sample_rate: Frame sample rate
+            pre_roll_ms: Audio kept ahead of the detection
+            phrase: Wake phrase, for logs and detections
+        """
+        self.detector = detector
+        self.sample_rate = sample_rate
+        self.phrase = phrase
+        self._ring = PreRollRing(max(1, int(sample_rate * pre_roll_ms / 1000)))
+        self.detections = 0
+    
+    @classmethod
+    def from_config(cls, config, phrase: str = "", sample_rate: int = 16000,
+                    frame_ms: int = 30) -> "WakeWordGate":
+        """
+        Build a gate from a WakeWordConfig.
+        
+        Args:
+            config: WakeWordConfig section
+            phrase: Wake phrase (``BridgeConfig.wake_word``)
+            sample_rate: Frame sample rate
+            frame_ms: Frame duration
+        """
+        detector = create_wake_word_detector(
+            WakeWordBackend(config.backend),
+            frame_ms=frame_ms,
+            syllables=config.syllables,
+            template_path=config.template_path,
+            threshold=config.threshold
+        )
+        return cls(detector, sample_rate, config.pre_roll_ms, phrase)
+    
+    @property
+    def pre_roll_samples(self) -> int:
+        """Samples currently held in the ring."""
+        return self._ring.length
+    
+    def pre_roll(self) -> np.ndarray:
+        """Copy of the ring contents, oldest sample first."""
+        return np.concatenate(self._ring.parts())
+    
+    def process(self, frame: np.ndarray, timestamp: float) -> Optional[WakeWordDetection]:
+        """
+        Add a frame to the pre-roll and run the detector.
+        
+        Args:
+            frame: Mono int16 frame at the VAD rate
+            timestamp: Monotonic capture time of the frame
+        
+        Returns:
+            WakeWordDetection if the phrase was heard, None otherwise
+        """
+        self._ring.push(frame)
+        score = self.detector.process(frame)
+        if score is None:
+            return None
+        self.detections += 1
+        detection = WakeWordDetection(
+            phrase=self.phrase,
+            score=score,
+            timestamp=timestamp,
+            audio=self.pre_roll()
+        )
+        logger.info("wake_word_detected", phrase=self.phrase, score=round(score, 3))
+        return detection
+    
+    def reset(self):
+        """Clear the pre-roll and the detector's partial match."""
+        self._ring.clear()
+        self.detector.reset()
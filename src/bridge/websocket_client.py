@@ -7,16 +7,37 @@ Integrates with session persistence (Issue #20).
 """
 import asyncio
 import enum
-import json
 import time
 from dataclasses import dataclass, field
-from typing import Callable, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Any, Union
 
+import numpy as np
 import structlog
 import websockets
 from websockets.exceptions import ConnectionClosed, InvalidStatusCode
 
+from bridge import codec
+from bridge.audio_frame import (
+    MAX_PAYLOAD_BYTES,
+    AudioCodec,
+    AudioFrame,
+    AudioFrameError,
+    FrameFlags,
+)
+from bridge.codec import (
+    ControlMessage,
+    KeepaliveMessage,
+    VoiceInputMessage,
+    decode_message,
+)
 from bridge.config import get_config, OpenClawConfig
+from bridge.latency import LatencyTracer, TurnStage
+from bridge.metrics import get_metrics_registry
+from bridge.persistence_writer import PendingTurn, PersistenceWriter
+from bridge.send_queue import OutboundMessage, OutboundQueue, SendPriority
+
+if TYPE_CHECKING:
+    from bridge.vad import SpeechChunk
 
 logger = structlog.get_logger()
 
@@ -55,6 +76,7 @@ class MessageType(enum.Enum):
     SESSION_RESTORE = "session_restore"
     PING = "ping"
     PONG = "pong"
+    AUDIO = "audio"  # Binary frames only (see bridge.audio_frame)
 
 
 class ControlAction(enum.Enum):
@@ -64,6 +86,36 @@ class ControlAction(enum.Enum):
     UNMUTE = "unmute"
 
 
+# Outbound lane per message type (unlisted types go to the voice lane)
+MESSAGE_PRIORITIES = {
+    MessageType.CONTROL.value: SendPriority.CONTROL,
+    MessageType.SESSION_RESTORE.value: SendPriority.CONTROL,
+    MessageType.VOICE_INPUT.value: SendPriority.VOICE,
+    MessageType.AUDIO.value: SendPriority.VOICE,
+    MessageType.PING.value: SendPriority.BACKGROUND,
+    MessageType.PONG.value: SendPriority.BACKGROUND,
+}
+
+
+def default_coalesce_key(message: dict) -> Optional[str]:
+    """
+    Key under which a queued message is superseded by a newer one.
+    
+    Pings replace queued pings, a second interrupt replaces a queued one,
+    and mute/unmute replace each other. Everything else is sent as is.
+    """
+    msg_type = message.get("type")
+    if msg_type in (MessageType.PING.value, MessageType.PONG.value):
+        return msg_type
+    if msg_type == MessageType.CONTROL.value:
+        action = message.get("action")
+        if action in (ControlAction.MUTE.value, ControlAction.UNMUTE.value):
+            return "control:mute"
+        if action == ControlAction.INTERRUPT.value:
+            return "control:interrupt"
+    return None
+
+
 @dataclass
 class ConnectionStats:
     """Connection statistics."""
@@ -71,6 +123,8 @@ class ConnectionStats:
     successful_connections: int = 0
     messages_sent: int = 0
     messages_received: int = 0
+    audio_frames_sent: int = 0
+    audio_bytes_sent: int = 0
     reconnections: int = 0
     last_connect_time: Optional[float] = None
     last_disconnect_time: Optional[float] = None
@@ -110,6 +164,44 @@ class MessageValidator:
             return MessageValidator._validate_session_restore(message)
         elif msg_type in (MessageType.PING.value, MessageType.PONG.value):
             return True, None
+        elif msg_type == MessageType.AUDIO.value:
+            return False, "audio is sent as binary frames, not JSON"
+        
+        return True, None
+    
+    @staticmethod
+    def validate_binary(data: bytes) -> tuple[bool, Optional[str]]:
+        """
+        Validate a binary audio frame.
+        
+        Returns:
+            (is_valid, error_message)
+        """
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            return False, "Binary frame must be bytes"
+        try:
+            frame = AudioFrame.decode(data)
+        except AudioFrameError as e:
+            return False, str(e)
+        return MessageValidator._validate_audio_frame(frame)
+    
+    @staticmethod
+    def _validate_audio_frame(frame: AudioFrame) -> tuple[bool, Optional[str]]:
+        """Validate decoded audio frame fields."""
+        if not frame.session_id:
+            return False, "audio frame requires a session ID"
+        if not 8000 <= frame.sample_rate <= 192000:
+            return False, f"Unsupported sample rate {frame.sample_rate}"
+        if not 1 <= frame.channels <= 255:
+            return False, f"Unsupported channel count {frame.channels}"
+        if frame.timestamp < 0:
+            return False, "audio frame timestamp is negative"
+        if len(frame.payload) > MAX_PAYLOAD_BYTES:
+            return False, f"audio payload exceeds {MAX_PAYLOAD_BYTES} bytes"
+        if not frame.payload and not frame.flags & (FrameFlags.END | FrameFlags.DISCARD):
+            return False, "audio frame payload is empty"
+        if frame.codec == AudioCodec.PCM16 and len(frame.payload) % (2 * frame.channels):
+            return False, "PCM16 payload is not a whole number of samples"
         
         return True, None
     
@@ -166,6 +258,7 @@ class OpenClawWebSocketClient:
     - Automatic reconnection with exponential backoff
     - Connection state machine with detailed tracking
     - Bidirectional message handling with protocol validation
+    - Per-type handlers for received messages (register_handler)
     - Integration with config system
     - Connection statistics
     """
@@ -174,9 +267,12 @@ class OpenClawWebSocketClient:
         self,
         config: Optional[OpenClawConfig] = None,
         on_message: Optional[Callable[[dict], None]] = None,
+        on_audio: Optional[Callable[[AudioFrame], None]] = None,
         on_connect: Optional[Callable[[], None]] = None,
         on_disconnect: Optional[Callable[[], None]] = None,
         on_state_change: Optional[Callable[[ConnectionState, ConnectionState], None]] = None,
+        handlers: Optional[Dict[str, Callable[[dict], None]]] = None,
+        latency_tracer: Optional[LatencyTracer] = None,
     ):
         # Use provided config or load from system
         self.config = config or get_config().openclaw
@@ -198,9 +294,44 @@ class OpenClawWebSocketClient:
         self._connection_attempts = 0
         self.stats = ConnectionStats()
         
+        # Per-turn latency (text sent / first response byte); share the
+        # audio pipeline's tracer so both mark the same turn
+        self.latency_tracer = latency_tracer or LatencyTracer()
+        metrics = get_metrics_registry()
+        self._send_hist = metrics.histogram("ws_send_seconds", "Time to hand a message to the socket")
+        self._sent_counter = metrics.counter("ws_messages_sent_total", "Messages sent to OpenClaw")
+        self._received_counter = metrics.counter("ws_messages_received_total", "Messages received from OpenClaw")
+        self._connects_counter = metrics.counter("ws_connect_attempts_total", "Connection attempts")
+        self._connect_hist = metrics.histogram("ws_connect_seconds", "Time to establish a connection")
+        self._audio_frames_counter = metrics.counter("ws_audio_frames_sent_total", "Binary audio frames sent")
+        self._audio_bytes_counter = metrics.counter("ws_audio_bytes_sent_total", "Audio payload bytes sent")
+        
+        # Binary audio stream (sequence restarts on every connection)
+        self._audio_sequence = 0
+        
+        # Outbound queue, drained by the sender task while connected
+        self._send_queue = OutboundQueue()
+        self._queue_hists = {
+            priority: metrics.histogram(
+                "ws_send_queue_seconds",
+                "Time messages waited in the outbound queue",
+                labels={"lane": priority.name.lower()},
+            )
+            for priority in SendPriority
+        }
+        self._coalesced_counter = metrics.counter(
+            "ws_messages_coalesced_total", "Queued messages superseded by a newer one"
+        )
+        metrics.gauge(
+            "ws_send_queue_depth", "Messages waiting in the outbound queue",
+            owner=self, fn=lambda client: len(client._send_queue)
+        )
+        
         # Session persistence (Issue #20)
         config_obj = get_config()
         self.enable_persistence = config_obj.persistence.enabled
+        self._persistence: Optional[PersistenceWriter] = None  # Created on first turn
+        self.persistence_flush_timeout = 5.0
         
         # Session recovery (Issue #23)
         self.previous_session_uuid: Optional[str] = None
@@ -209,14 +340,17 @@ class OpenClawWebSocketClient:
         
         # Message handlers
         self.on_message = on_message
+        self.on_audio = on_audio
+        # Received message type -> handler (on_message handles the rest)
+        self._handlers: Dict[str, Callable[[dict], None]] = dict(handlers or {})
         self.on_connect = on_connect
         self.on_disconnect = on_disconnect
         self.on_state_change = on_state_change
         
         # Runtime
         self._receive_task: Optional[asyncio.Task] = None
-        self._shutdown_event = asyncio.Event()
         self._ping_task: Optional[asyncio.Task] = None
+        self._send_task: Optional[asyncio.Task] = None
         
         # Connection lock to prevent race conditions
         self._connection_lock = asyncio.Lock()
@@ -271,10 +405,10 @@ class OpenClawWebSocketClient:
     async def _do_connect(self) -> bool:
         """Internal connection logic (call with lock held)."""
         self._set_state(ConnectionState.CONNECTING)
-        self._shutdown_event.clear()
         
         while self._connection_attempts < self.max_retries:
             self.stats.connect_attempts += 1
+            self._connects_counter.inc()
             
             try:
                 logger.info(
@@ -284,6 +418,7 @@ class OpenClawWebSocketClient:
                     max_retries=self.max_retries,
                 )
                 
+                started = time.perf_counter()
                 self.websocket = await asyncio.wait_for(
                     websockets.connect(
                         self.url,
@@ -294,6 +429,7 @@ class OpenClawWebSocketClient:
                     timeout=self.config.timeout,
                 )
                 
+                self._connect_hist.observe(time.perf_counter() - started)
                 self._connection_attempts = 0
                 self.stats.successful_connections += 1
                 self.stats.last_connect_time = time.time()
@@ -304,8 +440,9 @@ class OpenClawWebSocketClient:
                     self.websocket.recv(),
                     timeout=5.0
                 )
-                welcome_data = json.loads(welcome)
+                welcome_data = codec.loads(welcome)
                 self.session_id = welcome_data.get("session_id")
+                self._audio_sequence = 0
                 
                 logger.info(
                     "Connected to OpenClaw",
@@ -321,6 +458,10 @@ class OpenClawWebSocketClient:
                     self._ping_loop(),
                     name="websocket_ping",
                 )
+                self._send_task = asyncio.create_task(
+                    self._send_loop(),
+                    name="websocket_send",
+                )
                 
                 if self.on_connect:
                     try:
@@ -440,7 +581,6 @@ class OpenClawWebSocketClient:
         Gracefully close the WebSocket connection.
         """
         logger.info("Disconnecting from OpenClaw")
-        self._shutdown_event.set()
         
         # Update stats
         if self.stats.last_connect_time:
@@ -448,8 +588,8 @@ class OpenClawWebSocketClient:
             self.stats.total_uptime += session_duration
         self.stats.last_disconnect_time = time.time()
         
-        # Cancel background tasks
-        tasks = [self._receive_task, self._ping_task]
+        # Cancel background tasks (their loops only end by cancellation)
+        tasks = [self._receive_task, self._ping_task, self._send_task]
         for task in tasks:
             if task and not task.done():
                 task.cancel()
@@ -460,6 +600,8 @@ class OpenClawWebSocketClient:
         
         self._receive_task = None
         self._ping_task = None
+        self._send_task = None
+        self._send_queue.clear(sent=False)
         
         # Close websocket
         if self.websocket:
@@ -480,6 +622,14 @@ class OpenClawWebSocketClient:
                 voice_session_id=self.previous_session_uuid,
             )
         
+        # Write queued turns before the session is closed
+        if self._persistence is not None:
+            if not await self._persistence.aclose(self.persistence_flush_timeout):
+                logger.warning(
+                    "Persistence flush timed out",
+                    pending=self._persistence.pending,
+                )
+        
         # Sprint 3 Phase 1: Close bridge session on disconnect (Issue #20)
         if self.enable_persistence and self.voice_session_id:
             try:
@@ -505,10 +655,37 @@ class OpenClawWebSocketClient:
         
         logger.info("Disconnected")
     
-    async def send(self, message: dict) -> bool:
+    @property
+    def _sender_running(self) -> bool:
+        return self._send_task is not None and not self._send_task.done()
+    
+    async def send(
+        self,
+        message: dict,
+        priority: Optional[SendPriority] = None,
+        coalesce_key: Optional[str] = None,
+        coalesce: bool = True,
+        wait: bool = True,
+    ) -> bool:
         """
         Send a message to OpenClaw with protocol validation.
-        Returns True if sent successfully, False otherwise.
+        
+        While the sender task runs (started on connect), the message is
+        queued in its priority lane and written in lane order, so control
+        messages overtake queued voice input and pings. Without a sender
+        task the message is written directly.
+        
+        Args:
+            message: Protocol message
+            priority: Outbound lane (by message type if None)
+            coalesce_key: Queued message with this key that the new one
+                supersedes (default_coalesce_key if None)
+            coalesce: Set False to always queue the message separately
+            wait: Wait until the message is written (False returns once
+                it is queued)
+        
+        Returns:
+            True if sent (or queued when wait=False), False otherwise
         """
         # Validate message
         is_valid, error = MessageValidator.validate_message(message)
@@ -520,9 +697,79 @@ class OpenClawWebSocketClient:
             logger.warning("Cannot send, not connected", state=self._state.value)
             return False
         
+        return await self._enqueue(
+            message, codec.dumps(message), priority, coalesce_key, coalesce, wait
+        )
+    
+    async def _enqueue(
+        self,
+        message: dict,
+        payload: Union[str, bytes],
+        priority: Optional[SendPriority],
+        coalesce_key: Optional[str],
+        coalesce: bool,
+        wait: bool,
+    ) -> bool:
+        """Queue a serialized message for the sender task (or write it directly)."""
+        if not self._sender_running:
+            return await self._deliver(message, payload)
+        
+        if priority is None:
+            priority = MESSAGE_PRIORITIES.get(message["type"], SendPriority.VOICE)
+        if not coalesce:
+            coalesce_key = None
+        elif coalesce_key is None:
+            coalesce_key = default_coalesce_key(message)
+        item = OutboundMessage(
+            message=message,
+            payload=payload,
+            priority=priority,
+            coalesce_key=coalesce_key,
+        )
+        waiter = asyncio.get_running_loop().create_future() if wait else None
+        if waiter is not None:
+            item.waiters.append(waiter)
+        
+        accepted, queued = self._send_queue.put(item)
+        if not accepted:
+            logger.warning("Outbound queue full, message dropped", type=message["type"])
+            return False
+        if queued is not item:
+            self._coalesced_counter.inc()
+            logger.debug("Message coalesced", type=message["type"], key=coalesce_key)
+        return await waiter if waiter is not None else True
+    
+    async def _send_loop(self) -> None:
+        """
+        Background task writing queued messages in priority order.
+        """
+        item: Optional[OutboundMessage] = None
+        try:
+            while True:
+                item = await self._send_queue.get()
+                self._queue_hists[item.priority].observe(time.monotonic() - item.enqueued_at)
+                sent = await self._deliver(item.message, item.payload)
+                item.resolve(sent)
+                item = None
+                if not self.is_connected:
+                    self._send_queue.clear(sent=False)
+        except asyncio.CancelledError:
+            logger.debug("Send loop cancelled")
+            raise
+        finally:
+            if item is not None:
+                item.resolve(False)
+    
+    async def _deliver(self, message: dict, payload: Union[str, bytes]) -> bool:
+        """Write one serialized message to the socket."""
+        if not self.websocket:
+            return False
         try:
-            await self.websocket.send(json.dumps(message))
+            started = time.perf_counter()
+            await self.websocket.send(payload)
+            self._send_hist.observe(time.perf_counter() - started)
             self.stats.messages_sent += 1
+            self._sent_counter.inc()
             logger.debug("Message sent", type=message.get("type"))
             return True
             
@@ -557,29 +804,110 @@ class OpenClawWebSocketClient:
             message["metadata"] = {"confidence": confidence}
         
         result = await self.send(message)
+        if result:
+            self.latency_tracer.mark(TurnStage.TEXT_SENT)
         
         # Sprint 3 Phase 1: Persist user message (Issue #20)
         if result and self.enable_persistence and self.voice_session_id:
             try:
-                hist_mgr = _get_history_manager()
-                session_mgr = _get_session_manager()
-                
-                session = session_mgr.get_session(self.voice_session_id)
-                if session and session.id:
-                    hist_mgr.add_turn(
-                        session_id=session.id,
-                        role="user",
-                        content=text,
-                        turn_index=self._turn_index,
-                        message_type="voice_input",
-                        speakability="speakable",
-                    )
-                    self._turn_index += 1
+                self._queue_turn("user", text, "voice_input", "speakable")
             except Exception as e:
                 logger.error("Failed to persist voice input", error=str(e))
         
         return result
     
+    async def send_audio(
+        self,
+        audio: Union[np.ndarray, bytes],
+        sample_rate: int = 16000,
+        channels: int = 1,
+        audio_codec: AudioCodec = AudioCodec.PCM16,
+        flags: FrameFlags = FrameFlags.NONE,
+        timestamp: Optional[float] = None,
+        wait: bool = True,
+    ) -> bool:
+        """
+        Stream one chunk of audio to OpenClaw as a binary frame.
+        
+        For endpoints without local STT: OpenClaw transcribes the audio
+        once a frame flagged END arrives. Frames share the voice lane with
+        voice_input and are numbered per connection.
+        
+        Args:
+            audio: int16 samples (PCM16) or an encoded payload (e.g. an Opus packet)
+            sample_rate: Sample rate in Hz
+            channels: Channel count (taken from the array shape for samples)
+            audio_codec: Payload encoding
+            flags: START/END/DISCARD utterance markers
+            timestamp: Capture time (now if None)
+            wait: Wait until the frame is written
+        
+        Returns:
+            True if sent (or queued when wait=False), False otherwise
+        """
+        try:
+            if isinstance(audio, np.ndarray):
+                frame = AudioFrame.from_pcm(
+                    audio, self.session_id or "", self._audio_sequence,
+                    sample_rate=sample_rate, timestamp=timestamp, flags=flags,
+                )
+            else:
+                frame = AudioFrame(
+                    session_id=self.session_id or "",
+                    sequence=self._audio_sequence,
+                    payload=bytes(audio),
+                    timestamp=time.time() if timestamp is None else timestamp,
+                    codec=audio_codec,
+                    sample_rate=sample_rate,
+                    channels=channels,
+                    flags=flags,
+                )
+            is_valid, error = MessageValidator._validate_audio_frame(frame)
+            payload = frame.encode() if is_valid else b""
+        except AudioFrameError as e:
+            is_valid, error = False, str(e)
+        if not is_valid:
+            logger.error("Invalid audio frame", error=error)
+            return False
+        
+        if not self.is_connected or not self.websocket:
+            logger.warning("Cannot send audio, not connected", state=self._state.value)
+            return False
+        
+        self._audio_sequence += 1
+        message = {"type": MessageType.AUDIO.value, "sequence": frame.sequence}
+        result = await self._enqueue(message, payload, None, None, False, wait)
+        if result:
+            self.stats.audio_frames_sent += 1
+            self.stats.audio_bytes_sent += len(frame.payload)
+            self._audio_frames_counter.inc()
+            self._audio_bytes_counter.inc(len(frame.payload))
+        return result
+    
+    async def send_speech_chunk(self, chunk: 'SpeechChunk', sample_rate: int = 16000) -> bool:
+        """
+        Stream a segmenter chunk, mapping its position to frame flags.
+        
+        Args:
+            chunk: SpeechChunk from SpeechSegmenter streaming
+            sample_rate: Sample rate of the chunk audio
+        """
+        from bridge.vad import SpeechChunkType
+        
+        flags = FrameFlags.NONE
+        kind = chunk.chunk_type.value
+        if kind == SpeechChunkType.START.value:
+            flags |= FrameFlags.START
+        elif kind == SpeechChunkType.END.value:
+            flags |= FrameFlags.END
+            if chunk.discarded:
+                flags |= FrameFlags.DISCARD
+        # Chunk timestamps are monotonic capture times; the header carries epoch time
+        timestamp = time.time() - time.monotonic() + chunk.timestamp
+        return await self.send_audio(
+            chunk.audio_data, sample_rate=sample_rate, flags=flags, timestamp=timestamp
+        )
+    
     async def send_interrupt(self, event: Optional['InterruptionEvent'] = None) -> bool:
         """
         Send interruption signal (user barge-in).
@@ -628,57 +956,122 @@ class OpenClawWebSocketClient:
     async def _receive_loop(self) -> None:
         """
         Background task to receive messages from OpenClaw.
+        
+        Iterates the socket directly, so an idle connection costs no
+        wakeups; the loop ends when the server closes the connection or
+        the task is cancelled by disconnect().
         """
+        websocket = self.websocket
         try:
-            while not self._shutdown_event.is_set():
-                try:
-                    message_raw = await asyncio.wait_for(
-                        self.websocket.recv(),
-                        timeout=1.0,
-                    )
-                    
-                    message = json.loads(message_raw)
-                    self.stats.messages_received += 1
-                    logger.debug("Message received", type=message.get("type"))
-                    
-                    # Sprint 3 Phase 1: Persist message to history (Issue #20)
-                    if self.enable_persistence and self.voice_session_id:
-                        try:
-                            self._persist_message(message)
-                        except Exception as e:
-                            logger.error("Failed to persist message", error=str(e))
-                    
-                    if self.on_message:
-                        try:
-                            self.on_message(message)
-                        except Exception as e:
-                            logger.error("Message callback failed", error=str(e))
-                
-                except asyncio.TimeoutError:
-                    continue
-                    
-                except ConnectionClosed as e:
-                    logger.warning(
-                        "Connection closed by server",
-                        code=e.code,
-                        reason=e.reason,
-                    )
-                    self._set_state(ConnectionState.DISCONNECTED)
-                    break
-                    
+            async for message_raw in websocket:
+                self._dispatch(message_raw)
+            self._on_server_close(
+                getattr(websocket, "close_code", None),
+                getattr(websocket, "close_reason", None),
+            )
         except asyncio.CancelledError:
             logger.debug("Receive loop cancelled")
             raise
+        except ConnectionClosed as e:
+            self._on_server_close(e.code, e.reason)
         except Exception as e:
             logger.error("Error in receive loop", error=str(e))
             self._set_state(ConnectionState.ERROR)
     
+    def _on_server_close(self, code: Optional[int], reason: Optional[str]) -> None:
+        logger.warning("Connection closed by server", code=code, reason=reason)
+        self._set_state(ConnectionState.DISCONNECTED)
+    
+    def _dispatch(self, message_raw: Union[str, bytes]) -> None:
+        """
+        Route one received frame to its handler.
+        
+        Binary frames go to on_audio; JSON messages are persisted and then
+        passed to the handler registered for their type, or to on_message
+        when none is.
+        """
+        self._trace_response(time.monotonic())
+        self.stats.messages_received += 1
+        self._received_counter.inc()
+        
+        if isinstance(message_raw, bytes):
+            self._handle_audio(message_raw)
+            return
+        
+        try:
+            message = codec.loads(message_raw)
+        except ValueError as e:
+            logger.warning("Invalid JSON received", error=str(e))
+            return
+        if not isinstance(message, dict):
+            logger.warning("Message is not a JSON object, ignored")
+            return
+        msg_type = message.get("type")
+        logger.debug("Message received", type=msg_type)
+        
+        # Sprint 3 Phase 1: Persist message to history (Issue #20)
+        if self.enable_persistence and self.voice_session_id:
+            try:
+                self._persist_message(message)
+            except Exception as e:
+                logger.error("Failed to persist message", error=str(e))
+        
+        handler = self._handlers.get(msg_type, self.on_message)
+        if handler:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error("Message callback failed", type=msg_type, error=str(e))
+    
+    def register_handler(
+        self,
+        msg_type: Union[str, MessageType],
+        handler: Callable[[dict], None]
+    ) -> None:
+        """
+        Handle received messages of one type with ``handler``.
+        
+        Messages of that type no longer reach on_message. Handlers run on
+        the receive loop and must not block.
+        
+        Args:
+            msg_type: Protocol message type (e.g. "response")
+            handler: Called with the decoded message dict
+        """
+        if isinstance(msg_type, MessageType):
+            msg_type = msg_type.value
+        self._handlers[msg_type] = handler
+    
+    def unregister_handler(self, msg_type: Union[str, MessageType]) -> None:
+        """Send messages of ``msg_type`` back to on_message."""
+        if isinstance(msg_type, MessageType):
+            msg_type = msg_type.value
+        self._handlers.pop(msg_type, None)
+    
+    def _handle_audio(self, data: bytes) -> None:
+        """Pass a binary audio frame from OpenClaw to on_audio."""
+        is_valid, error = MessageValidator.validate_binary(data)
+        if not is_valid:
+            logger.warning("Invalid audio frame received", error=error, size=len(data))
+            return
+        if self.on_audio:
+            try:
+                self.on_audio(AudioFrame.decode(data))
+            except Exception as e:
+                logger.error("Audio callback failed", error=str(e))
+    
+    def _trace_response(self, received_at: float) -> None:
+        """Mark the first message received after the current turn's text was sent."""
+        trace = self.latency_tracer.current
+        if trace is not None and TurnStage.TEXT_SENT in trace.marks:
+            trace.mark(TurnStage.FIRST_RESPONSE_BYTE, received_at)
+    
     async def _ping_loop(self) -> None:
         """
         Send periodic pings to keep connection alive.
         """
         try:
-            while not self._shutdown_event.is_set():
+            while True:
                 await asyncio.sleep(30)
                 if self.is_connected:
                     ping_msg = {
@@ -686,7 +1079,7 @@ class OpenClawWebSocketClient:
                         "timestamp": time.time(),
                     }
                     try:
-                        await self.send(ping_msg)
+                        await self.send(ping_msg, wait=False)
                     except Exception as e:
                         logger.debug("Ping failed", error=str(e))
         except asyncio.CancelledError:
@@ -713,11 +1106,47 @@ class OpenClawWebSocketClient:
             logger.info("Requested session restoration", session_id=sid)
         return success
     
+    def _persistence_writer(self) -> PersistenceWriter:
+        """Get the background history writer, creating it on first use."""
+        if self._persistence is None:
+            self._persistence = PersistenceWriter(
+                history_manager=_get_history_manager(),
+                session_manager=_get_session_manager(),
+            )
+        return self._persistence
+    
+    def _queue_turn(
+        self,
+        role: str,
+        content: str,
+        message_type: Optional[str] = None,
+        speakability: Optional[str] = None,
+    ) -> bool:
+        """
+        Hand a turn to the background writer and advance the turn index.
+        
+        Returns:
+            True if queued, False if the writer's queue was full
+        """
+        queued = self._persistence_writer().submit(PendingTurn(
+            session_uuid=self.voice_session_id,
+            role=role,
+            content=content,
+            turn_index=self._turn_index,
+            message_type=message_type,
+            speakability=speakability,
+        ))
+        self._turn_index += 1
+        return queued
+    
     def _persist_message(self, message: dict) -> None:
         """
         Persist received message to conversation history.
         Sprint 3 Phase 1: Message persistence integration (Issue #20).
         
+        The turn is queued for the background writer, so no database
+        work happens on the receive loop.
+        
         Args:
             message: Message dict from OpenClaw
         """
@@ -725,59 +1154,16 @@ class OpenClawWebSocketClient:
             return
         
         try:
-            hist_mgr = _get_history_manager()
-            session_mgr = _get_session_manager()
-            
-            # Get session DB ID
-            session = session_mgr.get_session(self.voice_session_id)
-            if not session or not session.id:
-                return
-            
-            # Determine role based on message type
-            msg_type = message.get("type", "")
-            role = "assistant"  # Default
-            
-            if msg_type == "voice_input":
-                role = "user"
-            elif msg_type in ("ping", "pong", "control"):
+            typed = decode_message(message)
+            if isinstance(typed, (KeepaliveMessage, ControlMessage)):
                 # Skip internal messages
                 return
             
-            # Get content (handle various message structures)
-            content = message.get("text", "")
-            if not content and "content" in message:
-                content = message["content"]
-            if not content:
-                content = json.dumps(message)  # Fallback to JSON
-            
-            # Extract metadata for persistence
-            metadata = {}
-            if "metadata" in message:
-                metadata = message["metadata"]
-            
-            # Determine message type from middleware if available
-            message_type = msg_type
-            speakability = None
-            
-            if "_type" in message:
-                message_type = message["_type"]
-            if "_speakability" in message:
-                speakability = message["_speakability"]
-            elif "speakable" in metadata:
-                speakability = "speakable" if metadata["speakable"] else "silent"
-            
-            # Add turn to history
-            hist_mgr.add_turn(
-                session_id=session.id,
-                role=role,
-                content=content,
-                turn_index=self._turn_index,
-                message_type=message_type,
-                speakability=speakability,
-            )
+            role = "user" if isinstance(typed, VoiceInputMessage) else "assistant"
+            # Fall back to the whole message as JSON
+            content = typed.content or codec.dumps(typed.raw)
             
-            # Increment turn counter
-            self._turn_index += 1
+            self._queue_turn(role, content, typed.message_type, typed.speakability)
             
         except Exception as e:
             logger.error("Failed to persist message", error=str(e), exc_info=True)
@@ -833,8 +1219,12 @@ class OpenClawWebSocketClient:
             "successful_connections": self.stats.successful_connections,
             "messages_sent": self.stats.messages_sent,
             "messages_received": self.stats.messages_received,
+            "audio_frames_sent": self.stats.audio_frames_sent,
+            "audio_bytes_sent": self.stats.audio_bytes_sent,
             "reconnections": self.stats.reconnections,
             "last_connect_time": self.stats.last_connect_time,
             "last_disconnect_time": self.stats.last_disconnect_time,
             "total_uptime": self.stats.total_uptime,
+            "send_queue": self._send_queue.stats(),
+            "persistence": self._persistence.stats() if self._persistence else None,
         }
@@ -29,6 +29,7 @@ from bridge.config import OpenClawConfig
 from bridge.session_manager import get_session_manager, SessionState
 from bridge.context_window import ContextWindow
 from bridge.response_filter import ResponseFilter, FilterDecision
+from bridge.vad import MockVAD, SpeechSegmenter, VADConfig, VADMode
 
 
 # Performance thresholds
@@ -253,6 +254,98 @@ class TestMemoryBenchmarks:
         assert growth_kb < 500
 
 
+class TestSegmenterBenchmarks:
+    """Speech segment assembly benchmarks."""
+    
+    @pytest.mark.slow
+    @pytest.mark.integration
+    @pytest.mark.performance
+    @pytest.mark.parametrize("utterance_sec", [1, 10, 60])
+    def test_segment_handoff(self, utterance_sec):
+        """Benchmark: End-of-utterance hand-off does not scale with utterance length."""
+        import tracemalloc
+        
+        config = VADConfig(mode=VADMode.NORMAL, max_speech_duration_ms=120000)
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        speech = np.full(480, 2000, dtype=np.int16)
+        silence = np.zeros(480, dtype=np.int16)
+        frame_sec = config.frame_duration_ms / 1000
+        speech_frames = int(utterance_sec / frame_sec)
+        
+        tracemalloc.start()
+        t = 0.0
+        frame_times = []
+        for _ in range(speech_frames):
+            start = time.perf_counter()
+            segmenter.process_frame(speech, timestamp=t)
+            frame_times.append((time.perf_counter() - start) * 1000)
+            t += frame_sec
+        
+        segment = None
+        while segment is None:
+            start = time.perf_counter()
+            segment = segmenter.process_frame(silence, timestamp=t)
+            handoff_ms = (time.perf_counter() - start) * 1000
+            t += frame_sec
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        audio_mb = segment.audio_data.nbytes / (1024 * 1024)
+        print(
+            f"\nSegment {utterance_sec}s: hand-off {handoff_ms:.3f}ms, "
+            f"max frame {max(frame_times):.3f}ms, "
+            f"audio {audio_mb:.2f}MB, peak {peak / (1024 * 1024):.2f}MB"
+        )
+        assert len(segment.audio_data) >= speech_frames * 480
+        assert handoff_ms < 5
+
+
+class TestReplayBenchmarks:
+    """Audio hot path driven by the replay harness (no sound hardware)."""
+    
+    @pytest.mark.slow
+    @pytest.mark.integration
+    @pytest.mark.performance
+    @pytest.mark.parametrize("rate,channels", [(16000, 1), (48000, 4)])
+    def test_replay_hot_path(self, rate, channels):
+        """Benchmark: 30 s of synthetic speech replayed faster than real time."""
+        from bridge.bench_cli import run_replay_bench
+        from bridge.replay import ReplaySource, synthetic_speech
+        from bridge.vad import VADBackend
+        
+        mono = synthetic_speech(30.0, rate)
+        source = ReplaySource(np.repeat(mono[:, None], channels, axis=1), rate)
+        
+        report = run_replay_bench(source, VADBackend.ENERGY)
+        
+        print(
+            f"\nReplay {rate} Hz x{channels}: {report['realtime_factor']:.0f}x realtime, "
+            f"callback p99 {report['callback_ms']['p99']:.3f}ms, "
+            f"analysis p99 {report['analysis_ms']['p99']:.3f}ms"
+        )
+        assert report['frames_dropped'] == 0
+        assert report['segments'] == 15
+        assert report['realtime_factor'] > 5
+        assert report['callback_ms']['p99'] < 5
+    
+    @pytest.mark.integration
+    def test_bench_json_output_parses(self):
+        """The --json report is the only thing written to stdout."""
+        import os
+        import subprocess
+        
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run(
+            [sys.executable, "-m", "bridge.bench_cli", "run",
+             "--seconds", "2", "--vad", "energy", "--json"],
+            capture_output=True, text=True, env=env, timeout=60, check=True
+        )
+        
+        report = json.loads(result.stdout)
+        assert report['source'] == "synthetic"
+        assert report['segments'] >= 1
+
+
 class TestConcurrentLoad:
     """Concurrent session load tests."""
     
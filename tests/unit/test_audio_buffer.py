@@ -7,7 +7,7 @@ import time
 import numpy as np
 import pytest
 
-from bridge.audio_buffer import AudioBuffer
+from bridge.audio_buffer import AudioBuffer, PlaybackQueue
 
 
 class TestAudioBuffer:
@@ -219,3 +219,202 @@ class TestAudioBuffer:
         assert stats['underflow_count'] == 1
         assert stats['total_written'] == 2  # Only 2 successful writes
         assert stats['total_read'] == 2
+    
+    @pytest.mark.parametrize("lock_free", [False, True])
+    def test_timestamps_follow_frames(self, lock_free):
+        """Test each read exposes the capture timestamp of its frame."""
+        buffer = AudioBuffer(max_frames=4, frame_size=10, lock_free=lock_free)
+        assert buffer.last_timestamp is None
+        
+        buffer.write(np.zeros(10, dtype=np.int16), timestamp=1.5)
+        buffer.write(np.zeros(10, dtype=np.int16), timestamp=1.53)
+        
+        buffer.read(block=False)
+        assert buffer.last_timestamp == 1.5
+        buffer.read(block=False)
+        assert buffer.last_timestamp == 1.53
+        
+        before = time.monotonic()
+        buffer.write(np.zeros(10, dtype=np.int16))
+        buffer.read(block=False)
+        assert buffer.last_timestamp >= before
+
+
+class TestAudioBufferLockFree:
+    """Test cases for the lock-free SPSC ring mode."""
+    
+    def test_init_preallocates_ring(self):
+        """Test ring storage is allocated once up front."""
+        buffer = AudioBuffer(max_frames=4, frame_size=10, lock_free=True)
+        
+        assert buffer.lock_free
+        assert buffer._ring.shape == (4, 10)
+        assert buffer._ring.dtype == np.int16
+        assert buffer.is_empty
+        assert buffer.frame_count == 0
+    
+    def test_read_survives_wraparound(self):
+        """Test frames read without out= are not overwritten by later writes."""
+        buffer = AudioBuffer(max_frames=4, frame_size=10, lock_free=True)
+        
+        frame = np.arange(10, dtype=np.int16)
+        assert buffer.write(frame) is True
+        
+        read_frame = buffer.read(block=False)
+        for i in range(4):
+            buffer.write(np.full(10, i, dtype=np.int16))
+        
+        assert np.array_equal(read_frame, frame)
+        assert not np.shares_memory(read_frame, buffer._ring)
+    
+    def test_read_into_out(self):
+        """Test reading into a caller-supplied array."""
+        buffer = AudioBuffer(max_frames=4, frame_size=10, lock_free=True)
+        out = np.zeros(10, dtype=np.int16)
+        
+        buffer.write(np.full(10, 7, dtype=np.int16))
+        result = buffer.read(block=False, out=out)
+        
+        assert result is out
+        assert np.all(out == 7)
+    
+    def test_wraparound_order(self):
+        """Test FIFO order is preserved across ring wraparound."""
+        buffer = AudioBuffer(max_frames=3, frame_size=4, lock_free=True)
+        
+        for i in range(10):
+            assert buffer.write(np.full(4, i, dtype=np.int16), block=False)
+            assert buffer.read(block=False)[0] == i
+        
+        assert buffer.stats['total_written'] == 10
+        assert buffer.stats['total_read'] == 10
+    
+    def test_overflow_and_underflow(self):
+        """Test stats match the locked mode on overflow/underflow."""
+        buffer = AudioBuffer(max_frames=2, frame_size=10, lock_free=True)
+        frame = np.ones(10, dtype=np.int16)
+        
+        assert buffer.write(frame, block=False)
+        assert buffer.write(frame, block=False)
+        assert buffer.write(frame, block=False) is False
+        assert buffer.is_full
+        
+        buffer.read(block=False)
+        buffer.read(block=False)
+        assert buffer.read(block=False) is None
+        
+        stats = buffer.stats
+        assert stats['overflow_count'] == 1
+        assert stats['underflow_count'] == 1
+        assert stats['total_written'] == 2
+        assert stats['total_read'] == 2
+        assert stats['current_frames'] == 0
+    
+    def test_frame_size_mismatch(self):
+        """Test short frames are zero-padded and long frames truncated in place."""
+        buffer = AudioBuffer(max_frames=2, frame_size=10, lock_free=True)
+        
+        buffer.write(np.full(15, 3, dtype=np.int16))
+        assert np.all(buffer.read(block=False) == 3)
+        
+        buffer.write(np.full(5, 9, dtype=np.int16))
+        frame = buffer.read(block=False)
+        assert np.all(frame[:5] == 9)
+        assert np.all(frame[5:] == 0)
+    
+    def test_clear_and_peek(self):
+        """Test clear discards published frames and peek copies."""
+        buffer = AudioBuffer(max_frames=5, frame_size=10, lock_free=True)
+        for i in range(3):
+            buffer.write(np.full(10, i, dtype=np.int16))
+        
+        peeked = buffer.peek()
+        assert peeked[0] == 0
+        assert not np.shares_memory(peeked, buffer._ring)
+        
+        assert buffer.clear() == 3
+        assert buffer.is_empty
+        assert buffer.peek() is None
+    
+    def test_blocking_producer_consumer(self):
+        """Test blocking reads and writes across threads."""
+        buffer = AudioBuffer(max_frames=4, frame_size=10, lock_free=True)
+        received = []
+        
+        def reader():
+            out = np.zeros(10, dtype=np.int16)
+            for _ in range(100):
+                frame = buffer.read(block=True, timeout=2.0, out=out)
+                if frame is None:
+                    break
+                received.append(int(frame[0]))
+        
+        reader_thread = threading.Thread(target=reader)
+        reader_thread.start()
+        for i in range(100):
+            assert buffer.write(np.full(10, i, dtype=np.int16), block=True, timeout=2.0)
+        reader_thread.join(timeout=5.0)
+        
+        assert received == list(range(100))
+    
+    def test_blocking_read_timeout(self):
+        """Test blocking read on empty ring times out."""
+        buffer = AudioBuffer(max_frames=2, frame_size=10, lock_free=True)
+        
+        start = time.monotonic()
+        assert buffer.read(block=True, timeout=0.05) is None
+        assert time.monotonic() - start >= 0.04
+        assert buffer.stats['underflow_count'] == 1
+
+
+class TestPlaybackQueue:
+    """Test cases for the sample-granular playback queue."""
+    
+    def test_wraparound_preserves_order(self):
+        """Test writes and reads crossing the end of the array."""
+        queue = PlaybackQueue(capacity=10)
+        out = np.zeros(4, dtype=np.int16)
+        
+        assert queue.write(np.arange(8, dtype=np.int16)) == 8
+        assert queue.read_into(out) == 4
+        assert queue.write(np.arange(8, 14, dtype=np.int16)) == 6
+        
+        drained = np.zeros(12, dtype=np.int16)
+        assert queue.read_into(drained) == 10
+        assert list(drained[:10]) == list(range(4, 14))
+        assert queue.is_empty
+    
+    def test_non_blocking_write_partial(self):
+        """Test non-blocking writes queue only what fits."""
+        queue = PlaybackQueue(capacity=5)
+        
+        assert queue.write(np.ones(8, dtype=np.int16), block=False) == 5
+        assert queue.free == 0
+        assert queue.write(np.ones(1, dtype=np.int16), block=True, timeout=0.02) == 0
+    
+    def test_read_into_strided_view(self):
+        """Test reading into a column of a 2-D device buffer."""
+        queue = PlaybackQueue(capacity=8)
+        outdata = np.zeros((4, 2), dtype=np.int16)
+        queue.write(np.array([1, 2, 3], dtype=np.int16))
+        
+        assert queue.read_into(outdata[:, 0]) == 3
+        assert list(outdata[:, 0]) == [1, 2, 3, 0]
+        assert np.all(outdata[:, 1] == 0)
+    
+    def test_clear_releases_blocked_writer(self):
+        """Test clear() wakes a writer waiting for space."""
+        queue = PlaybackQueue(capacity=4)
+        queue.write(np.ones(4, dtype=np.int16))
+        result = []
+        
+        writer = threading.Thread(
+            target=lambda: result.append(queue.write(np.ones(4, dtype=np.int16)))
+        )
+        writer.start()
+        time.sleep(0.02)
+        assert queue.clear() == 4
+        writer.join(timeout=1.0)
+        
+        assert result == [0]
+        assert queue.stats['total_written'] == 4
@@ -0,0 +1,170 @@
+"""
+Unit tests for audio_frame module.
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from bridge.audio_frame import (
+    HEADER_SIZE,
+    AudioCodec,
+    AudioFrame,
+    AudioFrameError,
+    FrameFlags,
+)
+from bridge.config import OpenClawConfig
+from bridge.stub_server import StubOpenClawServer
+from bridge.vad import SpeechChunk, SpeechChunkType
+from bridge.websocket_client import MessageValidator, OpenClawWebSocketClient
+
+
+def tone(n=320, channels=1):
+    samples = (np.sin(np.arange(n) / 5) * 8000).astype(np.int16)
+    return samples if channels == 1 else np.repeat(samples[:, None], channels, axis=1)
+
+
+class TestAudioFrame:
+    """Test the binary frame format."""
+    
+    def test_round_trip(self):
+        """Test header fields and PCM samples survive encoding."""
+        samples = tone(channels=2)
+        frame = AudioFrame.from_pcm(
+            samples, "session-1", 41, sample_rate=48000, timestamp=1760700000.25,
+            flags=FrameFlags.START
+        )
+        data = frame.encode()
+        decoded = AudioFrame.decode(data)
+        
+        assert len(data) == HEADER_SIZE + len("session-1") + samples.nbytes
+        assert (decoded.session_id, decoded.sequence) == ("session-1", 41)
+        assert (decoded.sample_rate, decoded.channels) == (48000, 2)
+        assert decoded.timestamp == pytest.approx(1760700000.25)
+        assert decoded.flags == FrameFlags.START
+        np.testing.assert_array_equal(decoded.samples(), samples)
+    
+    def test_malformed_frames_rejected(self):
+        """Test decode refuses foreign, truncated and unknown-codec data."""
+        data = AudioFrame.from_pcm(tone(), "s", 0).encode()
+        unknown_codec = data[:3] + b"\x09" + data[4:]
+        
+        for bad in (b"VB", b"XX" + data[2:], data[:HEADER_SIZE], unknown_codec):
+            with pytest.raises(AudioFrameError):
+                AudioFrame.decode(bad)
+        with pytest.raises(AudioFrameError):
+            AudioFrame.from_pcm(np.zeros(10, dtype=np.float32), "s", 0)
+    
+    def test_out_of_range_header_fields(self):
+        """Test fields that do not fit the header raise AudioFrameError, not struct.error."""
+        for frame in (
+            AudioFrame("s", 0, b"\x00\x00", channels=256),
+            AudioFrame("s", 0, b"\x00\x00", timestamp=-1.0),
+            AudioFrame("s", 0, b"\x00\x00", sample_rate=2 ** 32),
+        ):
+            with pytest.raises(AudioFrameError):
+                frame.encode()
+            assert not MessageValidator._validate_audio_frame(frame)[0]
+    
+    def test_validate_binary(self):
+        """Test the validator's binary path checks the decoded fields."""
+        good = AudioFrame.from_pcm(tone(), "s", 0).encode()
+        odd = AudioFrame("s", 1, b"\x00\x01\x02").encode()
+        empty = AudioFrame("s", 2, b"").encode()
+        end = AudioFrame("s", 3, b"", flags=FrameFlags.END).encode()
+        opus = AudioFrame("s", 4, b"\xfc\x01\x02", codec=AudioCodec.OPUS).encode()
+        
+        assert MessageValidator.validate_binary(good) == (True, None)
+        assert MessageValidator.validate_binary(end) == (True, None)
+        assert MessageValidator.validate_binary(opus) == (True, None)
+        assert not MessageValidator.validate_binary(odd)[0]
+        assert not MessageValidator.validate_binary(empty)[0]
+        assert not MessageValidator.validate_binary(b"not audio")[0]
+        assert not MessageValidator.validate_message({"type": "audio"})[0]
+
+
+@pytest.fixture
+def no_persistence():
+    config = MagicMock()
+    config.persistence.enabled = False
+    with patch("bridge.websocket_client.get_config", return_value=config):
+        yield
+
+
+class TestAudioStreaming:
+    """Test streaming audio to the stand-in server."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_utterance_and_transcript(self, no_persistence):
+        """Test chunks arrive in order as binary frames and get a transcript."""
+        received = []
+        async with StubOpenClawServer() as server:
+            client = OpenClawWebSocketClient(config=server.config(), on_message=received.append)
+            assert await client.connect()
+            try:
+                audio = tone(960)
+                captured = time.monotonic()
+                chunks = [
+                    SpeechChunk(SpeechChunkType.START, 0, 0, audio[:320], captured),
+                    SpeechChunk(SpeechChunkType.CONTINUE, 0, 320, audio[320:640], captured + 0.02),
+                    SpeechChunk(SpeechChunkType.END, 0, 640, audio[640:], captured + 0.04),
+                ]
+                for chunk in chunks:
+                    assert await client.send_speech_chunk(chunk)
+                assert await client.send_voice_input("typed too")
+                
+                for _ in range(100):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await client.disconnect()
+        
+        assert [f.sequence for f in server.audio_frames] == [0, 1, 2]
+        assert [f.flags for f in server.audio_frames] == [
+            FrameFlags.START, FrameFlags.NONE, FrameFlags.END
+        ]
+        assert server.audio_frames[0].session_id == "stub-session"
+        # Monotonic chunk times go out as epoch times
+        assert server.audio_frames[0].timestamp == pytest.approx(time.time(), abs=5.0)
+        assert server.audio_frames[2].timestamp - server.audio_frames[0].timestamp == \
+            pytest.approx(0.04, abs=1e-3)
+        np.testing.assert_array_equal(server.utterances[0], audio)
+        assert server.messages[0]["text"] == "typed too"
+        assert (server.lost_frames, server.errors) == (0, [])
+        assert received[0]["type"] == "transcript"
+        assert received[0]["metadata"]["samples"] == 960
+        assert client.get_stats()["audio_bytes_sent"] == audio.nbytes
+    
+    @pytest.mark.asyncio
+    async def test_send_audio_rejects_unencodable_frame(self, no_persistence):
+        """Test send_audio reports header overflow as an invalid frame."""
+        client = OpenClawWebSocketClient(config=OpenClawConfig())
+        
+        assert not await client.send_audio(b"\x00" * 600, channels=300)
+        assert not await client.send_audio(tone(), timestamp=-5.0)
+    
+    @pytest.mark.asyncio
+    async def test_discarded_utterance_and_audio_from_server(self, no_persistence):
+        """Test DISCARD drops the utterance and server audio reaches on_audio."""
+        frames = []
+        async with StubOpenClawServer() as server:
+            client = OpenClawWebSocketClient(config=server.config(), on_audio=frames.append)
+            assert await client.connect()
+            try:
+                assert await client.send_audio(tone(), flags=FrameFlags.START)
+                assert await client.send_audio(b"", flags=FrameFlags.END | FrameFlags.DISCARD)
+                assert await server.wait_for(lambda: len(server.audio_frames) == 2)
+                
+                await server.send_audio(AudioFrame.from_pcm(tone(160), "stub-session", 0))
+                for _ in range(100):
+                    if frames:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await client.disconnect()
+        
+        assert server.utterances == []
+        assert frames[0].samples().shape == (160,)
@@ -1,6 +1,7 @@
 """
 Unit tests for audio_pipeline module.
 """
+import asyncio
 import threading
 import time
 from unittest.mock import Mock, patch, MagicMock
@@ -15,8 +16,10 @@ from bridge.audio_pipeline import (
     AudioDeviceType,
     PipelineState,
     PipelineStats,
+    VoiceActivityMonitor,
 )
 from bridge.vad import VADConfig, VADMode, SpeechSegment
+from bridge.latency import LatencyTracer, TurnStage
 from bridge.config import AudioConfig
 
 
@@ -236,3 +239,522 @@ class TestAudioPipeline:
         
         assert callback_called
         assert received_segment == segment
+
+
+class TestCaptureCallback:
+    """Test the zero-allocation input callback path."""
+    
+    def test_int16_mono_passes_view(self):
+        """Test int16 mono blocks reach the buffer without dtype conversion."""
+        pipeline = AudioPipeline()
+        indata = np.arange(480, dtype=np.int16).reshape(480, 1)
+        
+        frame = pipeline._capture_to_mono(indata, 480)
+        
+        assert np.shares_memory(frame, indata)
+        assert frame.dtype == np.int16
+        assert pipeline.stats.callback_allocations == 0
+    
+    def test_multichannel_downmix_into_scratch(self):
+        """Test stereo int16 is averaged into the preallocated scratch frame."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_capture_scratch(480, 2)
+        indata = np.empty((480, 2), dtype=np.int16)
+        indata[:, 0] = 1000
+        indata[:, 1] = 3000
+        
+        frame = pipeline._capture_to_mono(indata, 480)
+        
+        assert frame is pipeline._capture_frame
+        assert np.all(frame == 2000)
+        assert pipeline.stats.callback_allocations == 0
+    
+    def test_pick_downmix_from_config(self):
+        """Test the configured channel of an array mic is passed through."""
+        pipeline = AudioPipeline(audio_config=AudioConfig(channels=4, downmix="pick", capture_channel=2))
+        pipeline._prepare_capture_scratch(480, 4)
+        indata = np.zeros((480, 4), dtype=np.int16)
+        indata[:, 2] = 1234
+        
+        frame = pipeline._capture_to_mono(indata, 480)
+        
+        assert np.all(frame == 1234)
+        assert pipeline.stats.callback_allocations == 0
+    
+    def test_capture_channels_capped_by_device(self):
+        """Test the configured channel count is limited to the device's."""
+        pipeline = AudioPipeline(audio_config=AudioConfig(channels=8))
+        pipeline._input_device = AudioDeviceInfo(
+            index=0, name="Array", device_type=AudioDeviceType.INPUT,
+            channels=4, sample_rate=16000
+        )
+        
+        assert pipeline._select_capture_channels() == 4
+    
+    def test_short_channel_weights_rejected(self):
+        """Test weights covering fewer channels than captured are an error, not a silent average."""
+        pipeline = AudioPipeline(audio_config=AudioConfig(channels=4, channel_weights=[0.4, 0.3, 0.2, 0.1]))
+        
+        assert pipeline._create_downmixer(2, 480).weights == [0.4, 0.3]
+        pipeline.audio_config = AudioConfig.model_construct(
+            channels=4, downmix="sum", capture_channel=0, channel_weights=[0.5, 0.5]
+        )
+        with pytest.raises(ValueError):
+            pipeline._create_downmixer(4, 480)
+    
+    def test_steady_state_allocates_nothing(self):
+        """Test repeated callbacks reuse scratch and the ring buffer."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_capture_scratch(480, 2)
+        indata = np.full((480, 2), 500, dtype=np.int16)
+        
+        for _ in range(200):
+            pipeline._audio_input_callback(indata, 480, None, None)
+        
+        assert pipeline.stats.audio_frames_processed == 200
+        assert pipeline.stats.callback_allocations == 0
+    
+    def test_frame_size_change_counts_allocation(self):
+        """Test scratch reallocation is counted when the block size changes."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_capture_scratch(480, 1)
+        indata = np.zeros((240, 1), dtype=np.float32)
+        
+        pipeline._capture_to_mono(indata, 240)
+        pipeline._capture_to_mono(indata, 240)
+        
+        assert pipeline.stats.callback_allocations == 1
+        assert pipeline._capture_frame.shape == (240,)
+
+
+class TestAnalysisWorker:
+    """Test VAD/segmentation running off the capture callback."""
+    
+    def test_callback_only_enqueues(self):
+        """Test the callback never calls the segmenter directly."""
+        pipeline = AudioPipeline()
+        pipeline.segmenter = Mock()
+        pipeline._set_state(PipelineState.LISTENING)
+        indata = np.zeros((480, 1), dtype=np.int16)
+        
+        pipeline._audio_input_callback(indata, 480, None, None)
+        
+        pipeline.segmenter.process_frame.assert_not_called()
+        assert pipeline.input_buffer.frame_count == 1
+    
+    def test_worker_emits_segments(self):
+        """Test the worker drains the buffer and reports segments."""
+        pipeline = AudioPipeline()
+        segment = SpeechSegment(
+            start_time=0.0,
+            end_time=1.0,
+            audio_data=np.ones(16000, dtype=np.int16)
+        )
+        pipeline.segmenter = Mock()
+        pipeline.segmenter.process_frame.side_effect = [None, None, segment]
+        received = []
+        pipeline._on_speech_segment = received.append
+        pipeline._set_state(PipelineState.LISTENING)
+        
+        pipeline._start_analysis_worker()
+        try:
+            indata = np.zeros((480, 1), dtype=np.int16)
+            for _ in range(3):
+                pipeline._audio_input_callback(indata, 480, None, None)
+            
+            deadline = time.monotonic() + 2.0
+            while not received and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            pipeline._stop_analysis_worker()
+        
+        assert received == [segment]
+        assert pipeline.stats.speech_segments_detected == 1
+        assert pipeline._analysis_thread is None
+    
+    def test_callback_duration_percentiles(self):
+        """Test callback durations are summarised in PipelineStats."""
+        pipeline = AudioPipeline()
+        indata = np.zeros((480, 1), dtype=np.int16)
+        
+        for _ in range(20):
+            pipeline._audio_input_callback(indata, 480, None, None)
+        
+        stats = pipeline.stats
+        assert stats.callback_count == 20
+        assert 0 < stats.callback_p50_ms <= stats.callback_p99_ms <= stats.callback_max_ms
+    
+    def test_percentiles_use_recent_window(self):
+        """Test percentiles are computed over the rolling window."""
+        stats = PipelineStats()
+        assert stats.callback_p99_ms == 0.0
+        
+        for value in range(1, 101):
+            stats.record_callback_duration(float(value))
+        
+        assert stats.callback_max_ms == 100.0
+        assert stats.callback_p50_ms == pytest.approx(50.5)
+        assert stats.callback_p99_ms == pytest.approx(99.01)
+
+
+class TestVoiceActivity:
+    """Test per-frame VAD activity publishing and frame-driven barge-in."""
+    
+    def test_monitor_latest_and_history(self):
+        """Test the latest slot and chronological ring history."""
+        monitor = VoiceActivityMonitor(history_frames=4)
+        assert monitor.latest is None
+        
+        for i in range(6):
+            monitor.publish(i / 10, 0.5, False, float(i))
+        
+        assert monitor.latest.frame_index == 5
+        assert monitor.latest.energy == 0.5
+        history = monitor.history()
+        assert list(history['timestamp']) == [2.0, 3.0, 4.0, 5.0]
+        assert list(monitor.history(2)['timestamp']) == [4.0, 5.0]
+    
+    def test_monitor_listener_errors_isolated(self):
+        """Test a failing listener does not stop later listeners."""
+        monitor = VoiceActivityMonitor()
+        received = []
+        monitor.add_listener(Mock(side_effect=RuntimeError("boom")))
+        monitor.add_listener(received.append)
+        
+        monitor.publish(0.1, 1.0, True, 0.0)
+        
+        assert len(received) == 1
+        assert received[0].is_speech
+    
+    def test_analysis_publishes_energy_in_every_state(self):
+        """Test frames are analysed and published while speaking too."""
+        pipeline = AudioPipeline()
+        pipeline._set_state(PipelineState.SPEAKING)
+        frame = np.full(pipeline.input_buffer.frame_size, 16384, dtype=np.int16)
+        
+        pipeline._analyze_frame(frame)
+        
+        latest = pipeline.activity.latest
+        assert latest is not None
+        assert latest.energy == pytest.approx(0.5)
+    
+    def test_barge_in_driven_by_frames(self):
+        """Test sustained voiced frames interrupt playback without polling."""
+        from bridge.barge_in_integration import AudioPipelineBargeIn
+        from audio.barge_in import BargeInConfig, BargeInState
+        
+        pipeline = AudioPipeline()
+        integration = AudioPipelineBargeIn(pipeline, BargeInConfig(min_speech_ms=90))
+        counted = pipeline._barge_in_counter.snapshot()
+        events = []
+        integration.on_interruption = events.append
+        
+        pipeline._set_state(PipelineState.SPEAKING)
+        assert integration.barge_in.state == BargeInState.SPEAKING
+        
+        # 30 ms frames: three voiced frames reach the 90 ms debounce
+        pipeline.activity.publish(0.2, 1.0, True, time.monotonic())
+        pipeline.activity.publish(0.0, 0.0, False, time.monotonic())
+        pipeline.activity.publish(0.2, 1.0, True, time.monotonic())
+        pipeline.activity.publish(0.2, 1.0, True, time.monotonic())
+        assert events == []
+        pipeline.activity.publish(0.3, 0.9, True, time.monotonic())
+        
+        assert len(events) == 1
+        assert events[0].vad_energy == pytest.approx(0.9)
+        assert pipeline.state == PipelineState.LISTENING
+        assert pipeline.stats.barge_in_count == 1
+        assert pipeline._barge_in_counter.snapshot() == counted + 1
+        assert integration.barge_in.state == BargeInState.LISTENING
+    
+    @pytest.mark.asyncio
+    async def test_async_interruption_callback_runs_on_loop(self):
+        """Test an async callback is awaited on the loop when the analysis thread interrupts."""
+        from bridge.barge_in_integration import AudioPipelineBargeIn
+        from audio.barge_in import BargeInConfig
+        
+        pipeline = AudioPipeline()
+        integration = AudioPipelineBargeIn(pipeline, BargeInConfig(min_speech_ms=30))
+        interrupted = asyncio.Event()
+        
+        async def on_interruption(event):
+            interrupted.set()
+        
+        integration.on_interruption = on_interruption
+        pipeline._set_state(PipelineState.SPEAKING)
+        
+        worker = threading.Thread(
+            target=pipeline.activity.publish, args=(0.2, 1.0, True, time.monotonic())
+        )
+        worker.start()
+        worker.join()
+        
+        await asyncio.wait_for(interrupted.wait(), timeout=2.0)
+        assert pipeline.state == PipelineState.LISTENING
+
+
+class TestPlaybackCancel:
+    """Test barge-in cancellation of TTS output."""
+    
+    def _callback(self, pipeline, frames=1024):
+        outdata = np.empty((frames, 1), dtype=np.int16)
+        pipeline._audio_output_callback(outdata, frames, None, None)
+        return outdata[:, 0]
+    
+    def test_cancel_fades_next_samples_then_silence(self):
+        """Test the block after a cancel is a short ramp, not a full frame."""
+        pipeline = AudioPipeline()
+        pipeline.play_audio(np.full(4096, 10000, dtype=np.int16))
+        assert np.all(self._callback(pipeline) == 10000)
+        
+        dropped = pipeline.cancel_playback()
+        block = self._callback(pipeline)
+        
+        fade = pipeline._fade_ramp.shape[0]
+        assert fade == 128  # 8 ms at 16 kHz
+        assert dropped == 4096 - 1024 - fade
+        assert block[0] == 10000
+        assert np.all(np.diff(block[:fade].astype(np.int32)) <= 0)
+        assert np.all(block[fade:] == 0)
+        assert pipeline.stats.samples_played_after_interrupt == fade
+        assert np.all(self._callback(pipeline) == 0)
+    
+    def test_cancel_with_empty_queue_plays_nothing(self):
+        """Test cancelling with nothing queued adds no samples."""
+        pipeline = AudioPipeline()
+        
+        pipeline.cancel_playback()
+        
+        assert np.all(self._callback(pipeline) == 0)
+        assert pipeline.stats.samples_played_after_interrupt == 0
+    
+    def test_playback_resumes_after_cancel(self):
+        """Test audio queued after the fade block plays normally."""
+        pipeline = AudioPipeline()
+        pipeline.play_audio(np.full(2048, 5000, dtype=np.int16))
+        pipeline.stop_playback_immediate()
+        self._callback(pipeline)
+        
+        pipeline.play_audio(np.full(1024, 7000, dtype=np.int16))
+        
+        assert np.all(self._callback(pipeline) == 7000)
+        assert pipeline.stats.barge_in_count == 1
+
+
+class TestStreamingPlayback:
+    """Test the streaming TTS playback path."""
+    
+    def _drain(self, pipeline, frames=1024):
+        outdata = np.empty((frames, 1), dtype=np.int16)
+        pipeline._audio_output_callback(outdata, frames, None, None)
+        return outdata[:, 0].copy()
+    
+    def test_odd_chunk_sizes_play_contiguously(self):
+        """Test chunks of any size come out in order without padding gaps."""
+        pipeline = AudioPipeline()
+        audio = np.arange(3000, dtype=np.int16)
+        chunks = [audio[:7], audio[7:1500], audio[1500:1501], audio[1501:]]
+        
+        assert pipeline.stream_audio(chunks) == 3000
+        assert pipeline.state == PipelineState.SPEAKING
+        
+        played = np.concatenate([self._drain(pipeline) for _ in range(3)])
+        assert np.array_equal(played[:3000], audio)
+        assert np.all(played[3000:] == 0)
+    
+    def test_backpressure_instead_of_dropping(self):
+        """Test a stream longer than the queue blocks until the device drains it."""
+        pipeline = AudioPipeline()
+        total = pipeline.output_buffer.capacity * 3
+        chunks = [np.ones(1000, dtype=np.int16)] * (total // 1000)
+        result = {}
+        
+        producer = threading.Thread(
+            target=lambda: result.setdefault('queued', pipeline.stream_audio(chunks))
+        )
+        producer.start()
+        deadline = time.monotonic() + 5.0
+        while producer.is_alive() and time.monotonic() < deadline:
+            self._drain(pipeline)
+        producer.join(timeout=1.0)
+        
+        assert result['queued'] == total
+        assert pipeline.stats.playback_samples_dropped == 0
+    
+    def test_cancel_releases_blocked_stream(self):
+        """Test barge-in unblocks and ends a stream waiting for space."""
+        pipeline = AudioPipeline()
+        chunks = [np.ones(pipeline.output_buffer.capacity, dtype=np.int16)] * 3
+        result = {}
+        
+        producer = threading.Thread(
+            target=lambda: result.setdefault('queued', pipeline.stream_audio(chunks))
+        )
+        producer.start()
+        time.sleep(0.05)
+        pipeline.stop_playback_immediate()
+        producer.join(timeout=1.0)
+        
+        assert not producer.is_alive()
+        assert result['queued'] == pipeline.output_buffer.capacity
+        assert pipeline.state == PipelineState.LISTENING
+    
+    @pytest.mark.asyncio
+    async def test_async_stream(self):
+        """Test the async variant accepts async generators."""
+        pipeline = AudioPipeline()
+        
+        async def synth():
+            for value in (1, 2, 3):
+                yield np.full(700, value, dtype=np.int16)
+        
+        assert await pipeline.stream_audio_async(synth()) == 2100
+        played = np.concatenate([self._drain(pipeline) for _ in range(3)])
+        assert np.all(played[:700] == 1) and np.all(played[1400:2100] == 3)
+    
+    def test_play_audio_counts_overflow(self):
+        """Test non-blocking play_audio reports dropped samples."""
+        pipeline = AudioPipeline()
+        capacity = pipeline.output_buffer.capacity
+        
+        assert pipeline.play_audio(np.ones(capacity + 500, dtype=np.int16))
+        assert pipeline.stats.playback_samples_dropped == 500
+
+
+class TestCaptureResampling:
+    """Test capturing at the device rate and resampling to the VAD rate."""
+    
+    def test_native_rate_selected(self):
+        """Test the device's default rate is used when native capture is on."""
+        assert AudioConfig().native_capture_rate is False
+        pipeline = AudioPipeline(audio_config=AudioConfig(native_capture_rate=True))
+        pipeline._input_device = AudioDeviceInfo(
+            index=0, name="USB Mic", device_type=AudioDeviceType.INPUT,
+            channels=1, sample_rate=48000
+        )
+        
+        assert pipeline._select_capture_rate() == 48000
+        pipeline.audio_config = AudioConfig(native_capture_rate=False)
+        assert pipeline._select_capture_rate() == 16000
+    
+    def test_no_resampler_at_vad_rate(self):
+        """Test the stage is bypassed when rates already match."""
+        pipeline = AudioPipeline()
+        
+        pipeline._prepare_resampler(16000, 480)
+        
+        assert pipeline._resampler is None
+    
+    def test_48k_blocks_become_vad_frames(self):
+        """Test 48 kHz callback blocks arrive as 16 kHz frames."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_resampler(48000, 1440)
+        pipeline._prepare_capture_scratch(1440, 1)
+        indata = np.full((1440, 1), 1000, dtype=np.int16)
+        
+        for _ in range(5):
+            pipeline._audio_input_callback(indata, 1440, None, None)
+        
+        assert pipeline.input_buffer.frame_count == 5
+        frame = None
+        for _ in range(5):
+            frame = pipeline.input_buffer.read(block=False)
+        assert frame.shape == (480,)
+        assert np.all(np.abs(frame.astype(np.int32) - 1000) <= 2)
+        assert pipeline.stats.callback_allocations == 0
+    
+    def test_fractional_ratio_is_reframed(self):
+        """Test uneven resampled block lengths are assembled into whole frames."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_resampler(22050, 661)
+        indata = np.zeros((661, 1), dtype=np.int16)
+        frames = 0
+        
+        for _ in range(100):
+            pipeline._audio_input_callback(indata, 661, None, None)
+            while pipeline.input_buffer.read(block=False) is not None:
+                frames += 1
+        
+        # 100 blocks of 661 samples at 22.05 kHz ~= 47959 samples at 16 kHz
+        resampled = frames * 480 + pipeline._resample_fill
+        assert resampled == pytest.approx(100 * 661 * 16000 / 22050, abs=2)
+        assert pipeline._resample_fill < 480
+    
+    def test_resampled_frames_carry_capture_time(self):
+        """Test re-framed frames are stamped with their first sample's time."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_resampler(22050, 661)
+        
+        pipeline._write_resampled(np.zeros(300, dtype=np.int16), 10.0)
+        pipeline._write_resampled(np.zeros(300, dtype=np.int16), 11.0)
+        
+        assert pipeline.input_buffer.read(block=False) is not None
+        assert pipeline.input_buffer.last_timestamp == 10.0
+        assert pipeline._resample_frame_ts == pytest.approx(11.0 + 180 / 16000)
+
+
+class TestLatencyTracing:
+    """Test capture timestamps and per-turn latency marks."""
+    
+    def test_capture_time_reaches_activity(self):
+        """Test the callback's ADC time is the analysed frame's timestamp."""
+        pipeline = AudioPipeline()
+        pipeline._prepare_capture_scratch(480, 1)
+        time_info = Mock(currentTime=100.0, inputBufferAdcTime=99.99)
+        
+        before = time.monotonic()
+        pipeline._audio_input_callback(np.zeros((480, 1), dtype=np.int16), 480, time_info, None)
+        frame = pipeline.input_buffer.read(block=False)
+        pipeline._analyze_frame(frame, pipeline.input_buffer.last_timestamp)
+        
+        stamp = pipeline.activity.latest.timestamp
+        assert before - 0.011 <= stamp <= time.monotonic() - 0.009
+    
+    def test_turn_marked_from_segment_to_playback(self):
+        """Test a segment opens a turn and the first played sample closes it."""
+        pipeline = AudioPipeline()
+        pipeline.latency_tracer = LatencyTracer()
+        pipeline._on_speech_segment = Mock()
+        segment = SpeechSegment(
+            audio_data=np.zeros(480, dtype=np.int16),
+            start_time=5.0,
+            end_time=6.0
+        )
+        
+        pipeline._trace_segment(segment)
+        pipeline.output_buffer.write(np.ones(256, dtype=np.int16), block=False)
+        outdata = np.zeros((256, 1), dtype=np.int16)
+        pipeline._audio_output_callback(outdata, 256, None, None)
+        
+        marks = pipeline.latency_tracer.current.marks
+        assert marks[TurnStage.FIRST_VOICED] == 5.0
+        assert marks[TurnStage.SPEECH_END] == 6.0
+        assert TurnStage.SEGMENT_EMITTED in marks
+        assert TurnStage.FIRST_TTS_SAMPLE in marks
+    
+    def test_leaving_speaking_finishes_turn(self):
+        """Test the turn is closed when playback ends."""
+        pipeline = AudioPipeline()
+        pipeline.latency_tracer = LatencyTracer()
+        pipeline.latency_tracer.start_turn(1.0)
+        
+        pipeline._set_state(PipelineState.SPEAKING)
+        pipeline._set_state(PipelineState.LISTENING)
+        
+        assert pipeline.latency_tracer.current is None
+        assert len(pipeline.latency_tracer.recent()) == 1
+    
+    def test_pipelines_trace_turns_separately(self):
+        """Test one pipeline's segment does not close another's turn."""
+        first, second = AudioPipeline(), AudioPipeline()
+        assert first.latency_tracer is not second.latency_tracer
+        
+        def segment(start):
+            return SpeechSegment(audio_data=np.zeros(480, dtype=np.int16), start_time=start, end_time=start + 1)
+        
+        first._trace_segment(segment(1.0))
+        second._trace_segment(segment(2.0))
+        
+        assert first.latency_tracer.current.marks[TurnStage.FIRST_VOICED] == 1.0
+        assert first.latency_tracer.recent() == []
+        assert second.latency_tracer.current.marks[TurnStage.FIRST_VOICED] == 2.0
@@ -2,6 +2,7 @@
 
 import pytest
 import asyncio
+import time
 from datetime import datetime, timedelta
 
 from audio.barge_in import (
@@ -381,6 +382,88 @@ class TestBargeInIntegration:
         ]
 
 
+class TestBargeInPushMode:
+    """Test frame-driven (push) barge-in detection."""
+    
+    def _speaking_handler(self, **config):
+        handler = BargeInHandler(config=BargeInConfig(**config))
+        handler.set_state(BargeInState.SPEAKING)
+        return handler
+    
+    def test_debounce_counts_frames(self):
+        """Test min_speech_ms is measured in frames, not wall-clock time."""
+        handler = self._speaking_handler(min_speech_ms=90, frame_duration_ms=30)
+        ts = time.monotonic()
+        
+        assert handler.feed_frame(0.9, ts) is None
+        assert handler.feed_frame(0.9, ts + 0.03) is None
+        event = handler.feed_frame(0.9, ts + 0.06)
+        
+        assert event is not None
+        assert handler.state == BargeInState.INTERRUPTING
+        assert handler.stats['interruptions_detected'] == 1
+    
+    def test_quiet_frame_resets_debounce(self):
+        """Test a frame below sensitivity restarts the voiced run."""
+        handler = self._speaking_handler(min_speech_ms=60, frame_duration_ms=30)
+        ts = time.monotonic()
+        
+        handler.feed_frame(0.9, ts)
+        handler.feed_frame(0.1, ts + 0.03)
+        assert handler.feed_frame(0.9, ts + 0.06) is None
+        assert handler.feed_frame(0.9, ts + 0.09) is not None
+    
+    def test_latency_from_first_voiced_frame(self):
+        """Test latency is measured from the first voiced capture timestamp."""
+        handler = self._speaking_handler(min_speech_ms=30, frame_duration_ms=30)
+        
+        event = handler.feed_frame(0.9, time.monotonic() - 0.02)
+        
+        assert 20 <= event.latency_ms < 100
+    
+    def test_ignored_when_not_speaking(self):
+        """Test frames are ignored outside the SPEAKING state."""
+        handler = BargeInHandler(config=BargeInConfig(min_speech_ms=0))
+        
+        assert handler.feed_frame(1.0, time.monotonic()) is None
+        assert handler.stats['interruptions_detected'] == 0
+    
+    def test_cooldown_uses_frame_timestamps(self):
+        """Test cooldown is applied against frame timestamps."""
+        handler = self._speaking_handler(min_speech_ms=30, frame_duration_ms=30, cooldown_ms=500)
+        ts = time.monotonic()
+        
+        assert handler.feed_frame(0.9, ts) is not None
+        handler.set_state(BargeInState.SPEAKING)
+        assert handler.feed_frame(0.9, ts + 0.1) is None
+        assert handler.feed_frame(0.9, ts + 0.6) is not None
+    
+    def test_sync_callbacks_run_inline(self):
+        """Test plain callbacks are called from feed_frame directly."""
+        handler = self._speaking_handler(min_speech_ms=30, frame_duration_ms=30)
+        events = []
+        handler.on_interruption = events.append
+        
+        event = handler.feed_frame(0.9, time.monotonic())
+        
+        assert events == [event]
+    
+    @pytest.mark.asyncio
+    async def test_async_callback_scheduled_from_thread(self):
+        """Test coroutine callbacks are scheduled on the handler's loop."""
+        handler = BargeInHandler(config=BargeInConfig(min_speech_ms=30, frame_duration_ms=30))
+        await handler.start_speaking()
+        received = asyncio.Event()
+        
+        async def on_interrupt(event):
+            received.set()
+        
+        handler.on_interruption = on_interrupt
+        await asyncio.to_thread(handler.feed_frame, 0.9, time.monotonic())
+        
+        await asyncio.wait_for(received.wait(), timeout=1.0)
+
+
 @pytest.mark.performance
 class TestBargeInPerformance:
     """Performance tests for barge-in."""
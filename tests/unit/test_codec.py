@@ -0,0 +1,124 @@
+"""
+Unit tests for codec module.
+"""
+import json
+
+import pytest
+
+from bridge import codec
+from bridge.bench_cli import run_codec_bench
+from bridge.codec import (
+    ControlMessage,
+    JSONCodec,
+    KeepaliveMessage,
+    TextMessage,
+    VoiceInputMessage,
+    available_codecs,
+    create_codec,
+    decode_message,
+)
+from bridge.context_window import ContextWindow
+from bridge.openclaw_middleware import OpenClawMiddleware, TaggedMessage
+
+BACKENDS = list(available_codecs())
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Make each available backend the active codec in turn."""
+    previous = codec.set_codec(request.param)
+    yield codec.get_codec()
+    codec.set_codec(previous)
+
+
+class TestCodec:
+    """Test encoding backends."""
+    
+    def test_round_trip_matches_stdlib(self, backend):
+        """Test every backend agrees with the standard library."""
+        message = {"type": "voice_input", "text": "héllo", "metadata": {"confidence": 0.5}}
+        encoded = backend.dumps(message)
+        
+        assert isinstance(encoded, str)
+        assert json.loads(encoded) == message
+        assert backend.loads(json.dumps(message)) == message
+        assert backend.loads(backend.dumpb(message)) == message
+    
+    def test_unsupported_value_falls_back(self, backend):
+        """Test values a fast backend rejects are encoded by the stdlib."""
+        assert json.loads(backend.dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+    
+    def test_decode_error_is_json_error(self, backend):
+        """Test invalid input raises json.JSONDecodeError on every backend."""
+        with pytest.raises(json.JSONDecodeError):
+            backend.loads("{not json")
+    
+    def test_set_codec_returns_previous(self):
+        """Test set_codec swaps the active codec and hands back the old one."""
+        stdlib = JSONCodec()
+        previous = codec.set_codec(stdlib)
+        try:
+            assert codec.get_codec() is stdlib
+        finally:
+            codec.set_codec(previous)
+        assert codec.get_codec() is previous
+        
+        with pytest.raises(ValueError):
+            create_codec("no-such-backend")
+
+
+class TestDecodeMessage:
+    """Test typed protocol decoding."""
+    
+    def test_message_types(self, backend):
+        """Test messages decode to their typed classes."""
+        voice = decode_message('{"type": "voice_input", "text": "hi", "metadata": {"confidence": 0.9}}')
+        control = decode_message({"type": "control", "action": "interrupt", "data": {"reason": "barge_in"}})
+        
+        assert isinstance(voice, VoiceInputMessage)
+        assert (voice.content, voice.confidence) == ("hi", 0.9)
+        assert isinstance(control, ControlMessage)
+        assert (control.action, control.data) == ("interrupt", {"reason": "barge_in"})
+        assert isinstance(decode_message(b'{"type": "ping"}'), KeepaliveMessage)
+        with pytest.raises(ValueError):
+            decode_message("[1, 2]")
+    
+    def test_tag_speakability_and_content(self, backend):
+        """Test middleware annotations and structured content are extracted."""
+        tagged = decode_message({
+            "type": "response", "text": "Done", "_type": "final", "_speakability": "speakable"
+        })
+        tool = decode_message({
+            "type": "tool_result", "content": {"ok": True}, "metadata": {"speakable": False}
+        })
+        
+        assert isinstance(tagged, TextMessage)
+        assert (tagged.message_type, tagged.speakability) == ("final", "speakable")
+        assert tool.message_type == "tool_result"
+        assert tool.speakability == "silent"
+        assert json.loads(tool.content) == {"ok": True}
+    
+    def test_tagged_message_and_context_round_trip(self, backend):
+        """Test call sites routed through the codec round-trip their data."""
+        message = OpenClawMiddleware(session_id="s1").create_final_message("All set")
+        restored = TaggedMessage.from_json(message.to_json())
+        assert restored.content == "All set"
+        assert restored.metadata.message_type == message.metadata.message_type
+        
+        window = ContextWindow.from_json(codec.dumps({
+            "session_uuid": "test",
+            "session_id": None,
+            "max_turns": 5,
+            "messages": [{"role": "user", "content": "Hello"}],
+            "pruned_count": 0,
+        }))
+        assert json.loads(window.to_json())["messages"][0]["content"] == "Hello"
+
+
+def test_codec_bench_smoke():
+    """Test the codec bench reports every requested backend."""
+    reports = run_codec_bench(iterations=5, backends=["json"])
+    
+    assert [r["backend"] for r in reports] == ["json"]
+    assert reports[0]["messages"] == 25
+    assert reports[0]["decode_message_us"] > 0
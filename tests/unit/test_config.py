@@ -65,6 +65,16 @@ class TestAudioConfig:
             AudioConfig(sample_rate=500)  # Too low
         with pytest.raises(ValueError):
             AudioConfig(sample_rate=200000)  # Too high
+    
+    def test_per_channel_downmix_lengths(self):
+        """Test channel weights and delays must give one value per channel."""
+        AudioConfig(channels=4, channel_weights=[0.25] * 4, channel_delays=[0, 1, 2, 3])
+        
+        with pytest.raises(ValueError) as exc_info:
+            AudioConfig(channels=4, channel_weights=[0.5, 0.5])
+        assert "channel_weights needs 4 values, got 2" in str(exc_info.value)
+        with pytest.raises(ValueError):
+            AudioConfig(channels=2, channel_delays=[0, 1, 2])
 
 
 class TestSTTConfig:
@@ -0,0 +1,170 @@
+"""
+Unit tests for device_registry module.
+"""
+import time
+from datetime import datetime
+
+import pytest
+
+from bridge.audio_discovery import AudioDiscovery
+from bridge.audio_pipeline import AudioDeviceManager, AudioDeviceType
+from bridge.bug_tracker import BugTracker, SystemSnapshot
+from bridge.device_registry import DeviceRegistry, DeviceSnapshot
+
+
+DEVICES = [
+    {'name': 'Built-in Microphone', 'max_input_channels': 2, 'max_output_channels': 0,
+     'default_samplerate': 48000},
+    {'name': 'Built-in Output', 'max_input_channels': 0, 'max_output_channels': 2,
+     'default_samplerate': 48000},
+    {'name': 'USB Audio Mic', 'max_input_channels': 1, 'max_output_channels': 0,
+     'default_samplerate': 16000},
+]
+
+
+class DeviceList(list):
+    """Device list that counts full enumerations."""
+    queries = 0
+
+
+@pytest.fixture
+def devices(mock_sounddevice):
+    """Mutable device list served by the mocked sounddevice."""
+    current = DeviceList(dict(d) for d in DEVICES)
+    
+    def query_devices(kind=None):
+        if kind == 'input':
+            return current[0]
+        if kind == 'output':
+            return current[1]
+        current.queries += 1
+        return current
+    
+    mock_sounddevice.query_devices = query_devices
+    return current
+
+
+class TestDeviceSnapshot:
+    """Test DeviceSnapshot lookups."""
+    
+    def test_find_by_index_and_name(self):
+        """Test exact, partial and direction-filtered lookups."""
+        snapshot = DeviceSnapshot(devices=[dict(d) for d in DEVICES])
+        
+        assert snapshot.find(0, 'input') == 0
+        assert snapshot.find(0, 'output') is None
+        assert snapshot.find("built-in output") == 1
+        assert snapshot.find("usb", 'input') == 2
+        assert snapshot.find("built-in", 'output') == 1
+        assert snapshot.find("missing") is None
+        assert snapshot.by_name["usb audio mic"] == 2
+
+
+class TestDeviceRegistry:
+    """Test DeviceRegistry caching and refresh."""
+    
+    def test_snapshot_cached(self, devices):
+        """Test devices are enumerated once for many readers."""
+        registry = DeviceRegistry()
+        
+        first = registry.snapshot()
+        second = registry.snapshot()
+        
+        assert first is second
+        assert devices.queries == 1
+        assert first.default_input == 0
+        assert first.default_output == 1
+    
+    def test_max_age_requeries(self, devices, monkeypatch):
+        """Test an expired snapshot is replaced."""
+        registry = DeviceRegistry(max_age=10.0)
+        first = registry.snapshot()
+        monkeypatch.setattr(
+            "bridge.device_registry.time.monotonic", lambda: first.captured_at + 11.0
+        )
+        
+        assert registry.snapshot() is not first
+        assert devices.queries == 2
+    
+    def test_refresh_notifies_on_change(self, devices):
+        """Test listeners only hear about refreshes that changed devices."""
+        registry = DeviceRegistry()
+        registry.snapshot()
+        seen = []
+        registry.add_listener(seen.append)
+        
+        registry.refresh()
+        assert seen == []
+        
+        devices.append({'name': 'Headset', 'max_input_channels': 1, 'max_output_channels': 2})
+        snapshot = registry.refresh()
+        
+        assert seen == [snapshot]
+        assert snapshot.version == 3
+        assert snapshot.find("headset") == 3
+    
+    def test_auto_refresh(self, devices):
+        """Test the timer refreshes in the background."""
+        registry = DeviceRegistry()
+        registry.snapshot()
+        
+        registry.start_auto_refresh(interval=0.01)
+        try:
+            for _ in range(200):
+                if devices.queries >= 3:
+                    break
+                time.sleep(0.01)
+        finally:
+            registry.stop_auto_refresh()
+        
+        assert devices.queries >= 3
+
+
+class TestRegistryConsumers:
+    """Test the device consumers share the registry."""
+    
+    def test_managers_share_one_enumeration(self, devices):
+        """Test several managers do not re-query devices."""
+        registry = DeviceRegistry()
+        managers = [AudioDeviceManager(registry) for _ in range(5)]
+        
+        assert devices.queries == 1
+        assert managers[4].get_device("usb audio mic", AudioDeviceType.INPUT).index == 2
+        assert managers[4].get_default_device(AudioDeviceType.OUTPUT).name == "Built-in Output"
+    
+    def test_manager_follows_refresh(self, devices):
+        """Test managers pick up devices after a registry refresh."""
+        registry = DeviceRegistry()
+        manager = AudioDeviceManager(registry)
+        other = AudioDeviceManager(registry)
+        
+        devices.append({'name': 'Headset', 'max_input_channels': 1, 'max_output_channels': 2})
+        manager.refresh()
+        
+        assert manager.get_device("headset", AudioDeviceType.INPUT) is not None
+        assert other.get_device("headset", AudioDeviceType.INPUT) is not None
+    
+    def test_discovery_uses_registry(self, devices, monkeypatch):
+        """Test discovery reads the shared snapshot and its defaults."""
+        registry = DeviceRegistry()
+        monkeypatch.setattr("bridge.audio_discovery.get_device_registry", lambda: registry)
+        registry.snapshot()
+        
+        discovery = AudioDiscovery().discover()
+        
+        assert devices.queries == 1
+        assert len(discovery.devices) == 3
+        assert discovery.default_input.name == "Built-in Microphone"
+        assert discovery.default_output.name == "Built-in Output"
+    
+    def test_system_snapshot_uses_registry(self, devices, monkeypatch):
+        """Test error snapshots do not enumerate devices each time."""
+        registry = DeviceRegistry()
+        monkeypatch.setattr("bridge.device_registry._device_registry", registry)
+        monkeypatch.setattr(BugTracker, "_start_time", datetime.now())
+        
+        for _ in range(3):
+            snapshot = SystemSnapshot.capture()
+        
+        assert devices.queries == 1
+        assert snapshot.audio_devices[2] == {"name": "USB Audio Mic", "channels": 1}
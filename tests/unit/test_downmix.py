@@ -0,0 +1,90 @@
+"""
+Unit tests for downmix module.
+"""
+import numpy as np
+import pytest
+
+from bridge.downmix import ChannelDownmixer, DownmixMode
+
+
+def _block(*columns) -> np.ndarray:
+    return np.stack([np.asarray(c, dtype=np.int16) for c in columns], axis=1)
+
+
+class TestChannelDownmixer:
+    """Test cases for ChannelDownmixer."""
+    
+    def test_default_sum_is_average(self):
+        """Test equal weights reproduce the channel mean."""
+        mixer = ChannelDownmixer(4, 3)
+        block = _block([100, 200, -400], [300, 200, -400], [500, 200, -400], [700, 200, -400])
+        
+        assert list(mixer.process(block)) == [400, 200, -400]
+    
+    def test_pick_returns_view(self):
+        """Test PICK selects one channel without copying."""
+        mixer = ChannelDownmixer(3, 4, mode=DownmixMode.PICK, channel=2)
+        block = _block([1] * 4, [2] * 4, [3] * 4)
+        
+        mono = mixer.process(block)
+        
+        assert np.all(mono == 3)
+        assert np.shares_memory(mono, block)
+    
+    def test_fixed_weights(self):
+        """Test custom weights in Q15 fixed point."""
+        mixer = ChannelDownmixer(2, 2, weights=[0.75, 0.25])
+        block = _block([1000, -1000], [2000, 2000])
+        
+        assert list(mixer.process(block)) == [1250, -250]
+    
+    def test_sum_saturates_instead_of_wrapping(self):
+        """Test gains above unity clip to the int16 range."""
+        mixer = ChannelDownmixer(2, 2, weights=[1.0, 1.0])
+        block = _block([30000, -30000], [30000, -30000])
+        
+        assert list(mixer.process(block)) == [32767, -32768]
+    
+    def test_large_gains_on_many_channels_do_not_wrap(self):
+        """Test 32 full-scale channels with large gains saturate rather than overflow."""
+        mixer = ChannelDownmixer(32, 2, weights=[4.0] * 32)
+        block = _block(*([[32767, -32768]] * 32))
+        
+        assert list(mixer.process(block)) == [32767, -32768]
+    
+    def test_delay_and_sum_aligns_channels(self):
+        """Test steering delays align a wavefront that hits channels at different times."""
+        rng = np.random.default_rng(1)
+        source = rng.integers(-8000, 8000, size=4000).astype(np.int16)
+        # Channel 1 hears the source 3 samples before channel 0
+        ch0 = np.concatenate([np.zeros(3, dtype=np.int16), source[:-3]])
+        ch1 = source
+        mixer = ChannelDownmixer(2, 400, mode=DownmixMode.DELAY_SUM, delays=[0, 3])
+        
+        out = np.concatenate([
+            mixer.process(_block(ch0[i:i + 400], ch1[i:i + 400])).copy()
+            for i in range(0, 4000, 400)
+        ])
+        
+        # Coherent sum: equal to the delayed source, across block boundaries
+        assert np.array_equal(out[3:], ch0[3:])
+    
+    def test_out_parameter(self):
+        """Test results are written into the caller's scratch frame."""
+        mixer = ChannelDownmixer(2, 3)
+        out = np.zeros(3, dtype=np.int16)
+        
+        result = mixer.process(_block([2, 4, 6], [2, 4, 6]), out=out)
+        
+        assert result is out
+        assert list(out) == [2, 4, 6]
+    
+    @pytest.mark.parametrize("kwargs", [
+        {"channel": 2},
+        {"weights": [1.0]},
+        {"delays": [0, -1]},
+    ])
+    def test_invalid_configuration(self, kwargs):
+        """Test bad channel, weight or delay settings raise ValueError."""
+        with pytest.raises(ValueError):
+            ChannelDownmixer(2, 10, **kwargs)
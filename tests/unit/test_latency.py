@@ -0,0 +1,123 @@
+"""
+Unit tests for latency module.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from bridge.latency import (
+    LatencyTracer,
+    TurnStage,
+    TurnTrace,
+    STAGE_ORDER,
+    stream_time_to_monotonic,
+)
+
+
+class TestStreamTime:
+    """Test PortAudio stream time conversion."""
+    
+    def test_offset_applied_to_now(self):
+        """Test the ADC offset from currentTime is applied to now."""
+        time_info = Mock(currentTime=50.0, inputBufferAdcTime=49.98)
+        
+        stamp = stream_time_to_monotonic(time_info, 'inputBufferAdcTime', now=10.0)
+        
+        assert stamp == pytest.approx(9.98)
+    
+    def test_missing_timing_falls_back_to_now(self):
+        """Test host APIs without timing report the current time."""
+        assert stream_time_to_monotonic(None, 'inputBufferAdcTime', now=3.0) == 3.0
+        zeros = Mock(currentTime=0.0, outputBufferDacTime=0.0)
+        assert stream_time_to_monotonic(zeros, 'outputBufferDacTime', now=3.0) == 3.0
+        assert stream_time_to_monotonic(object(), 'outputBufferDacTime', now=3.0) == 3.0
+
+
+class TestTurnTrace:
+    """Test TurnTrace."""
+    
+    def test_first_mark_wins(self):
+        """Test a stage keeps its first timestamp."""
+        trace = TurnTrace(turn_id=1)
+        
+        assert trace.mark(TurnStage.TEXT_SENT, 1.0)
+        assert not trace.mark(TurnStage.TEXT_SENT, 2.0)
+        assert trace.marks[TurnStage.TEXT_SENT] == 1.0
+    
+    def test_breakdown_and_total(self):
+        """Test per-stage breakdown follows pipeline order."""
+        trace = TurnTrace(turn_id=1)
+        for i, stage in enumerate(reversed(STAGE_ORDER)):
+            trace.mark(stage, 1.0 - i * 0.1)
+        
+        breakdown = trace.breakdown_ms()
+        
+        assert trace.complete
+        assert trace.total_ms == pytest.approx(500.0)
+        assert list(breakdown) == [
+            "first_voiced_to_speech_end",
+            "speech_end_to_segment_emitted",
+            "segment_emitted_to_text_sent",
+            "text_sent_to_first_response_byte",
+            "first_response_byte_to_first_tts_sample",
+        ]
+        assert breakdown["text_sent_to_first_response_byte"] == pytest.approx(100.0)
+        assert trace.to_dict()['marks']['first_voiced'] == pytest.approx(0.5)
+    
+    def test_incomplete_trace(self):
+        """Test missing stages are skipped."""
+        trace = TurnTrace(turn_id=1)
+        trace.mark(TurnStage.FIRST_VOICED, 1.0)
+        trace.mark(TurnStage.TEXT_SENT, 1.2)
+        
+        assert not trace.complete
+        assert trace.total_ms is None
+        assert trace.breakdown_ms() == {
+            "first_voiced_to_text_sent": pytest.approx(200.0)
+        }
+
+
+class TestLatencyTracer:
+    """Test LatencyTracer."""
+    
+    def test_mark_without_turn_ignored(self):
+        """Test marks outside a turn are dropped."""
+        tracer = LatencyTracer()
+        
+        assert not tracer.mark(TurnStage.TEXT_SENT)
+        assert tracer.current is None
+    
+    def test_start_turn_finishes_previous(self):
+        """Test starting a turn closes the one in progress."""
+        tracer = LatencyTracer()
+        first = tracer.start_turn(1.0)
+        second = tracer.start_turn(2.0)
+        
+        assert tracer.current is second
+        assert tracer.recent() == [first]
+        assert second.turn_id == first.turn_id + 1
+    
+    def test_finish_turn_reports_trace(self):
+        """Test finished traces go to history and the callback."""
+        tracer = LatencyTracer(history=2)
+        received = []
+        tracer.on_trace = received.append
+        
+        for i in range(3):
+            tracer.start_turn(float(i))
+            tracer.mark(TurnStage.FIRST_TTS_SAMPLE, i + 0.8)
+            tracer.finish_turn()
+        
+        assert tracer.finish_turn() is None
+        assert len(received) == 3
+        assert [t.turn_id for t in tracer.recent()] == [2, 3]
+        assert received[-1].total_ms == pytest.approx(800.0)
+    
+    def test_callback_errors_isolated(self):
+        """Test a failing callback does not break tracing."""
+        tracer = LatencyTracer()
+        tracer.on_trace = Mock(side_effect=RuntimeError("boom"))
+        tracer.start_turn(0.0)
+        
+        assert tracer.finish_turn() is not None
+        assert len(tracer.recent()) == 1
@@ -0,0 +1,209 @@
+"""
+Unit tests for metrics module.
+"""
+import math
+import urllib.request
+
+import pytest
+
+from bridge.metrics import (
+    MetricsRegistry,
+    Histogram,
+    exponential_buckets,
+    get_metrics_registry,
+)
+
+
+class TestHistogram:
+    """Test fixed-bucket histogram."""
+    
+    def test_observations_land_in_buckets(self):
+        """Test values are counted in the first bucket whose bound covers them."""
+        hist = Histogram([0.1, 0.2, 0.4])
+        for value in (0.05, 0.1, 0.15, 0.3, 5.0):
+            hist.observe(value)
+        
+        assert hist.counts == [2, 1, 1, 1]
+        assert hist.count == 5
+        assert hist.sum == pytest.approx(5.6)
+    
+    def test_quantiles_interpolate(self):
+        """Test quantiles interpolate within the bucket holding the rank."""
+        hist = Histogram(exponential_buckets(0.001, 2.0, 12))
+        for _ in range(99):
+            hist.observe(0.003)
+        hist.observe(0.5)
+        
+        assert 0.002 <= hist.quantile(0.5) <= 0.004
+        assert hist.quantile(0.99) <= 0.004
+        assert hist.quantile(1.0) > 0.256
+    
+    def test_empty_and_overflow(self):
+        """Test empty histograms and ranks in the +Inf bucket."""
+        hist = Histogram([1.0, 2.0])
+        assert hist.quantile(0.99) == 0.0
+        
+        hist.observe(10.0)
+        
+        assert hist.quantile(0.99) == 2.0
+    
+    def test_exponential_buckets_validation(self):
+        """Test invalid bucket layouts are rejected."""
+        assert exponential_buckets(1.0, 2.0, 3) == [1.0, 2.0, 4.0]
+        with pytest.raises(ValueError):
+            exponential_buckets(0.0, 2.0, 3)
+
+
+class TestMetricsRegistry:
+    """Test MetricsRegistry."""
+    
+    def test_get_or_create(self):
+        """Test repeated lookups return the same metric per label set."""
+        registry = MetricsRegistry()
+        
+        a = registry.counter("requests_total", labels={"kind": "a"})
+        assert registry.counter("requests_total", labels={"kind": "a"}) is a
+        assert registry.counter("requests_total", labels={"kind": "b"}) is not a
+    
+    def test_kind_conflict(self):
+        """Test a name cannot be reused for a different metric type."""
+        registry = MetricsRegistry()
+        registry.counter("events_total")
+        
+        with pytest.raises(ValueError):
+            registry.histogram("events_total")
+    
+    def test_prometheus_text(self):
+        """Test the text exposition of each metric type."""
+        registry = MetricsRegistry(prefix="test_", const_labels={"instance": "kitchen"})
+        registry.counter("frames_total", "Frames seen").inc(3)
+        registry.gauge("queue_depth", "Queued items", fn=lambda: 7)
+        hist = registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1.0])
+        hist.observe(0.05)
+        hist.observe(0.5)
+        
+        text = registry.render_prometheus()
+        
+        assert "# HELP test_frames_total Frames seen" in text
+        assert "# TYPE test_frames_total counter" in text
+        assert 'test_frames_total{instance="kitchen"} 3' in text
+        assert 'test_queue_depth{instance="kitchen"} 7' in text
+        assert "# TYPE test_latency_seconds histogram" in text
+        assert 'test_latency_seconds_bucket{instance="kitchen",le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{instance="kitchen",le="1.0"} 2' in text
+        assert 'test_latency_seconds_bucket{instance="kitchen",le="+Inf"} 2' in text
+        assert 'test_latency_seconds_count{instance="kitchen"} 2' in text
+        assert text.endswith("\n")
+    
+    def test_label_values_escaped(self):
+        """Test quotes and backslashes in label values are escaped."""
+        registry = MetricsRegistry(prefix="")
+        registry.counter("x_total", labels={"tool": 'say "hi"\\'}).inc()
+        
+        assert 'x_total{tool="say \\"hi\\"\\\\"} 1' in registry.render_prometheus()
+    
+    def test_snapshot_and_reset(self):
+        """Test snapshot shapes and reset keeping registrations."""
+        registry = MetricsRegistry(prefix="")
+        registry.counter("plain_total").inc()
+        registry.counter("labelled_total", labels={"k": "v"}).inc(2)
+        registry.histogram("h_seconds").observe(0.01)
+        
+        snapshot = registry.snapshot()
+        assert snapshot["plain_total"] == 1
+        assert snapshot["labelled_total"] == {"k=v": 2}
+        assert snapshot["h_seconds"]["count"] == 1
+        
+        registry.reset()
+        assert registry.snapshot()["plain_total"] == 0
+        assert registry.snapshot()["h_seconds"]["count"] == 0
+    
+    def test_failing_gauge_callback(self):
+        """Test a raising gauge callback exports NaN instead of failing."""
+        registry = MetricsRegistry(prefix="")
+        registry.gauge("broken", fn=lambda: 1 / 0)
+        
+        assert math.isnan(registry.snapshot()["broken"])
+        assert "broken NaN" in registry.render_prometheus()
+    
+    def test_owner_gauges_sum_live_owners(self):
+        """Test owner callbacks are summed and dropped with their owner."""
+        import gc
+        
+        class Owner:
+            def __init__(self, depth):
+                self.depth = depth
+        
+        registry = MetricsRegistry(prefix="")
+        first, second = Owner(3), Owner(4)
+        registry.gauge("depth", owner=first, fn=lambda o: o.depth)
+        registry.gauge("depth", owner=second, fn=lambda o: o.depth)
+        assert registry.snapshot()["depth"] == 7
+        
+        del second
+        gc.collect()
+        assert registry.snapshot()["depth"] == 3
+    
+    def test_write_textfile(self, tmp_path):
+        """Test the textfile export replaces the destination."""
+        registry = MetricsRegistry(prefix="")
+        registry.counter("written_total").inc()
+        path = tmp_path / "bridge.prom"
+        
+        registry.write_textfile(str(path))
+        
+        assert "written_total 1" in path.read_text()
+        assert list(tmp_path.iterdir()) == [path]
+    
+    def test_http_endpoint(self):
+        """Test /metrics serves the text export."""
+        registry = MetricsRegistry(prefix="")
+        registry.counter("served_total").inc()
+        server = registry.serve(port=0)
+        try:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.stop()
+        
+        assert "served_total 1" in body
+        assert content_type.startswith("text/plain")
+    
+    def test_global_registry(self):
+        """Test the global registry is a singleton."""
+        assert get_metrics_registry() is get_metrics_registry()
+
+
+class TestComponentMetrics:
+    """Test components record into the global registry."""
+    
+    def test_latency_tracer_records_turns(self):
+        """Test finished turns feed the turn latency histograms."""
+        from bridge.latency import LatencyTracer, TurnStage
+        
+        tracer = LatencyTracer()
+        hist = get_metrics_registry().histogram("turn_latency_seconds")
+        before = hist.count
+        tracer.start_turn(1.0)
+        tracer.mark(TurnStage.FIRST_TTS_SAMPLE, 1.25)
+        tracer.finish_turn()
+        
+        assert hist.count == before + 1
+        stage = get_metrics_registry().histogram(
+            "turn_stage_seconds", labels={"span": "first_voiced_to_first_tts_sample"}
+        )
+        assert stage.count >= 1
+    
+    def test_response_filter_counts_decisions(self):
+        """Test the response filter counts messages by type and decision."""
+        from bridge.response_filter import ResponseFilter
+        
+        response_filter = ResponseFilter()
+        counter = get_metrics_registry().counter("filter_messages_total", labels={"type": "final"})
+        before = counter.value
+        
+        response_filter.filter_message({"type": "final", "content": "Here you go."})
+        
+        assert counter.value == before + 1
@@ -0,0 +1,168 @@
+"""
+Unit tests for persistence_writer module.
+"""
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bridge.config import OpenClawConfig
+from bridge.conversation_store import ConversationStore
+from bridge.history_manager import HistoryManager
+from bridge.persistence_writer import PendingTurn, PersistenceWriter
+from bridge.session_manager import SessionManager
+from bridge.websocket_client import ConnectionState, OpenClawWebSocketClient
+
+
+class BlockingHistory:
+    """History manager whose writes wait for a release event."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.batches = []
+    
+    def add_turns(self, turns):
+        self.started.set()
+        self.release.wait(timeout=5.0)
+        self.batches.append(turns)
+        return len(turns)
+
+
+def session_manager(session_id=7):
+    manager = MagicMock()
+    manager.get_session.return_value = MagicMock(id=session_id)
+    return manager
+
+
+def turn(index, role="assistant"):
+    return PendingTurn(session_uuid="uuid-1", role=role, content=f"turn {index}", turn_index=index)
+
+
+class TestPersistenceWriter:
+    """Test the background writer."""
+    
+    def test_backlog_written_as_one_batch(self):
+        """Test turns queued during a slow write share the next transaction."""
+        history = BlockingHistory()
+        writer = PersistenceWriter(history, session_manager())
+        
+        writer.submit(turn(0))
+        assert history.started.wait(timeout=2.0)
+        for i in range(1, 5):
+            writer.submit(turn(i))
+        assert writer.queue_depth == 4
+        
+        history.release.set()
+        assert writer.flush(timeout=2.0)
+        writer.close()
+        
+        assert [len(batch) for batch in history.batches] == [1, 4]
+        assert [t.turn_index for t in history.batches[1]] == [1, 2, 3, 4]
+        assert history.batches[1][0].session_id == 7
+        assert writer.stats()["turns_written"] == 5
+        assert writer.pending == 0
+    
+    def test_full_queue_drops(self):
+        """Test submit never blocks and counts dropped turns."""
+        history = BlockingHistory()
+        writer = PersistenceWriter(history, session_manager(), max_queue=2)
+        writer.submit(turn(0))
+        assert history.started.wait(timeout=2.0)
+        
+        results = [writer.submit(turn(i)) for i in range(1, 5)]
+        history.release.set()
+        writer.close()
+        
+        assert results == [True, True, False, False]
+        assert writer.turns_dropped == 2
+        assert writer.turns_written == 3
+    
+    def test_unknown_session_counted(self):
+        """Test turns whose session no longer resolves are counted, not lost silently."""
+        history = BlockingHistory()
+        history.release.set()
+        sessions = MagicMock()
+        sessions.get_session.side_effect = lambda uuid: MagicMock(id=7) if uuid == "uuid-1" else None
+        writer = PersistenceWriter(history, sessions)
+        
+        orphan = turn(1)
+        orphan.session_uuid = "uuid-gone"
+        writer.submit(turn(0))
+        writer.submit(orphan)
+        assert writer.close(timeout=2.0)
+        
+        assert writer.turns_written == 1
+        assert writer.stats()["turns_orphaned"] == 1
+    
+    def test_close_and_restart(self):
+        """Test close stops the thread and a later submit restarts it."""
+        history = BlockingHistory()
+        history.release.set()
+        writer = PersistenceWriter(history, session_manager())
+        
+        writer.submit(turn(0))
+        assert writer.close(timeout=2.0)
+        assert not writer.is_running
+        
+        writer.submit(turn(1))
+        assert writer.flush(timeout=2.0)
+        assert writer.is_running
+        writer.close()
+        assert writer.turns_written == 2
+    
+    def test_writes_to_database(self, tmp_path):
+        """Test batches land in SQLite in order with their own timestamps."""
+        store = ConversationStore(db_path=tmp_path / "sessions.db")
+        sessions = SessionManager(store)
+        with patch("bridge.history_manager.get_conversation_store", return_value=store), \
+                patch("bridge.history_manager.get_session_manager", return_value=sessions):
+            history = HistoryManager()
+        session = sessions.create_session()
+        writer = PersistenceWriter(history, sessions)
+        
+        for i, role in enumerate(["user", "assistant", "user"]):
+            pending = turn(i, role)
+            pending.session_uuid = session.session_uuid
+            writer.submit(pending)
+        assert writer.close(timeout=5.0)
+        
+        turns = history.get_session_turns(session.session_uuid)
+        assert [(t.turn_index, t.role) for t in turns] == [(0, "user"), (1, "assistant"), (2, "user")]
+        assert all(t.timestamp for t in turns)
+
+
+class TestClientPersistence:
+    """Test the WebSocket client hands turns to the writer."""
+    
+    @pytest.mark.asyncio
+    async def test_received_message_queued_and_flushed_on_disconnect(self):
+        """Test no history write happens inline and disconnect flushes."""
+        history = BlockingHistory()
+        sessions = session_manager()
+        config = MagicMock()
+        config.persistence.enabled = True
+        config.openclaw = OpenClawConfig()
+        
+        with patch("bridge.websocket_client.get_config", return_value=config), \
+                patch("bridge.websocket_client._get_history_manager", return_value=history), \
+                patch("bridge.websocket_client._get_session_manager", return_value=sessions):
+            client = OpenClawWebSocketClient(config=OpenClawConfig())
+            client._state = ConnectionState.CONNECTED
+            client.websocket = AsyncMock()
+            client.voice_session_id = "uuid-1"
+            client._turn_index = 0
+            
+            client._persist_message({"type": "response", "text": "Hi there"})
+            client._persist_message({"type": "ping"})
+            assert client._turn_index == 1
+            assert history.batches == []
+            
+            history.release.set()
+            await client.disconnect()
+        
+        assert len(history.batches) == 1
+        written = history.batches[0][0]
+        assert (written.role, written.content, written.session_id) == ("assistant", "Hi there", 7)
+        assert sessions.close_session.called
+        assert client.get_stats()["persistence"]["turns_written"] == 1
@@ -0,0 +1,147 @@
+"""
+Unit tests for pipeline_host module.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from bridge.audio_pipeline import AudioDeviceManager, PipelineState
+from bridge.config import AudioConfig
+from bridge.pipeline_host import PipelineHost
+from bridge.replay import FAST_QUEUE_FRAMES, ReplaySource, synthetic_speech
+from bridge.vad import EnergyVAD, VADBackend, VADConfig
+
+
+@pytest.fixture
+def host():
+    """Host with energy VADs and a shared device manager."""
+    host = PipelineHost(
+        audio_config=AudioConfig(sample_rate=16000),
+        vad_config=VADConfig(backend=VADBackend.ENERGY),
+        device_manager=AudioDeviceManager()
+    )
+    yield host
+    host.stop()
+
+
+def replay_source(host, audio, sample_rate=16000):
+    """Fast replay source paced by the host's backlog."""
+    source = ReplaySource(audio, sample_rate, realtime=False)
+    source.backpressure = lambda: host.backlog() >= FAST_QUEUE_FRAMES
+    return source
+
+
+def drain(host, timeout=2.0):
+    """Wait until the host's worker has analysed every queued frame."""
+    deadline = time.monotonic() + timeout
+    while host.backlog() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestRouting:
+    """Test sources and pipeline routing."""
+    
+    def test_pipelines_take_free_channels(self, host):
+        """Test pipelines get consecutive channels and share devices."""
+        source = host.add_source(4, stream_factory=lambda **kwargs: None)
+        first = host.add_pipeline(source)
+        second = host.add_pipeline(source, channel=3)
+        third = host.add_pipeline(source)
+        
+        assert [channel for _, channel in source.routes] == [0, 3, 1]
+        assert host.pipelines == [first, second, third]
+        assert first.device_manager is host.device_manager
+        assert third.device_manager is host.device_manager
+    
+    def test_invalid_channels_rejected(self, host):
+        """Test out-of-range, duplicate and exhausted channels raise."""
+        source = host.add_source(2, stream_factory=lambda **kwargs: None)
+        host.add_pipeline(source, channel=0)
+        
+        with pytest.raises(ValueError):
+            host.add_pipeline(source, channel=2)
+        with pytest.raises(ValueError):
+            host.add_pipeline(source, channel=0)
+        host.add_pipeline(source)
+        with pytest.raises(ValueError):
+            host.add_pipeline(source)
+    
+    def test_start_without_pipelines_fails(self, host):
+        """Test an empty host does not start."""
+        assert host.start() is False
+        assert not host.is_running
+
+
+class TestBatchedAnalysis:
+    """Test the shared analysis worker."""
+    
+    def test_round_matches_per_frame_vad(self, host):
+        """Test batched energies drive each VAD as process_frame would."""
+        source = host.add_source(3, stream_factory=lambda **kwargs: None)
+        pipelines = [host.add_pipeline(source) for _ in range(3)]
+        for pipeline in pipelines:
+            pipeline.attach_capture(16000, host.frame_size)
+        
+        rng = np.random.default_rng(0)
+        frames = (rng.standard_normal((3, host.frame_size)) * [[50], [2000], [8000]]).astype(np.int16)
+        reference = EnergyVAD(host.vad_config)
+        expected = [reference.frame_energy(frame) for frame in frames]
+        for pipeline, frame in zip(pipelines[:2], frames):
+            pipeline.input_buffer.write(frame, block=False, timestamp=1.0)
+        
+        batch = np.zeros((3, host.frame_size), dtype=np.int16)
+        analysed = host._analyse_round(pipelines, batch, np.zeros(3), [])
+        
+        assert analysed == 2
+        assert pipelines[0].vad.current_energy == pytest.approx(expected[0], rel=1e-5)
+        assert pipelines[1].vad.current_energy == pytest.approx(expected[1], rel=1e-5)
+        assert pipelines[2].vad.current_energy == 0.0
+        assert pipelines[1].activity.latest.energy == pytest.approx(expected[1] / 32768, rel=1e-5)
+        assert pipelines[0].input_buffer.stats['underflow_count'] == 0
+        assert pipelines[2].input_buffer.stats['underflow_count'] == 0
+    
+    def test_channels_reach_their_pipelines(self, host):
+        """Test replayed multichannel audio is segmented per channel."""
+        speech = synthetic_speech(4.0, 16000)
+        audio = np.zeros((speech.shape[0], 3), dtype=np.int16)
+        audio[:, 1] = speech
+        audio[:, 2] = speech
+        replay = replay_source(host, audio)
+        source = host.add_source(3, stream_factory=replay)
+        quiet, talker, second_talker = (host.add_pipeline(source) for _ in range(3))
+        
+        assert host.start()
+        assert {p.state.value for p in host.pipelines} == {PipelineState.LISTENING.value}
+        assert replay.wait(timeout=10.0)
+        drain(host)
+        host.stop()
+        
+        assert quiet.stats.speech_segments_detected == 0
+        assert talker.stats.speech_segments_detected == 2
+        assert second_talker.stats.speech_segments_detected == 2
+        assert host.stats()['frames_analysed'] > 3 * 100
+        assert host.stats()['frames_dropped'] == 0
+        assert {p.state.value for p in host.pipelines} == {PipelineState.IDLE.value}
+    
+    def test_multiple_sources_resampled(self, host):
+        """Test pipelines on a 48 kHz source are resampled to the VAD rate."""
+        wide = replay_source(host, np.repeat(
+            synthetic_speech(2.0, 48000)[:, None], 2, axis=1
+        ), sample_rate=48000)
+        narrow = replay_source(host, synthetic_speech(2.0, 16000)[:, None])
+        wide_source = host.add_source(2, sample_rate=48000, stream_factory=wide)
+        narrow_source = host.add_source(1, stream_factory=narrow)
+        wide_pipelines = [host.add_pipeline(wide_source) for _ in range(2)]
+        narrow_pipeline = host.add_pipeline(narrow_source)
+        
+        assert host.start()
+        assert wide.wait(timeout=10.0) and narrow.wait(timeout=10.0)
+        drain(host)
+        host.stop()
+        
+        for pipeline in wide_pipelines + [narrow_pipeline]:
+            assert pipeline.stats.speech_segments_detected == 1
+        assert wide_pipelines[0].input_buffer.stats['total_read'] == pytest.approx(
+            narrow_pipeline.input_buffer.stats['total_read'], abs=2
+        )
@@ -0,0 +1,156 @@
+"""
+Unit tests for replay module.
+"""
+import time
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from bridge.audio_pipeline import AudioPipeline, PipelineState
+from bridge.config import AudioConfig
+from bridge.metrics import get_metrics_registry
+from bridge.replay import (
+    ReplayHarness,
+    ReplaySink,
+    ReplaySource,
+    synthetic_speech,
+)
+from bridge.vad import VADBackend, VADConfig
+
+
+class TestSyntheticSpeech:
+    """Test synthetic_speech."""
+    
+    def test_bursts_and_gaps(self):
+        """Test voiced bursts alternate with near-silence deterministically."""
+        audio = synthetic_speech(4.0, 16000, burst_ms=500, gap_ms=500)
+        
+        assert audio.dtype == np.int16
+        assert audio.shape == (64000,)
+        assert np.abs(audio[:8000]).max() > 5000
+        assert np.abs(audio[8000:16000]).max() < 500
+        assert np.array_equal(audio, synthetic_speech(4.0, 16000, burst_ms=500, gap_ms=500))
+
+
+class TestReplaySource:
+    """Test ReplaySource."""
+    
+    def test_delivers_blocks_like_input_stream(self):
+        """Test callback receives (frames, channels) blocks and a padded tail."""
+        audio = np.arange(1000, dtype=np.int16).reshape(-1, 2)
+        source = ReplaySource(audio, 8000)
+        blocks = []
+        
+        stream = source(
+            callback=lambda indata, frames, time_info, status: blocks.append(
+                (indata.copy(), frames, time_info)
+            ),
+            samplerate=8000, blocksize=200, channels=2, dtype=np.int16, device=-1
+        )
+        stream.start()
+        assert source.wait(timeout=5.0)
+        stream.stop()
+        
+        assert len(blocks) == 3
+        assert all(block.shape == (200, 2) and frames == 200 for block, frames, _ in blocks)
+        assert np.array_equal(blocks[0][0], audio[:200])
+        assert np.all(blocks[2][0][100:] == 0)
+        assert blocks[1][2].inputBufferAdcTime - blocks[0][2].inputBufferAdcTime == pytest.approx(0.025)
+    
+    def test_rate_mismatch_rejected(self):
+        """Test opening at a different rate than the audio fails."""
+        source = ReplaySource(np.zeros(100, dtype=np.int16), 16000)
+        
+        with pytest.raises(ValueError):
+            source(callback=lambda *a: None, samplerate=48000, blocksize=10)
+    
+    def test_from_wav(self, tmp_path):
+        """Test WAV files load with their rate and channels."""
+        path = tmp_path / "stereo.wav"
+        data = np.arange(200, dtype=np.int16)
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(22050)
+            wav.writeframes(data.tobytes())
+        
+        source = ReplaySource.from_wav(path)
+        
+        assert source.sample_rate == 22050
+        assert source.channels == 2
+        assert source.device_info.channels == 2
+        assert np.array_equal(source.audio[:, 1], data[1::2])
+
+
+class TestReplaySink:
+    """Test ReplaySink."""
+    
+    def test_records_output_when_ready(self):
+        """Test fast-mode sink pulls only while ready and records the blocks."""
+        sink = ReplaySink()
+        pending = [3]
+        
+        def callback(outdata, frames, time_info, status):
+            outdata.fill(pending[0])
+            pending[0] -= 1
+        
+        sink.ready = lambda: pending[0] > 0
+        stream = sink(callback=callback, samplerate=16000, blocksize=64, channels=1)
+        stream.start()
+        deadline = 200
+        while pending[0] > 0 and deadline:
+            time.sleep(0.005)
+            deadline -= 1
+        stream.stop()
+        
+        assert sink.blocks_played == 3
+        assert np.array_equal(sink.audio, np.repeat([3, 2, 1], 64).astype(np.int16))
+
+
+class TestReplayHarness:
+    """Test running a pipeline from a replay source."""
+    
+    def test_fast_replay_segments_every_burst(self):
+        """Test each synthetic burst becomes a segment with no dropped frames."""
+        source = ReplaySource(synthetic_speech(8.0, 16000), 16000)
+        pipeline = AudioPipeline(
+            audio_config=AudioConfig(),
+            vad_config=VADConfig(backend=VADBackend.ENERGY)
+        )
+        segments = []
+        pipeline._on_speech_segment = segments.append
+        
+        result = ReplayHarness(pipeline, source).run(timeout=30.0)
+        
+        assert result.blocks == 267
+        assert result.frames_analysed == 267
+        assert result.frames_dropped == 0
+        assert len(segments) == 4
+        assert result.realtime_factor > 1.0
+    
+    def test_responses_recorded_and_pipeline_relistens(self):
+        """Test queued responses reach the sink and listening resumes."""
+        source = ReplaySource(synthetic_speech(4.0, 16000), 16000)
+        pipeline = AudioPipeline(
+            audio_config=AudioConfig(),
+            vad_config=VADConfig(backend=VADBackend.ENERGY)
+        )
+        response = np.full(1600, 1000, dtype=np.int16)
+        pipeline._on_speech_segment = lambda segment: pipeline.play_audio(response)
+        turn_hist = get_metrics_registry().histogram("turn_latency_seconds")
+        lag_hist = get_metrics_registry().histogram("audio_capture_to_analysis_seconds")
+        before = (turn_hist.count, lag_hist.count)
+        
+        with patch("bridge.latency.logger") as latency_logger:
+            result = ReplayHarness(pipeline, source).run(timeout=30.0)
+            pipeline.latency_tracer.finish_turn()
+        
+        assert pipeline.stats.speech_segments_detected == 2
+        # Fast replay keeps traces but neither observes nor logs their spans
+        assert len(pipeline.latency_tracer.recent()) >= 1
+        assert (turn_hist.count, lag_hist.count) == before
+        assert not latency_logger.info.called
+        assert np.count_nonzero(result.played == 1000) == 2 * 1600
+        assert pipeline.state == PipelineState.IDLE
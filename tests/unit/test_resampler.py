@@ -0,0 +1,89 @@
+"""
+Unit tests for resampler module.
+"""
+import numpy as np
+import pytest
+
+from bridge.resampler import StreamingResampler
+
+
+def _tone(rate: int, freq: float, seconds: float = 1.0, amplitude: float = 10000.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _run(resampler: StreamingResampler, samples: np.ndarray, block: int) -> np.ndarray:
+    out = [
+        resampler.process(samples[i:i + block]).copy()
+        for i in range(0, samples.shape[0] - block + 1, block)
+    ]
+    return np.concatenate(out)
+
+
+class TestStreamingResampler:
+    """Test cases for StreamingResampler."""
+    
+    @pytest.mark.parametrize("rate,block", [(48000, 1440), (44100, 1323)])
+    def test_device_block_yields_one_vad_frame(self, rate, block):
+        """Test a 30 ms device block becomes exactly one 30 ms 16 kHz frame."""
+        resampler = StreamingResampler(rate, 16000)
+        samples = _tone(rate, 1000)
+        
+        for i in range(0, samples.shape[0] - block + 1, block):
+            assert resampler.process(samples[i:i + block]).shape[0] == 480
+    
+    @pytest.mark.parametrize("rate,block", [(48000, 1440), (44100, 1323), (22050, 661)])
+    def test_passband_preserved_across_blocks(self, rate, block):
+        """Test a 1 kHz tone keeps its level and frequency through block edges."""
+        y = _run(StreamingResampler(rate, 16000), _tone(rate, 1000), block)
+        steady = y[1600:].astype(np.float64)
+        
+        rms = np.sqrt(np.mean(steady ** 2))
+        assert rms == pytest.approx(10000 / np.sqrt(2), rel=0.02)
+        spectrum = np.abs(np.fft.rfft(steady))
+        peak_hz = np.argmax(spectrum) * 16000 / steady.shape[0]
+        assert peak_hz == pytest.approx(1000, abs=5)
+    
+    def test_stopband_rejects_aliases(self):
+        """Test content above the output Nyquist rate is attenuated."""
+        y = _run(StreamingResampler(48000, 16000), _tone(48000, 9000), 1440)
+        
+        rms = np.sqrt(np.mean(y[1600:].astype(np.float64) ** 2))
+        assert rms < 10000 / np.sqrt(2) * 0.05
+    
+    def test_block_size_does_not_change_output(self):
+        """Test streaming state makes output independent of block boundaries."""
+        samples = _tone(44100, 440, seconds=0.5)
+        a = _run(StreamingResampler(44100, 16000), samples, 1323)
+        b = _run(StreamingResampler(44100, 16000), samples, 441)
+        
+        n = min(a.shape[0], b.shape[0])
+        assert np.array_equal(a[:n], b[:n])
+    
+    def test_steady_state_reuses_plans(self):
+        """Test repeated blocks reuse cached gather plans and buffers."""
+        resampler = StreamingResampler(48000, 16000)
+        block = np.zeros(1440, dtype=np.int16)
+        
+        first = resampler.process(block)
+        for _ in range(10):
+            again = resampler.process(block)
+        
+        assert len(resampler._plans) == 1
+        assert np.shares_memory(first, again)
+    
+    def test_out_parameter(self):
+        """Test writing into a caller-supplied array."""
+        resampler = StreamingResampler(48000, 16000)
+        out = np.zeros(480, dtype=np.int16)
+        
+        result = resampler.process(_tone(48000, 1000, seconds=0.03), out=out)
+        
+        assert np.shares_memory(result, out)
+    
+    def test_rejects_oversized_block(self):
+        """Test blocks beyond max_block raise ValueError."""
+        resampler = StreamingResampler(48000, 16000, max_block=100)
+        
+        with pytest.raises(ValueError):
+            resampler.process(np.zeros(101, dtype=np.int16))
@@ -0,0 +1,141 @@
+"""
+Unit tests for send_queue module.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bridge.config import OpenClawConfig
+from bridge.metrics import get_metrics_registry
+from bridge.send_queue import OutboundMessage, OutboundQueue, SendPriority
+from bridge.websocket_client import (
+    ConnectionState,
+    ControlAction,
+    OpenClawWebSocketClient,
+)
+
+
+def outbound(name, priority=SendPriority.VOICE, key=None):
+    return OutboundMessage(message={"name": name}, payload=name, priority=priority, coalesce_key=key)
+
+
+class TestOutboundQueue:
+    """Test lanes and coalescing."""
+    
+    def test_lanes_drain_in_priority_order(self):
+        """Test control messages overtake voice input and pings."""
+        queue = OutboundQueue()
+        for item in (
+            outbound("ping", SendPriority.BACKGROUND),
+            outbound("voice-1"),
+            outbound("interrupt", SendPriority.CONTROL),
+            outbound("voice-2"),
+        ):
+            queue.put(item)
+        
+        order = []
+        while (item := queue.pop()) is not None:
+            order.append(item.payload)
+        
+        assert order == ["interrupt", "voice-1", "voice-2", "ping"]
+    
+    def test_coalesce_keeps_place_and_latest_payload(self):
+        """Test a superseded message is replaced in its original slot."""
+        queue = OutboundQueue()
+        queue.put(outbound("mute", SendPriority.CONTROL, key="control:mute"))
+        queue.put(outbound("interrupt", SendPriority.CONTROL))
+        accepted, queued = queue.put(outbound("unmute", SendPriority.CONTROL, key="control:mute"))
+        
+        assert accepted
+        assert queued.coalesced == 1
+        assert len(queue) == 2
+        assert [queue.pop().payload, queue.pop().payload] == ["unmute", "interrupt"]
+        assert queue.coalesced == 1
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_and_clear(self):
+        """Test put refuses past max_size and clear resolves waiters."""
+        queue = OutboundQueue(max_size=1)
+        first = outbound("a")
+        waiter = asyncio.get_running_loop().create_future()
+        first.waiters.append(waiter)
+        
+        assert queue.put(first)[0]
+        assert not queue.put(outbound("b"))[0]
+        assert queue.clear(sent=False) == 1
+        assert waiter.result() is False
+        assert queue.stats()["rejected"] == 1
+
+
+@pytest.fixture
+def client():
+    """Connected client whose socket takes 20 ms per message."""
+    config = MagicMock()
+    config.persistence.enabled = False
+    config.openclaw = OpenClawConfig()
+    with patch("bridge.websocket_client.get_config", return_value=config):
+        client = OpenClawWebSocketClient(config=OpenClawConfig())
+    client._state = ConnectionState.CONNECTED
+    client.sent = []
+    
+    async def slow_send(payload):
+        await asyncio.sleep(0.02)
+        client.sent.append(json.loads(payload))
+    
+    client.websocket = AsyncMock()
+    client.websocket.send = slow_send
+    return client
+
+
+class TestClientSendQueue:
+    """Test the client's queued send path."""
+    
+    @pytest.mark.asyncio
+    async def test_interrupt_overtakes_voice_input(self, client):
+        """Test an interrupt is written before voice input queued earlier."""
+        client._send_task = asyncio.create_task(client._send_loop())
+        try:
+            voice = [
+                asyncio.create_task(client.send_voice_input(f"utterance {i}"))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.005)  # First utterance is being written
+            assert await client.send_interrupt()
+            assert all(await asyncio.gather(*voice))
+        finally:
+            client._send_task.cancel()
+        
+        kinds = [m.get("action") or m["text"] for m in client.sent]
+        assert kinds == ["utterance 0", "interrupt", "utterance 1", "utterance 2"]
+        hist = get_metrics_registry().histogram(
+            "ws_send_queue_seconds", labels={"lane": "control"}
+        )
+        assert hist.snapshot()["count"] >= 1
+    
+    @pytest.mark.asyncio
+    async def test_pings_and_mute_coalesced(self, client):
+        """Test queued pings collapse and unmute supersedes a queued mute."""
+        client._send_task = asyncio.create_task(client._send_loop())
+        try:
+            first = asyncio.create_task(client.send_voice_input("busy"))
+            await asyncio.sleep(0.005)
+            for _ in range(3):
+                assert await client.send({"type": "ping", "timestamp": 1.0}, wait=False)
+            mute = asyncio.create_task(client.send_control(ControlAction.MUTE))
+            unmute = asyncio.create_task(client.send_control(ControlAction.UNMUTE))
+            assert await first and await mute and await unmute
+            await asyncio.sleep(0.05)
+        finally:
+            client._send_task.cancel()
+        
+        types = [m.get("action") or m["type"] for m in client.sent]
+        assert types == ["voice_input", "unmute", "ping"]
+        assert client.get_stats()["send_queue"]["coalesced"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_direct_send_without_sender_task(self, client):
+        """Test messages are written inline when no sender task runs."""
+        assert await client.send_voice_input("hello")
+        assert client.sent[0]["text"] == "hello"
@@ -13,7 +13,16 @@ from bridge.vad import (
     VADState,
     SpeechSegmenter,
     SpeechSegment,
+    SpeechChunkType,
+    SegmentAccumulator,
+    PreRollRing,
     MockVAD,
+    EnergyVAD,
+    VADBackend,
+    create_vad,
+    open_pcm16_wav,
+    process_wav_file,
+    read_pcm16_frames,
 )
 from bridge.audio_pipeline import (
     AudioDeviceManager,
@@ -93,6 +102,96 @@ class TestMockVAD:
         assert vad_high.process_frame(high_energy)
 
 
+class TestEnergyVAD:
+    """Test the energy VAD backend."""
+    
+    def test_detects_speech_over_silence(self):
+        """Test basic energy thresholding."""
+        vad = EnergyVAD(VADConfig(mode=VADMode.MEDIUM))
+        
+        assert not vad.process_frame(np.zeros(480, dtype=np.int16))
+        assert vad.process_frame(np.full(480, 1000, dtype=np.int16))
+        assert vad.state == VADState.SPEECH
+        assert vad.current_energy == pytest.approx(1000.0)
+    
+    def test_speech_probability_scales_with_threshold(self):
+        """Test the soft score is 0.5 at threshold and saturates at 1.0."""
+        vad = EnergyVAD(VADConfig(mode=VADMode.MEDIUM), adaptive=False, hysteresis=1.0)
+        
+        vad.process_frame(np.full(480, 150, dtype=np.int16))
+        assert vad.speech_probability == pytest.approx(0.25)
+        vad.process_frame(np.full(480, 300, dtype=np.int16))
+        assert vad.speech_probability == pytest.approx(0.5)
+        vad.process_frame(np.full(480, 5000, dtype=np.int16))
+        assert vad.speech_probability == 1.0
+    
+    def test_noise_floor_raises_threshold(self):
+        """Test steady background noise stops counting as speech."""
+        vad = EnergyVAD(VADConfig(mode=VADMode.NORMAL), noise_alpha=0.5)
+        noise = np.full(480, 400, dtype=np.int16)
+        
+        # Loud fan: over the absolute threshold, but the floor adapts
+        vad.noise_floor = 300.0
+        assert not vad.process_frame(noise)
+        assert vad.noise_floor > 300.0
+        
+        # Speech well above the floor is still detected
+        assert vad.process_frame(np.full(480, 3000, dtype=np.int16))
+    
+    def test_hysteresis_holds_speech(self):
+        """Test energy just under the onset threshold keeps speech on."""
+        vad = EnergyVAD(VADConfig(mode=VADMode.MEDIUM), adaptive=False, hysteresis=0.7)
+        
+        assert not vad.process_frame(np.full(480, 250, dtype=np.int16))
+        assert vad.process_frame(np.full(480, 400, dtype=np.int16))
+        assert vad.process_frame(np.full(480, 250, dtype=np.int16))
+        assert not vad.process_frame(np.full(480, 150, dtype=np.int16))
+    
+    def test_batch_matches_per_frame(self):
+        """Test batch scoring gives the same decisions as frame-by-frame."""
+        rng = np.random.default_rng(0)
+        levels = rng.choice([0, 200, 400, 2000], size=200)
+        samples = np.repeat(levels, 480).astype(np.int16)
+        
+        batch = EnergyVAD(VADConfig(mode=VADMode.MEDIUM)).process_batch(samples)
+        single = EnergyVAD(VADConfig(mode=VADMode.MEDIUM))
+        expected = [single.process_frame(f) for f in samples.reshape(-1, 480)]
+        
+        assert batch.tolist() == expected
+    
+    def test_process_energy_matches_process_frame(self):
+        """Test feeding precomputed energies gives the same decisions."""
+        frames = [np.full(480, level, dtype=np.int16) for level in (0, 200, 2000, 250, 0)]
+        by_frame = EnergyVAD(VADConfig(mode=VADMode.MEDIUM))
+        by_energy = EnergyVAD(VADConfig(mode=VADMode.MEDIUM))
+        
+        for frame in frames:
+            assert by_energy.process_energy(by_energy.frame_energy(frame)) == by_frame.process_frame(frame)
+            assert by_energy.state == by_frame.state
+            assert by_energy.noise_floor == by_frame.noise_floor
+    
+    def test_batch_vectorized_without_state(self):
+        """Test the stateless configuration uses the pure vectorized path."""
+        vad = EnergyVAD(VADConfig(mode=VADMode.LOW), adaptive=False, hysteresis=1.0)
+        samples = np.repeat(np.array([0, 1000, 100, 300]), 480).astype(np.int16)
+        
+        assert vad.process_batch(samples).tolist() == [False, True, False, True]
+    
+    def test_create_vad_backend_selection(self):
+        """Test VADConfig.backend selects the engine."""
+        assert isinstance(create_vad(VADConfig(backend=VADBackend.ENERGY)), EnergyVAD)
+        webrtc = create_vad(VADConfig(backend=VADBackend.WEBRTC))
+        assert isinstance(webrtc, WebRTCVAD)
+    
+    def test_create_vad_falls_back_without_webrtc(self, monkeypatch):
+        """Test AUTO and WEBRTC use the energy VAD when webrtcvad is missing."""
+        import bridge.vad
+        monkeypatch.setattr(bridge.vad, 'WEBRTC_AVAILABLE', False)
+        
+        assert isinstance(create_vad(VADConfig()), EnergyVAD)
+        assert isinstance(create_vad(VADConfig(backend=VADBackend.WEBRTC)), EnergyVAD)
+
+
 class TestSpeechSegment:
     """Test SpeechSegment dataclass."""
     
@@ -180,14 +279,14 @@ class TestSpeechSegmenter:
         # Simulate being in speech
         segmenter._in_speech = True
         segmenter._speech_start_time = time.time()
-        segmenter._buffered_frames = [np.zeros(480, dtype=np.int16)]
+        segmenter._accumulator.append(np.zeros(480, dtype=np.int16))
         
         # Reset
         segmenter.reset()
         
         assert not segmenter._in_speech
         assert segmenter._speech_start_time is None
-        assert len(segmenter._buffered_frames) == 0
+        assert segmenter._accumulator.length == 0
     
     def test_flush(self):
         """Test flushing pending speech."""
@@ -198,7 +297,8 @@ class TestSpeechSegmenter:
         speech = np.full(480, 2000, dtype=np.int16)
         segmenter._in_speech = True
         segmenter._speech_start_time = time.time() - 0.5  # 500ms ago
-        segmenter._buffered_frames = [speech.copy() for _ in range(10)]
+        for _ in range(10):
+            segmenter._accumulator.append(speech)
         
         # Flush
         result = segmenter.flush()
@@ -216,13 +316,332 @@ class TestSpeechSegmenter:
         speech = np.full(480, 2000, dtype=np.int16)
         segmenter._in_speech = True
         segmenter._speech_start_time = time.time() - 0.1  # 100ms ago
-        segmenter._buffered_frames = [speech.copy() for _ in range(3)]
+        for _ in range(3):
+            segmenter._accumulator.append(speech)
         
         # Flush
         result = segmenter.flush()
         
         # Should be None because speech was too short
         assert result is None
+    
+    def test_segment_audio_is_view_of_accumulator(self):
+        """Test emitted audio is handed out without a final concatenate."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=60,
+            padding_duration_ms=0
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        speech = np.full(480, 2000, dtype=np.int16)
+        silence = np.zeros(480, dtype=np.int16)
+        
+        t = 0.0
+        for _ in range(10):
+            assert segmenter.process_frame(speech, timestamp=t) is None
+            t += 0.03
+        segment = None
+        while segment is None:
+            segment = segmenter.process_frame(silence, timestamp=t)
+            t += 0.03
+        
+        assert segment.audio_data.base is not None
+        assert np.all(segment.audio_data[:10 * 480] == 2000)
+        assert len(segment.audio_data) == 10 * 480 + 2 * 480
+    
+    def test_precomputed_decision_skips_vad(self):
+        """Test a decision passed in is used instead of running the VAD."""
+        config = VADConfig(
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=60,
+            padding_duration_ms=0
+        )
+        vad = MockVAD(config)
+        segmenter = SpeechSegmenter(vad, config)
+        frame = np.zeros(480, dtype=np.int16)
+        
+        segment = None
+        for i, is_speech in enumerate([True] * 5 + [False] * 3):
+            segment = segmenter.process_frame(frame, timestamp=i * 0.03, is_speech=is_speech) or segment
+        
+        assert vad._frame_count == 0
+        assert segment is not None
+        assert segment.duration_ms == pytest.approx(150)
+    
+    def test_max_speech_duration_forces_segment(self):
+        """Test utterances are cut at max_speech_duration_ms."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            max_speech_duration_ms=300,
+            padding_duration_ms=0
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        speech = np.full(480, 2000, dtype=np.int16)
+        
+        segments = []
+        for i in range(25):
+            segment = segmenter.process_frame(speech, timestamp=i * 0.03)
+            if segment is not None:
+                segments.append(segment)
+        
+        assert len(segments) == 2
+        assert all(len(s.audio_data) == 4800 for s in segments)
+        assert not np.shares_memory(segments[0].audio_data, segments[1].audio_data)
+
+
+class TestSegmentPadding:
+    """Test pre-roll and trailing padding on segments."""
+    
+    def _run(self, segmenter, frames):
+        segments = []
+        for i, frame in enumerate(frames):
+            segment = segmenter.process_frame(frame, timestamp=i * 0.03)
+            if segment is not None:
+                segments.append(segment)
+        return segments
+    
+    def test_pre_roll_prepended(self):
+        """Test the full padding duration of audio precedes the onset."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=90,
+            padding_duration_ms=90
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        quiet = [np.full(480, i, dtype=np.int16) for i in range(5)]
+        speech = [np.full(480, 2000, dtype=np.int16)] * 4
+        silence = [np.zeros(480, dtype=np.int16)] * 5
+        
+        segments = self._run(segmenter, quiet + speech + silence)
+        
+        assert len(segments) == 1
+        audio = segments[0].audio_data
+        assert audio[:3 * 480:480].tolist() == [2, 3, 4]
+        assert np.all(audio[3 * 480:7 * 480] == 2000)
+        assert segments[0].start_time == pytest.approx(5 * 0.03)
+    
+    def test_pre_roll_short_history(self):
+        """Test speech right after start only gets the audio seen so far."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=60,
+            padding_duration_ms=300
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        frames = [np.ones(480, dtype=np.int16)] + [np.full(480, 2000, dtype=np.int16)] * 3
+        
+        segments = self._run(segmenter, frames + [np.zeros(480, dtype=np.int16)] * 3)
+        
+        assert len(segments[0].audio_data) == (1 + 3 + 2) * 480
+    
+    def test_trailing_padding_trims_silence(self):
+        """Test trailing silence is cut to trailing_padding_ms."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=300,
+            padding_duration_ms=0,
+            trailing_padding_ms=60
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        frames = [np.full(480, 2000, dtype=np.int16)] * 5 + [np.zeros(480, dtype=np.int16)] * 12
+        
+        segments = self._run(segmenter, frames)
+        
+        assert len(segments) == 1
+        assert len(segments[0].audio_data) == (5 + 2) * 480
+    
+    def test_prime_loads_pre_roll(self):
+        """Test primed audio leads the next utterance."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=60,
+            padding_duration_ms=60
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        segmenter.prime(np.arange(2000, dtype=np.int16))
+        
+        segments = self._run(segmenter, [np.full(480, 2000, dtype=np.int16)] * 3
+                             + [np.zeros(480, dtype=np.int16)] * 3)
+        
+        assert np.array_equal(segments[0].audio_data[:960], np.arange(1040, 2000))
+
+
+class TestSpeechStreaming:
+    """Test partial SpeechChunk emission."""
+    
+    def _run(self, segmenter, speech_frames, silence_frames):
+        speech = np.full(480, 2000, dtype=np.int16)
+        silence = np.zeros(480, dtype=np.int16)
+        segments = []
+        t = 0.0
+        for frame in [silence] * 2 + [speech] * speech_frames + [silence] * silence_frames:
+            segment = segmenter.process_frame(frame, timestamp=t)
+            if segment is not None:
+                segments.append(segment)
+            t += 0.03
+        return segments
+    
+    def test_chunks_cover_segment(self):
+        """Test START/CONTINUE/END chunks reassemble to the segment audio."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=90,
+            padding_duration_ms=60,
+            stream_chunk_ms=90
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        chunks = []
+        segmenter.on_chunk = chunks.append
+        
+        segments = self._run(segmenter, speech_frames=10, silence_frames=5)
+        
+        assert len(segments) == 1
+        types = [c.chunk_type for c in chunks]
+        assert types[0] == SpeechChunkType.START
+        assert types[-1] == SpeechChunkType.END
+        assert all(t == SpeechChunkType.CONTINUE for t in types[1:-1])
+        assert np.array_equal(
+            np.concatenate([c.audio_data for c in chunks]), segments[0].audio_data
+        )
+        # Utterance starts two padding frames before onset (stream frame 0)
+        assert chunks[0].sample_offset == 0
+        for prev, cur in zip(chunks, chunks[1:]):
+            assert cur.sample_offset == prev.sample_offset + len(prev.audio_data)
+    
+    def test_offsets_monotonic_across_utterances(self):
+        """Test sample offsets keep increasing for later utterances."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=60,
+            min_silence_duration_ms=90,
+            padding_duration_ms=0,
+            stream_chunk_ms=60
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        chunks = []
+        segmenter.on_chunk = chunks.append
+        
+        self._run(segmenter, speech_frames=4, silence_frames=5)
+        self._run(segmenter, speech_frames=4, silence_frames=5)
+        
+        assert [c.utterance_id for c in chunks if c.chunk_type == SpeechChunkType.START] == [1, 2]
+        offsets = [c.sample_offset for c in chunks]
+        assert offsets == sorted(offsets)
+        second_start = next(c for c in chunks if c.utterance_id == 2)
+        assert second_start.sample_offset == (2 + 4 + 5 + 2) * 480
+    
+    def test_short_utterance_end_is_discarded(self):
+        """Test a streamed utterance that is too short ends with discarded=True."""
+        config = VADConfig(
+            mode=VADMode.NORMAL,
+            min_speech_duration_ms=300,
+            min_silence_duration_ms=60,
+            padding_duration_ms=0,
+            stream_chunk_ms=30
+        )
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        chunks = []
+        segmenter.on_chunk = chunks.append
+        
+        segments = self._run(segmenter, speech_frames=3, silence_frames=4)
+        
+        assert segments == []
+        assert chunks[-1].chunk_type == SpeechChunkType.END
+        assert chunks[-1].discarded
+    
+    def test_streaming_disabled_by_default(self):
+        """Test no chunks are emitted without stream_chunk_ms."""
+        config = VADConfig(mode=VADMode.NORMAL, min_speech_duration_ms=60,
+                           min_silence_duration_ms=90)
+        segmenter = SpeechSegmenter(MockVAD(config), config)
+        chunks = []
+        segmenter.on_chunk = chunks.append
+        
+        assert len(self._run(segmenter, speech_frames=10, silence_frames=5)) == 1
+        assert chunks == []
+
+
+class TestSegmentAccumulator:
+    """Test the in-place utterance accumulator."""
+    
+    def test_append_and_view(self):
+        """Test frames are written contiguously."""
+        acc = SegmentAccumulator(initial_samples=16)
+        acc.append(np.full(10, 1, dtype=np.int16))
+        acc.append(np.full(10, 2, dtype=np.int16))
+        
+        data = acc.view()
+        assert acc.length == 20
+        assert np.all(data[:10] == 1)
+        assert np.all(data[10:] == 2)
+    
+    def test_capacity_doubles(self):
+        """Test growth is amortised by doubling."""
+        acc = SegmentAccumulator(initial_samples=100)
+        frame = np.ones(100, dtype=np.int16)
+        
+        for _ in range(16):
+            acc.append(frame)
+        
+        assert acc.capacity == 1600
+        assert acc.grow_count == 4
+    
+    def test_cap_truncates(self):
+        """Test appends stop at max_samples."""
+        acc = SegmentAccumulator(initial_samples=8, max_samples=25)
+        frame = np.ones(10, dtype=np.int16)
+        
+        assert acc.append(frame) == 10
+        assert acc.append(frame) == 10
+        assert acc.append(frame) == 5
+        assert acc.append(frame) == 0
+        assert acc.is_full
+        assert acc.capacity == 25
+    
+    def test_detach_starts_new_buffer(self):
+        """Test detached data is not overwritten by the next utterance."""
+        acc = SegmentAccumulator(initial_samples=16)
+        acc.append(np.full(10, 1, dtype=np.int16))
+        first = acc.detach()
+        acc.append(np.full(10, 2, dtype=np.int16))
+        
+        assert acc.length == 10
+        assert np.all(first == 1)
+        assert not np.shares_memory(first, acc.view())
+
+
+class TestPreRollRing:
+    """Test the fixed-size pre-roll ring."""
+    
+    def test_parts_oldest_first_after_wrap(self):
+        """Test wrapped contents come back as two ordered views."""
+        ring = PreRollRing(10)
+        ring.push(np.arange(4, dtype=np.int16))
+        assert np.concatenate(ring.parts()).tolist() == [0, 1, 2, 3]
+        
+        ring.push(np.arange(4, 12, dtype=np.int16))
+        first, second = ring.parts()
+        
+        assert ring.length == 10
+        assert np.concatenate((first, second)).tolist() == list(range(2, 12))
+        assert np.shares_memory(first, ring._data)
+    
+    def test_large_frame_and_disabled_ring(self):
+        """Test oversized frames keep their tail and capacity 0 holds nothing."""
+        ring = PreRollRing(3)
+        ring.push(np.arange(5, dtype=np.int16))
+        assert np.concatenate(ring.parts()).tolist() == [2, 3, 4]
+        
+        empty = PreRollRing(0)
+        empty.push(np.ones(5, dtype=np.int16))
+        assert empty.length == 0
+        assert sum(part.shape[0] for part in empty.parts()) == 0
 
 
 class TestWebRTCVAD:
@@ -292,6 +711,108 @@ class TestWebRTCVAD:
         result = vad.process_frame(small_frame)
         # Result depends on energy, but shouldn't crash
         assert isinstance(result, bool)
+    
+    def test_strided_frame_matches_contiguous(self):
+        """Test non-contiguous frames take the copy path with the same result."""
+        vad = WebRTCVAD(VADConfig(mode=VADMode.NORMAL))
+        stereo = np.zeros((480, 2), dtype=np.int16)
+        
+        assert not stereo[:, 0].flags.c_contiguous
+        assert vad.process_frame(stereo[:, 0]) == vad.process_frame(np.zeros(480, dtype=np.int16))
+
+
+class TestBatchVAD:
+    """Test batch and file-level VAD."""
+    
+    def _signal(self):
+        speech = np.full(480 * 5, 2000, dtype=np.int16)
+        silence = np.zeros(480 * 5, dtype=np.int16)
+        return np.concatenate([silence, speech, silence, speech])
+    
+    def test_batch_matches_per_frame(self):
+        """Test process_batch gives the same decisions as process_frame."""
+        samples = self._signal()
+        batch_vad = WebRTCVAD(VADConfig(mode=VADMode.NORMAL))
+        frame_vad = WebRTCVAD(VADConfig(mode=VADMode.NORMAL))
+        
+        result = batch_vad.process_batch(samples)
+        expected = [frame_vad.process_frame(f) for f in samples.reshape(-1, 480)]
+        
+        assert result.dtype == bool
+        assert result.tolist() == expected
+        assert batch_vad.state == frame_vad.state
+    
+    def test_batch_ignores_partial_frame(self):
+        """Test trailing samples that do not fill a frame are dropped."""
+        vad = WebRTCVAD(VADConfig(mode=VADMode.NORMAL))
+        
+        assert len(vad.process_batch(np.zeros(480 * 3 + 100, dtype=np.int16))) == 3
+        assert len(vad.process_batch(np.zeros(100, dtype=np.int16))) == 0
+    
+    def test_batch_mock_fallback(self):
+        """Test VADs without a WebRTC backend fall back to per-frame scoring."""
+        vad = MockVAD(VADConfig(mode=VADMode.NORMAL))
+        
+        result = vad.process_batch(self._signal())
+        
+        assert result.tolist() == [False] * 5 + [True] * 5 + [False] * 5 + [True] * 5
+    
+    def test_process_wav_file(self, tmp_path):
+        """Test running VAD over a WAV file in blocks."""
+        import wave
+        
+        samples = self._signal()
+        path = tmp_path / "session.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(samples.tobytes())
+        
+        result = process_wav_file(path, block_frames=3)
+        expected = WebRTCVAD(VADConfig(mode=VADMode.MEDIUM)).process_batch(samples)
+        
+        assert result.tolist() == expected.tolist()
+    
+    def test_read_pcm16_wav(self, tmp_path):
+        """Test the shared WAV reader keeps channels or averages them, and rejects non-16-bit PCM."""
+        import wave
+        
+        stereo = np.array([[100, 300], [-200, -400]], dtype=np.int16)
+        path = tmp_path / "stereo.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(stereo.tobytes())
+        
+        with open_pcm16_wav(path) as wav:
+            np.testing.assert_array_equal(read_pcm16_frames(wav, 2), stereo)
+        with open_pcm16_wav(path) as wav:
+            assert read_pcm16_frames(wav, 2, mono=True).tolist() == [200, -300]
+        
+        wide = tmp_path / "wide.wav"
+        with wave.open(str(wide), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(3)
+            wav.setframerate(16000)
+            wav.writeframes(b"\x00" * 6)
+        with pytest.raises(ValueError, match="Expected 16-bit PCM, got 24-bit"):
+            open_pcm16_wav(wide)
+    
+    def test_process_wav_file_rate_mismatch(self, tmp_path):
+        """Test a VAD configured for another rate is rejected."""
+        import wave
+        
+        path = tmp_path / "session.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes(np.zeros(800, dtype=np.int16).tobytes())
+        
+        with pytest.raises(ValueError):
+            process_wav_file(path, vad=WebRTCVAD(VADConfig(sample_rate=16000)))
 
 
 class TestAudioDeviceManager:
@@ -0,0 +1,227 @@
+"""
+Unit tests for wake_word module.
+"""
+import numpy as np
+import pytest
+
+from bridge.audio_pipeline import AudioPipeline, PipelineState
+from bridge.config import AppConfig, AudioConfig
+from unittest.mock import patch
+
+from bridge.vad import VADConfig, create_vad
+from bridge.wake_word import (
+    EnergyPatternDetector,
+    TemplateDetector,
+    WakeWordBackend,
+    WakeWordGate,
+    create_wake_word_detector,
+)
+
+FRAME = 480  # 30 ms at 16 kHz
+
+
+def pattern(*parts):
+    """Frames of (voiced, milliseconds) runs: voiced runs are a loud tone."""
+    frames = []
+    t = np.arange(FRAME) / 16000
+    tone = (np.sin(2 * np.pi * 220 * t) * 6000).astype(np.int16)
+    for voiced, ms in parts:
+        for _ in range(ms // 30):
+            frames.append(tone.copy() if voiced else np.zeros(FRAME, dtype=np.int16))
+    return frames
+
+
+HEY_HAL = pattern((False, 600), (True, 180), (False, 120), (True, 240), (False, 600))
+
+
+def fired(detector, frames):
+    """Indices of frames on which the detector fired."""
+    return [i for i, frame in enumerate(frames) if detector.process(frame) is not None]
+
+
+class TestEnergyPatternDetector:
+    """Test EnergyPatternDetector."""
+    
+    def test_fires_on_two_bursts(self):
+        """Test two short bursts followed by a pause fire once."""
+        hits = fired(EnergyPatternDetector(syllables=2), HEY_HAL)
+        
+        assert len(hits) == 1
+        assert hits[0] > 20  # After the closing pause, not mid-phrase
+    
+    def test_ignores_other_patterns(self):
+        """Test long speech and the wrong syllable count do not fire."""
+        detector = EnergyPatternDetector(syllables=2)
+        
+        assert fired(detector, pattern((False, 300), (True, 900), (False, 600))) == []
+        assert fired(detector, pattern(
+            (True, 150), (False, 120), (True, 150), (False, 120), (True, 150), (False, 600)
+        )) == []
+        assert fired(detector, pattern((True, 150), (False, 600))) == []
+    
+    def test_long_run_spoils_until_pause(self):
+        """Test a long run ahead of the phrase does not merge into it."""
+        frames = pattern((True, 900), (False, 120)) + HEY_HAL
+        
+        assert len(fired(EnergyPatternDetector(syllables=2), frames)) == 1
+
+
+class TestTemplateDetector:
+    """Test TemplateDetector."""
+    
+    def test_matches_enrolled_phrase(self):
+        """Test the enrolled contour fires and a different one does not."""
+        phrase = np.concatenate(HEY_HAL[18:40])
+        detector = TemplateDetector.from_audio(phrase, FRAME, threshold=0.8)
+        
+        assert fired(detector, pattern((True, 900), (False, 900))) == []
+        detector.reset()
+        hits = fired(detector, HEY_HAL)
+        assert len(hits) == 1
+        assert detector.last_score >= 0.8
+    
+    def test_template_needs_frames(self):
+        """Test an empty template is rejected."""
+        with pytest.raises(ValueError):
+            TemplateDetector.from_audio(np.zeros(100, dtype=np.int16), FRAME)
+    
+    def test_template_backend_needs_path(self):
+        """Test create_wake_word_detector validates the template backend."""
+        with pytest.raises(ValueError):
+            create_wake_word_detector(WakeWordBackend.TEMPLATE)
+        assert isinstance(
+            create_wake_word_detector(WakeWordBackend.ENERGY), EnergyPatternDetector
+        )
+
+
+class TestWakeWordGate:
+    """Test WakeWordGate."""
+    
+    def test_pre_roll_is_ordered_after_wrap(self):
+        """Test the ring hands out the newest audio, oldest first."""
+        gate = WakeWordGate(EnergyPatternDetector(), pre_roll_ms=90)
+        for i in range(5):
+            gate.process(np.full(FRAME, i, dtype=np.int16), float(i))
+        
+        pre_roll = gate.pre_roll()
+        assert pre_roll.shape == (3 * FRAME,)
+        assert pre_roll[::FRAME].tolist() == [2, 3, 4]
+    
+    def test_detection_carries_pre_roll(self):
+        """Test a detection hands over the audio that led to it."""
+        gate = WakeWordGate(EnergyPatternDetector(), pre_roll_ms=1000, phrase="hey hal")
+        detections = [gate.process(frame, i * 0.03) for i, frame in enumerate(HEY_HAL)]
+        detections = [d for d in detections if d is not None]
+        
+        assert len(detections) == 1
+        assert detections[0].phrase == "hey hal"
+        assert detections[0].audio.shape == (16000,)
+        assert np.abs(detections[0].audio).max() > 5000
+        assert gate.detections == 1
+    
+    def test_from_config(self):
+        """Test the gate follows the wake_word config section."""
+        config = AppConfig().wake_word
+        assert config.enabled is False
+        
+        gate = WakeWordGate.from_config(config, phrase="hey hal")
+        assert isinstance(gate.detector, EnergyPatternDetector)
+        assert gate.detector.syllables == config.syllables
+
+
+class TestGatedPipeline:
+    """Test the pipeline with a wake-word gate."""
+    
+    @pytest.fixture
+    def pipeline(self):
+        config = VADConfig(min_speech_duration_ms=60, min_silence_duration_ms=150)
+        gate = WakeWordGate(EnergyPatternDetector(), pre_roll_ms=1500, phrase="hey hal")
+        pipeline = AudioPipeline(
+            audio_config=AudioConfig(),
+            vad_config=config,
+            wake_gate=gate,
+            listen_timeout=1.0
+        )
+        pipeline.attach_capture(16000, FRAME)
+        
+        # Count VAD calls on the pipeline's own (default) VAD
+        pipeline.vad_calls = 0
+        process_frame = pipeline.vad.process_frame
+        
+        def counting(frame):
+            pipeline.vad_calls += 1
+            return process_frame(frame)
+        pipeline.vad.process_frame = counting
+        return pipeline
+    
+    def test_uses_default_vad(self, pipeline):
+        """Test the gated pipeline runs on the backend create_vad picks."""
+        assert type(pipeline.vad) is type(create_vad(VADConfig()))
+        assert pipeline.segmenter.vad is pipeline.vad
+    
+    def test_vad_idle_until_wake_word(self, pipeline):
+        """Test IDLE frames skip the VAD and the wake word starts listening."""
+        wakes = []
+        pipeline._on_wake_word = wakes.append
+        speech = pattern((True, 600), (False, 450))
+        assert pipeline.state.value == PipelineState.IDLE.value
+        
+        t = 0.0
+        for frame in speech:
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert pipeline.vad_calls == 0
+        assert pipeline.stats.speech_segments_detected == 0
+        
+        for frame in HEY_HAL:
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert len(wakes) == 1
+        assert pipeline.state.value == PipelineState.LISTENING.value
+        
+        for frame in speech:
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert pipeline.vad_calls > 0
+        assert pipeline.stats.speech_segments_detected == 1
+    
+    def test_returns_to_idle_after_timeout(self, pipeline):
+        """Test listening without speech falls back to the gate."""
+        t = 0.0
+        for frame in HEY_HAL:
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert pipeline.state.value == PipelineState.LISTENING.value
+        
+        for frame in pattern((False, 1200)):
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert pipeline.state.value == PipelineState.IDLE.value
+    
+    def test_gate_built_from_app_config(self):
+        """Test enabling wake_word in the app config gates the pipeline."""
+        config = AppConfig()
+        config.wake_word.enabled = True
+        config.wake_word.listen_timeout = 3.0
+        with patch("bridge.audio_pipeline.get_config", return_value=config):
+            pipeline = AudioPipeline(vad_config=VADConfig())
+        pipeline.attach_capture(16000, FRAME)
+        
+        assert isinstance(pipeline.wake_gate.detector, EnergyPatternDetector)
+        assert pipeline.wake_gate.phrase == config.bridge.wake_word
+        assert pipeline.listen_timeout == 3.0
+        assert pipeline.waiting_for_wake_word
+        
+        t = 0.0
+        for frame in HEY_HAL:
+            pipeline._analyze_frame(frame, t)
+            t += 0.03
+        assert pipeline.state.value == PipelineState.LISTENING.value
+    
+    def test_ungated_pipeline_listens(self):
+        """Test pipelines without a gate start listening as before."""
+        pipeline = AudioPipeline(audio_config=AudioConfig(), vad_config=VADConfig())
+        pipeline.attach_capture(16000, FRAME)
+        
+        assert pipeline.state.value == PipelineState.LISTENING.value
+        assert not pipeline.waiting_for_wake_word
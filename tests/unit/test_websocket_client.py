@@ -43,6 +43,7 @@ class TestMessageType:
         assert MessageType.SESSION_RESTORE.value == "session_restore"
         assert MessageType.PING.value == "ping"
         assert MessageType.PONG.value == "pong"
+        assert MessageType.AUDIO.value == "audio"
 
 
 class TestControlAction:
@@ -471,10 +472,10 @@ class TestOpenClawWebSocketClientDisconnect:
         """Test disconnect callback is called."""
         config = OpenClawConfig()
         disconnect_called = []
-
+        
         def on_disconnect():
             disconnect_called.append(True)
-
+        
         client = OpenClawWebSocketClient(
             config=config,
             on_disconnect=on_disconnect,
@@ -483,12 +484,109 @@ class TestOpenClawWebSocketClientDisconnect:
         mock_ws = AsyncMock()
         mock_ws.close = AsyncMock()
         client.websocket = mock_ws
-
+        
         await client.disconnect()
-
+        
         assert len(disconnect_called) == 1
 
 
+class TestReceiveDispatch:
+    """Tests for the receive loop and per-type handlers."""
+    
+    @pytest.fixture
+    def no_persistence(self):
+        config = MagicMock()
+        config.persistence.enabled = False
+        with patch("bridge.websocket_client.get_config", return_value=config):
+            yield
+    
+    @pytest.mark.asyncio
+    async def test_handlers_route_by_type(self, no_persistence):
+        """Test registered types go to their handler and the rest to on_message."""
+        from bridge.stub_server import StubOpenClawServer
+        
+        transcripts, responses, other = [], [], []
+        async with StubOpenClawServer() as server:
+            client = OpenClawWebSocketClient(
+                config=server.config(),
+                on_message=other.append,
+                handlers={"transcript": transcripts.append},
+            )
+            client.register_handler("response", responses.append)
+            assert await client.connect()
+            try:
+                await server.send({"type": "transcript", "text": "a"})
+                await server.send({"type": "response", "text": "b"})
+                await server.send({"type": "pong"})
+                for _ in range(100):
+                    if responses:
+                        break
+                    await asyncio.sleep(0.01)
+                client.unregister_handler("response")
+                await server.send({"type": "response", "text": "c"})
+                for _ in range(100):
+                    if len(other) == 2:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await client.disconnect()
+        
+        assert [m["text"] for m in transcripts] == ["a"]
+        assert [m["text"] for m in responses] == ["b"]
+        assert [m["type"] for m in other] == ["pong", "response"]
+        assert client.stats.messages_received == 4
+    
+    @pytest.mark.asyncio
+    async def test_bad_messages_do_not_stop_loop(self, no_persistence):
+        """Test invalid JSON and failing handlers are skipped."""
+        from bridge.stub_server import StubOpenClawServer
+        
+        received = []
+        
+        def failing(message):
+            raise RuntimeError("boom")
+        
+        async with StubOpenClawServer() as server:
+            client = OpenClawWebSocketClient(
+                config=server.config(), on_message=received.append, handlers={"bad": failing}
+            )
+            assert await client.connect()
+            try:
+                for websocket in server._clients:
+                    await websocket.send("{not json")
+                    await websocket.send("[1, 2]")
+                await server.send({"type": "bad"})
+                await server.send({"type": "response", "text": "still here"})
+                for _ in range(100):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+                assert not client._receive_task.done()
+            finally:
+                await client.disconnect()
+        
+        assert received[0]["text"] == "still here"
+    
+    @pytest.mark.asyncio
+    async def test_server_close_and_cancellation(self, no_persistence):
+        """Test a server close ends the loop and disconnect cancels a live one."""
+        from bridge.stub_server import StubOpenClawServer
+        
+        async with StubOpenClawServer() as server:
+            client = OpenClawWebSocketClient(config=server.config())
+            assert await client.connect()
+            receive_task = client._receive_task
+            await client.disconnect()
+            assert receive_task.cancelled()
+            
+            assert await client.connect()
+            for websocket in list(server._clients):
+                await websocket.close()
+            await asyncio.wait_for(client._receive_task, timeout=2.0)
+            assert client.state == ConnectionState.DISCONNECTED
+            await client.disconnect()
+
+
 class TestOpenClawWebSocketClientStats:
     """Tests for connection statistics."""
     